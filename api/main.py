@@ -38,13 +38,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from diotec360.core.env_guard import validate_environment, print_report
 from diotec360.core.env_compat import getenv
 from diotec360.core.parser import AethelParser
-from diotec360.core.judge import AethelJudge
 from diotec360.core.vault import AethelVault
 from diotec360.core.state import AethelStateManager
 from diotec360.core.persistence import get_persistence_layer
 from diotec360.nexo.p2p_streams import get_lattice_streams
 from api.explorer import router as explorer_router
 from api.autopilot import router as autopilot_router
+from api.verify_executor import (
+    VerifyExecutor,
+    VerificationRejected,
+    VerificationDeadlineExceeded,
+    verify_source,
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -75,7 +80,14 @@ parser = AethelParser()
 vault = AethelVault()
 persistence = None  # Will be initialized in startup
 lattice_streams = None  # Will be initialized in startup
-# Judge will be initialized per-request with the parsed intent_map
+# Judge sessions are bound per-request to pre-warmed engines in the verification workers
+
+# Parsing and Z3 verification run in worker processes, off the event loop
+verify_executor = VerifyExecutor(
+    workers=int(getenv("DIOTEC360_VERIFY_WORKERS", legacy="AETHEL_VERIFY_WORKERS", default="0")) or None,
+    max_pending=int(getenv("DIOTEC360_VERIFY_MAX_PENDING", legacy="AETHEL_VERIFY_MAX_PENDING", default="0")) or None,
+    default_deadline=float(getenv("DIOTEC360_VERIFY_DEADLINE_S", legacy="AETHEL_VERIFY_DEADLINE_S", default="30")),
+)
 
 # Hybrid Sync state
 http_sync_task = None
@@ -94,6 +106,7 @@ _reconciliation_failures: Dict[str, int] = {}  # Tracks failure count per peer
 # Request/Response models
 class VerifyRequest(BaseModel):
     code: str
+    deadline_ms: Optional[int] = None
     
 class VerifyResponse(BaseModel):
     success: bool
@@ -200,7 +213,8 @@ async def lattice_state():
     except ImportError:
         AethelCrypt = None
     
-    merkle_root = persistence.merkle_db.get_root()
+    # Legacy flat root on the wire, so peers on earlier releases can verify it
+    merkle_root = persistence.merkle_db.get_legacy_root()
     timestamp = int(time.time())
     
     # Sign the state with node's private key
@@ -408,11 +422,21 @@ async def _lattice_startup() -> None:
         http_sync_task = asyncio.create_task(_http_sync_heartbeat())
         print("[STARTUP] [LUNG] HTTP Sync Heartbeat activated")
     
+    # Spawn and warm the verification workers
+    verify_executor.start()
+    print(f"[STARTUP] Verification executor started ({verify_executor.workers} workers, "
+          f"{verify_executor.max_pending} max pending)")
+    
     print("="*70)
     print("[ROCKET] LATTICE READY - Hybrid Sync Active")
     print("="*70 + "\n")
 
 
+@app.on_event("shutdown")
+async def _verify_executor_shutdown() -> None:
+    verify_executor.shutdown()
+
+
 async def _p2p_heartbeat_monitor():
     """
     P2P Heartbeat Monitor - Detects peerless condition
@@ -501,9 +525,10 @@ async def _http_sync_heartbeat():
                         if response.status_code == 200:
                             peer_state = response.json()
                             peer_root = peer_state.get("merkle_root")
-                            local_root = persistence.merkle_db.get_root()
+                            local_root = persistence.merkle_db.get_legacy_root()
                             
-                            if peer_root and peer_root != local_root:
+                            # Peers may publish the legacy or the sparse root
+                            if peer_root and peer_root not in (local_root, persistence.merkle_db.get_root()):
                                 # Increment divergence counter
                                 _divergence_tracker[peer_url] = _divergence_tracker.get(peer_url, 0) + 1
                                 
@@ -616,7 +641,7 @@ async def _force_state_reconciliation(client: httpx.AsyncClient, peer_url: str,
         if peer_state:
             # Update local Merkle DB with peer state
             for key, value in peer_state.items():
-                persistence.merkle_db.state[key] = value
+                persistence.merkle_db.put(key, value)
             
             # Recompute Merkle Root
             new_root = persistence.merkle_db.get_root()
@@ -662,12 +687,17 @@ def _handle_reconciliation_failure(peer_url: str):
 async def verify_code(request: VerifyRequest):
     """
     Verify Aethel code using the Judge (Z3 Solver)
+    
+    Parsing and verification run in the verification executor; the event
+    loop only awaits the result. Returns 429 with Retry-After when the
+    executor is saturated and 504 when the deadline passes.
     """
     try:
-        # Parse code - returns intent_map directly
-        intent_map = parser.parse(request.code)
+        # Parse code and verify each intent (v1.1.4 - Unified Proof Engine)
+        deadline = request.deadline_ms / 1000 if request.deadline_ms else None
+        outcome = await verify_executor.run(verify_source, request.code, deadline=deadline)
         
-        if not intent_map:
+        if not outcome['parsed']:
             return VerifyResponse(
                 success=False,
                 status="PARSE_ERROR",
@@ -676,53 +706,36 @@ async def verify_code(request: VerifyRequest):
                 errors=["Invalid syntax"]
             )
         
-        # Initialize Judge with intent map
-        judge = AethelJudge(intent_map)
-        
-        # Verify each intent (v1.1.4 - Unified Proof Engine)
-        results = []
+        results = outcome['results']
         all_proved = True
         
-        for intent_name in intent_map.keys():
-            try:
-                result = judge.verify_logic(intent_name)
-                
-                # result is now a dict with status, message, etc.
-                status = result.get('status', 'ERROR')
-                message = result.get('message', 'Unknown error')
-                
-                results.append({
-                    "name": intent_name,
-                    "status": status,
-                    "message": message
-                })
-                
-                if status != 'PROVED':
-                    all_proved = False
-                else:
-                    if lattice_streams.config.enabled:
-                        try:
-                            await lattice_streams.publish_proof_event({
-                                "intent": intent_name,
-                                "status": status,
-                            })
-                        except Exception:
-                            pass
-            except Exception as e:
-                results.append({
-                    "name": intent_name,
-                    "status": "ERROR",
-                    "message": str(e)
-                })
+        for result in results:
+            if result['status'] != 'PROVED':
                 all_proved = False
+            elif lattice_streams.config.enabled:
+                try:
+                    await lattice_streams.publish_proof_event({
+                        "intent": result['name'],
+                        "status": result['status'],
+                    })
+                except Exception:
+                    pass
         
         return VerifyResponse(
             success=all_proved,
             status="PROVED" if all_proved else "FAILED",
-            message=f"Verified {len(intent_map)} intent(s)",
+            message=f"Verified {len(results)} intent(s)",
             intents=results
         )
         
+    except VerificationRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except VerificationDeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         return VerifyResponse(
             success=False,
@@ -732,6 +745,15 @@ async def verify_code(request: VerifyRequest):
             errors=[str(e)]
         )
 
+
+@app.get("/api/verify/metrics")
+async def verify_metrics():
+    """Queue depth, admission and latency metrics of the verification executor"""
+    return {
+        "success": True,
+        "executor": verify_executor.get_metrics()
+    }
+
 # Compilation endpoint
 @app.post("/api/compile", response_model=CompileResponse)
 async def compile_code(request: CompileRequest):
@@ -764,6 +786,9 @@ async def compile_code(request: CompileRequest):
             vault_hash=vault_hash
         )
         
+    except HTTPException:
+        # Saturation (429) and deadline (504) errors from verification
+        raise
     except Exception as e:
         return CompileResponse(
             success=False,
@@ -1092,6 +1117,7 @@ async def ghost_predict(request: VerifyRequest):
             "latency": prediction.latency,
             "eliminated_states": prediction.eliminated_states,
             "message": prediction.message,
+            "region": prediction.region,
             "result": {
                 "variables": prediction.result.variables if prediction.result else None,
                 "merkle_root": prediction.result.merkle_root if prediction.result else None
@@ -0,0 +1,282 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Verification Executor - Off-event-loop parsing and Z3 verification
+
+/api/verify used to parse and run judge.verify_logic inside the async
+endpoint, so a single Z3 solve froze the uvicorn event loop: /health, the
+lattice heartbeats and the P2P pump all stalled behind it.
+
+VerifyExecutor runs that work in a bounded pool of worker processes that the
+endpoints await:
+- Admission control: at most max_pending requests in flight; beyond that
+  VerificationRejected carries a Retry-After estimate (HTTP 429)
+- Per-request deadlines (VerificationDeadlineExceeded, HTTP 504); a request
+  that already started keeps its slot until the worker finishes it, so
+  backpressure stays honest
+- Queue-depth and latency metrics
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+
+# Worker-process state (one parser and one pre-warmed judge engine per
+# worker, built by the initializer; a worker runs one request at a time)
+_worker_parser = None
+_worker_engines = None
+
+
+def _init_worker() -> None:
+    """Warm a worker: build the parser and a judge engine once, silence console output"""
+    global _worker_parser, _worker_engines
+    sys.stdout = open(os.devnull, "w")
+
+    from diotec360.core.parser import AethelParser
+    from diotec360.core.judge_engine import JudgeEnginePool
+
+    _worker_parser = AethelParser()
+    _worker_engines = JudgeEnginePool(size=1, quiet=True)
+
+
+def _ping() -> bool:
+    return True
+
+
+def verify_source(code: str) -> Dict[str, Any]:
+    """
+    Parse Aethel source and verify every intent (runs in a worker process).
+
+    Returns:
+        {'parsed': bool, 'results': [{'name', 'status', 'message'}, ...]}
+    """
+    global _worker_parser, _worker_engines
+    if _worker_parser is None:
+        # Called outside a worker (e.g. inline): build the same state lazily
+        from diotec360.core.parser import AethelParser
+        _worker_parser = AethelParser()
+    if _worker_engines is None:
+        from diotec360.core.judge_engine import JudgeEnginePool
+        _worker_engines = JudgeEnginePool(size=1, quiet=True)
+    parser = _worker_parser
+
+    intent_map = parser.parse(code)
+    if not intent_map:
+        return {'parsed': False, 'results': []}
+
+    results = []
+    with _worker_engines.session(intent_map) as judge:
+        for intent_name in intent_map.keys():
+            try:
+                result = judge.verify_logic(intent_name)
+                results.append({
+                    'name': intent_name,
+                    'status': result.get('status', 'ERROR'),
+                    'message': str(result.get('message', 'Unknown error'))
+                })
+            except Exception as e:
+                results.append({
+                    'name': intent_name,
+                    'status': 'ERROR',
+                    'message': str(e)
+                })
+
+    return {'parsed': True, 'results': results}
+
+
+class VerificationRejected(Exception):
+    """The executor is saturated; the client should retry later"""
+
+    def __init__(self, retry_after: int, in_flight: int):
+        self.retry_after = retry_after
+        self.in_flight = in_flight
+        super().__init__(f"Verification queue full ({in_flight} in flight), retry after {retry_after}s")
+
+
+class VerificationDeadlineExceeded(Exception):
+    """A verification did not finish before its deadline"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        super().__init__(f"Verification exceeded its {deadline:.1f}s deadline")
+
+
+class VerifyExecutor:
+    """
+    Bounded process pool for CPU-bound verification work.
+
+    One instance is shared by the API endpoints. All bookkeeping happens on
+    the event loop except the completion callback, which runs on the pool's
+    management thread and is guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        default_deadline: Optional[float] = 30.0
+    ):
+        """
+        Initialize the executor. Worker processes start on start() or first use.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            max_pending: Requests admitted at once, running plus queued
+                (default: 4 per worker)
+            default_deadline: Seconds a request may take (None: no deadline)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 4
+        self.default_deadline = default_deadline
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Metrics
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._deadline_exceeded = 0
+        self._max_queue_depth = 0
+        self._latencies_ms: deque = deque(maxlen=1024)
+
+    def start(self) -> None:
+        """Start the worker processes and warm them up in the background"""
+        with self._lock:
+            if self._pool is not None:
+                return
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            pool = self._pool
+        # Submitting one task per worker spawns all of them now, not on the first requests
+        for _ in range(self.workers):
+            pool.submit(_ping)
+
+    async def run(self, fn: Callable[..., Any], *args: Any, deadline: Optional[float] = None) -> Any:
+        """
+        Run fn(*args) in a worker process and await its result.
+
+        Args:
+            fn: Picklable module-level function
+            deadline: Seconds to wait (default: default_deadline)
+
+        Raises:
+            VerificationRejected: max_pending requests are already in flight
+            VerificationDeadlineExceeded: the result did not arrive in time
+        """
+        timeout = self.default_deadline if deadline is None else deadline
+
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self._rejected += 1
+                raise VerificationRejected(self._retry_after(), self._in_flight)
+            self._in_flight += 1
+            self._submitted += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._in_flight - self.workers)
+
+        self.start()
+        submitted_at = time.monotonic()
+        try:
+            future = self._pool.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            self._finish(submitted_at, failed=True)
+            self._discard_pool()
+            raise
+        future.add_done_callback(
+            lambda f: self._finish(submitted_at, failed=f.cancelled() or f.exception() is not None)
+        )
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            # Queued work is dropped; started work keeps its slot until it ends
+            future.cancel()
+            with self._lock:
+                self._deadline_exceeded += 1
+            raise VerificationDeadlineExceeded(timeout)
+        except BrokenProcessPool:
+            self._discard_pool()
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get executor metrics.
+
+        Returns:
+            Dictionary with queue depth, admission and latency statistics
+        """
+        with self._lock:
+            latencies = sorted(self._latencies_ms)
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'in_flight': self._in_flight,
+                'queue_depth': max(0, self._in_flight - self.workers),
+                'max_queue_depth': self._max_queue_depth,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'deadline_exceeded': self._deadline_exceeded,
+                'avg_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+                'p99_latency_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, dropping queued work"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _finish(self, submitted_at: float, failed: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._failed += 1
+            else:
+                self._completed += 1
+                self._latencies_ms.append((time.monotonic() - submitted_at) * 1000)
+
+    def _retry_after(self) -> int:
+        """Seconds until a slot is likely free, from recent latencies"""
+        if not self._latencies_ms:
+            return 1
+        avg_seconds = sum(self._latencies_ms) / len(self._latencies_ms) / 1000
+        waves = max(1, math.ceil((self._in_flight - self.workers + 1) / self.workers))
+        return max(1, math.ceil(avg_seconds * waves))
+
+    def _discard_pool(self) -> None:
+        """Drop a broken pool; the next request starts a fresh one"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
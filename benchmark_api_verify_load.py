@@ -0,0 +1,178 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Load test: /health latency while /api/verify saturates the verifier.
+
+By default an in-process FastAPI app (driven through httpx's ASGI transport on
+one event loop, like a single uvicorn worker) exposes both strategies:
+- inline: parse + verify inside the async handler (previous /api/verify)
+- pooled: the same work awaited through VerifyExecutor
+A prober hits /health every --probe-interval while --clients keep verifying.
+
+With --url the pooled scenario runs against a live server's /api/verify
+and /health instead.
+
+Run with: python benchmark_api_verify_load.py [--clients 8] [--duration 5] [--url http://localhost:8000]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from api.verify_executor import VerifyExecutor, VerificationRejected, verify_source
+
+
+def build_source(intents: int) -> str:
+    blocks = []
+    for i in range(intents):
+        blocks.append(f"""intent transfer_{i}(sender: Account, receiver: Account, amount: Balance) {{
+    guard {{
+        sender_balance >= amount;
+        amount > {i};
+    }}
+    solve {{
+        priority: security;
+    }}
+    verify {{
+        sender_balance == old_sender_balance - amount;
+        receiver_balance == old_receiver_balance + amount;
+    }}
+}}""")
+    return "\n\n".join(blocks)
+
+
+def build_app(executor: VerifyExecutor) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/inline/verify")
+    async def inline_verify(request: Dict[str, Any]):
+        return verify_source(request["code"])
+
+    @app.post("/pooled/verify")
+    async def pooled_verify(request: Dict[str, Any]):
+        try:
+            return await executor.run(verify_source, request["code"])
+        except VerificationRejected as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    return app
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def run_load(client: httpx.AsyncClient, verify_path: str, code: str, args) -> Dict[str, Any]:
+    stop_at = time.monotonic() + args.duration
+    health_ms: List[float] = []
+    verified = 0
+    throttled = 0
+
+    async def verifier():
+        nonlocal verified, throttled
+        while time.monotonic() < stop_at:
+            response = await client.post(verify_path, json={"code": code}, timeout=120)
+            if response.status_code == 429:
+                throttled += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+            else:
+                verified += 1
+
+    async def prober():
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            await client.get("/health")
+            health_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(args.probe_interval)
+
+    await asyncio.gather(prober(), *(verifier() for _ in range(args.clients)))
+    return {
+        'health_probes': len(health_ms),
+        'health_p50_ms': statistics.median(health_ms),
+        'health_p99_ms': percentile(health_ms, 0.99),
+        'health_max_ms': max(health_ms),
+        'verifies_per_second': verified / args.duration,
+        'throttled': throttled,
+    }
+
+
+async def main_async(args) -> Dict[str, Any]:
+    code = build_source(args.intents)
+    results: Dict[str, Any] = {}
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url) as client:
+            results['live'] = await run_load(client, "/api/verify", code, args)
+            metrics = await client.get("/api/verify/metrics")
+            results['live']['executor'] = metrics.json().get('executor')
+        return results
+
+    executor = VerifyExecutor(workers=args.workers, max_pending=args.max_pending)
+    executor.start()
+    await executor.run(verify_source, code)  # Warm-up: workers import Z3
+    transport = httpx.ASGITransport(app=build_app(executor))
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results['inline'] = await run_load(client, "/inline/verify", code, args)
+            results['pooled'] = await run_load(client, "/pooled/verify", code, args)
+        results['pooled']['executor'] = executor.get_metrics()
+    finally:
+        executor.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/health latency under verification load")
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--intents', type=int, default=5, help="Intents per verified source")
+    parser.add_argument('--probe-interval', type=float, default=0.02)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=None)
+    parser.add_argument('--url', default=None, help="Live server to load instead of the in-process app")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"API VERIFY LOAD: {args.clients} clients, {args.duration:.0f}s, {args.intents} intents per source")
+    print("=" * 80)
+
+    results = asyncio.run(main_async(args))
+
+    print(f"{'mode':>8} {'probes':>7} {'health p50':>12} {'health p99':>12} {'health max':>12} {'verify/s':>10} {'429s':>6}")
+    for mode, r in results.items():
+        print(f"{mode:>8} {r['health_probes']:>7} {r['health_p50_ms']:>10.1f}ms {r['health_p99_ms']:>10.1f}ms "
+              f"{r['health_max_ms']:>10.1f}ms {r['verifies_per_second']:>10.1f} {r['throttled']:>6}")
+
+    with open('benchmark_api_verify_load_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_api_verify_load_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Aethel-Pilot keystroke replay over large multi-intent files.
+
+A new guard condition and a new verify condition are typed, one character
+at a time, into the middle intent of a file of N intents. Every keystroke
+makes the three editor calls /api/autopilot makes: get_suggestions,
+get_safety_status and get_correction_stream.
+
+- full: caches cleared before every keystroke, so each call parses and
+  analyses the whole document (the behaviour before the intent document,
+  whose caches keyed on code + cursor never hit while typing)
+- incremental: one AethelAutopilot for the session; only the edited intent
+  is re-parsed and re-analysed
+
+Responses of both modes are checked equal on every keystroke.
+
+Run with: python benchmark_autopilot_keystrokes.py [--intents 50 200] [--budget-ms 50]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from diotec360.ai.autopilot_engine import AethelAutopilot, EditorState
+
+
+GUARD_TYPED = "\n        receiver_balance + amount <= max_balance;"
+VERIFY_TYPED = "\n        receiver_balance == old_receiver_balance + amount;"
+
+
+def intent(i: int) -> str:
+    return f"""intent transfer_{i}(sender: Account, receiver: Account, amount: Balance) {{
+    guard {{
+        sender_balance >= amount;
+        amount > 0;
+    }}
+    solve {{
+        priority: security;
+    }}
+    verify {{
+        sender_balance == old_sender_balance - amount;
+    }}
+}}
+"""
+
+
+def keystrokes(intents: int) -> List[tuple]:
+    """(code, cursor) after every typed character"""
+    code = "\n".join(intent(i) for i in range(intents))
+    middle = code.index(f"intent transfer_{intents // 2}(")
+    states = []
+    for anchor, typed in (("amount > 0;", GUARD_TYPED), ("- amount;", VERIFY_TYPED)):
+        cursor = code.index(anchor, middle) + len(anchor)
+        for char in typed:
+            code = code[:cursor] + char + code[cursor:]
+            cursor += 1
+            states.append((code, cursor))
+    return states
+
+
+def replay(states: List[tuple], mode: str) -> Dict:
+    autopilot = AethelAutopilot()
+    latencies = []
+    responses = []
+    for code, cursor in states:
+        if mode == 'full':
+            autopilot.clear_cache()
+        start = time.perf_counter()
+        suggestions = autopilot.get_suggestions(EditorState(code, cursor, "", 0, ""))
+        safety = autopilot.get_safety_status(code)
+        corrections = autopilot.get_correction_stream(code)
+        latencies.append((time.perf_counter() - start) * 1000)
+        responses.append(([vars(s) for s in suggestions], safety, corrections))
+    return {'latencies': latencies, 'responses': responses}
+
+
+def summarize(latencies: List[float], budget_ms: float) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        'mean_ms': statistics.mean(latencies),
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': ordered[int(len(ordered) * 0.99)],
+        'within_budget': sum(1 for l in latencies if l <= budget_ms) / len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aethel-Pilot keystroke replay")
+    parser.add_argument('--intents', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--budget-ms', type=float, default=AethelAutopilot.SUGGESTION_LATENCY_BUDGET_MS)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"AETHEL-PILOT KEYSTROKE REPLAY: 3 editor calls per keystroke, budget {args.budget_ms:.0f} ms")
+    print("=" * 80)
+    print(f"{'intents':>8} {'mode':>12} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'in budget':>10}")
+
+    results = []
+    for intents in args.intents:
+        states = keystrokes(intents)
+        full = replay(states, 'full')
+        incremental = replay(states, 'incremental')
+        row = {
+            'intents': intents,
+            'document_chars': len(states[-1][0]),
+            'keystrokes': len(states),
+            'full': summarize(full['latencies'], args.budget_ms),
+            'incremental': summarize(incremental['latencies'], args.budget_ms),
+            'identical': full['responses'] == incremental['responses'],
+        }
+        row['speedup'] = row['full']['mean_ms'] / row['incremental']['mean_ms']
+        results.append(row)
+
+        for mode in ('full', 'incremental'):
+            r = row[mode]
+            print(f"{intents:>8} {mode:>12} {r['mean_ms']:>9.2f} {r['p50_ms']:>9.2f} "
+                  f"{r['p99_ms']:>9.2f} {r['within_budget']:>9.0%}")
+        print(f"{'':>8} {'speedup':>12} {row['speedup']:>8.1f}x  identical: "
+              f"{'yes' if row['identical'] else 'NO'}")
+
+    with open('benchmark_autopilot_keystrokes_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_autopilot_keystrokes_results.json")
+
+
+if __name__ == "__main__":
+    main()
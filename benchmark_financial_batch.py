@@ -0,0 +1,119 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Financial batch APIs versus a loop over the scalar functions.
+
+One risk cycle: every portfolio gets VaR at 95%, Sharpe and Sortino; a loan
+book gets payments and full schedules; a deposit book is compounded over a
+rate table. Batch results are checked equal to the scalar results.
+
+Run with: python benchmark_financial_batch.py [--portfolios 2000] [--history 1000] [--loans 1000]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Callable, Dict
+
+from diotec360.stdlib.financial import (
+    value_at_risk, sharpe_ratio, sortino_ratio,
+    compound_interest, loan_payment, amortization_schedule,
+    value_at_risk_batch, sharpe_ratio_batch, sortino_ratio_batch,
+    compound_interest_batch, loan_payment_batch, amortization_schedule_batch,
+)
+
+
+def timed(fn: Callable):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def compare(scalar: Callable, batch: Callable, normalize=lambda r: r) -> Dict[str, float]:
+    expected, scalar_seconds = timed(scalar)
+    actual, batch_seconds = timed(batch)
+    return {
+        'scalar_seconds': scalar_seconds,
+        'batch_seconds': batch_seconds,
+        'speedup': scalar_seconds / batch_seconds,
+        'identical': normalize(actual) == expected,
+    }
+
+
+def run(portfolios: int, history: int, loans: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(360)
+    returns = [[rng.randint(-1500, 1800) for _ in range(history)] for _ in range(portfolios)]
+    values = [rng.randint(10**6, 10**10) for _ in range(portfolios)]
+
+    rate_table = [300, 450, 600, 750, 900, 1200]
+    book = [(rng.randint(10**5, 10**8), rng.choice(rate_table), rng.choice([60, 120, 180, 360]))
+            for _ in range(loans)]
+    principals, rates, terms = (list(column) for column in zip(*book))
+    deposits = [rng.randint(10**4, 10**8) for _ in range(loans)]
+    deposit_rates = [rng.choice(rate_table) for _ in range(loans)]
+
+    return {
+        'value_at_risk': compare(
+            lambda: [value_at_risk(v, r, 9500) for v, r in zip(values, returns)],
+            lambda: value_at_risk_batch(values, returns, 9500)),
+        'sharpe_ratio': compare(
+            lambda: [sharpe_ratio(r, 200) for r in returns],
+            lambda: sharpe_ratio_batch(returns, 200)),
+        'sortino_ratio': compare(
+            lambda: [sortino_ratio(r, 200) for r in returns],
+            lambda: sortino_ratio_batch(returns, 200)),
+        'compound_interest': compare(
+            lambda: [compound_interest(d, r, 12, 10) for d, r in zip(deposits, deposit_rates)],
+            lambda: compound_interest_batch(deposits, deposit_rates, 12, 10)),
+        'loan_payment': compare(
+            lambda: [loan_payment(*loan) for loan in book],
+            lambda: loan_payment_batch(principals, rates, terms)),
+        'amortization_schedule': compare(
+            lambda: [amortization_schedule(*loan) for loan in book],
+            lambda: amortization_schedule_batch(principals, rates, terms),
+            normalize=lambda tables: [t.to_schedule() for t in tables]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Financial batch APIs vs scalar loop")
+    parser.add_argument('--portfolios', type=int, default=2000)
+    parser.add_argument('--history', type=int, default=1000)
+    parser.add_argument('--loans', type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"FINANCIAL BATCH: {args.portfolios:,} portfolios x {args.history:,} returns, "
+          f"{args.loans:,} loans")
+    print("=" * 80)
+
+    results = run(args.portfolios, args.history, args.loans)
+
+    print(f"{'function':>22} {'scalar s':>9} {'batch s':>9} {'speedup':>8} {'identical':>10}")
+    for name, r in results.items():
+        print(f"{name:>22} {r['scalar_seconds']:>9.3f} {r['batch_seconds']:>9.3f} "
+              f"{r['speedup']:>7.1f}x {'yes' if r['identical'] else 'NO':>10}")
+
+    with open('benchmark_financial_batch_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_financial_batch_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Rolling risk per tick: RollingRiskMetrics versus recomputing over the window.
+
+The window is filled first (untimed); then every tick pushes one return and reads VaR at 95%, Sharpe and Sortino over
+the last --window returns. The recompute baseline calls the scalar
+functions on the window each tick. Results are checked equal on every tick.
+
+Run with: python benchmark_financial_streaming.py [--ticks 5000] [--window 1000]
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import deque
+from typing import Dict, List
+
+from diotec360.stdlib.financial import (
+    value_at_risk, sharpe_ratio, sortino_ratio, RollingRiskMetrics,
+)
+
+
+def recompute(history: List[int], stream: List[int], window: int):
+    current = deque(history, maxlen=window)
+    results = []
+    start = time.perf_counter()
+    for r in stream:
+        current.append(r)
+        returns = list(current)
+        results.append((value_at_risk(10**8, returns, 9500),
+                        sharpe_ratio(returns, 200), sortino_ratio(returns, 200)))
+    return results, time.perf_counter() - start
+
+
+def streaming(history: List[int], stream: List[int], window: int):
+    metrics = RollingRiskMetrics(window)
+    metrics.extend(history)
+    results = []
+    start = time.perf_counter()
+    for r in stream:
+        metrics.push(r)
+        results.append((metrics.value_at_risk(10**8, 9500),
+                        metrics.sharpe_ratio(200), metrics.sortino_ratio(200)))
+    return results, time.perf_counter() - start
+
+
+def run(ticks: int, window: int) -> Dict[str, float]:
+    rng = random.Random(360)
+    history = [rng.randint(-1500, 1800) for _ in range(window)]
+    stream = [rng.randint(-1500, 1800) for _ in range(ticks)]
+
+    expected, recompute_seconds = recompute(history, stream, window)
+    actual, streaming_seconds = streaming(history, stream, window)
+
+    return {
+        'ticks': ticks,
+        'window': window,
+        'recompute_seconds': recompute_seconds,
+        'streaming_seconds': streaming_seconds,
+        'recompute_us_per_tick': recompute_seconds / ticks * 1e6,
+        'streaming_us_per_tick': streaming_seconds / ticks * 1e6,
+        'speedup': recompute_seconds / streaming_seconds,
+        'identical': actual == expected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming risk metrics vs per-tick recompute")
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--window', type=int, nargs='+', default=[250, 1000, 5000])
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"ROLLING RISK: {args.ticks:,} ticks, VaR 95% + Sharpe + Sortino per tick")
+    print("=" * 80)
+
+    results = [run(args.ticks, window) for window in args.window]
+
+    print(f"{'window':>8} {'recompute us':>13} {'streaming us':>13} {'speedup':>8} {'identical':>10}")
+    for r in results:
+        print(f"{r['window']:>8,} {r['recompute_us_per_tick']:>13.1f} {r['streaming_us_per_tick']:>13.1f} "
+              f"{r['speedup']:>7.1f}x {'yes' if r['identical'] else 'NO':>10}")
+
+    with open('benchmark_financial_streaming_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_financial_streaming_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Ghost-Runner keystroke latency: shared incremental solver versus a cold one.
+
+A file of --intents intents (each with --conditions guard conditions) is
+typed one character at a time. Every keystroke calls can_type_next_char,
+as /api/ghost/can-type does.
+
+- warm: one GhostRunner for the whole session (compiled conditions, solver
+  scopes and per-intent predictions are reused)
+- cold: a fresh GhostRunner per keystroke (every condition is compiled and
+  solved again)
+
+Run with: python benchmark_ghost_runner.py [--intents 10] [--conditions 8]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from diotec360.core.ghost import GhostRunner
+
+
+def build_source(intents: int, conditions: int) -> str:
+    blocks = []
+    for i in range(intents):
+        guards = "\n".join(f"        v{i}_{k + 1} >= v{i}_{k} + {k};" for k in range(conditions))
+        blocks.append(
+            f"intent step_{i}(v{i}_0: Balance) {{\n"
+            f"    guard {{\n{guards}\n        v{i}_0 >= 0;\n    }}\n"
+            f"    solve {{\n        priority: security;\n    }}\n"
+            f"    verify {{\n        v{i}_{conditions} <= 1000000;\n    }}\n"
+            f"}}\n"
+        )
+    return "\n".join(blocks)
+
+
+def replay(source: str, mode: str) -> Dict[str, float]:
+    shared = GhostRunner()
+    latencies: List[float] = []
+    blocked = 0
+
+    for i, char in enumerate(source):
+        ghost = GhostRunner() if mode == 'cold' else shared
+        start = time.perf_counter()
+        if not ghost.can_type_next_char(source[:i], char):
+            blocked += 1
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    terminators = [l for l, c in zip(latencies, source) if c in ';}']
+    return {
+        'keystrokes': len(source),
+        'blocked': blocked,
+        'total_seconds': sum(latencies) / 1000,
+        'mean_ms': statistics.mean(latencies),
+        'terminator_p50_ms': statistics.median(terminators),
+        'terminator_p99_ms': sorted(terminators)[int(len(terminators) * 0.99)],
+        'terminator_max_ms': max(terminators),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ghost-Runner keystroke latency")
+    parser.add_argument('--intents', type=int, default=10)
+    parser.add_argument('--conditions', type=int, default=8)
+    args = parser.parse_args()
+
+    source = build_source(args.intents, args.conditions)
+
+    print("=" * 80)
+    print(f"GHOST-RUNNER: typing {args.intents} intents x {args.conditions} guards "
+          f"({len(source):,} keystrokes)")
+    print("=" * 80)
+
+    results = {mode: replay(source, mode) for mode in ('cold', 'warm')}
+
+    print(f"{'mode':>6} {'total s':>8} {'mean ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'blocked':>8}")
+    for mode, r in results.items():
+        print(f"{mode:>6} {r['total_seconds']:>8.2f} {r['mean_ms']:>8.3f} {r['terminator_p50_ms']:>8.2f} "
+              f"{r['terminator_p99_ms']:>8.2f} {r['terminator_max_ms']:>8.2f} {r['blocked']:>8}")
+    print("(p50/p99/max over keystrokes that complete a condition: ';' and '}')")
+    print(f"\nWarm vs cold: {results['cold']['total_seconds'] / results['warm']['total_seconds']:.1f}x")
+
+    with open('benchmark_ghost_runner_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_ghost_runner_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Gossip propagation: session-per-message sequential fan-out versus pooled,
+concurrent, batched fan-out.
+
+Every node is a GossipProtocol behind a local aiohttp server that stands in
+for the node's HTTP API (/api/gossip and /api/gossip/batch). Node 0
+broadcasts all messages at once; a message is delivered when every other
+node has received it.
+
+The origin fans out to every peer with message_ttl=1: ttl is part of the
+signed content, so a message a peer decrements and forwards no longer
+verifies, and multi-hop relaying cannot be measured here.
+
+- legacy: a reference copy of the previous gossip loop (one message per
+  round, a new ClientSession per send, peers one after another)
+- pooled: the current GossipProtocol (one batch per round, pooled
+  keep-alive session, concurrent sends)
+
+Run with: python benchmark_gossip_fanout.py [--nodes 5] [--messages 200] [--interval 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import aiohttp
+from aiohttp import web
+
+from diotec360.core.crypto import AethelCrypt
+from diotec360.lattice.gossip import GossipProtocol, GossipConfig, GossipMessage
+
+
+@dataclass
+class StandInPeer:
+    """Peer record with the fields GossipProtocol reads"""
+    peer_id: str
+    address: str
+
+
+class LegacyGossipProtocol(GossipProtocol):
+    """Previous gossip loop and send path, kept here as the baseline"""
+
+    async def _gossip_loop(self) -> None:
+        while self._running:
+            if self.pending_messages:
+                message = self.pending_messages.popleft()
+                await self._gossip_message(message)
+            await asyncio.sleep(self.config.gossip_interval)
+
+    async def _gossip_message(self, message: GossipMessage) -> None:
+        import random
+        peers = self.get_peers()
+        if not peers:
+            return
+        for peer in random.sample(peers, min(self.config.fanout, len(peers))):
+            if peer.peer_id in message.seen_by:
+                continue
+            async with aiohttp.ClientSession() as session:
+                async with session.post(f"{peer.address}/api/gossip", json=message.to_dict(),
+                                        timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    await response.read()
+            message.seen_by.add(peer.peer_id)
+            self.stats["messages_sent"] += 1
+
+
+async def start_node(cls, node_id: str, port: int, config: GossipConfig, peers: List[StandInPeer],
+                     arrivals: Dict[str, Dict[int, float]]):
+    keypair = AethelCrypt.generate_keypair()
+    protocol = cls(config, node_id, lambda: [p for p in peers if p.peer_id != node_id], keypair.private_key)
+
+    async def on_bench(payload, origin_node):
+        arrivals[node_id].setdefault(payload["seq"], time.perf_counter())
+
+    protocol.register_handler("bench", on_bench)
+
+    async def gossip(request):
+        await protocol.receive_message(await request.json())
+        return web.json_response({"ok": True})
+
+    async def gossip_batch(request):
+        await protocol.receive_batch(await request.json())
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/api/gossip", gossip)
+    app.router.add_post("/api/gossip/batch", gossip_batch)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    await protocol.start()
+    return protocol, runner
+
+
+async def run_mode(cls, nodes: int, messages: int, interval: float, base_port: int,
+                   timeout: float) -> Dict[str, float]:
+    config = GossipConfig(fanout=nodes - 1, gossip_interval=interval, message_ttl=1,
+                          enable_anti_entropy=False)
+    peers = [StandInPeer(f"node_{i}", f"http://127.0.0.1:{base_port + i}") for i in range(nodes)]
+    arrivals: Dict[str, Dict[int, float]] = {peer.peer_id: {} for peer in peers}
+
+    started = [await start_node(cls, peer.peer_id, base_port + i, config, peers, arrivals)
+               for i, peer in enumerate(peers)]
+    origin = started[0][0]
+    receivers = [peer.peer_id for peer in peers[1:]]
+
+    sent_at = {}
+    start = time.perf_counter()
+    for seq in range(messages):
+        sent_at[seq] = time.perf_counter()
+        origin.broadcast("bench", {"seq": seq})
+
+    expected = messages * len(receivers)
+    while time.perf_counter() - start < timeout:
+        if sum(len(arrivals[node]) for node in receivers) >= expected:
+            break
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    for protocol, runner in started:
+        await protocol.stop()
+        await runner.cleanup()
+
+    delivered = sum(len(arrivals[node]) for node in receivers)
+    # Propagation latency: broadcast until the last receiver has the message
+    latencies = [
+        (max(arrivals[node][seq] for node in receivers) - sent_at[seq]) * 1000
+        for seq in range(messages)
+        if all(seq in arrivals[node] for node in receivers)
+    ]
+    return {
+        'seconds': elapsed,
+        'delivered_ratio': delivered / expected,
+        'messages_per_second': len(latencies) / elapsed,
+        'p50_latency_ms': statistics.median(latencies) if latencies else float('nan'),
+        'max_latency_ms': max(latencies) if latencies else float('nan'),
+    }
+
+
+async def run(nodes: int, messages: int, interval: float, timeout: float) -> Dict[str, Dict[str, float]]:
+    return {
+        'legacy': await run_mode(LegacyGossipProtocol, nodes, messages, interval, 18600, timeout),
+        'pooled': await run_mode(GossipProtocol, nodes, messages, interval, 18700, timeout),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gossip propagation throughput")
+    parser.add_argument('--nodes', type=int, default=5)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=0.02, help="gossip_interval in seconds")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Per-mode time limit in seconds")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"GOSSIP FAN-OUT: {args.nodes} nodes, {args.messages} messages, "
+          f"{args.interval * 1000:.0f}ms rounds")
+    print("=" * 80)
+
+    results = asyncio.run(run(args.nodes, args.messages, args.interval, args.timeout))
+
+    print(f"{'mode':>8} {'seconds':>9} {'delivered':>10} {'msg/s':>9} {'p50':>10} {'max':>10}")
+    for name, r in results.items():
+        print(f"{name:>8} {r['seconds']:>9.2f} {r['delivered_ratio']:>9.0%} {r['messages_per_second']:>9.1f} "
+              f"{r['p50_latency_ms']:>8.0f}ms {r['max_latency_ms']:>8.0f}ms")
+
+    with open('benchmark_gossip_fanout_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_gossip_fanout_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Judge construction cost versus per-verify cost.
+
+Measures, in one process:
+- engine: building a JudgeEngine (sanitizers, patterns, reports, MOE experts)
+- judge: building a standalone AethelJudge (engine + session), as
+  /api/verify did per request
+- session: binding an AethelJudge session to a pooled engine
+- verify: one verify_logic call
+- request: construction plus verifying every intent of a request, for a new
+  judge per request and for a session from a pre-warmed JudgeEnginePool
+
+Run with: python benchmark_judge_engine.py [--iterations 200] [--intents 5] [--moe]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from diotec360.core.judge import AethelJudge
+from diotec360.core.judge_engine import JudgeEngine, JudgeEnginePool
+
+
+def build_intents(count: int) -> Dict[str, Any]:
+    return {
+        f'transfer_{i}': {
+            'params': [],
+            'constraints': ['sender_balance >= amount', f'amount > {i}'],
+            'post_conditions': [
+                'sender_balance_new == sender_balance - amount',
+                'receiver_balance_new == receiver_balance + amount',
+                'sender_balance_new >= 0',
+            ],
+        }
+        for i in range(count)
+    }
+
+
+def time_us(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return {'median_us': statistics.median(samples), 'mean_us': statistics.mean(samples)}
+
+
+def run(iterations: int, intent_count: int, enable_moe: bool) -> Dict[str, Dict[str, float]]:
+    intents = build_intents(intent_count)
+    first_intent = next(iter(intents))
+    engine = JudgeEngine(enable_moe=enable_moe, quiet=True)
+    pool = JudgeEnginePool(size=1, enable_moe=enable_moe, quiet=True)
+    session = AethelJudge(intents, engine=engine)
+
+    def per_request_judge():
+        judge = AethelJudge(intents, enable_moe=enable_moe, quiet=True)
+        for name in intents:
+            judge.verify_logic(name)
+
+    def pooled_session():
+        with pool.session(intents) as judge:
+            for name in intents:
+                judge.verify_logic(name)
+
+    # Construction in isolation, then the two request paths end to end
+    results = {
+        'engine': time_us(lambda: JudgeEngine(enable_moe=enable_moe, quiet=True), iterations),
+        'judge': time_us(lambda: AethelJudge(intents, enable_moe=enable_moe, quiet=True), iterations),
+        'session': time_us(lambda: AethelJudge(intents, engine=engine), iterations),
+        'verify': time_us(lambda: session.verify_logic(first_intent), iterations),
+        'request (new judge)': time_us(per_request_judge, max(1, iterations // intent_count)),
+        'request (pooled)': time_us(pooled_session, max(1, iterations // intent_count)),
+    }
+    results['pool warm-up'] = {'median_us': pool.construction_ms * 1000, 'mean_us': pool.construction_ms * 1000}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Judge construction vs per-verify cost")
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--intents', type=int, default=5, help="Intents verified per request")
+    parser.add_argument('--moe', action='store_true', help="Enable the MOE layer (if available)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"JUDGE ENGINE: {args.iterations} iterations, {args.intents} intents per request, "
+          f"MOE {'on' if args.moe else 'off'}")
+    print("=" * 80)
+
+    results = run(args.iterations, args.intents, args.moe)
+
+    print(f"{'measurement':>22} {'median':>12} {'mean':>12}")
+    for name, r in results.items():
+        print(f"{name:>22} {r['median_us']:>10.0f}us {r['mean_us']:>10.0f}us")
+
+    with open('benchmark_judge_engine_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_judge_engine_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Microbenchmark of the judge's console output overhead per verify_logic call.
+
+The same intent is verified with the trace at DEBUG level (every banner and
+constraint echo written to stdout, as the print() version did), at INFO
+level, and in quiet mode. stdout goes to a real file (os.devnull by default)
+so the write path is exercised.
+
+Run with: python benchmark_judge_trace.py [--iterations 300] [--output /dev/null]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+from diotec360.core.judge import AethelJudge
+from diotec360.core.judge_trace import JudgeTrace, TraceLevel
+
+
+INTENT = {
+    'params': [],
+    'constraints': ['sender_balance >= amount', 'amount > 0', 'receiver_balance >= 0'],
+    'post_conditions': [
+        'sender_balance_new == sender_balance - amount',
+        'receiver_balance_new == receiver_balance + amount',
+        'sender_balance_new >= 0',
+    ],
+}
+
+
+def run(iterations: int, output: str) -> List[Dict[str, Any]]:
+    """Interleave the levels so Sentinel baseline drift affects all equally"""
+    levels = (TraceLevel.DEBUG, TraceLevel.INFO, TraceLevel.QUIET)
+    judges = {level: AethelJudge({'transfer': INTENT}, trace=JudgeTrace(level=level)) for level in levels}
+    timings = {level: [] for level in levels}
+
+    with open(output, 'w') as sink, contextlib.redirect_stdout(sink):
+        for judge in judges.values():
+            judge.verify_logic('transfer')  # Warm-up
+        for _ in range(iterations):
+            for level, judge in judges.items():
+                start = time.perf_counter()
+                judge.verify_logic('transfer')
+                timings[level].append((time.perf_counter() - start) * 1_000_000)
+
+    return [
+        {
+            'level': level.name,
+            'median_us': statistics.median(timings[level]),
+            'mean_us': statistics.mean(timings[level]),
+        }
+        for level in levels
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Judge console output overhead")
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--output', default=os.devnull, help="File that receives stdout")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"JUDGE TRACE OVERHEAD: {args.iterations} verifications per level")
+    print("=" * 80)
+
+    results = run(args.iterations, args.output)
+    baseline = results[0]['median_us']
+
+    print(f"{'level':>8} {'median':>12} {'mean':>12} {'saved':>10}")
+    for r in results:
+        print(f"{r['level']:>8} {r['median_us']:>10.0f}us {r['mean_us']:>10.0f}us "
+              f"{baseline - r['median_us']:>8.0f}us")
+
+    with open('benchmark_judge_trace_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_judge_trace_results.json")
+
+
+if __name__ == "__main__":
+    main()
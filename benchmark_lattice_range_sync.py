@@ -0,0 +1,182 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+State sync cost: full-tree Merkle diff versus interactive range diff.
+
+The remote node is ahead of the local node by a fraction of a long block
+history. Transfers go through an in-process loopback that serializes to
+JSON, so byte counts are what would cross the wire.
+
+- full_tree: the remote ships its whole tree, then calculate_merkle_diff
+- range: calculate_range_diff (one round trip per differing tree level),
+  then stream_blocks/apply_block_stream for the missing blocks. The range
+  hash tree build is a one-time cost per node, reported separately
+
+Run with: python benchmark_lattice_range_sync.py [--blocks 1000000] [--divergence 0.001]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from diotec360.lattice.sync import StateSynchronizer, MerkleNode
+
+
+def make_chain(genesis_hash: str, length: int) -> List[MerkleNode]:
+    chain = []
+    parent = genesis_hash
+    for i in range(length):
+        node = MerkleNode(hash="", parent_hash=parent, data={'index': i}, timestamp=1000.0 + i)
+        content = {'parent_hash': parent, 'data': node.data, 'timestamp': node.timestamp}
+        node.hash = hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+        chain.append(node)
+        parent = node.hash
+    return chain
+
+
+class Loopback:
+    """Counts round trips and JSON bytes of every exchange"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.bytes = 0
+
+    def exchange(self, request, response):
+        self.round_trips += 1
+        payload = json.dumps(response)
+        self.bytes += len(json.dumps(request)) + len(payload)
+        return json.loads(payload)
+
+
+def build_pair(tmpdir: str, blocks: int, divergence: float, tag: str):
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet):
+        local = StateSynchronizer("local", os.path.join(tmpdir, f"{tag}_local.db"))
+        remote = StateSynchronizer("remote", os.path.join(tmpdir, f"{tag}_remote.db"))
+    chain = make_chain(local.genesis_hash, blocks)
+    behind = max(1, int(blocks * divergence))
+
+    for node in chain:
+        remote.state_tree[node.hash] = node
+    for node in chain[:-behind]:
+        local.state_tree[node.hash] = MerkleNode.from_dict(node.to_dict())
+    remote.root_hash = chain[-1].hash
+    local.root_hash = chain[-behind - 1].hash
+    return local, remote, behind
+
+
+def run_full_tree(tmpdir: str, blocks: int, divergence: float) -> Dict[str, float]:
+    local, remote, behind = build_pair(tmpdir, blocks, divergence, "full")
+    link = Loopback()
+
+    start = time.perf_counter()
+    tree = link.exchange({}, {h: node.to_dict() for h, node in remote.state_tree.items()})
+    remote_tree = {h: MerkleNode.from_dict(data) for h, data in tree.items()}
+    with contextlib.redirect_stdout(io.StringIO()):
+        diff = local.calculate_merkle_diff(remote.root_hash, remote_tree)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'seconds': elapsed,
+        'round_trips': link.round_trips,
+        'bytes': link.bytes,
+        'missing_found': len(diff.missing_blocks),
+        'expected_missing': behind,
+    }
+
+
+def run_range(tmpdir: str, blocks: int, divergence: float) -> Dict[str, float]:
+    local, remote, behind = build_pair(tmpdir, blocks, divergence, "range")
+    link = Loopback()
+
+    start = time.perf_counter()
+    local._ensure_range_index()
+    remote._ensure_range_index()
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        diff = local.calculate_range_diff(
+            remote.root_hash,
+            lambda prefixes: link.exchange(prefixes, remote.get_range_summary(prefixes)),
+            lambda prefixes: link.exchange(prefixes, remote.get_range_hashes(prefixes))
+        )
+    diff_seconds = time.perf_counter() - start
+    diff_trips = link.round_trips
+
+    start = time.perf_counter()
+    batches = (
+        [MerkleNode.from_dict(data) for data in link.exchange({}, [node.to_dict() for node in batch])]
+        for batch in remote.stream_blocks(diff.missing_blocks)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        applied = local.apply_block_stream(batches)
+    transfer_seconds = time.perf_counter() - start
+
+    return {
+        'index_build_seconds': index_seconds,
+        'seconds': diff_seconds,
+        'round_trips': diff_trips,
+        'transfer_seconds': transfer_seconds,
+        'transfer_round_trips': link.round_trips - diff_trips,
+        'bytes': link.bytes,
+        'missing_found': len(diff.missing_blocks),
+        'expected_missing': behind,
+        'applied': applied,
+        'converged': local.root_hash == remote.root_hash,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="State sync cost")
+    parser.add_argument('--blocks', type=int, default=1000000)
+    parser.add_argument('--divergence', type=float, default=0.001)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"STATE SYNC: {args.blocks:,} blocks, remote ahead by {args.divergence:.1%}")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = {
+            'full_tree': run_full_tree(tmpdir, args.blocks, args.divergence),
+            'range': run_range(tmpdir, args.blocks, args.divergence),
+        }
+
+    print(f"{'method':>10} {'diff s':>9} {'trips':>6} {'bytes':>14} {'missing':>9}")
+    for name, r in results.items():
+        print(f"{name:>10} {r['seconds']:>9.3f} {r['round_trips']:>6} {r['bytes']:>14,} "
+              f"{r['missing_found']:>9}")
+    r = results['range']
+    print(f"\nRange tree build (one-time): {r['index_build_seconds']:.2f}s for both nodes")
+    print(f"Streamed {r['applied']} blocks in {r['transfer_round_trips']} batches, "
+          f"{r['transfer_seconds']:.2f}s, converged: {r['converged']}")
+
+    with open('benchmark_lattice_range_sync_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_lattice_range_sync_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Benchmark Merkle root computation against leaf count.
+
+Compares three ways of producing the state root after a block of updates:
+1. Full rebuild (the previous MerkleTree behaviour: sort + rehash every level)
+2. MerkleTree(compat_mode=True): legacy root, incremental path rehash
+3. MerkleTree(compat_mode=False): sparse, path-copying layout
+
+Run with: python benchmark_merkle_tree.py [--max-leaves 300000]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from diotec360.consensus.merkle_tree import MerkleTree
+
+
+def full_rebuild_root(tree: MerkleTree, state: Dict[str, Any]) -> str:
+    """Root computed the way the pre-incremental tree did on every change."""
+    level = [tree._hash_leaf(key, state[key]) for key in sorted(state)]
+    while len(level) > 1:
+        level = [
+            tree._hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def time_block_roots(tree: MerkleTree, blocks: List[Dict[str, Any]]) -> List[float]:
+    """Apply each block of updates and time the following root computation."""
+    timings = []
+    for block in blocks:
+        start = time.perf_counter()
+        tree.batch_update(block)
+        tree.get_root_hash()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def benchmark_leaf_count(num_leaves: int, block_size: int, num_blocks: int) -> Dict[str, Any]:
+    """Benchmark all three strategies for one tree size."""
+    state = {f"account_{i}": i for i in range(num_leaves)}
+    blocks = [
+        {f"account_{(b * 7919 + j * 104729) % num_leaves}": b * block_size + j for j in range(block_size)}
+        for b in range(num_blocks)
+    ]
+    
+    # 1. Full rebuild
+    reference = MerkleTree()
+    rebuild_state = dict(state)
+    rebuild_times = []
+    for block in blocks:
+        start = time.perf_counter()
+        rebuild_state.update(block)
+        full_rebuild_root(reference, rebuild_state)
+        rebuild_times.append((time.perf_counter() - start) * 1000)
+    
+    # 2. Compat mode (same root as the full rebuild)
+    compat = MerkleTree(compat_mode=True)
+    compat.batch_update(state)
+    compat.get_root_hash()
+    compat_times = time_block_roots(compat, blocks)
+    assert compat.get_root_hash() == full_rebuild_root(reference, rebuild_state)
+    
+    # 3. Sparse mode
+    sparse = MerkleTree(compat_mode=False)
+    start = time.perf_counter()
+    sparse.batch_update(state)
+    sparse.get_root_hash()
+    sparse_load_ms = (time.perf_counter() - start) * 1000
+    sparse_times = time_block_roots(sparse, blocks)
+    
+    return {
+        'leaves': num_leaves,
+        'block_size': block_size,
+        'full_rebuild_ms': statistics.median(rebuild_times),
+        'compat_incremental_ms': statistics.median(compat_times),
+        'sparse_incremental_ms': statistics.median(sparse_times),
+        'sparse_initial_load_ms': sparse_load_ms,
+        'speedup_sparse': statistics.median(rebuild_times) / max(statistics.median(sparse_times), 1e-9),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merkle root time vs leaf count")
+    parser.add_argument('--max-leaves', type=int, default=100_000)
+    parser.add_argument('--block-size', type=int, default=100)
+    parser.add_argument('--blocks', type=int, default=5)
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print("MERKLE ROOT BENCHMARK: root time per block vs leaf count")
+    print(f"Block size: {args.block_size} updates, {args.blocks} blocks per size")
+    print("=" * 80)
+    print(f"{'leaves':>10} {'full rebuild':>14} {'compat':>12} {'sparse':>12} {'speedup':>9}")
+    
+    results = []
+    sizes = [n for n in (1_000, 10_000, 100_000, 300_000, 1_000_000) if n <= args.max_leaves]
+    for num_leaves in sizes:
+        result = benchmark_leaf_count(num_leaves, args.block_size, args.blocks)
+        results.append(result)
+        print(
+            f"{result['leaves']:>10} "
+            f"{result['full_rebuild_ms']:>12.2f}ms "
+            f"{result['compat_incremental_ms']:>10.2f}ms "
+            f"{result['sparse_incremental_ms']:>10.2f}ms "
+            f"{result['speedup_sparse']:>8.1f}x"
+        )
+    
+    with open('benchmark_merkle_tree_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_merkle_tree_results.json")
+
+
+if __name__ == "__main__":
+    main()
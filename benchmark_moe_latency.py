@@ -0,0 +1,153 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+MOE verification latency: per-call thread pool versus persistent pool with
+early-exit consensus.
+
+Three simulated experts with the latency shape of the real ones (a slower
+Z3 expert with a heavy tail, fast Sentinel and Guardian experts). A fraction
+of intents is rejected with high confidence by the fast Sentinel expert, the
+case early exit decides without waiting for Z3. The verdict cache is off so
+every call runs the experts.
+
+- legacy: a reference copy of the previous _execute_experts_parallel (new
+  ThreadPoolExecutor per call, waits for every expert)
+- persistent: the current orchestrator (long-lived pool, deadlines, early exit)
+
+Run with: python benchmark_moe_latency.py [--iterations 300] [--reject-ratio 0.3] [--expert-timeout 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+from diotec360.moe.orchestrator import MOEOrchestrator
+from diotec360.moe.base_expert import BaseExpert
+from diotec360.moe.data_models import ExpertVerdict
+
+
+class SimulatedExpert(BaseExpert):
+    """Sleeps for a sampled latency; rejects intents containing its trigger word."""
+
+    def __init__(self, name: str, low_ms: float, high_ms: float, tail_ms: float = 0.0,
+                 tail_ratio: float = 0.0, reject_trigger: str = None, seed: int = 0):
+        super().__init__(name)
+        self.low_ms = low_ms
+        self.high_ms = high_ms
+        self.tail_ms = tail_ms
+        self.tail_ratio = tail_ratio
+        self.reject_trigger = reject_trigger
+        self.rng = random.Random(seed)
+
+    def verify(self, intent: str, tx_id: str) -> ExpertVerdict:
+        latency_ms = self.rng.uniform(self.low_ms, self.high_ms)
+        if self.rng.random() < self.tail_ratio:
+            latency_ms = self.tail_ms
+        time.sleep(latency_ms / 1000)
+        rejected = self.reject_trigger is not None and self.reject_trigger in intent
+        return ExpertVerdict(
+            expert_name=self.name,
+            verdict="REJECT" if rejected else "APPROVE",
+            confidence=0.95,
+            latency_ms=latency_ms
+        )
+
+
+class LegacyOrchestrator(MOEOrchestrator):
+    """Previous expert scheduling, kept here as the baseline"""
+
+    def _execute_experts_parallel(self, expert_names: List[str], intent: str, tx_id: str) -> List[ExpertVerdict]:
+        verdicts = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.experts[name].verify, intent, tx_id): name for name in expert_names}
+            for future in as_completed(futures):
+                verdicts.append(future.result(timeout=self.expert_timeout))
+        return verdicts
+
+
+def build(cls, db_path: str, expert_timeout: float) -> MOEOrchestrator:
+    orchestrator = cls(telemetry_db_path=db_path, enable_cache=False, expert_timeout=expert_timeout)
+    orchestrator.register_expert(SimulatedExpert("Z3_Expert", 5, 20, tail_ms=150, tail_ratio=0.05, seed=1))
+    orchestrator.register_expert(SimulatedExpert("Sentinel_Expert", 1, 4, reject_trigger="exploit", seed=2))
+    orchestrator.register_expert(SimulatedExpert("Guardian_Expert", 1, 3, seed=3))
+    return orchestrator
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        'p50_ms': statistics.median(ordered),
+        'p95_ms': ordered[int(0.95 * (len(ordered) - 1))],
+        'p99_ms': ordered[int(0.99 * (len(ordered) - 1))],
+        'mean_ms': statistics.mean(ordered),
+    }
+
+
+def run(iterations: int, reject_ratio: float, expert_timeout: float) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(42)
+    intents = [
+        f"check {i} {'exploit' if rng.random() < reject_ratio else 'routine'}"
+        for i in range(iterations)
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, cls in (('legacy', LegacyOrchestrator), ('persistent', MOEOrchestrator)):
+            orchestrator = build(cls, os.path.join(tmpdir, f"{name}.db"), expert_timeout)
+            samples = []
+            for i, intent in enumerate(intents):
+                start = time.perf_counter()
+                orchestrator.verify_transaction(intent, f"tx_{i}")
+                samples.append((time.perf_counter() - start) * 1000)
+            results[name] = percentiles(samples)
+            orchestrator.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MOE expert scheduling latency")
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--reject-ratio', type=float, default=0.3,
+                        help="Fraction of intents the fast expert rejects")
+    parser.add_argument('--expert-timeout', type=float, default=5.0,
+                        help="Per-expert deadline in seconds (the legacy scheduler never enforces it)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"MOE LATENCY: {args.iterations} verifications, {args.reject_ratio:.0%} rejected early, "
+          f"{args.expert_timeout}s expert deadline")
+    print("=" * 80)
+
+    results = run(args.iterations, args.reject_ratio, args.expert_timeout)
+
+    print(f"{'scheduler':>12} {'p50':>10} {'p95':>10} {'p99':>10} {'mean':>10}")
+    for name, r in results.items():
+        print(f"{name:>12} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms {r['mean_ms']:>8.1f}ms")
+
+    with open('benchmark_moe_latency_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_moe_latency_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Benchmark block verification scaling across worker counts.
+
+A block of intent-name proofs is verified sequentially in-process, then
+with ProofVerifier(process_pool=True) for each worker count (1, 2, 4, 8,
+16 up to --max-workers) once the workers are warm.
+
+The thread-pool path is not measured: its threads share the judge's Z3
+context, which is not thread-safe and can crash the process.
+
+Run with: python benchmark_proof_verification.py [--proofs 64] [--max-workers 16]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from typing import Any, Dict
+
+from diotec360.consensus.data_models import ProofBlock
+from diotec360.consensus.proof_verifier import ProofVerifier
+from diotec360.core.judge import AethelJudge
+
+
+def build_intent_map(num_proofs: int, constraints: int) -> Dict[str, Any]:
+    """Independent transfer intents with a chain of linear constraints each."""
+    intent_map = {}
+    for i in range(num_proofs):
+        guards = [f'balance_{i} >= {100 + i}', f'amount_{i} > 0', f'amount_{i} <= balance_{i}']
+        guards += [f'v{k}_{i} + v{k + 1}_{i} >= {k}' for k in range(constraints)]
+        intent_map[f"transfer_{i}"] = {
+            'params': [],
+            'constraints': guards,
+            'post_conditions': [f'new_balance_{i} == balance_{i} - amount_{i}', f'new_balance_{i} >= 0'],
+        }
+    return intent_map
+
+
+def make_block(intent_map: Dict[str, Any]) -> ProofBlock:
+    return ProofBlock(
+        block_id="benchmark",
+        timestamp=int(time.time()),
+        proofs=list(intent_map),
+        previous_block_hash="",
+        proposer_id="benchmark",
+        signature=b"",
+    )
+
+
+def time_block(verifier: ProofVerifier, block: ProofBlock, repeats: int, parallel: bool = True) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = verifier.verify_proof_block(block, parallel=parallel)
+        best = min(best, time.perf_counter() - start)
+        assert result.valid, [r.error for r in result.results if not r.valid]
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Block verification scaling vs worker count")
+    parser.add_argument('--proofs', type=int, default=64)
+    parser.add_argument('--constraints', type=int, default=20)
+    parser.add_argument('--max-workers', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    intent_map = build_intent_map(args.proofs, args.constraints)
+    block = make_block(intent_map)
+    with contextlib.redirect_stdout(io.StringIO()):
+        judge = AethelJudge(intent_map)
+
+    print("=" * 80)
+    print(f"PROOF BLOCK VERIFICATION: {args.proofs} proofs, {os.cpu_count()} CPUs available")
+    print("=" * 80)
+    sequential_ms = time_block(
+        ProofVerifier(judge=judge, require_signatures=False), block, args.repeats, parallel=False
+    )
+    print(f"Sequential (in-process): {sequential_ms:.1f}ms")
+    print(f"{'workers':>8} {'processes':>12} {'speedup':>9}")
+
+    results = []
+    for workers in (1, 2, 4, 8, 16):
+        if workers > args.max_workers:
+            break
+
+        pooled = ProofVerifier(judge=judge, require_signatures=False, max_workers=workers,
+                               process_pool=True, proof_timeout=60.0)
+        try:
+            pooled.verification_pool.start()
+            time_block(pooled, block, 1)  # Warm-up: workers build their judges
+            process_ms = time_block(pooled, block, args.repeats)
+        finally:
+            pooled.shutdown()
+
+        results.append({'workers': workers, 'process_ms': process_ms})
+        print(f"{workers:>8} {process_ms:>10.1f}ms {sequential_ms / process_ms:>8.2f}x")
+
+    with open('benchmark_proof_verification_results.json', 'w') as f:
+        json.dump({'sequential_ms': sequential_ms, 'process_pool': results}, f, indent=2)
+    print("\nResults saved to benchmark_proof_verification_results.json")
+
+
+if __name__ == "__main__":
+    main()
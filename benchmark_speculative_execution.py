@@ -0,0 +1,141 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Level-based versus speculative batch execution (BatchProcessor stages 1-3).
+
+Workloads: each transaction touches two accounts of its own, and a fraction
+of transactions (the contention ratio) also touches one of a few hot
+accounts. Both engines run the same passthrough program, which writes every
+account the transaction touches.
+
+- level: DependencyAnalyzer.analyze + ParallelExecutor.execute_parallel
+- speculative: SpeculativeExecutor.execute (multi-version store, validation,
+  re-execution of conflicting transactions in batch order)
+- serial: SpeculativeExecutor.execute_serial, for reference
+
+The level engine rejects any batch with a shared account (the analyzer's
+dependency rule is symmetric), which is reported as "rejected".
+
+Run with: python benchmark_speculative_execution.py [--sizes 100 1000] [--contention 0 0.05 0.5]
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from diotec360.core.synchrony import Transaction, CircularDependencyError
+from diotec360.core.dependency_analyzer import DependencyAnalyzer
+from diotec360.core.parallel_executor import ParallelExecutor
+from diotec360.core.speculative_executor import SpeculativeExecutor
+
+
+def build_batch(size: int, contention: float, seed: int = 42) -> Tuple[List[Transaction], Dict[str, Any]]:
+    rng = random.Random(seed)
+    hot_accounts = [f"hot_{i}" for i in range(max(1, size // 100))]
+    transactions = []
+    initial_states: Dict[str, Any] = {}
+    for i in range(size):
+        accounts = [f"acc_{i}_a", f"acc_{i}_b"]
+        if rng.random() < contention:
+            accounts.append(rng.choice(hot_accounts))
+        states = {account: {"balance": 1000} for account in accounts}
+        initial_states.update(states)
+        transactions.append(Transaction(
+            id=f"tx_{i}",
+            intent_name="transfer",
+            accounts=states,
+            operations=[],
+            verify_conditions=[]
+        ))
+    return transactions, initial_states
+
+
+def run_level(transactions, initial_states, threads) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        graph = DependencyAnalyzer().analyze(transactions)
+    except CircularDependencyError:
+        return {"status": "rejected", "time_ms": (time.perf_counter() - start) * 1000}
+    with ParallelExecutor(thread_count=threads) as executor:
+        executor.execute_parallel(transactions, graph, initial_states)
+    elapsed = time.perf_counter() - start
+    return {"status": "ok", "time_ms": elapsed * 1000, "tps": len(transactions) / elapsed}
+
+
+def run_speculative(transactions, initial_states, threads) -> Dict[str, Any]:
+    with SpeculativeExecutor(thread_count=threads) as executor:
+        start = time.perf_counter()
+        executor.execute(transactions, initial_states)
+        elapsed = time.perf_counter() - start
+        stats = executor.get_stats()
+    return {
+        "status": "ok",
+        "time_ms": elapsed * 1000,
+        "tps": len(transactions) / elapsed,
+        "re_executions": stats["re_executions"],
+    }
+
+
+def run_serial(transactions, initial_states) -> Dict[str, Any]:
+    executor = SpeculativeExecutor(thread_count=1)
+    start = time.perf_counter()
+    executor.execute_serial(transactions, initial_states)
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return {"status": "ok", "time_ms": elapsed * 1000, "tps": len(transactions) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Level-based vs speculative batch execution")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--contention', type=float, nargs='+', default=[0.0, 0.05, 0.5])
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"SPECULATIVE EXECUTION: {args.threads} threads")
+    print("=" * 80)
+    print(f"{'size':>6} {'contention':>10} {'engine':>12} {'status':>9} {'time':>10} {'tx/s':>10} {'re-exec':>8}")
+
+    results = []
+    for size in args.sizes:
+        for contention in args.contention:
+            transactions, initial_states = build_batch(size, contention)
+            row = {
+                "size": size,
+                "contention": contention,
+                "level": run_level(transactions, initial_states, args.threads),
+                "speculative": run_speculative(transactions, initial_states, args.threads),
+                "serial": run_serial(transactions, initial_states),
+            }
+            results.append(row)
+            for engine in ("level", "speculative", "serial"):
+                r = row[engine]
+                tps = f"{r['tps']:>10.0f}" if "tps" in r else f"{'-':>10}"
+                print(f"{size:>6} {contention:>10.2f} {engine:>12} {r['status']:>9} "
+                      f"{r['time_ms']:>8.1f}ms {tps} {r.get('re_executions', '-'):>8}")
+
+    with open('benchmark_speculative_execution_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_speculative_execution_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Telemetry write throughput: one connection per row versus TelemetrySink.
+
+Both writers insert the same transaction_metrics rows SentinelMonitor
+persists.
+
+- legacy: the previous _persist_metrics_sync (connect, INSERT, commit, close
+  for every row)
+- sink: rows queued on a TelemetrySink and written in executemany batches
+  through one WAL connection; the timer stops after flush(), so the sink
+  figure counts rows on disk, not rows queued
+
+Run with: python benchmark_telemetry_sink.py [--rows 5000] [--batch-size 256]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from diotec360.core.telemetry_sink import TelemetrySink
+
+
+SCHEMA = """
+    CREATE TABLE transaction_metrics (
+        tx_id TEXT PRIMARY KEY,
+        timestamp REAL NOT NULL,
+        cpu_time_ms REAL NOT NULL,
+        memory_delta_mb REAL NOT NULL,
+        z3_duration_ms REAL NOT NULL,
+        anomaly_score REAL NOT NULL,
+        layer_results TEXT NOT NULL,
+        outcome TEXT NOT NULL
+    )
+"""
+
+INSERT = """
+    INSERT OR REPLACE INTO transaction_metrics
+    (tx_id, timestamp, cpu_time_ms, memory_delta_mb, z3_duration_ms,
+     anomaly_score, layer_results, outcome)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def make_rows(count: int) -> List[Tuple]:
+    layer_results = json.dumps({"z3": True, "guardian": True, "sentinel": True})
+    return [
+        (f"tx_{i}", time.time(), 1.5, 0.1, 4.2, 0.05, layer_results, "accepted")
+        for i in range(count)
+    ]
+
+
+def create_db(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    conn.commit()
+    conn.close()
+
+
+def count_rows(path: str) -> int:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM transaction_metrics").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def run_legacy(path: str, rows: List[Tuple]) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        conn = sqlite3.connect(path)
+        cursor = conn.cursor()
+        cursor.execute(INSERT, row)
+        conn.commit()
+        conn.close()
+    return time.perf_counter() - start
+
+
+def run_sink(path: str, rows: List[Tuple], batch_size: int) -> Tuple[float, Dict]:
+    sink = TelemetrySink(path, batch_size=batch_size, max_queue_size=len(rows))
+    start = time.perf_counter()
+    for row in rows:
+        sink.submit(INSERT, row)
+    sink.flush()
+    elapsed = time.perf_counter() - start
+    sink.close()
+    return elapsed, sink.get_stats()
+
+
+def run(row_count: int, batch_size: int) -> Dict[str, Dict[str, float]]:
+    rows = make_rows(row_count)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        legacy_path = os.path.join(tmpdir, "legacy.db")
+        create_db(legacy_path)
+        elapsed = run_legacy(legacy_path, rows)
+        results['legacy'] = {
+            'seconds': elapsed,
+            'rows_per_second': row_count / elapsed,
+            'rows_on_disk': count_rows(legacy_path),
+        }
+
+        sink_path = os.path.join(tmpdir, "sink.db")
+        create_db(sink_path)
+        elapsed, stats = run_sink(sink_path, rows, batch_size)
+        results['sink'] = {
+            'seconds': elapsed,
+            'rows_per_second': row_count / elapsed,
+            'rows_on_disk': count_rows(sink_path),
+            'batches_written': stats['batches_written'],
+            'avg_batch_size': stats['avg_batch_size'],
+        }
+    results['speedup'] = {
+        'rows_per_second': results['sink']['rows_per_second'] / results['legacy']['rows_per_second']
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry write throughput")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=256)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"TELEMETRY THROUGHPUT: {args.rows} rows, sink batch size {args.batch_size}")
+    print("=" * 80)
+
+    results = run(args.rows, args.batch_size)
+
+    print(f"{'writer':>10} {'seconds':>10} {'rows/s':>12} {'on disk':>10}")
+    for name in ('legacy', 'sink'):
+        r = results[name]
+        print(f"{name:>10} {r['seconds']:>10.3f} {r['rows_per_second']:>12.0f} {r['rows_on_disk']:>10}")
+    print(f"\nSink: {results['sink']['batches_written']} batches, "
+          f"avg {results['sink']['avg_batch_size']:.0f} rows/batch, "
+          f"{results['speedup']['rows_per_second']:.1f}x rows/s")
+
+    with open('benchmark_telemetry_sink_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_telemetry_sink_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Benchmark WAL recovery and truncation time against WAL history size.
+
+For each history size N, both logs hold N committed transactions followed
+by a tail of --tail transactions written after the last checkpoint:
+1. WriteAheadLog (JSON lines): recovery parses the whole file, and
+   truncate_committed rewrites it
+2. SegmentedWriteAheadLog: the checkpoint LSN bounds recovery to the tail,
+   and truncate_committed unlinks whole segments
+
+Run with: python benchmark_wal_recovery.py [--max-entries 100000] [--tail 1000]
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from diotec360.consensus.atomic_commit import WriteAheadLog
+from diotec360.consensus.segmented_wal import SegmentedWriteAheadLog
+
+
+def fill_json_wal(wal_dir: Path, history: int, tail: int) -> Path:
+    """JSON-lines WAL: the plain layer never truncates, so history stays."""
+    wal = WriteAheadLog(wal_dir)
+    lines = []
+    for i in range(history + tail):
+        lines.append(json.dumps({'op': 'PREPARE', 'tx_id': f"tx_{i}",
+                                 'changes': {f"account_{i % 1000}": i}, 'timestamp': 0.0}))
+        lines.append(json.dumps({'op': 'COMMIT', 'tx_id': f"tx_{i}", 'timestamp': 0.0}))
+    with open(wal.wal_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return wal.wal_file
+
+
+def fill_segmented_wal(wal_dir: Path, history: int, tail: int) -> None:
+    wal = SegmentedWriteAheadLog(wal_dir)
+    # Bypass per-record fsync while building the fixture
+    wal._append([
+        record
+        for i in range(history)
+        for record in (
+            (1, json.dumps({'tx_id': f"tx_{i}", 'changes': {f"account_{i % 1000}": i},
+                            'timestamp': 0.0}).encode()),
+            (2, json.dumps({'tx_id': f"tx_{i}", 'timestamp': 0.0}).encode()),
+        )
+    ])
+    wal.truncate_committed()
+    for i in range(history, history + tail):
+        wal.append_committed_entry(f"tx_{i}", {f"account_{i % 1000}": i})
+    wal.shutdown()
+
+
+def timed_ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark_history(history: int, tail: int) -> Dict[str, Any]:
+    tmp = Path(tempfile.mkdtemp(prefix="wal_recovery_"))
+    try:
+        json_dir = tmp / "json"
+        wal_file = fill_json_wal(json_dir, history, tail)
+        json_recovery = timed_ms(lambda: WriteAheadLog(json_dir).get_committed_entries())
+        json_truncate = timed_ms(lambda: WriteAheadLog(json_dir).truncate_committed())
+
+        seg_dir = tmp / "segmented"
+        fill_segmented_wal(seg_dir, history, tail)
+        holder = {}
+        seg_recovery = timed_ms(
+            lambda: holder.setdefault('wal', SegmentedWriteAheadLog(seg_dir)).get_committed_entries()
+        )
+        seg_truncate = timed_ms(holder['wal'].truncate_committed)
+        holder['wal'].shutdown()
+
+        return {
+            'history': history,
+            'tail': tail,
+            'json_wal_bytes': wal_file.stat().st_size if wal_file.exists() else 0,
+            'json_recovery_ms': json_recovery,
+            'json_truncate_ms': json_truncate,
+            'segmented_recovery_ms': seg_recovery,
+            'segmented_truncate_ms': seg_truncate,
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WAL recovery time vs WAL history size")
+    parser.add_argument('--max-entries', type=int, default=100_000)
+    parser.add_argument('--tail', type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("WAL RECOVERY BENCHMARK: JSON lines vs segmented binary")
+    print(f"Tail after last checkpoint: {args.tail} transactions")
+    print("=" * 80)
+    print(f"{'history':>10} {'json recover':>14} {'json truncate':>14} "
+          f"{'seg recover':>12} {'seg truncate':>13}")
+
+    results = []
+    sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max_entries]
+    for history in sizes:
+        result = benchmark_history(history, args.tail)
+        results.append(result)
+        print(
+            f"{history:>10} "
+            f"{result['json_recovery_ms']:>12.1f}ms "
+            f"{result['json_truncate_ms']:>12.1f}ms "
+            f"{result['segmented_recovery_ms']:>10.1f}ms "
+            f"{result['segmented_truncate_ms']:>11.1f}ms"
+        )
+
+    with open('benchmark_wal_recovery_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_wal_recovery_results.json")
+
+
+if __name__ == "__main__":
+    main()
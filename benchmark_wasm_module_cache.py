@@ -0,0 +1,123 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+WASM runtime throughput: cold modules versus the module cache.
+
+Each execution is a full AethelWasmRuntime.execute_safely call on the
+compiled transfer intent (sandbox validation, envelope sealing included).
+
+- cold: a fresh module cache per call, so every call assembles the WAT and
+  compiles the module before instantiating it
+- cached: one shared cache; after the first call only a Store and an
+  Instance are created per execution
+- simulator: the Python fallback used when wasmtime is not installed
+
+Run with: python benchmark_wasm_module_cache.py [--executions 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from typing import Dict
+
+from diotec360.core import wasm_runtime
+from diotec360.core.wasm_compiler import AethelWasmCompiler
+from diotec360.core.wasm_runtime import AethelWasmRuntime, WasmModuleCache
+
+
+BUNDLE = {
+    'function_hash': 'benchmark_transfer_hash',
+    'intent_name': 'transfer',
+    'ast': {
+        'params': ['sender:Account', 'receiver:Account', 'amount:Balance'],
+        'constraints': [
+            'sender_balance >= amount',
+            'amount >= min_transfer',
+            'receiver_balance >= balance_zero',
+            'old_sender_balance == sender_balance',
+            'old_receiver_balance == receiver_balance',
+        ],
+        'post_conditions': [],
+    },
+}
+
+INPUTS = {'sender_balance': 500, 'receiver_balance': 100, 'amount': 150}
+
+
+def measure(wat_code: str, executions: int, mode: str) -> Dict[str, float]:
+    shared = WasmModuleCache()
+    backends = set()
+
+    start = time.perf_counter()
+    for _ in range(executions):
+        cache = WasmModuleCache() if mode == 'cold' else shared
+        runtime = AethelWasmRuntime(wat_code, module_cache=cache, verbose=False)
+        envelope = runtime.execute_safely('transfer', INPUTS)
+        backends.add(envelope['backend'])
+    elapsed = time.perf_counter() - start
+
+    return {
+        'executions': executions,
+        'seconds': elapsed,
+        'executions_per_second': executions / elapsed,
+        'backend': ",".join(sorted(backends)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WASM module cache throughput")
+    parser.add_argument('--executions', type=int, default=2000)
+    args = parser.parse_args()
+
+    if wasm_runtime.wasmtime is None:
+        print("wasmtime is not installed: only the simulator can be measured")
+        return
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        wat_code = AethelWasmCompiler(BUNDLE).compile()
+
+    print("=" * 80)
+    print(f"WASM RUNTIME: {args.executions:,} transfer executions per mode")
+    print("=" * 80)
+
+    results = {
+        'cold': measure(wat_code, args.executions, 'cold'),
+        'cached': measure(wat_code, args.executions, 'cached'),
+    }
+    engine = wasm_runtime.wasmtime
+    wasm_runtime.wasmtime = None
+    try:
+        results['simulator'] = measure(wat_code, args.executions, 'cached')
+    finally:
+        wasm_runtime.wasmtime = engine
+
+    print(f"{'mode':>10} {'backend':>10} {'seconds':>9} {'exec/s':>10}")
+    for mode, r in results.items():
+        print(f"{mode:>10} {r['backend']:>10} {r['seconds']:>9.3f} {r['executions_per_second']:>10,.0f}")
+    speedup = results['cached']['executions_per_second'] / results['cold']['executions_per_second']
+    print(f"\nCached vs cold: {speedup:.1f}x")
+
+    with open('benchmark_wasm_module_cache_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("\nResults saved to benchmark_wasm_module_cache_results.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ Copyright (c) 2024 DIOTEC 360. All rights reserved.
 
 import time
 import json
+import random
+import argparse
 import statistics
 import multiprocessing
 from pathlib import Path
@@ -26,6 +28,13 @@ except ImportError:
     ParallelExecutor = None
     BatchProcessor = None
 
+try:
+    from diotec360.core.synchrony import Transaction, CircularDependencyError
+    from diotec360.core.dependency_analyzer import DependencyAnalyzer
+    from diotec360.core.conflict_detector import ConflictDetector
+except ImportError:
+    DependencyAnalyzer = None
+
 
 class ParallelExecutionBenchmark:
     """Benchmark for parallel execution performance"""
@@ -200,6 +209,98 @@ class ParallelExecutionBenchmark:
             "results": results
         }
     
+    def _contended_batch(self, batch_size: int, contention: float, seed: int = 360) -> List[Any]:
+        """
+        Transfers from a private or a hot account to a private account.
+        
+        A `contention` fraction of the transactions draw their source from a
+        pool of batch_size // 100 hot accounts (at least one); all others
+        touch only accounts of their own.
+        """
+        rng = random.Random(seed)
+        hot_accounts = max(1, batch_size // 100)
+        transactions = []
+        for i in range(batch_size):
+            if rng.random() < contention:
+                source = f"hot_{rng.randrange(hot_accounts)}"
+            else:
+                source = f"src_{i}"
+            transactions.append(Transaction(
+                id=f"tx_{i:05d}",
+                intent_name="transfer",
+                accounts={source: {}, f"dst_{i}": {}},
+                operations=[],
+                verify_conditions=[]
+            ))
+        return transactions
+    
+    @staticmethod
+    def _pairwise_scan(transactions: List[Any]) -> int:
+        """Reference: intersect the read/write sets of every pair (previous algorithm)"""
+        rw_sets = [(tx.get_read_set(), tx.get_write_set()) for tx in transactions]
+        conflicting = 0
+        for i, (r1, w1) in enumerate(rw_sets):
+            for r2, w2 in rw_sets[i + 1:]:
+                if (w1 & r2) or (w1 & w2) or (r1 & w2):
+                    conflicting += 1
+        return conflicting
+    
+    def benchmark_dependency_analysis(self,
+                                      batch_sizes=(10, 100, 1000, 10000),
+                                      contention_ratios=(0.0, 0.05, 0.25, 0.5),
+                                      pairwise_limit: int = 1000) -> Dict[str, Any]:
+        """
+        Benchmark DependencyAnalyzer.analyze and ConflictDetector.detect_conflicts
+        across batch sizes and contention ratios.
+        
+        Both are driven by a resource -> readers/writers index; the pairwise
+        scan they replaced is timed as a reference up to pairwise_limit.
+        """
+        print("Benchmarking dependency analysis...")
+        
+        if DependencyAnalyzer is None:
+            return {"test": "dependency_analysis", "results": []}
+        
+        results = []
+        for batch_size in batch_sizes:
+            for contention in contention_ratios:
+                print(f"  Batch {batch_size}, {contention*100:.0f}% contention...")
+                transactions = self._contended_batch(batch_size, contention)
+                
+                start = time.perf_counter()
+                try:
+                    DependencyAnalyzer().analyze(transactions)
+                    cyclic = False
+                except CircularDependencyError:
+                    # Conflicting pairs depend both ways (see DependencyAnalyzer)
+                    cyclic = True
+                analyze_ms = (time.perf_counter() - start) * 1000
+                
+                start = time.perf_counter()
+                conflicts = ConflictDetector().detect_conflicts(transactions, None)
+                detect_ms = (time.perf_counter() - start) * 1000
+                
+                pairwise_ms = None
+                if batch_size <= pairwise_limit:
+                    start = time.perf_counter()
+                    self._pairwise_scan(transactions)
+                    pairwise_ms = (time.perf_counter() - start) * 1000
+                
+                results.append({
+                    "batch_size": batch_size,
+                    "contention": contention,
+                    "conflicts": len(conflicts),
+                    "cyclic": cyclic,
+                    "analyze_ms": analyze_ms,
+                    "detect_ms": detect_ms,
+                    "pairwise_scan_ms": pairwise_ms
+                })
+        
+        return {
+            "test": "dependency_analysis",
+            "results": results
+        }
+    
     def benchmark_scaling_efficiency(self) -> Dict[str, Any]:
         """Benchmark scaling efficiency with increasing load"""
         print("Benchmarking scaling efficiency...")
@@ -255,6 +356,7 @@ class ParallelExecutionBenchmark:
         results["tests"].append(self.benchmark_parallel_scaling())
         results["tests"].append(self.benchmark_batch_processing())
         results["tests"].append(self.benchmark_conflict_detection())
+        results["tests"].append(self.benchmark_dependency_analysis())
         results["tests"].append(self.benchmark_scaling_efficiency())
         
         # Save results
@@ -309,6 +411,15 @@ class ParallelExecutionBenchmark:
                 for result in test['results']:
                     print(f"    {result['conflict_rate']*100:5.1f}% conflicts: {result['tps']:8.2f} TPS")
             
+            elif test['test'] == 'dependency_analysis':
+                print("  Dependency Analysis (resource index):")
+                for result in test['results']:
+                    pairwise = result['pairwise_scan_ms']
+                    pairwise_text = f"{pairwise:9.2f}ms" if pairwise is not None else "        -  "
+                    print(f"    {result['batch_size']:5d} txs, {result['contention']*100:4.0f}% contention: "
+                          f"analyze {result['analyze_ms']:9.2f}ms, detect {result['detect_ms']:9.2f}ms "
+                          f"({result['conflicts']} conflicts), pairwise scan {pairwise_text}")
+            
             elif test['test'] == 'scaling_efficiency':
                 print("  Load Scaling:")
                 for result in test['results']:
@@ -320,7 +431,15 @@ class ParallelExecutionBenchmark:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Parallel execution benchmark")
+    parser.add_argument("--dependency-analysis", action="store_true",
+                        help="Only run the dependency analysis sweep (batch size x contention)")
+    args = parser.parse_args()
+    
     benchmark = ParallelExecutionBenchmark(num_transactions=1000)
+    if args.dependency_analysis:
+        benchmark._print_summary({"tests": [benchmark.benchmark_dependency_analysis()]})
+        return
     benchmark.run_all()
 
 
@@ -13,6 +13,7 @@ import hashlib
 import time
 from functools import lru_cache
 
+from diotec360.ai.intent_document import IntentDocument, IntentRegion
 from diotec360.core.parser import AethelParser
 from diotec360.core.judge import AethelJudge
 from diotec360.nexo.precedent_engine import PrecedentEngine, PrecedentQuery
@@ -48,10 +49,15 @@ class AethelAutopilot:
     - Real-time error detection
     - "Traffic light" safety indicator
     - Performance optimizations (caching, parallel processing)
+    - Incremental analysis: only the edited intent is re-parsed and re-analysed
     """
     
+    # Suggestions skip uncached precedent lookups once this budget is spent
+    SUGGESTION_LATENCY_BUDGET_MS = 50.0
+    
     def __init__(self):
         self.parser = AethelParser()
+        self.document = IntentDocument(self.parser)  # Per-intent parse/analysis cache
         self.judge = None  # Initialized per-request
         self.precedents = PrecedentEngine()
 
@@ -72,6 +78,8 @@ class AethelAutopilot:
         self._suggestion_cache: Dict[str, Tuple[List, float]] = {}
         self._safety_cache: Dict[str, Tuple[Dict, float]] = {}
         self._correction_cache: Dict[str, Tuple[List, float]] = {}
+        self._precedent_cache: Dict[str, Tuple[List, float]] = {}
+        self._budget_skips = 0
         self._cache_ttl = 60.0  # Cache TTL in seconds
         self._max_cache_size = 1000  # Maximum cache entries
         
@@ -107,7 +115,13 @@ class AethelAutopilot:
         
         Task 6.2: Context-specific suggestion methods
         Task 11.1: Caching for performance optimization
+        
+        Precedent lookups not already cached are skipped once the latency
+        budget is spent; such partial results are not cached.
         """
+        deadline = time.perf_counter() + self.SUGGESTION_LATENCY_BUDGET_MS / 1000.0
+        budget_skips = self._budget_skips
+        
         # Generate cache key
         cache_key = self._generate_cache_key(
             editor_state.code,
@@ -128,10 +142,10 @@ class AethelAutopilot:
         # Context-specific suggestions
         if context == 'guard':
             suggestions.extend(self._suggest_guards(editor_state))
-            suggestions.extend(self._suggest_from_precedents(editor_state, context))
+            suggestions.extend(self._suggest_from_precedents(editor_state, context, deadline))
         elif context == 'verify':
             suggestions.extend(self._suggest_verifications(editor_state))
-            suggestions.extend(self._suggest_from_precedents(editor_state, context))
+            suggestions.extend(self._suggest_from_precedents(editor_state, context, deadline))
         elif context == 'intent_signature':
             suggestions.extend(self._suggest_intent_params(editor_state))
         elif context == 'solve':
@@ -149,13 +163,15 @@ class AethelAutopilot:
         # Sort by confidence
         suggestions.sort(key=lambda s: s.confidence, reverse=True)
         
-        # Cache result
+        # Cache result (unless the budget cut it short)
         result = suggestions[:10]  # Top 10 suggestions
-        self._add_to_cache(self._suggestion_cache, cache_key, result)
+        if self._budget_skips == budget_skips:
+            self._add_to_cache(self._suggestion_cache, cache_key, result)
         
         return result
 
-    def _suggest_from_precedents(self, editor_state: EditorState, context: str) -> List[Suggestion]:
+    def _suggest_from_precedents(self, editor_state: EditorState, context: str,
+                                 deadline: Optional[float] = None) -> List[Suggestion]:
         suggestions: List[Suggestion] = []
 
         code = editor_state.code or ""
@@ -178,17 +194,25 @@ class AethelAutopilot:
         elif domain == 'finance':
             tags.extend(['priority:fairness', 'priority:risk', 'target:trading', 'target:finance'])
 
-        try:
-            results = self.precedents.query(
-                PrecedentQuery(
-                    intent_name=intent_name,
-                    tags=tags,
-                    tokens=tokens,
-                    limit=3,
+        # Precedent results depend only on the query, not on the keystroke
+        query_key = self._generate_cache_key(intent_name, tags, sorted(tokens))
+        results = self._get_from_cache(self._precedent_cache, query_key)
+        if results is None:
+            if deadline is not None and time.perf_counter() >= deadline:
+                self._budget_skips += 1
+                return suggestions
+            try:
+                results = self.precedents.query(
+                    PrecedentQuery(
+                        intent_name=intent_name,
+                        tags=tags,
+                        tokens=tokens,
+                        limit=3,
+                    )
                 )
-            )
-        except Exception:
-            return suggestions
+            except Exception:
+                return suggestions
+            self._add_to_cache(self._precedent_cache, query_key, results)
 
         if not results:
             return suggestions
@@ -249,16 +273,10 @@ class AethelAutopilot:
         return suggestions
 
     def _detect_domain(self, code: str, variables: List[str]) -> str:
-        blob = (code or "") + " " + " ".join(variables or [])
-        toks = {t.lower() for t in re.findall(r"[A-Za-z_][A-Za-z0-9_]*", blob)}
-        # Expand composite identifiers (snake_case) to improve domain hits.
-        expanded = set(toks)
-        for t in toks:
-            if '_' in t:
-                for part in t.split('_'):
-                    if part:
-                        expanded.add(part)
-        toks = expanded
+        toks = self._domain_tokens(" ".join(variables or []))
+        for region_toks in self.document.map_regions(code or "", 'domain_tokens',
+                                                     lambda region: self._domain_tokens(region.text)):
+            toks |= region_toks
 
         finance_hits = len(toks.intersection(self._domain_keywords['finance']))
         prod_hits = len(toks.intersection(self._domain_keywords['productivity']))
@@ -269,6 +287,17 @@ class AethelAutopilot:
             return 'finance'
         return 'general'
 
+    def _domain_tokens(self, text: str) -> set[str]:
+        toks = {t.lower() for t in re.findall(r"[A-Za-z_][A-Za-z0-9_]*", text)}
+        # Expand composite identifiers (snake_case) to improve domain hits.
+        expanded = set(toks)
+        for t in toks:
+            if '_' in t:
+                for part in t.split('_'):
+                    if part:
+                        expanded.add(part)
+        return expanded
+
     def _infer_domain_from_tags(self, tags: set[str]) -> str:
         if 'target:life_management' in tags:
             return 'productivity'
@@ -302,11 +331,11 @@ class AethelAutopilot:
         if cached_result is not None:
             return cached_result
         
-        # Try to parse code
+        # Try to parse code (only edited intents are re-parsed)
         try:
-            intent_map = self.parser.parse(code)
+            intents = self.document.intents(code)
             
-            if not intent_map:
+            if not intents:
                 result = {
                     'status': 'warning',
                     'message': 'Incomplete code - keep typing',
@@ -315,33 +344,14 @@ class AethelAutopilot:
                 self._add_to_cache(self._safety_cache, cache_key, result)
                 return result
             
-            # Check for common vulnerabilities
+            # Check for common vulnerabilities (cached per intent)
             issues = []
             
-            for intent_name, intent in intent_map.items():
-                # Check if guards exist
-                if not intent.get('guards'):
-                    issues.append({
-                        'severity': 'high',
-                        'message': f'Intent "{intent_name}" has no guards',
-                        'suggestion': 'Add guard block to prevent invalid inputs'
-                    })
-                
-                # Check if verify exists
-                if not intent.get('verifications'):
-                    issues.append({
-                        'severity': 'high',
-                        'message': f'Intent "{intent_name}" has no verifications',
-                        'suggestion': 'Add verify block to ensure correctness'
-                    })
-                
-                # Check for conservation violations
-                if self._has_conservation_violation(intent):
-                    issues.append({
-                        'severity': 'critical',
-                        'message': f'Intent "{intent_name}" may violate conservation',
-                        'suggestion': 'Ensure total value is preserved'
-                    })
+            for intent_name, intent, entry in intents:
+                issues.extend(self._memo_intent(
+                    entry, ('safety', intent_name),
+                    lambda: self._intent_safety_issues(intent_name, intent)
+                ))
             
             # Determine overall status
             if not issues:
@@ -402,95 +412,34 @@ class AethelAutopilot:
         
         corrections = []
         
-        # Try to parse and verify
+        # Try to parse and verify (only edited intents are re-parsed)
         try:
-            intent_map = self.parser.parse(code)
+            intents = self.document.intents(code)
             
-            if not intent_map:
+            if not intents:
                 # Parser failed, use heuristic analysis
                 result = self._heuristic_analysis(code)
                 self._add_to_cache(self._correction_cache, cache_key, result)
                 return result
             
-            # Check each intent for vulnerabilities
-            for intent_name, intent in intent_map.items():
-                # 1. Missing guards
-                if not intent.get('guards'):
-                    corrections.append({
-                        'vulnerability_type': 'missing_guards',
-                        'severity': 'high',
-                        'line': self._find_intent_line(code, intent_name),
-                        'message': f'Intent "{intent_name}" has no guard block',
-                        'fix': self._generate_guard_block_fix(intent),
-                        'reason': 'Guards prevent invalid inputs and protect against attacks'
-                    })
-                
-                # 2. Missing verify
-                if not intent.get('verifications'):
-                    corrections.append({
-                        'vulnerability_type': 'missing_verify',
-                        'severity': 'high',
-                        'line': self._find_intent_line(code, intent_name),
-                        'message': f'Intent "{intent_name}" has no verify block',
-                        'fix': self._generate_verify_block_fix(intent),
-                        'reason': 'Verify blocks ensure correctness and detect bugs'
-                    })
-                
-                # 3. Missing amount > 0 check
-                if 'amount' in str(intent) and 'amount > 0' not in str(intent.get('guards', [])):
-                    corrections.append({
-                        'vulnerability_type': 'missing_amount_check',
-                        'severity': 'high',
-                        'line': self._find_guard_block_line(code),
-                        'message': 'Missing check for positive amount',
-                        'fix': 'amount > 0;',
-                        'reason': 'Prevent zero or negative transfers'
-                    })
-                
-                # 4. Missing balance check
-                if 'balance' in str(intent) and 'balance >=' not in str(intent.get('guards', [])):
-                    corrections.append({
-                        'vulnerability_type': 'insufficient_balance_check',
-                        'severity': 'high',
-                        'line': self._find_guard_block_line(code),
-                        'message': 'Missing check for sufficient balance',
-                        'fix': 'sender_balance >= amount;',
-                        'reason': 'Prevent insufficient balance transfers'
-                    })
-                
-                # 5. Conservation violations
-                if self._has_conservation_violation(intent):
-                    corrections.append({
-                        'vulnerability_type': 'conservation_violation',
-                        'severity': 'critical',
-                        'line': self._find_intent_line(code, intent_name),
-                        'message': f'Intent "{intent_name}" may violate conservation',
-                        'fix': self._generate_conservation_fix(intent),
-                        'reason': 'Conservation laws must be preserved to prevent value creation/destruction'
-                    })
-                
-                # 6. Overflow detection
-                overflow_issues = self._detect_overflow_patterns(intent)
-                for issue in overflow_issues:
-                    corrections.append({
-                        'vulnerability_type': 'overflow_risk',
-                        'severity': 'high',
-                        'line': self._find_guard_block_line(code),
-                        'message': f'Potential overflow in {issue["operation"]}',
-                        'fix': issue['fix'],
-                        'reason': 'Prevent arithmetic overflow that could lead to incorrect balances'
-                    })
-                
-                # 7. Reentrancy detection
-                if self._has_reentrancy_pattern(intent):
-                    corrections.append({
-                        'vulnerability_type': 'reentrancy_risk',
-                        'severity': 'critical',
-                        'line': self._find_intent_line(code, intent_name),
-                        'message': f'Intent "{intent_name}" may be vulnerable to reentrancy',
-                        'fix': 'Add reentrancy guard or use checks-effects-interactions pattern',
-                        'reason': 'Reentrancy attacks can drain funds by calling back into the contract'
-                    })
+            # Check each intent for vulnerabilities (cached per intent, lines
+            # resolved against the current document)
+            guard_line = None
+            for intent_name, intent, entry in intents:
+                intent_line = None
+                for correction in self._memo_intent(
+                    entry, ('corrections', intent_name),
+                    lambda: self._intent_corrections(intent_name, intent)
+                ):
+                    if correction['line'] == 'guard':
+                        if guard_line is None:
+                            guard_line = self._find_guard_block_line(code)
+                        line = guard_line
+                    else:
+                        if intent_line is None:
+                            intent_line = self._find_intent_line(code, intent_name)
+                        line = intent_line
+                    corrections.append(dict(correction, line=line))
             
             # Cache result
             self._add_to_cache(self._correction_cache, cache_key, corrections)
@@ -502,6 +451,129 @@ class AethelAutopilot:
             # Don't cache errors
             return result
     
+    def _memo_intent(self, entry, key, compute):
+        """Per-intent analysis, reused while the intent's region is unchanged"""
+        if entry is None:
+            return compute()
+        return entry.memo(key, compute)
+    
+    def _intent_safety_issues(self, intent_name: str, intent: Dict) -> List[Dict[str, any]]:
+        """Traffic-light issues of one intent"""
+        issues = []
+        
+        # Check if guards exist
+        if not intent.get('guards'):
+            issues.append({
+                'severity': 'high',
+                'message': f'Intent "{intent_name}" has no guards',
+                'suggestion': 'Add guard block to prevent invalid inputs'
+            })
+        
+        # Check if verify exists
+        if not intent.get('verifications'):
+            issues.append({
+                'severity': 'high',
+                'message': f'Intent "{intent_name}" has no verifications',
+                'suggestion': 'Add verify block to ensure correctness'
+            })
+        
+        # Check for conservation violations
+        if self._has_conservation_violation(intent):
+            issues.append({
+                'severity': 'critical',
+                'message': f'Intent "{intent_name}" may violate conservation',
+                'suggestion': 'Ensure total value is preserved'
+            })
+        
+        return issues
+    
+    def _intent_corrections(self, intent_name: str, intent: Dict) -> List[Dict[str, any]]:
+        """
+        Corrections of one intent. 'line' holds where the line is found:
+        'intent' (the intent definition) or 'guard' (the first guard block).
+        """
+        corrections = []
+        
+        # 1. Missing guards
+        if not intent.get('guards'):
+            corrections.append({
+                'vulnerability_type': 'missing_guards',
+                'severity': 'high',
+                'line': 'intent',
+                'message': f'Intent "{intent_name}" has no guard block',
+                'fix': self._generate_guard_block_fix(intent),
+                'reason': 'Guards prevent invalid inputs and protect against attacks'
+            })
+        
+        # 2. Missing verify
+        if not intent.get('verifications'):
+            corrections.append({
+                'vulnerability_type': 'missing_verify',
+                'severity': 'high',
+                'line': 'intent',
+                'message': f'Intent "{intent_name}" has no verify block',
+                'fix': self._generate_verify_block_fix(intent),
+                'reason': 'Verify blocks ensure correctness and detect bugs'
+            })
+        
+        # 3. Missing amount > 0 check
+        if 'amount' in str(intent) and 'amount > 0' not in str(intent.get('guards', [])):
+            corrections.append({
+                'vulnerability_type': 'missing_amount_check',
+                'severity': 'high',
+                'line': 'guard',
+                'message': 'Missing check for positive amount',
+                'fix': 'amount > 0;',
+                'reason': 'Prevent zero or negative transfers'
+            })
+        
+        # 4. Missing balance check
+        if 'balance' in str(intent) and 'balance >=' not in str(intent.get('guards', [])):
+            corrections.append({
+                'vulnerability_type': 'insufficient_balance_check',
+                'severity': 'high',
+                'line': 'guard',
+                'message': 'Missing check for sufficient balance',
+                'fix': 'sender_balance >= amount;',
+                'reason': 'Prevent insufficient balance transfers'
+            })
+        
+        # 5. Conservation violations
+        if self._has_conservation_violation(intent):
+            corrections.append({
+                'vulnerability_type': 'conservation_violation',
+                'severity': 'critical',
+                'line': 'intent',
+                'message': f'Intent "{intent_name}" may violate conservation',
+                'fix': self._generate_conservation_fix(intent),
+                'reason': 'Conservation laws must be preserved to prevent value creation/destruction'
+            })
+        
+        # 6. Overflow detection
+        overflow_issues = self._detect_overflow_patterns(intent)
+        for issue in overflow_issues:
+            corrections.append({
+                'vulnerability_type': 'overflow_risk',
+                'severity': 'high',
+                'line': 'guard',
+                'message': f'Potential overflow in {issue["operation"]}',
+                'fix': issue['fix'],
+                'reason': 'Prevent arithmetic overflow that could lead to incorrect balances'
+            })
+        
+        # 7. Reentrancy detection
+        if self._has_reentrancy_pattern(intent):
+            corrections.append({
+                'vulnerability_type': 'reentrancy_risk',
+                'severity': 'critical',
+                'line': 'intent',
+                'message': f'Intent "{intent_name}" may be vulnerable to reentrancy',
+                'fix': 'Add reentrancy guard or use checks-effects-interactions pattern',
+                'reason': 'Reentrancy attacks can drain funds by calling back into the contract'
+            })
+        
+        return corrections
+    
     def _heuristic_analysis(self, code: str) -> List[Dict[str, any]]:
         """
         Perform heuristic analysis when parser fails.
@@ -645,11 +717,11 @@ class AethelAutopilot:
     
     def _find_intent_line(self, code: str, intent_name: str) -> int:
         """Find line number where intent is defined"""
-        lines = code.split('\n')
-        for i, line in enumerate(lines, 1):
-            if f'intent {intent_name}' in line or f'intent{intent_name}' in line:
-                return i
-        return 1
+        found = [pos for pos in (code.find(f'intent {intent_name}'), code.find(f'intent{intent_name}'))
+                 if pos >= 0]
+        if not found:
+            return 1
+        return code.count('\n', 0, min(found)) + 1
     
     def _detect_context(self, code: str, cursor_pos: int) -> str:
         """
@@ -660,13 +732,10 @@ class AethelAutopilot:
         - Analyzes cursor position for exact context
         - Extracts variables in current scope
         """
-        code_before_cursor = code[:cursor_pos]
-        code_after_cursor = code[cursor_pos:]
+        cursor_pos = slice(cursor_pos).indices(len(code))[1]  # As code[:cursor_pos]
         
-        # Get current line and position in line
-        lines_before = code_before_cursor.split('\n')
-        current_line = lines_before[-1] if lines_before else ''
-        current_line_number = len(lines_before)
+        # Get current line up to the cursor
+        current_line = code[code.rfind('\n', 0, cursor_pos) + 1:cursor_pos]
         
         # Check if at line start (only whitespace before cursor on current line)
         at_line_start = current_line.strip() == ''
@@ -675,31 +744,11 @@ class AethelAutopilot:
         if 'intent ' in current_line and '{' not in current_line:
             return 'intent_signature'
         
-        # Count block depth by tracking braces
-        # We need to find which block we're currently in
-        block_stack = []
+        # Count block depth by tracking braces (block keyword looked up
+        # before each '{'); intents before the cursor reuse cached effects
+        block_stack = self.document.block_stack(code, cursor_pos)
         current_block = 'general'
         
-        # Parse code before cursor to build block stack
-        for i, char in enumerate(code_before_cursor):
-            # Check for block keywords before opening brace
-            if char == '{':
-                # Look back to find the keyword
-                lookback = code_before_cursor[max(0, i-20):i]
-                if 'guard' in lookback:
-                    block_stack.append('guard')
-                elif 'verify' in lookback:
-                    block_stack.append('verify')
-                elif 'solve' in lookback:
-                    block_stack.append('solve')
-                elif 'intent' in lookback:
-                    block_stack.append('intent_body')
-                else:
-                    block_stack.append('unknown')
-            elif char == '}':
-                if block_stack:
-                    block_stack.pop()
-        
         # Current context is the top of the stack
         if block_stack:
             current_block = block_stack[-1]
@@ -1071,6 +1120,19 @@ class AethelAutopilot:
         - Extracts variables from intent signature
         - Includes variables from current scope
         """
+        variables = set()
+        for region_variables in self.document.map_regions(code, 'variables', self._scan_variables):
+            variables |= region_variables
+        
+        # Remove common keywords
+        keywords = {'let', 'old', 'new', 'if', 'else', 'return', 'true', 'false'}
+        return [v for v in variables if v not in keywords]
+    
+    def _scan_variables(self, region: IntentRegion) -> set:
+        """Variable names declared in one region of the document"""
+        # The next region starts with the intent keyword; a trailing "name:"
+        # matches against it as in the whole document
+        code = region.text if region.last else region.text + 'intent'
         variables = []
         
         # Extract from intent signature (parameter names)
@@ -1091,11 +1153,7 @@ class AethelAutopilot:
         assign_matches = re.findall(assign_pattern, code, re.IGNORECASE)
         variables.extend(assign_matches)
         
-        # Remove duplicates and common keywords
-        keywords = {'let', 'old', 'new', 'if', 'else', 'return', 'true', 'false'}
-        variables = [v for v in set(variables) if v not in keywords]
-        
-        return variables
+        return set(variables)
     
     def _has_conservation_violation(self, intent: Dict) -> bool:
         """Check if intent might violate conservation"""
@@ -1105,11 +1163,10 @@ class AethelAutopilot:
     
     def _find_guard_block_line(self, code: str) -> int:
         """Find line number of guard block"""
-        lines = code.split('\n')
-        for i, line in enumerate(lines, 1):
-            if 'guard {' in line:
-                return i + 1  # Return line after opening brace
-        return 1
+        pos = code.find('guard {')
+        if pos < 0:
+            return 1
+        return code.count('\n', 0, pos) + 2  # Return line after opening brace
     
     # Task 11.1: Cache management methods
     
@@ -1146,6 +1203,8 @@ class AethelAutopilot:
         self._suggestion_cache.clear()
         self._safety_cache.clear()
         self._correction_cache.clear()
+        self._precedent_cache.clear()
+        self.document.clear()
     
     def get_cache_stats(self) -> Dict[str, int]:
         """Get cache statistics"""
@@ -1154,7 +1213,10 @@ class AethelAutopilot:
             'safety_cache_size': len(self._safety_cache),
             'correction_cache_size': len(self._correction_cache),
             'total_cache_size': len(self._suggestion_cache) + len(self._safety_cache) + len(self._correction_cache),
-            'max_cache_size': self._max_cache_size
+            'max_cache_size': self._max_cache_size,
+            'precedent_cache_size': len(self._precedent_cache),
+            'budget_skips': self._budget_skips,
+            **self.document.get_stats()
         }
 
 
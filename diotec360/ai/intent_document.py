@@ -0,0 +1,250 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Aethel-Pilot - Incremental Intent Document
+
+Editor calls arrive once per keystroke with the whole document, but a
+keystroke only changes one intent. The document is split into regions:
+each starts at a line that begins with the `intent` keyword and runs up to
+the next one (text before the first intent is a region of its own).
+Results derived from a region are cached by the region's text, so only the
+edited region is re-parsed and re-analysed:
+- parse: the region's intents, or its parse error
+- per-intent analyses, memoized on the region entry by the caller
+- per-region scans (variables, identifier tokens, ...) via map_regions
+- the guard/solve/verify block-stack effect used for context detection
+
+Parsing the regions one by one gives the same intent map as parsing the
+whole document: the grammar is a sequence of intent definitions. Documents
+with atomic_batch blocks nest intents inside braces and are parsed whole.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_INTENT_START = re.compile(r'^[ \t]*intent\b', re.MULTILINE)
+_BLANK = re.compile(r'(?:\s|#[^\n]*)*')
+_BRACE = re.compile(r'[{}]')
+
+# Characters looked back from a '{' to find the keyword that opens the block
+BLOCK_LOOKBACK = 20
+
+
+@dataclass
+class IntentRegion:
+    """A contiguous slice of the document holding (at most) one intent"""
+    text: str
+    start: int
+    key: str  # Hash of text
+    last: bool  # No region follows
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+@dataclass
+class RegionEntry:
+    """Cached results for one region text"""
+    intent_map: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+    parsed: bool = False
+    analyses: Dict[Any, Any] = field(default_factory=dict)
+
+    def memo(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Result of compute(), computed once per region text"""
+        if key not in self.analyses:
+            self.analyses[key] = compute()
+        return self.analyses[key]
+
+
+class IntentDocument:
+    """
+    Intent-level view of an editor document with per-region caches.
+
+    Example:
+        >>> document = IntentDocument(AethelParser())
+        >>> for name, intent, entry in document.intents(code):
+        ...     issues = entry.memo(('safety', name), lambda: analyse(intent))
+    """
+
+    def __init__(self, parser, max_regions: int = 4096):
+        self.parser = parser
+        self.max_regions = max_regions
+        self._entries: "OrderedDict[str, RegionEntry]" = OrderedDict()
+        self._last_code: Optional[str] = None
+        self._last_regions: List[IntentRegion] = []
+        self.stats = {'region_parses': 0, 'region_hits': 0, 'region_misses': 0}
+
+    def regions(self, code: str) -> List[IntentRegion]:
+        """Split code into intent regions (memoized for the last document)"""
+        if code == self._last_code:
+            return self._last_regions
+
+        starts = [m.start() for m in _INTENT_START.finditer(code)]
+        if not starts or starts[0] != 0:
+            starts.insert(0, 0)
+        bounds = starts + [len(code)]
+
+        regions = []
+        for i, start in enumerate(starts):
+            text = code[start:bounds[i + 1]]
+            regions.append(IntentRegion(
+                text=text,
+                start=start,
+                key=hashlib.md5(text.encode()).hexdigest(),
+                last=i == len(starts) - 1
+            ))
+
+        self._last_code = code
+        self._last_regions = regions
+        return regions
+
+    def entry(self, region: IntentRegion) -> RegionEntry:
+        """Cache entry of a region (LRU over region texts)"""
+        entry = self._entries.get(region.key)
+        if entry is not None:
+            self.stats['region_hits'] += 1
+            self._entries.move_to_end(region.key)
+            return entry
+
+        self.stats['region_misses'] += 1
+        entry = RegionEntry()
+        self._entries[region.key] = entry
+        if len(self._entries) > self.max_regions:
+            self._entries.popitem(last=False)
+        return entry
+
+    def intents(self, code: str) -> List[Tuple[str, Dict[str, Any], Optional[RegionEntry]]]:
+        """
+        (name, intent, region entry) for every intent, as AethelParser.parse
+        would return them: a later definition of a name replaces an earlier one.
+
+        Raises:
+            The parse error of the first region that does not parse
+        """
+        if 'atomic_batch' in code:
+            intent_map = self.parser.parse(code)
+            return [(name, intent, None) for name, intent in intent_map.items()]
+
+        regions = self.regions(code)
+        if not any(_INTENT_START.match(region.text) for region in regions):
+            # No intent at all: the parser decides (it rejects an empty program)
+            intent_map = self.parser.parse(code)
+            return [(name, intent, None) for name, intent in intent_map.items()]
+
+        merged: Dict[str, Tuple[Dict[str, Any], RegionEntry]] = {}
+        for region in regions:
+            entry = self._parsed_entry(region)
+            if entry.error is not None:
+                raise entry.error
+            for name, intent in entry.intent_map.items():
+                merged[name] = (intent, entry)
+
+        return [(name, intent, entry) for name, (intent, entry) in merged.items()]
+
+    def parse(self, code: str) -> Dict[str, Any]:
+        """Intent map of the document, re-parsing only changed regions"""
+        return {name: intent for name, intent, _ in self.intents(code)}
+
+    def map_regions(self, code: str, name: str, scan: Callable[[IntentRegion], Any]) -> List[Any]:
+        """scan(region) for every region, cached per region text under `name`"""
+        results = []
+        for region in self.regions(code):
+            entry = self.entry(region)
+            results.append(entry.memo((name, region.last), lambda: scan(region)))
+        return results
+
+    def block_stack(self, code: str, cursor: int) -> List[str]:
+        """
+        Open blocks ('guard', 'verify', 'solve', 'intent_body', 'unknown')
+        at the cursor, innermost last.
+
+        Whole regions before the cursor contribute their cached brace effect;
+        only the region holding the cursor is scanned.
+        """
+        stack: List[str] = []
+        for region in self.regions(code):
+            if region.start >= cursor:
+                break
+            if region.end <= cursor:
+                lookback = code[max(0, region.start - BLOCK_LOOKBACK):region.start]
+                entry = self.entry(region)
+                effect = entry.memo(('blocks', lookback),
+                                    lambda: _block_effect(code, region.start, region.end))
+            else:
+                effect = _block_effect(code, region.start, cursor)
+
+            pops, pushed = effect
+            if pops:
+                del stack[max(0, len(stack) - pops):]
+            stack.extend(pushed)
+        return stack
+
+    def clear(self):
+        self._entries.clear()
+        self._last_code = None
+        self._last_regions = []
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, cached_regions=len(self._entries))
+
+    def _parsed_entry(self, region: IntentRegion) -> RegionEntry:
+        entry = self.entry(region)
+        if not entry.parsed:
+            if _BLANK.fullmatch(region.text):
+                entry.intent_map = {}
+            else:
+                self.stats['region_parses'] += 1
+                try:
+                    entry.intent_map = self.parser.parse(region.text)
+                except Exception as e:
+                    entry.error = e
+            entry.parsed = True
+        return entry
+
+
+def _block_effect(code: str, start: int, end: int) -> Tuple[int, List[str]]:
+    """
+    Brace effect of code[start:end] on the block stack: how many blocks open
+    before start it closes, and the blocks it leaves open.
+    """
+    pops = 0
+    pushed: List[str] = []
+    for match in _BRACE.finditer(code, start, end):
+        i = match.start()
+        if code[i] == '{':
+            lookback = code[max(0, i - BLOCK_LOOKBACK):i]
+            if 'guard' in lookback:
+                pushed.append('guard')
+            elif 'verify' in lookback:
+                pushed.append('verify')
+            elif 'solve' in lookback:
+                pushed.append('solve')
+            elif 'intent' in lookback:
+                pushed.append('intent_body')
+            else:
+                pushed.append('unknown')
+        elif pushed:
+            pushed.pop()
+        else:
+            pops += 1
+    return pops, pushed
@@ -128,6 +128,10 @@ class WriteAheadLog:
     The WAL is fsync'd after each write to ensure durability.
     """
     
+    # Set when a failed write could not be rolled back: the log may hold
+    # records the caller was told had failed, so no further appends
+    _failed: Optional[BaseException] = None
+    
     def __init__(self, wal_dir: Path):
         """
         Initialize WAL.
@@ -165,6 +169,7 @@ class WriteAheadLog:
         Raises:
             OSError: If disk is full (ENOSPC) or other I/O error occurs
         """
+        self._check_writable()
         entry = WALEntry(
             tx_id=tx_id,
             changes=changes,
@@ -210,6 +215,7 @@ class WriteAheadLog:
         Args:
             entry: WAL entry to mark as committed
         """
+        self._check_writable()
         commit_entry = {
             "op": "COMMIT",
             "tx_id": entry.tx_id,
@@ -222,6 +228,73 @@ class WriteAheadLog:
             f.flush()
             os.fsync(f.fileno())  # Ensure durability
     
+    def append_committed_entry(self, tx_id: str, changes: Dict[str, Any]) -> WALEntry:
+        """
+        Append PREPARE and COMMIT records for a transaction with one fsync.
+        
+        For layers where nothing has to happen between the two records
+        (the change is applied in memory after it is durable), this halves
+        the fsyncs per transaction compared to append_entry + mark_committed.
+        
+        Args:
+            tx_id: Transaction ID
+            changes: State changes to log
+            
+        Returns:
+            Committed WALEntry object
+            
+        Raises:
+            OSError: If disk is full (ENOSPC) or other I/O error occurs
+        """
+        self._check_writable()
+        entry = WALEntry(
+            tx_id=tx_id,
+            changes=changes,
+            timestamp=time.time(),
+            committed=True
+        )
+        
+        records = json.dumps({
+            'op': 'PREPARE',
+            'tx_id': entry.tx_id,
+            'changes': entry.changes,
+            'timestamp': entry.timestamp
+        }) + '\n' + json.dumps({
+            'op': 'COMMIT',
+            'tx_id': entry.tx_id,
+            'timestamp': entry.timestamp
+        }) + '\n'
+        
+        with open(self.wal_file, 'ab', buffering=0) as f:
+            entry.entry_offset = f.tell()
+            try:
+                f.write(records.encode('utf-8'))
+                os.fsync(f.fileno())  # Ensure durability
+            except OSError as e:
+                # A COMMIT left behind would be replayed for a failed transaction
+                self._roll_back(f.fileno(), entry.entry_offset)
+                if e.errno == 28:  # ENOSPC - No space left on device
+                    raise OSError(f"Disk full: Cannot write to WAL file {self.wal_file}") from e
+                else:
+                    raise OSError(f"I/O error writing to WAL: {e}") from e
+        
+        return entry
+    
+    def _check_writable(self) -> None:
+        """
+        Raises:
+            RuntimeError: If an earlier failed write could not be rolled back
+        """
+        if self._failed is not None:
+            raise RuntimeError(f"WAL has failed: {self._failed!r}") from self._failed
+    
+    def _roll_back(self, fd: int, offset: int) -> None:
+        """Truncate a failed write; if that fails too, refuse further appends"""
+        try:
+            os.ftruncate(fd, offset)
+        except OSError as e:
+            self._failed = e
+    
     def get_uncommitted_entries(self) -> List[WALEntry]:
         """
         Get all uncommitted WAL entries.
@@ -234,6 +307,19 @@ class WriteAheadLog:
         entries = self._read_all_entries()
         return [e for e in entries if not e.committed]
     
+    def get_committed_entries(self) -> List[WALEntry]:
+        """
+        Get all committed WAL entries, in log order.
+        
+        Used during crash recovery to replay committed transactions into
+        state layers that persist lazily.
+        
+        Returns:
+            List of committed WAL entries
+        """
+        entries = self._read_all_entries()
+        return [e for e in entries if e.committed]
+    
     def truncate_committed(self) -> None:
         """
         Remove committed entries from WAL (garbage collection).
@@ -581,8 +667,7 @@ class AtomicCommitLayer:
                 self._log_audit(report, "CLEANUP_ORPHANS", f"Cleaned up {orphaned_count} orphaned temp files")
             
             # Step 4: Replay committed but unapplied WAL entries (if any)
-            # For now, we assume all committed entries are already applied
-            # This is a placeholder for future enhancement
+            self._replay_committed_entries(report)
             
             # Step 5: Verify state file exists and is valid
             if self.state_file.exists():
@@ -663,6 +748,18 @@ class AtomicCommitLayer:
         
         return report
     
+    def _replay_committed_entries(self, report: RecoveryReport) -> None:
+        """
+        Replay committed WAL entries that are not yet reflected in state.
+        
+        This layer renames the new state file into place before marking the
+        WAL entry committed, so every committed entry is already applied.
+        Layers that persist state lazily override this hook.
+        
+        Args:
+            report: RecoveryReport to log replayed entries to
+        """
+    
     def _log_audit(self, report: RecoveryReport, operation: str, details: str) -> None:
         """
         Log a recovery operation to the audit trail.
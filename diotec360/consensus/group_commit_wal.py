@@ -0,0 +1,361 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Group Commit Write-Ahead Log
+
+WriteAheadLog opens the log and fsyncs once per record. Under concurrent
+commits that means one fsync per caller, and fsync latency dominates
+throughput. OptimizedWriteAheadLog batches by count but acknowledges
+records before they are durable.
+
+GroupCommitWriteAheadLog keeps one long-lived handle and a single flush
+thread. Callers enqueue their records and block; the flush thread writes
+everything that is queued, fsyncs once, and wakes every caller in the
+batch. Records that arrive while an fsync is in flight form the next
+batch, so batching grows with load without adding latency when idle.
+No caller returns before its record is on disk.
+
+An OSError fails only its batch: the file is truncated back to where the
+batch started, so recovery never replays records whose callers were told
+they failed. If that rollback fails, or the error is not an OSError, the
+handle is in an unknown state: every queued caller receives the error and
+the WAL is marked failed, so later records raise instead of waiting on a
+dead flusher.
+
+The on-disk format is unchanged, so recovery and compaction are the
+same as for WriteAheadLog.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from diotec360.consensus.atomic_commit import WALEntry, WriteAheadLog
+
+
+class _FlushRequest:
+    """Records from one caller and the event it waits on"""
+
+    __slots__ = ("payload", "done", "error")
+
+    def __init__(self, payload: str):
+        self.payload = payload
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitWriteAheadLog(WriteAheadLog):
+    """
+    WAL that amortizes one fsync over every record queued since the last.
+
+    Args:
+        wal_dir: Directory for WAL files
+        max_batch_size: Upper bound on records written per fsync
+        max_batch_delay_ms: How long the flush thread waits for more
+            records before syncing a partial batch. 0 syncs as soon as
+            the previous fsync has returned.
+    """
+
+    # Number of recent fsync timings kept for percentile metrics
+    LATENCY_WINDOW = 1024
+
+    def __init__(
+        self,
+        wal_dir: Path,
+        max_batch_size: int = 256,
+        max_batch_delay_ms: float = 0.0
+    ):
+        super().__init__(wal_dir)
+
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_batch_delay_ms < 0:
+            raise ValueError("max_batch_delay_ms must be non-negative")
+
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay_ms / 1000.0
+
+        self._file = open(self.wal_file, 'ab', buffering=0)
+
+        # Guards the queue and wakes the flush thread
+        self._cond = threading.Condition()
+        self._pending: List[_FlushRequest] = []
+        self._closed = False
+        self._failed: Optional[BaseException] = None  # Unrecoverable flush error
+
+        # Held while the handle is written or swapped by _rewrite_wal
+        self._io_lock = threading.Lock()
+
+        # Metrics
+        self._batches = 0
+        self._records = 0
+        self._max_batch = 0
+        self._fsync_total = 0.0
+        self._fsync_latencies = deque(maxlen=self.LATENCY_WINDOW)
+
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            name="wal_group_commit",
+            daemon=True
+        )
+        self._flusher.start()
+
+    def append_entry(self, tx_id: str, changes: Dict[str, Any]) -> WALEntry:
+        """
+        Append a PREPARE record and block until it is durable.
+
+        Args:
+            tx_id: Transaction ID
+            changes: State changes to log
+
+        Returns:
+            WALEntry object
+
+        Raises:
+            OSError: If disk is full (ENOSPC) or other I/O error occurs
+        """
+        entry = WALEntry(
+            tx_id=tx_id,
+            changes=changes,
+            timestamp=time.time(),
+            committed=False
+        )
+
+        self._submit(json.dumps({
+            'op': 'PREPARE',
+            'tx_id': entry.tx_id,
+            'changes': entry.changes,
+            'timestamp': entry.timestamp
+        }) + '\n')
+
+        return entry
+
+    def mark_committed(self, entry: WALEntry) -> None:
+        """
+        Append a COMMIT record and block until it is durable.
+
+        Args:
+            entry: WAL entry to mark as committed
+        """
+        self._submit(json.dumps({
+            'op': 'COMMIT',
+            'tx_id': entry.tx_id,
+            'timestamp': time.time()
+        }) + '\n')
+        entry.committed = True
+
+    def append_committed_entry(self, tx_id: str, changes: Dict[str, Any]) -> WALEntry:
+        """
+        Append PREPARE and COMMIT records in the same batch.
+
+        Args:
+            tx_id: Transaction ID
+            changes: State changes to log
+
+        Returns:
+            Committed WALEntry object
+
+        Raises:
+            OSError: If disk is full (ENOSPC) or other I/O error occurs
+        """
+        entry = WALEntry(
+            tx_id=tx_id,
+            changes=changes,
+            timestamp=time.time(),
+            committed=True
+        )
+
+        self._submit(json.dumps({
+            'op': 'PREPARE',
+            'tx_id': entry.tx_id,
+            'changes': entry.changes,
+            'timestamp': entry.timestamp
+        }) + '\n' + json.dumps({
+            'op': 'COMMIT',
+            'tx_id': entry.tx_id,
+            'timestamp': entry.timestamp
+        }) + '\n')
+
+        return entry
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get group commit metrics.
+
+        Returns:
+            Dictionary with batch counts, batch sizes and fsync latency
+        """
+        with self._cond:
+            latencies = sorted(self._fsync_latencies)
+            batches = self._batches
+            records = self._records
+            max_batch = self._max_batch
+            fsync_total = self._fsync_total
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(p * len(latencies)))
+            return latencies[index] * 1000
+
+        return {
+            'batches': batches,
+            'records': records,
+            'avg_batch_size': records / batches if batches else 0.0,
+            'max_batch_size': max_batch,
+            'avg_fsync_ms': (fsync_total / batches * 1000) if batches else 0.0,
+            'p50_fsync_ms': percentile(0.50),
+            'p99_fsync_ms': percentile(0.99),
+        }
+
+    def shutdown(self) -> None:
+        """Flush queued records, stop the flush thread and close the handle"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        self._flusher.join()
+
+        with self._io_lock:
+            self._file.close()
+
+    def _submit(self, payload: str) -> None:
+        """
+        Queue records for the next batch and wait until they are durable.
+
+        Raises:
+            OSError: If the batch could not be written or synced
+            RuntimeError: If the WAL has been shut down or has failed
+        """
+        request = _FlushRequest(payload)
+
+        with self._cond:
+            if self._failed is not None:
+                raise RuntimeError(f"WAL has failed: {self._failed!r}") from self._failed
+            if self._closed:
+                raise RuntimeError("WAL has been shut down")
+            self._pending.append(request)
+            self._cond.notify_all()
+
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+
+    def _flush_loop(self) -> None:
+        """Flush thread: collect a batch, write it, fsync once, wake callers"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+
+                if not self._pending:
+                    return
+
+                # Give other callers a chance to join this batch
+                if self.max_batch_delay > 0:
+                    deadline = time.monotonic() + self.max_batch_delay
+                    while (len(self._pending) < self.max_batch_size
+                           and not self._closed):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:len(batch)]
+
+            self._write_batch(batch)
+
+            if self._failed is not None:
+                # Release everyone queued behind the failed batch and stop
+                with self._cond:
+                    batch, self._pending = self._pending, []
+                for request in batch:
+                    request.error = self._failed
+                    request.done.set()
+                return
+
+    def _write_batch(self, batch: List[_FlushRequest]) -> None:
+        """Write and sync one batch, then release every waiting caller"""
+        error: Optional[BaseException] = None
+        fsync_time = 0.0
+
+        try:
+            with self._io_lock:
+                offset = self._file.tell()
+                try:
+                    self._file.write(''.join(request.payload for request in batch).encode('utf-8'))
+
+                    start = time.perf_counter()
+                    os.fsync(self._file.fileno())  # One fsync for the whole batch
+                    fsync_time = time.perf_counter() - start
+                except OSError:
+                    self._roll_back(offset)
+                    raise
+        except OSError as e:
+            if e.errno == 28:  # ENOSPC - No space left on device
+                error = OSError(f"Disk full: Cannot write to WAL file {self.wal_file}")
+            else:
+                error = OSError(f"I/O error writing to WAL: {e}")
+            error.__cause__ = e
+        except BaseException as e:
+            # Not an I/O error: the handle can no longer be trusted
+            error = e
+            with self._cond:
+                self._failed = e
+
+        if error is None:
+            with self._cond:
+                self._batches += 1
+                self._records += len(batch)
+                self._max_batch = max(self._max_batch, len(batch))
+                self._fsync_total += fsync_time
+                self._fsync_latencies.append(fsync_time)
+
+        for request in batch:
+            request.error = error
+            request.done.set()
+
+    def _roll_back(self, offset: int) -> None:
+        """
+        Remove a failed batch from the file and reopen the handle.
+
+        Called with _io_lock held. If the batch cannot be removed the WAL is
+        marked failed: its records must never be acknowledged or replayed.
+        """
+        try:
+            os.ftruncate(self._file.fileno(), offset)
+            self._file.close()
+            self._file = open(self.wal_file, 'ab', buffering=0)
+        except OSError as e:
+            with self._cond:
+                self._failed = e
+
+    def _rewrite_wal(self, entries: List[WALEntry]) -> None:
+        """Rewrite the WAL and reopen the long-lived handle on the new file"""
+        with self._io_lock:
+            super()._rewrite_wal(entries)
+            if not self._file.closed:
+                self._file.close()
+                self._file = open(self.wal_file, 'ab', buffering=0)
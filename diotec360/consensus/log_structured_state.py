@@ -0,0 +1,613 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Log-Structured State Engine for the Atomic Commit Layer
+
+AtomicCommitLayer rewrites the whole state.json on every commit, so commit
+cost grows with total state size. This module provides a log-structured
+backend where commits only write their deltas:
+
+- Commit: PREPARE + COMMIT records in the WAL (one fsync), then apply to
+  a memtable
+- Checkpoint: flush the memtable to an immutable, sorted segment file and
+  atomically publish it in the manifest, then truncate committed WAL entries
+- Compaction: merge segments into one in a background thread
+- Recovery: recover_from_crash() replays committed WAL entries written
+  after the last checkpoint into the memtable
+
+Segment files are JSON lines of [key, value] sorted by key. The manifest
+records each segment's SHA-256, so a modified or truncated segment fails
+closed with StateCorruptionPanic, like a corrupted state.json.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from diotec360.consensus.atomic_commit import (
+    Transaction, RecoveryReport, AtomicCommitLayer
+)
+from diotec360.consensus.group_commit_wal import GroupCommitWriteAheadLog
+from diotec360.consensus.segmented_wal import SegmentedWriteAheadLog
+from diotec360.core.integrity_panic import StateCorruptionPanic, MerkleRootMismatchPanic
+
+
+class LogStructuredStateEngine:
+    """
+    Memtable + immutable sorted segments with a checksummed manifest.
+    
+    Segments are kept in memory after loading (the full-file layer also
+    held the whole state in memory on every commit); reads check the
+    memtable first, then segments from newest to oldest.
+    
+    Thread safety: all public methods may be called while a background
+    compaction is running.
+    """
+    
+    MANIFEST_NAME = "MANIFEST.json"
+    
+    def __init__(
+        self,
+        data_dir: Path,
+        max_segments: int = 8,
+        background_compaction: bool = True
+    ):
+        """
+        Initialize the engine (files are loaded by open()).
+        
+        Args:
+            data_dir: Directory for segment files and the manifest
+            max_segments: Compact once more segments than this exist
+            background_compaction: Run compaction in a daemon thread
+        """
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_file = self.data_dir / self.MANIFEST_NAME
+        
+        self.max_segments = max_segments
+        self.background_compaction = background_compaction
+        
+        self.memtable: Dict[str, Any] = {}
+        self._segments: List[Dict[str, Any]] = []  # Manifest records, oldest first
+        self._segment_data: Dict[str, Dict[str, Any]] = {}  # Segment name -> contents
+        self._next_segment = 1
+        
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()  # One compaction at a time
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._opened = False
+    
+    def open(self) -> None:
+        """
+        Load the manifest and verify every live segment.
+        
+        A fresh directory gets an empty manifest. Segment files without a
+        manifest, unreadable manifests and checksum mismatches raise
+        StateCorruptionPanic (fail-closed, never start from empty state).
+        """
+        with self._lock:
+            if self._opened:
+                return
+            
+            if not self.manifest_file.exists():
+                if any(self.data_dir.glob("segment_*.jsonl")):
+                    raise StateCorruptionPanic(
+                        violation_type="STATE_FILE_MISSING",
+                        details={
+                            "path": str(self.manifest_file),
+                            "state_dir": str(self.data_dir)
+                        }
+                    )
+                self._write_manifest()
+            else:
+                try:
+                    manifest = json.loads(self.manifest_file.read_text())
+                    records = manifest['segments']
+                    next_segment = manifest['next_segment']
+                except (json.JSONDecodeError, KeyError) as e:
+                    raise StateCorruptionPanic(
+                        violation_type="STATE_FILE_CORRUPTED",
+                        details={
+                            "path": str(self.manifest_file),
+                            "error": str(e),
+                            "error_type": type(e).__name__
+                        }
+                    )
+                
+                for record in records:
+                    self._segment_data[record['name']] = self._read_segment(record)
+                self._segments = records
+                self._next_segment = next_segment
+            
+            self._remove_orphans()
+            self._opened = True
+    
+    def apply(self, changes: Dict[str, Any]) -> None:
+        """
+        Apply committed changes to the memtable.
+        
+        Args:
+            changes: Dict of state changes (key -> value)
+        """
+        with self._lock:
+            self.memtable.update(changes)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read the latest value of a key.
+        
+        Args:
+            key: State key
+            default: Value returned if the key does not exist
+            
+        Returns:
+            Latest value for the key, or default
+        """
+        with self._lock:
+            if key in self.memtable:
+                return self.memtable[key]
+            for record in reversed(self._segments):
+                data = self._segment_data[record['name']]
+                if key in data:
+                    return data[key]
+            return default
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Materialize the full state (segments oldest to newest, then memtable).
+        
+        Returns:
+            State dictionary
+        """
+        with self._lock:
+            state: Dict[str, Any] = {}
+            for record in self._segments:
+                state.update(self._segment_data[record['name']])
+            state.update(self.memtable)
+            return state
+    
+    def segment_count(self) -> int:
+        """Number of live segment files"""
+        with self._lock:
+            return len(self._segments)
+    
+    def checkpoint(self) -> Optional[str]:
+        """
+        Flush the memtable to a new immutable segment.
+        
+        The segment is written, fsync'd and renamed into place, then
+        published by an atomic manifest rewrite. Compaction is scheduled if
+        too many segments accumulate.
+        
+        Returns:
+            Name of the new segment, or None if the memtable was empty
+        """
+        with self._lock:
+            if not self.memtable:
+                return None
+            
+            name = self._allocate_segment_name()
+            record = self._write_segment(name, self.memtable)
+            
+            self._segments.append(record)
+            self._segment_data[name] = self.memtable
+            self.memtable = {}
+            self._write_manifest()
+        
+        self._maybe_schedule_compaction()
+        return name
+    
+    def compact(self) -> bool:
+        """
+        Merge all current segments into one.
+        
+        The merged segment is written without holding the lock, so commits
+        and checkpoints continue meanwhile; segments checkpointed during
+        compaction stay ahead of (newer than) the merged one.
+        
+        Returns:
+            True if segments were merged
+        """
+        with self._compaction_lock:
+            with self._lock:
+                records = list(self._segments)
+                if len(records) < 2:
+                    return False
+                
+                merged: Dict[str, Any] = {}
+                for record in records:
+                    merged.update(self._segment_data[record['name']])
+                name = self._allocate_segment_name()
+            
+            new_record = self._write_segment(name, merged)
+            
+            with self._lock:
+                self._segments = [new_record] + self._segments[len(records):]
+                self._segment_data[name] = merged
+                for record in records:
+                    del self._segment_data[record['name']]
+                self._write_manifest()
+            
+            for record in records:
+                (self.data_dir / record['name']).unlink(missing_ok=True)
+            
+            return True
+    
+    def close(self) -> None:
+        """Wait for a running background compaction to finish"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+    
+    def _maybe_schedule_compaction(self) -> None:
+        """Start compaction if segment count exceeds max_segments"""
+        with self._lock:
+            if len(self._segments) <= self.max_segments:
+                return
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            
+            if self.background_compaction:
+                self._compaction_thread = threading.Thread(
+                    target=self._run_compaction,
+                    name="lsm_compaction",
+                    daemon=True
+                )
+                self._compaction_thread.start()
+                return
+        
+        self._run_compaction()
+    
+    def _run_compaction(self) -> None:
+        """Compaction entry point (errors leave the old segments live)"""
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"[LSM_STATE] Warning: Compaction failed: {e}")
+    
+    def _allocate_segment_name(self) -> str:
+        """Reserve the next segment file name"""
+        name = f"segment_{self._next_segment:06d}.jsonl"
+        self._next_segment += 1
+        return name
+    
+    def _write_segment(self, name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write a sorted segment file (temp file + fsync + atomic rename).
+        
+        Returns:
+            Manifest record for the segment
+        """
+        lines = [json.dumps([key, data[key]]) for key in sorted(data)]
+        payload = ("\n".join(lines) + "\n").encode() if lines else b""
+        
+        segment_file = self.data_dir / name
+        temp_file = self.data_dir / f"{name}.tmp"
+        
+        try:
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            temp_file.replace(segment_file)
+        except OSError as e:
+            if temp_file.exists():
+                temp_file.unlink()
+            if e.errno == 28:  # ENOSPC
+                raise OSError(f"Disk full: Cannot write segment {name}") from e
+            raise OSError(f"I/O error writing segment {name}: {e}") from e
+        
+        return {
+            'name': name,
+            'sha256': hashlib.sha256(payload).hexdigest(),
+            'entries': len(lines)
+        }
+    
+    def _read_segment(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read and verify a segment listed in the manifest.
+        
+        Raises:
+            StateCorruptionPanic: If the file is missing or its checksum
+                does not match the manifest
+        """
+        segment_file = self.data_dir / record['name']
+        if not segment_file.exists():
+            raise StateCorruptionPanic(
+                violation_type="STATE_FILE_MISSING",
+                details={
+                    "path": str(segment_file),
+                    "state_dir": str(self.data_dir)
+                }
+            )
+        
+        payload = segment_file.read_bytes()
+        if hashlib.sha256(payload).hexdigest() != record['sha256']:
+            raise StateCorruptionPanic(
+                violation_type="STATE_PARTIAL_CORRUPTION",
+                details={
+                    "path": str(segment_file),
+                    "expected_sha256": record['sha256'],
+                    "size_bytes": len(payload)
+                }
+            )
+        
+        data = {}
+        for line in payload.decode().splitlines():
+            if line:
+                key, value = json.loads(line)
+                data[key] = value
+        return data
+    
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest with the current segment list"""
+        manifest = {
+            'segments': self._segments,
+            'next_segment': self._next_segment
+        }
+        
+        temp_file = self.data_dir / f"{self.MANIFEST_NAME}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.manifest_file)
+    
+    def _remove_orphans(self) -> None:
+        """Delete temp files and segments not listed in the manifest"""
+        live = {record['name'] for record in self._segments}
+        
+        for path in self.data_dir.glob("*.tmp"):
+            path.unlink()
+        for path in self.data_dir.glob("segment_*.jsonl"):
+            if path.name not in live:
+                path.unlink()
+
+
+class LogStructuredCommitLayer(AtomicCommitLayer):
+    """
+    Atomic commit layer backed by LogStructuredStateEngine.
+    
+    Commits write only their delta (two WAL records) and update the
+    memtable, so commit cost no longer depends on total state size. The
+    WAL is the durable copy of every commit since the last checkpoint;
+    checkpoint() moves it into a segment and truncates the WAL.
+    
+    With group_commit=True the WAL is a GroupCommitWriteAheadLog and
+    commit_transaction may be called from several threads; concurrent
+    commits share fsyncs, and checkpoints wait for in-flight commits.
+    
+    With segmented_wal=True the WAL is a SegmentedWriteAheadLog, so a
+    checkpoint unlinks WAL segments and recovery only scans the log
+    written since the last checkpoint.
+    
+    Crash recovery keeps the AtomicCommitLayer contract: call
+    recover_from_crash() after construction. Uncommitted WAL entries are
+    rolled back, committed ones are replayed into the memtable, and the
+    manifest stands in for state.json in the integrity checks.
+    """
+    
+    def __init__(
+        self,
+        state_dir: Path,
+        wal_dir: Path,
+        merkle_tree=None,
+        checkpoint_interval: int = 1000,
+        max_segments: int = 8,
+        background_compaction: bool = True,
+        group_commit: bool = False,
+        max_batch_size: int = 256,
+        max_batch_delay_ms: float = 0.0,
+        segmented_wal: bool = False
+    ):
+        """
+        Initialize log-structured atomic commit layer.
+        
+        Args:
+            state_dir: Directory for state files
+            wal_dir: Directory for write-ahead log
+            merkle_tree: Optional MerkleTree instance for verification
+            checkpoint_interval: Commits between automatic checkpoints
+            max_segments: Compact once more segments than this exist
+            background_compaction: Run compaction in a daemon thread
+            group_commit: Share WAL fsyncs between concurrent commits
+            max_batch_size: Group commit: records per fsync at most
+            max_batch_delay_ms: Group commit: wait for a fuller batch
+            segmented_wal: Use the binary segmented WAL format
+        """
+        if group_commit and segmented_wal:
+            raise ValueError("group_commit and segmented_wal cannot be combined")
+        
+        super().__init__(state_dir, wal_dir, merkle_tree)
+        
+        if segmented_wal:
+            self.wal = SegmentedWriteAheadLog(self.wal_dir)
+        elif group_commit:
+            self.wal = GroupCommitWriteAheadLog(
+                self.wal_dir,
+                max_batch_size=max_batch_size,
+                max_batch_delay_ms=max_batch_delay_ms
+            )
+        
+        self.engine = LogStructuredStateEngine(
+            self.state_dir / "lsm",
+            max_segments=max_segments,
+            background_compaction=background_compaction
+        )
+        
+        # Recovery checks the manifest instead of state.json
+        self.state_file = self.engine.manifest_file
+        
+        self.checkpoint_interval = checkpoint_interval
+        self._commits_since_checkpoint = 0
+        self._replayed = False
+        self._replay_lock = threading.Lock()
+        
+        # Commits run concurrently; a checkpoint waits until none is in
+        # flight so it never truncates a WAL entry missing from the memtable
+        self._gate = threading.Condition()
+        self._active_commits = 0
+        self._checkpointing = False
+    
+    def commit_transaction(self, tx: Transaction) -> bool:
+        """
+        Commit a transaction by logging its delta.
+        
+        Protocol:
+        1. Write PREPARE + COMMIT to WAL with one fsync (durable from here on)
+        2. Apply changes to the memtable
+        3. Checkpoint every checkpoint_interval commits
+        
+        Args:
+            tx: Transaction to commit
+            
+        Returns:
+            True if commit succeeded
+            
+        Raises:
+            OSError: If disk is full or I/O error occurs
+        """
+        try:
+            self._ensure_replayed()
+            
+            with self._gate:
+                while self._checkpointing:
+                    self._gate.wait()
+                self._active_commits += 1
+            
+            try:
+                self.wal.append_committed_entry(tx.tx_id, tx.changes)
+                self.engine.apply(tx.changes)
+            finally:
+                with self._gate:
+                    self._active_commits -= 1
+                    self._commits_since_checkpoint += 1
+                    due = self._commits_since_checkpoint >= self.checkpoint_interval
+                    self._gate.notify_all()
+            
+            if due:
+                self.checkpoint()
+            
+            tx.status = "committed"
+            return True
+            
+        except (OSError, StateCorruptionPanic, MerkleRootMismatchPanic):
+            raise
+        except Exception as e:
+            print(f"[LSM_COMMIT] Commit failed: {e}")
+            return False
+    
+    def checkpoint(self) -> Optional[str]:
+        """
+        Flush the memtable to a segment and drop committed WAL entries.
+        
+        A crash between the two steps only means the next recovery replays
+        entries that are already in the segment, which is idempotent.
+        
+        Returns:
+            Name of the new segment, or None if there was nothing to flush
+        """
+        self._ensure_replayed()
+        
+        with self._gate:
+            while self._checkpointing:
+                self._gate.wait()
+            self._checkpointing = True
+            while self._active_commits:
+                self._gate.wait()
+        
+        try:
+            segment = self.engine.checkpoint()
+            self.wal.truncate_committed()
+            self._commits_since_checkpoint = 0
+        finally:
+            with self._gate:
+                self._checkpointing = False
+                self._gate.notify_all()
+        
+        return segment
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Read a single key without materializing the whole state.
+        
+        Args:
+            key: State key
+            default: Value returned if the key does not exist
+            
+        Returns:
+            Latest committed value, or default
+        """
+        self._ensure_replayed()
+        return self.engine.get(key, default)
+    
+    def shutdown(self) -> None:
+        """Checkpoint, wait for background compaction and close the WAL"""
+        self.checkpoint()
+        self.engine.close()
+        if isinstance(self.wal, (GroupCommitWriteAheadLog, SegmentedWriteAheadLog)):
+            self.wal.shutdown()
+    
+    def _replay_committed_entries(self, report: RecoveryReport) -> None:
+        """
+        Replay committed WAL entries written after the last checkpoint.
+        
+        Args:
+            report: RecoveryReport to log replayed entries to
+        """
+        if self._replayed:
+            return
+        
+        replayed = self._ensure_replayed()
+        self._log_audit(
+            report,
+            "REPLAY_WAL",
+            f"Replayed {replayed} committed transactions into memtable "
+            f"({self.engine.segment_count()} segments)"
+        )
+    
+    def _ensure_replayed(self) -> int:
+        """
+        Open the engine and rebuild the memtable from the WAL (once).
+        
+        Returns:
+            Number of committed WAL entries replayed
+        """
+        if self._replayed:
+            return 0
+        
+        with self._replay_lock:
+            if self._replayed:
+                return 0
+            
+            self.engine.open()
+            entries = self.wal.get_committed_entries()
+            for entry in entries:
+                self.engine.apply(entry.changes)
+            
+            self._commits_since_checkpoint = len(entries)
+            self._replayed = True
+            return len(entries)
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """Materialize state from segments and memtable"""
+        self._ensure_replayed()
+        return self.engine.snapshot()
@@ -19,7 +19,7 @@ Merkle Tree implementation for Proof-of-Proof consensus protocol.
 
 This module provides a hash-based Merkle tree for efficient state verification
 and synchronization across distributed nodes. The tree supports:
-- Efficient updates to leaf values
+- Incremental updates that rehash only the root-to-leaf path
 - Generation of Merkle proofs for state inclusion
 - Verification of Merkle proofs against root hash
 - State commitment via root hash
@@ -32,10 +32,17 @@ The Merkle tree is a binary tree where:
 
 import hashlib
 import json
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
 
 
+# Root hash of an empty tree, also used for empty subtrees in sparse mode
+EMPTY_HASH = hashlib.sha256(b"empty").hexdigest()
+
+# Depth of the sparse tree (one level per bit of SHA-256(key))
+KEY_PATH_BITS = 256
+
+
 @dataclass
 class MerkleNode:
     """
@@ -78,6 +85,24 @@ class MerkleProof:
     value: Any
 
 
+class _SparseBranch:
+    """
+    Internal node of the sparse Merkle tree.
+    
+    Branches are immutable once linked into a tree: an update copies the
+    branches on its root-to-leaf path and shares every other subtree with
+    the previous version. The hash is computed lazily, so a batch of updates
+    touching the same upper levels rehashes them only once.
+    """
+    
+    __slots__ = ('left', 'right', 'hash')
+    
+    def __init__(self, left: Optional[Any], right: Optional[Any]):
+        self.left = left
+        self.right = right
+        self.hash: Optional[str] = None
+
+
 class MerkleTree:
     """
     Binary Merkle tree for authenticated state storage.
@@ -88,101 +113,91 @@ class MerkleTree:
     - O(log n) proof verification
     - O(1) root hash access
     
-    The tree is automatically balanced and rebuilt when necessary.
+    Two layouts are supported:
     
-    Performance optimizations:
-    - Batch updates to amortize rebuild cost
-    - LRU cache for frequently accessed nodes
-    - Lazy rebuilding (only when root hash needed)
+    - Compat (default): reproduces the legacy root exactly (leaves
+      sorted by key, paired level by level, odd node paired with itself).
+      Value updates of existing keys rehash only their path; inserts and
+      deletes rebuild the level arrays.
+    - Sparse (compat_mode=False): a persistent, path-copying sparse Merkle
+      tree. Each key is placed at the position given by the bits of SHA-256(key), so
+      the shape does not depend on insertion order. A subtree holding a
+      single leaf is represented by the leaf itself and empty subtrees hash
+      to EMPTY_HASH. One update rehashes only its root-to-leaf path.
+      Roots differ from the legacy layout, so callers opt in explicitly.
+    
+    Both layouts produce MerkleProof objects with the same (hash, position)
+    path format, so generate_proof/verify_proof callers are unaffected.
     """
     
-    def __init__(self, cache_size: int = 1000):
+    def __init__(self, cache_size: int = 1000, compat_mode: bool = True):
         """
         Initialize empty Merkle tree.
         
         Args:
-            cache_size: Maximum number of nodes to cache (default 1000)
+            cache_size: Kept for API compatibility. Subtree hashes are now
+                memoized on the nodes themselves.
+            compat_mode: Use the legacy sorted layout so root hashes match
+                trees built by previous versions (default True); False
+                selects the sparse layout, whose roots differ
         """
-        self.root: Optional[MerkleNode] = None
+        self.compat_mode = compat_mode
+        self.root: Optional[Any] = None  # Sparse mode root (branch or leaf)
         self.leaves: Dict[str, MerkleNode] = {}  # Map key -> leaf node
-        self._dirty = False  # Track if tree needs rebuilding
+        self._dirty = False  # Track if root hash needs recomputing
+        
+        # Compat mode: hashes of every level, bottom (leaves) to top (root)
+        self._sorted_keys: List[str] = []
+        self._key_index: Dict[str, int] = {}
+        self._levels: List[List[str]] = []
+        self._dirty_indices: Set[int] = set()
+        self._structure_dirty = False
         
-        # Performance optimizations
-        self._node_cache: Dict[str, MerkleNode] = {}  # Cache for internal nodes
+        # Performance statistics
         self._cache_size = cache_size
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._cache_hits = 0  # Subtree hashes reused
+        self._cache_misses = 0  # Internal node hashes recomputed
     
     def update(self, key: str, value: Any) -> None:
         """
         Update or insert a key-value pair in the tree.
         
-        This marks the tree as dirty and requires rebuilding to
-        update the root hash. The rebuild happens lazily when
-        get_root_hash() is called.
+        Only the path from the leaf to the root is invalidated; hashes are
+        recomputed lazily when get_root_hash() or generate_proof() is called.
         
         Args:
             key: State key to update
             value: New value for the key
         """
-        # Calculate leaf hash
-        leaf_hash = self._hash_leaf(key, value)
+        leaf = MerkleNode(
+            hash=self._hash_leaf(key, value),
+            key=key,
+            value=value
+        )
         
-        # Create or update leaf node
-        if key in self.leaves:
-            # Update existing leaf
-            leaf = self.leaves[key]
-            leaf.value = value
-            leaf.hash = leaf_hash
+        if self.compat_mode:
+            if key in self.leaves and not self._structure_dirty:
+                self._dirty_indices.add(self._key_index[key])
+            else:
+                self._structure_dirty = True
         else:
-            # Create new leaf
-            leaf = MerkleNode(
-                hash=leaf_hash,
-                key=key,
-                value=value
-            )
-            self.leaves[key] = leaf
+            self.root = self._sparse_insert(leaf, self._key_path(key))
         
-        # Mark tree as dirty (needs rebuilding)
+        self.leaves[key] = leaf
         self._dirty = True
-        
-        # Invalidate cache since tree structure changed
-        self._node_cache.clear()
     
     def batch_update(self, updates: Dict[str, Any]) -> None:
         """
         Apply multiple updates in a single batch.
         
-        This is more efficient than calling update() multiple times
-        because it only rebuilds the tree once at the end.
+        Paths shared by several updated keys are rehashed only once, when
+        the root hash is next requested.
         
         Args:
             updates: Dictionary of key-value pairs to update
         """
         for key, value in updates.items():
-            # Calculate leaf hash
-            leaf_hash = self._hash_leaf(key, value)
-            
-            # Create or update leaf node
-            if key in self.leaves:
-                # Update existing leaf
-                leaf = self.leaves[key]
-                leaf.value = value
-                leaf.hash = leaf_hash
-            else:
-                # Create new leaf
-                leaf = MerkleNode(
-                    hash=leaf_hash,
-                    key=key,
-                    value=value
-                )
-                self.leaves[key] = leaf
-        
-        # Mark tree as dirty (needs rebuilding)
-        self._dirty = True
-        
-        # Invalidate cache since tree structure changed
-        self._node_cache.clear()
+            self.update(key, value)
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -205,9 +220,15 @@ class MerkleTree:
         Args:
             key: State key to delete
         """
-        if key in self.leaves:
-            del self.leaves[key]
-            self._dirty = True
+        if key not in self.leaves:
+            return
+        
+        del self.leaves[key]
+        if self.compat_mode:
+            self._structure_dirty = True
+        else:
+            self.root = self._sparse_delete(key, self._key_path(key))
+        self._dirty = True
     
     def generate_proof(self, key: str) -> Optional[MerkleProof]:
         """
@@ -226,24 +247,18 @@ class MerkleTree:
         if key not in self.leaves:
             return None
         
-        # Ensure tree is up to date
-        if self._dirty:
-            self._rebuild_tree()
-        
-        # Get leaf node
+        root_hash = self.get_root_hash()
         leaf = self.leaves[key]
         
-        # Build proof path by traversing from leaf to root
-        path = []
-        current_hash = leaf.hash
-        
-        # Find path in tree
-        self._build_proof_path(self.root, current_hash, path)
+        if self.compat_mode:
+            path = self._compat_proof_path(self._key_index[key])
+        else:
+            path = self._sparse_proof_path(self._key_path(key))
         
         return MerkleProof(
             leaf_hash=leaf.hash,
             path=path,
-            root_hash=self.get_root_hash(),
+            root_hash=root_hash,
             key=key,
             value=leaf.value
         )
@@ -252,6 +267,9 @@ class MerkleTree:
         """
         Verify a Merkle proof against the current root hash.
         
+        In sparse mode the sibling positions must also match the bits of
+        the key's path, so a valid proof cannot be replayed for another key.
+        
         Args:
             proof: MerkleProof to verify
             
@@ -263,6 +281,16 @@ class MerkleTree:
         if proof.leaf_hash != expected_leaf_hash:
             return False
         
+        if not self.compat_mode:
+            depth = len(proof.path)
+            if depth > KEY_PATH_BITS:
+                return False
+            key_path = self._key_path(proof.key)
+            for i, (_, position) in enumerate(proof.path):
+                expected = 'left' if self._path_bit(key_path, depth - 1 - i) else 'right'
+                if position != expected:
+                    return False
+        
         # Reconstruct root hash from proof path
         current_hash = proof.leaf_hash
         
@@ -287,15 +315,16 @@ class MerkleTree:
         Returns:
             Root hash as hex string
         """
-        # Rebuild tree if dirty
         if self._dirty:
             self._rebuild_tree()
         
-        if self.root is None:
+        if not self.leaves:
             # Empty tree
-            return hashlib.sha256(b"empty").hexdigest()
+            return EMPTY_HASH
         
-        return self.root.hash
+        if self.compat_mode:
+            return self._levels[-1][0]
+        return self._subtree_hash(self.root)
     
     def get_all_keys(self) -> List[str]:
         """
@@ -317,71 +346,57 @@ class MerkleTree:
     
     def _rebuild_tree(self) -> None:
         """
-        Rebuild the Merkle tree from leaves.
+        Recompute the hashes invalidated since the last root computation.
         
-        This creates a balanced binary tree from the current leaves
-        and recalculates all internal node hashes up to the root.
-        
-        Optimized with node caching for frequently accessed subtrees.
+        Sparse mode hashes only the branches created by path copying. Compat
+        mode rehashes the paths of updated leaves, or rebuilds every level
+        when keys were inserted or deleted (leaf positions shift).
         """
-        if not self.leaves:
-            self.root = None
+        if not self.compat_mode:
+            self._subtree_hash(self.root)
             self._dirty = False
             return
         
-        # Sort leaves by key for deterministic ordering
-        sorted_leaves = sorted(self.leaves.values(), key=lambda n: n.key)
-        
-        # Build tree bottom-up
-        current_level = sorted_leaves
-        
-        while len(current_level) > 1:
-            next_level = []
+        if self._structure_dirty:
+            self._sorted_keys = sorted(self.leaves)
+            self._key_index = {key: i for i, key in enumerate(self._sorted_keys)}
+            level = [self.leaves[key].hash for key in self._sorted_keys]
+            self._levels = [level] if level else []
             
-            # Pair up nodes and create parents
-            for i in range(0, len(current_level), 2):
-                left = current_level[i]
-                
-                if i + 1 < len(current_level):
-                    # We have a pair
-                    right = current_level[i + 1]
-                else:
-                    # Odd number of nodes, duplicate the last one
-                    right = left
-                
-                # Check cache for this parent node
-                cache_key = f"{left.hash}:{right.hash}"
-                
-                if cache_key in self._node_cache:
-                    # Cache hit
-                    parent = self._node_cache[cache_key]
-                    self._cache_hits += 1
-                else:
-                    # Cache miss - create parent node
-                    parent_hash = self._hash_pair(left.hash, right.hash)
-                    parent = MerkleNode(
-                        hash=parent_hash,
-                        left=left,
-                        right=right
-                    )
-                    
-                    # Add to cache if not full
-                    if len(self._node_cache) < self._cache_size:
-                        self._node_cache[cache_key] = parent
-                    
-                    self._cache_misses += 1
-                
-                next_level.append(parent)
+            while len(level) > 1:
+                level = [
+                    self._hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+                    for i in range(0, len(level), 2)
+                ]
+                self._cache_misses += len(level)
+                self._levels.append(level)
+        elif self._dirty_indices:
+            positions = self._dirty_indices
+            leaf_level = self._levels[0]
+            for i in positions:
+                leaf_level[i] = self.leaves[self._sorted_keys[i]].hash
             
-            current_level = next_level
-        
-        # Set root
-        self.root = current_level[0]
+            for depth in range(1, len(self._levels)):
+                below = self._levels[depth - 1]
+                level = self._levels[depth]
+                positions = {i // 2 for i in positions}
+                for parent in positions:
+                    left = below[2 * parent]
+                    right = below[2 * parent + 1] if 2 * parent + 1 < len(below) else left
+                    level[parent] = self._hash_pair(left, right)
+                self._cache_misses += len(positions)
+                self._cache_hits += len(level) - len(positions)
+        
+        self._dirty_indices = set()
+        self._structure_dirty = False
         self._dirty = False
     
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict[str, Any]:
         """
-        Get cache performance statistics.
+        Get hashing performance statistics.
+        
+        A hit is an internal node hash reused from a previous root
+        computation, a miss is one that had to be recomputed.
         
         Returns:
             Dictionary with cache hits, misses, and hit rate
@@ -393,53 +408,222 @@ class MerkleTree:
             'cache_hits': self._cache_hits,
             'cache_misses': self._cache_misses,
             'hit_rate_percent': round(hit_rate, 2),
-            'cache_size': len(self._node_cache),
-            'max_cache_size': self._cache_size
+            'mode': 'compat' if self.compat_mode else 'sparse',
+            'leaf_count': len(self.leaves)
         }
     
-    def _build_proof_path(
+    def _sparse_insert(self, leaf: MerkleNode, key_path: int) -> Any:
+        """
+        Return a new root with the leaf inserted or replaced.
+        
+        Args:
+            leaf: New leaf node
+            key_path: Path bits of the leaf's key
+            
+        Returns:
+            New root (subtrees off the leaf's path are shared)
+        """
+        # Walk down to the slot for this key, remembering the path
+        path = []
+        node = self.root
+        depth = 0
+        while isinstance(node, _SparseBranch):
+            bit = self._path_bit(key_path, depth)
+            path.append((node, bit))
+            node = node.right if bit else node.left
+            depth += 1
+        
+        if node is None or node.key == leaf.key:
+            new_node = leaf
+        else:
+            new_node = self._sparse_split(node, self._key_path(node.key), leaf, key_path, depth)
+        
+        # Copy the branches on the path, bottom-up
+        for branch, bit in reversed(path):
+            if bit:
+                new_node = _SparseBranch(branch.left, new_node)
+            else:
+                new_node = _SparseBranch(new_node, branch.right)
+        
+        return new_node
+    
+    def _sparse_split(
         self,
-        node: Optional[MerkleNode],
-        target_hash: str,
-        path: List[Tuple[str, str]]
-    ) -> bool:
+        existing: MerkleNode,
+        existing_path: int,
+        leaf: MerkleNode,
+        key_path: int,
+        depth: int
+    ) -> _SparseBranch:
+        """
+        Push two leaves down until their path bits diverge.
+        
+        Args:
+            existing: Leaf currently occupying the subtree
+            existing_path: Path bits of the existing leaf's key
+            leaf: Leaf being inserted
+            key_path: Path bits of the inserted leaf's key
+            depth: Depth at which the two leaves collide
+            
+        Returns:
+            Branch containing both leaves
         """
-        Recursively build proof path from leaf to root.
+        if depth >= KEY_PATH_BITS:
+            raise ValueError(f"Key path collision between {existing.key!r} and {leaf.key!r}")
+        
+        new_bit = self._path_bit(key_path, depth)
+        if self._path_bit(existing_path, depth) == new_bit:
+            child = self._sparse_split(existing, existing_path, leaf, key_path, depth + 1)
+            return _SparseBranch(None, child) if new_bit else _SparseBranch(child, None)
+        
+        if new_bit:
+            return _SparseBranch(existing, leaf)
+        return _SparseBranch(leaf, existing)
+    
+    def _sparse_delete(self, key: str, key_path: int) -> Optional[Any]:
+        """
+        Return a new root with the key removed.
+        
+        Branches left with a single leaf collapse into that leaf, keeping
+        the tree shape (and therefore the root) independent of history.
         
         Args:
-            node: Current node in traversal
-            target_hash: Hash we're looking for
-            path: Accumulated proof path (modified in place)
+            key: State key to remove
+            key_path: Path bits of the key
             
         Returns:
-            True if target found in this subtree
+            New root, or None if the tree became empty
+        """
+        path = []
+        node = self.root
+        depth = 0
+        while isinstance(node, _SparseBranch):
+            bit = self._path_bit(key_path, depth)
+            path.append((node, bit))
+            node = node.right if bit else node.left
+            depth += 1
+        
+        if node is None or node.key != key:
+            return self.root
+        
+        new_node = None
+        for branch, bit in reversed(path):
+            if bit:
+                left, right = branch.left, new_node
+            else:
+                left, right = new_node, branch.right
+            
+            if left is None and (right is None or isinstance(right, MerkleNode)):
+                new_node = right
+            elif right is None and isinstance(left, MerkleNode):
+                new_node = left
+            else:
+                new_node = _SparseBranch(left, right)
+        
+        return new_node
+    
+    def _subtree_hash(self, node: Optional[Any]) -> str:
+        """
+        Get the hash of a sparse subtree, computing missing branch hashes.
+        
+        Args:
+            node: Subtree root (branch, leaf or None)
+            
+        Returns:
+            Subtree hash as hex string
         """
         if node is None:
-            return False
+            return EMPTY_HASH
         
-        # Check if this is the target
-        if node.hash == target_hash:
-            return True
+        if isinstance(node, MerkleNode):
+            return node.hash
         
-        # Check if leaf (can't go deeper)
-        if node.is_leaf():
-            return False
+        if node.hash is None:
+            node.hash = self._hash_pair(
+                self._subtree_hash(node.left),
+                self._subtree_hash(node.right)
+            )
+            self._cache_misses += 1
+        else:
+            self._cache_hits += 1
+        
+        return node.hash
+    
+    def _sparse_proof_path(self, key_path: int) -> List[Tuple[str, str]]:
+        """
+        Collect sibling hashes from the leaf up to the root (sparse mode).
+        
+        Args:
+            key_path: Path bits of the key
+            
+        Returns:
+            List of (sibling_hash, position) from leaf to root
+        """
+        path = []
+        node = self.root
+        depth = 0
+        
+        while isinstance(node, _SparseBranch):
+            if self._path_bit(key_path, depth):
+                path.append((self._subtree_hash(node.left), 'left'))
+                node = node.right
+            else:
+                path.append((self._subtree_hash(node.right), 'right'))
+                node = node.left
+            depth += 1
+        
+        path.reverse()
+        return path
+    
+    def _compat_proof_path(self, index: int) -> List[Tuple[str, str]]:
+        """
+        Collect sibling hashes from the leaf up to the root (compat mode).
         
-        # Search left subtree
-        if self._build_proof_path(node.left, target_hash, path):
-            # Target found in left subtree, add right sibling to path
-            if node.right:
-                path.append((node.right.hash, 'right'))
-            return True
-        
-        # Search right subtree
-        if self._build_proof_path(node.right, target_hash, path):
-            # Target found in right subtree, add left sibling to path
-            if node.left:
-                path.append((node.left.hash, 'left'))
-            return True
-        
-        return False
+        Args:
+            index: Position of the leaf in sorted key order
+            
+        Returns:
+            List of (sibling_hash, position) from leaf to root
+        """
+        path = []
+        
+        for level in self._levels[:-1]:
+            if index % 2 == 0:
+                # Odd node out is paired with itself
+                sibling = level[index + 1] if index + 1 < len(level) else level[index]
+                path.append((sibling, 'right'))
+            else:
+                path.append((level[index - 1], 'left'))
+            index //= 2
+        
+        return path
+    
+    @staticmethod
+    def _key_path(key: str) -> int:
+        """
+        Map a key to its position in the sparse tree.
+        
+        Args:
+            key: State key
+            
+        Returns:
+            SHA-256 of the key as a 256-bit integer
+        """
+        return int.from_bytes(hashlib.sha256(key.encode()).digest(), 'big')
+    
+    @staticmethod
+    def _path_bit(key_path: int, depth: int) -> int:
+        """
+        Get the branch direction at a depth (0 = left, 1 = right).
+        
+        Args:
+            key_path: Path bits of a key
+            depth: Depth in the tree (0 = root)
+            
+        Returns:
+            Bit value at that depth
+        """
+        return (key_path >> (KEY_PATH_BITS - 1 - depth)) & 1
     
     def _hash_leaf(self, key: str, value: Any) -> str:
         """
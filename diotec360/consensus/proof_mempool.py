@@ -19,12 +19,18 @@ Proof Mempool for Proof-of-Proof consensus protocol.
 
 This module implements a priority queue for pending proofs awaiting verification.
 Proofs are ordered by difficulty (highest first) to maximize network rewards.
+
+The queue is an addressable binary heap: a proof-hash index tracks each
+entry's position, so removal is O(log n), and block selection walks the
+top of the heap instead of copying it.
 """
 
 import heapq
+import itertools
 import time
 import hashlib
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Optional, Dict, Any, Set
 from dataclasses import dataclass, field
 from threading import Lock
@@ -45,7 +51,8 @@ class PendingProof:
     A proof pending verification in the mempool.
     
     Uses priority queue ordering where higher difficulty = higher priority.
-    The dataclass order=True with difficulty as first field ensures correct heap ordering.
+    The dataclass order=True with difficulty as first field ensures correct heap ordering;
+    ties go to the older proof (timestamp, then admission sequence).
     """
     # Priority field (negative for max-heap behavior)
     priority: int = field(compare=True)
@@ -54,7 +61,8 @@ class PendingProof:
     proof: Any = field(compare=False)
     proof_hash: str = field(compare=False, default="")
     difficulty: int = field(compare=False, default=0)
-    timestamp: int = field(compare=False, default_factory=lambda: int(time.time()))
+    timestamp: int = field(compare=True, default_factory=lambda: int(time.time()))
+    sequence: int = field(compare=True, default=0)
     
     def __post_init__(self):
         """Calculate proof hash and set priority."""
@@ -78,7 +86,9 @@ class ProofMempool:
     
     Key features:
     - Priority queue ordered by difficulty (highest first)
+    - O(log n) insert and remove, top-k selection without copying the heap
     - Deduplication by proof hash
+    - Proof verification runs outside the lock (admission pipeline)
     - Thread-safe operations
     - Configurable maximum size
     """
@@ -88,6 +98,7 @@ class ProofMempool:
         max_size: int = 10000,
         proof_verifier: Optional[ProofVerifier] = None,
         metrics_collector: Optional['MetricsCollector'] = None,
+        admission_workers: int = 4,
     ):
         """
         Initialize ProofMempool.
@@ -96,20 +107,31 @@ class ProofMempool:
             max_size: Maximum number of proofs to store
             proof_verifier: ProofVerifier instance for difficulty calculation
             metrics_collector: MetricsCollector instance for metrics emission
+            admission_workers: Threads verifying proofs queued with submit_proof()
         """
         self.max_size = max_size
         self.proof_verifier = proof_verifier or ProofVerifier()
         self.metrics_collector = metrics_collector
+        self.admission_workers = admission_workers
         
         # Priority queue (min-heap with negative priorities for max-heap behavior)
         self._heap: List[PendingProof] = []
         
-        # Set of proof hashes for deduplication
-        self._proof_hashes: Set[str] = set()
+        # Proof hash -> index in _heap (deduplication and O(log n) removal)
+        self._positions: Dict[str, int] = {}
+        
+        # Hashes being verified outside the lock; they count towards max_size
+        self._admitting: Set[str] = set()
+        
+        # FIFO tie-breaker between proofs of equal difficulty and timestamp
+        self._sequence = itertools.count()
         
         # Lock for thread-safe operations
         self._lock = Lock()
         
+        # Created on first submit_proof()
+        self._admission_executor: Optional[ThreadPoolExecutor] = None
+        
         # Statistics
         self._total_added = 0
         self._total_removed = 0
@@ -122,6 +144,10 @@ class ProofMempool:
         If difficulty is not provided, it will be calculated using the proof verifier.
         Proofs are deduplicated by hash - duplicate proofs are rejected.
         
+        Verification runs without holding the mempool lock: the hash is
+        reserved first (so concurrent duplicates are rejected and the slot
+        counts towards max_size), then verified, then inserted.
+        
         Args:
             proof: Proof object to add
             difficulty: Pre-calculated difficulty (optional)
@@ -129,31 +155,44 @@ class ProofMempool:
         Returns:
             True if proof was added, False if rejected (duplicate or mempool full)
         """
+        # Calculate proof hash
+        proof_hash = hashlib.sha256(
+            json.dumps(proof).encode()
+        ).hexdigest()
+        
         with self._lock:
-            # Calculate proof hash
-            proof_hash = hashlib.sha256(
-                json.dumps(proof).encode()
-            ).hexdigest()
-            
             # Check for duplicates
-            if proof_hash in self._proof_hashes:
+            if proof_hash in self._positions or proof_hash in self._admitting:
                 self._total_rejected += 1
                 return False
             
             # Check mempool size
-            if len(self._heap) >= self.max_size:
+            if len(self._heap) + len(self._admitting) >= self.max_size:
                 # Reject if mempool is full
                 self._total_rejected += 1
                 return False
             
-            # Calculate difficulty if not provided
+            self._admitting.add(proof_hash)
+        
+        valid = True
+        try:
+            # Calculate difficulty if not provided (Z3 call, outside the lock)
             if difficulty is None:
                 verification_result = self.proof_verifier.verify_proof(proof)
-                if not verification_result.valid:
-                    # Reject invalid proofs
-                    self._total_rejected += 1
-                    return False
+                valid = verification_result.valid
                 difficulty = verification_result.difficulty
+        except BaseException:
+            with self._lock:
+                self._admitting.discard(proof_hash)
+            raise
+        
+        with self._lock:
+            self._admitting.discard(proof_hash)
+            
+            if not valid:
+                # Reject invalid proofs
+                self._total_rejected += 1
+                return False
             
             # Create pending proof
             pending = PendingProof(
@@ -161,12 +200,11 @@ class ProofMempool:
                 proof=proof,
                 proof_hash=proof_hash,
                 difficulty=difficulty,
-                timestamp=int(time.time())
+                timestamp=int(time.time()),
+                sequence=next(self._sequence)
             )
             
-            # Add to heap and hash set
-            heapq.heappush(self._heap, pending)
-            self._proof_hashes.add(proof_hash)
+            self._heap_push(pending)
             
             self._total_added += 1
             
@@ -175,6 +213,36 @@ class ProofMempool:
             
             return True
     
+    def submit_proof(self, proof: Any, difficulty: Optional[int] = None) -> 'Future[bool]':
+        """
+        Queue a proof for verification and admission on a worker thread.
+        
+        Args:
+            proof: Proof object to add
+            difficulty: Pre-calculated difficulty (optional)
+            
+        Returns:
+            Future resolving to the add_proof() result
+        """
+        with self._lock:
+            if self._admission_executor is None:
+                self._admission_executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.admission_workers),
+                    thread_name_prefix="mempool_admission"
+                )
+            executor = self._admission_executor
+        
+        return executor.submit(self.add_proof, proof, difficulty)
+    
+    def shutdown(self) -> None:
+        """Wait for queued admissions and stop the admission workers"""
+        with self._lock:
+            executor = self._admission_executor
+            self._admission_executor = None
+        
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
     def get_next_block(
         self,
         block_size: int = 10,
@@ -186,6 +254,9 @@ class ProofMempool:
         Selects up to block_size proofs with highest difficulty from the mempool.
         Proofs are NOT removed from the mempool - use remove_proof() after consensus.
         
+        The heap is not copied: a small frontier heap walks down from the
+        root, so selection costs O(k log k) for k = block_size.
+        
         Args:
             block_size: Maximum number of proofs to include
             proposer_id: ID of the node proposing this block
@@ -197,17 +268,7 @@ class ProofMempool:
             if not self._heap:
                 return None
             
-            # Get top proofs without removing them
-            # We need to peek at the heap without modifying it
-            selected_proofs = []
-            
-            # Create a copy of the heap to peek at top elements
-            heap_copy = self._heap.copy()
-            
-            for _ in range(min(block_size, len(heap_copy))):
-                if heap_copy:
-                    pending = heapq.heappop(heap_copy)
-                    selected_proofs.append(pending.proof)
+            selected_proofs = [p.proof for p in self._top(block_size)]
             
             if not selected_proofs:
                 return None
@@ -238,16 +299,10 @@ class ProofMempool:
             True if proof was removed, False if not found
         """
         with self._lock:
-            if proof_hash not in self._proof_hashes:
+            if proof_hash not in self._positions:
                 return False
             
-            # Remove from hash set
-            self._proof_hashes.remove(proof_hash)
-            
-            # Remove from heap (requires rebuilding heap)
-            # This is O(n) but acceptable for mempool operations
-            self._heap = [p for p in self._heap if p.proof_hash != proof_hash]
-            heapq.heapify(self._heap)
+            self._heap_remove(proof_hash)
             
             self._total_removed += 1
             
@@ -260,7 +315,8 @@ class ProofMempool:
         """
         Remove multiple proofs from the mempool.
         
-        More efficient than calling remove_proof() multiple times.
+        More efficient than calling remove_proof() multiple times: small
+        batches are removed in O(k log n), large ones by one O(n) rebuild.
         
         Args:
             proof_hashes: List of proof hashes to remove
@@ -272,18 +328,20 @@ class ProofMempool:
             # Convert to set for O(1) lookup
             hashes_to_remove = set(proof_hashes)
             
-            # Count how many we'll actually remove
-            removed_count = len(hashes_to_remove & self._proof_hashes)
+            # Only hashes that are actually in the mempool
+            hashes_to_remove = {h for h in hashes_to_remove if h in self._positions}
+            removed_count = len(hashes_to_remove)
             
-            # Remove from hash set
-            self._proof_hashes -= hashes_to_remove
-            
-            # Remove from heap
-            self._heap = [
-                p for p in self._heap
-                if p.proof_hash not in hashes_to_remove
-            ]
-            heapq.heapify(self._heap)
+            if removed_count * 8 < len(self._heap):
+                for proof_hash in hashes_to_remove:
+                    self._heap_remove(proof_hash)
+            elif removed_count:
+                self._heap = [
+                    p for p in self._heap
+                    if p.proof_hash not in hashes_to_remove
+                ]
+                heapq.heapify(self._heap)
+                self._reindex()
             
             self._total_removed += removed_count
             
@@ -323,7 +381,7 @@ class ProofMempool:
             True if proof is in mempool
         """
         with self._lock:
-            return proof_hash in self._proof_hashes
+            return proof_hash in self._positions
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -350,7 +408,95 @@ class ProofMempool:
         """
         with self._lock:
             self._heap.clear()
-            self._proof_hashes.clear()
+            self._positions.clear()
+    
+    def _top(self, k: int) -> List[PendingProof]:
+        """
+        Return the k highest-priority proofs in order, without modifying the heap.
+        
+        Children of a heap node never outrank it, so the next best proof is
+        always in the frontier of nodes whose parents were already taken.
+        """
+        heap = self._heap
+        selected: List[PendingProof] = []
+        if not heap or k <= 0:
+            return selected
+        
+        frontier = [(heap[0], 0)]
+        while frontier and len(selected) < k:
+            pending, index = heapq.heappop(frontier)
+            selected.append(pending)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        
+        return selected
+    
+    def _heap_push(self, pending: PendingProof) -> None:
+        """Insert a proof in O(log n)"""
+        self._heap.append(pending)
+        index = len(self._heap) - 1
+        self._positions[pending.proof_hash] = index
+        self._sift_up(index)
+    
+    def _heap_remove(self, proof_hash: str) -> PendingProof:
+        """Remove a proof by hash in O(log n)"""
+        index = self._positions.pop(proof_hash)
+        removed = self._heap[index]
+        last = self._heap.pop()
+        
+        if index < len(self._heap):
+            # Move the last entry into the hole and restore heap order
+            self._heap[index] = last
+            self._positions[last.proof_hash] = index
+            self._sift_down(self._sift_up(index))
+        
+        return removed
+    
+    def _sift_up(self, index: int) -> int:
+        """Move an entry towards the root; returns its final index"""
+        heap = self._heap
+        positions = self._positions
+        item = heap[index]
+        
+        while index > 0:
+            parent = (index - 1) // 2
+            if not item < heap[parent]:
+                break
+            heap[index] = heap[parent]
+            positions[heap[index].proof_hash] = index
+            index = parent
+        
+        heap[index] = item
+        positions[item.proof_hash] = index
+        return index
+    
+    def _sift_down(self, index: int) -> int:
+        """Move an entry towards the leaves; returns its final index"""
+        heap = self._heap
+        positions = self._positions
+        size = len(heap)
+        item = heap[index]
+        
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < item:
+                break
+            heap[index] = heap[child]
+            positions[heap[index].proof_hash] = index
+            index = child
+        
+        heap[index] = item
+        positions[item.proof_hash] = index
+        return index
+    
+    def _reindex(self) -> None:
+        """Rebuild the hash -> position index after a bulk heap rebuild"""
+        self._positions = {p.proof_hash: i for i, p in enumerate(self._heap)}
     
     def _generate_block_id(self) -> str:
         """
@@ -25,7 +25,8 @@ It also integrates with Sovereign Identity (v2.2) to verify cryptographic
 signatures on proofs before consensus.
 
 Performance optimizations:
-- Parallel proof verification using multiprocessing
+- Parallel proof verification using multiprocessing (persistent worker
+  processes with real cancellation, see verification_pool)
 - Batch signature verification
 - Verification result caching
 """
@@ -45,6 +46,7 @@ from diotec360.consensus.data_models import (
     BlockVerificationResult,
     SignedProof,
 )
+from diotec360.consensus.verification_pool import ProofVerificationPool
 
 
 @dataclass
@@ -78,7 +80,9 @@ class ProofVerifier:
         self,
         judge: Optional[AethelJudge] = None,
         require_signatures: bool = True,
-        max_workers: int = 4
+        max_workers: int = 4,
+        process_pool: bool = False,
+        proof_timeout: Optional[float] = 10.0
     ):
         """
         Initialize ProofVerifier.
@@ -87,6 +91,10 @@ class ProofVerifier:
             judge: AethelJudge instance (creates new one if None)
             require_signatures: Whether to require valid signatures on proofs
             max_workers: Maximum number of parallel verification workers
+            process_pool: Verify blocks in persistent worker processes
+                (each with its own judge built from judge.intent_map)
+            proof_timeout: Process pool only: seconds per proof before the
+                block is rejected and the proof cancelled
         """
         self.judge = judge
         self.require_signatures = require_signatures
@@ -100,6 +108,14 @@ class ProofVerifier:
         self._verification_cache: Dict[str, VerificationResult] = {}
         self._cache_hits = 0
         self._cache_misses = 0
+        
+        self.verification_pool: Optional[ProofVerificationPool] = None
+        if process_pool:
+            self.verification_pool = ProofVerificationPool(
+                intent_map=judge.intent_map if judge is not None else None,
+                workers=max_workers,
+                proof_timeout=proof_timeout
+            )
     
     def verify_signature(self, signed_proof: SignedProof) -> bool:
         """
@@ -325,7 +341,8 @@ class ProofVerifier:
         This method verifies each proof in the block and aggregates
         the results. If any proof fails, the entire block is marked as invalid.
         
-        Performance optimization: Uses parallel verification when enabled.
+        Performance optimization: Uses parallel verification when enabled,
+        in worker processes if the verifier was built with process_pool=True.
         
         Args:
             block: ProofBlock containing proofs to verify
@@ -334,7 +351,9 @@ class ProofVerifier:
         Returns:
             BlockVerificationResult with validity and aggregated difficulty
         """
-        if parallel and len(block.proofs) > 1:
+        if parallel and len(block.proofs) > 1 and self.verification_pool is not None:
+            return self._verify_proof_block_process_pool(block)
+        elif parallel and len(block.proofs) > 1:
             return self._verify_proof_block_parallel(block)
         else:
             return self._verify_proof_block_sequential(block)
@@ -449,6 +468,59 @@ class ProofVerifier:
             failed_proof=None
         )
     
+    def _verify_proof_block_process_pool(self, block: ProofBlock) -> BlockVerificationResult:
+        """
+        Verify proofs in the persistent worker process pool.
+        
+        Signatures are checked here first (cheap, and the workers never see
+        key material); the remaining proof data is sent to the workers.
+        
+        Args:
+            block: ProofBlock containing proofs to verify
+            
+        Returns:
+            BlockVerificationResult with validity and aggregated difficulty
+        """
+        payloads = []
+        for proof in block.proofs:
+            if isinstance(proof, SignedProof):
+                if self.require_signatures and not self.verify_signature(proof):
+                    return BlockVerificationResult(
+                        valid=False,
+                        total_difficulty=0,
+                        results=[VerificationResult(
+                            valid=False,
+                            difficulty=0,
+                            verification_time=0.0,
+                            proof_hash=hashlib.sha256(
+                                json.dumps(proof.to_dict()).encode()
+                            ).hexdigest(),
+                            error="Invalid or missing signature"
+                        )],
+                        failed_proof=proof
+                    )
+                payloads.append(proof.proof_data)
+            else:
+                payloads.append(proof)
+        
+        result = self.verification_pool.verify_block(payloads)
+        if result.failed_proof is not None:
+            failed_index = next(
+                i for i, payload in enumerate(payloads) if payload is result.failed_proof
+            )
+            result.failed_proof = block.proofs[failed_index]
+        
+        # Keep get_stats() in step with the in-process paths
+        self._verification_count += len(result.results)
+        self._total_difficulty += result.total_difficulty
+        
+        return result
+    
+    def shutdown(self) -> None:
+        """Stop the verification worker processes (if any)"""
+        if self.verification_pool is not None:
+            self.verification_pool.shutdown()
+    
     def batch_verify_signatures(self, signed_proofs: List[SignedProof]) -> Dict[str, bool]:
         """
         Verify signatures for multiple proofs in batch.
@@ -0,0 +1,589 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Segmented Binary Write-Ahead Log
+
+The JSON-lines WAL is re-read and re-parsed in full on every recovery,
+truncation and compaction, and truncate_committed rewrites the whole file.
+SegmentedWriteAheadLog keeps the WriteAheadLog interface on a binary,
+segmented layout:
+
+- Records are framed as [length u32][checksum u32][lsn u64][type u8][body]
+  and numbered by a log sequence number (LSN)
+- Segment files (wal_<first lsn>.seg) roll over at segment_size bytes
+- CHECKPOINT stores the LSN up to which every transaction is resolved;
+  recovery only scans segments after it
+- truncate_committed() re-logs pending PREPAREs, advances the checkpoint
+  and unlinks whole segments instead of rewriting the log
+
+Checksums are CRC32C when the optional crc32c package is installed and
+zlib's CRC-32 otherwise; the algorithm is recorded in each segment header
+so either build reads both. A torn record at the end of the newest
+segment is truncated on open; a bad record anywhere else fails closed
+with StateCorruptionPanic.
+
+An existing JSON-lines wal.log in the same directory is converted on open
+and kept as wal.log.converted.
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from diotec360.consensus.atomic_commit import WALEntry, WriteAheadLog
+from diotec360.core.integrity_panic import StateCorruptionPanic
+
+try:
+    import crc32c as _crc32c
+except ImportError:
+    _crc32c = None
+
+
+# Checksum algorithm ids stored in segment headers
+CHECKSUM_CRC32C = 1
+CHECKSUM_CRC32 = 2
+
+# Record types
+RECORD_PREPARE = 1
+RECORD_COMMIT = 2
+
+_HEADER = struct.Struct("<4sBBHQ")   # magic, version, checksum, reserved, base lsn
+_FRAME = struct.Struct("<II")        # payload length, checksum
+_RECORD = struct.Struct("<QB")       # lsn, record type
+
+
+def _make_crc32c_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _make_crc32c_table()
+
+
+def crc32c(data: bytes) -> int:
+    """
+    CRC32C (Castagnoli) of data.
+
+    Uses the crc32c package when available, else a table-driven fallback.
+    """
+    if _crc32c is not None:
+        return _crc32c.crc32c(data)
+
+    crc = 0xFFFFFFFF
+    table = _CRC32C_TABLE
+    for byte in data:
+        crc = table[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+
+def _checksum(algorithm: int, data: bytes) -> int:
+    if algorithm == CHECKSUM_CRC32C:
+        return crc32c(data)
+    if algorithm == CHECKSUM_CRC32:
+        return zlib.crc32(data)
+    raise ValueError(f"Unknown WAL checksum algorithm: {algorithm}")
+
+
+class SegmentedWriteAheadLog(WriteAheadLog):
+    """
+    WriteAheadLog on checksummed binary segments with an LSN checkpoint.
+
+    Drop-in replacement for WriteAheadLog: the same append / mark /
+    query / truncate methods, but recovery cost is proportional to the
+    log written since the last truncate_committed(), not to its history.
+    """
+
+    SEGMENT_MAGIC = b"AWAL"
+    FORMAT_VERSION = 1
+    CHECKPOINT_NAME = "CHECKPOINT"
+    LEGACY_WAL_NAME = "wal.log"
+
+    def __init__(
+        self,
+        wal_dir: Path,
+        segment_size: int = 4 * 1024 * 1024,
+        checksum: Optional[int] = None
+    ):
+        """
+        Open (or create) a segmented WAL.
+
+        Args:
+            wal_dir: Directory for WAL segments
+            segment_size: Roll over to a new segment beyond this many bytes
+            checksum: CHECKSUM_CRC32C or CHECKSUM_CRC32 for new segments
+                (default: CRC32C if the crc32c package is installed)
+        """
+        self.wal_dir = Path(wal_dir)
+        self.wal_dir.mkdir(parents=True, exist_ok=True)
+
+        if checksum is None:
+            checksum = CHECKSUM_CRC32C if _crc32c is not None else CHECKSUM_CRC32
+        _checksum(checksum, b"")  # Reject unknown algorithms early
+
+        self.segment_size = segment_size
+        self.checksum = checksum
+        self.checkpoint_file = self.wal_dir / self.CHECKPOINT_NAME
+
+        self._lock = threading.RLock()
+        self._file = None
+
+        self.checkpoint_lsn = self._read_checkpoint()
+        self._segments: List[Tuple[int, Path]] = self._list_segments()
+        self._remove_checkpointed_segments()
+        self._open_tail()
+
+        self.converted_entries = 0
+        legacy_file = self.wal_dir / self.LEGACY_WAL_NAME
+        if legacy_file.exists():
+            self.converted_entries = self._convert_legacy(legacy_file)
+
+    def append_entry(self, tx_id: str, changes: Dict[str, Any]) -> WALEntry:
+        """
+        Append a PREPARE record and fsync.
+
+        Args:
+            tx_id: Transaction ID
+            changes: State changes to log
+
+        Returns:
+            WALEntry object (entry_offset holds its LSN)
+
+        Raises:
+            OSError: If disk is full (ENOSPC) or other I/O error occurs
+        """
+        entry = WALEntry(
+            tx_id=tx_id,
+            changes=changes,
+            timestamp=time.time(),
+            committed=False
+        )
+        entry.entry_offset = self._append([self._prepare_record(entry)])
+        return entry
+
+    def mark_committed(self, entry: WALEntry) -> None:
+        """
+        Append a COMMIT record and fsync.
+
+        Args:
+            entry: WAL entry to mark as committed
+        """
+        self._append([self._commit_record(entry.tx_id, time.time())])
+        entry.committed = True
+
+    def append_committed_entry(self, tx_id: str, changes: Dict[str, Any]) -> WALEntry:
+        """
+        Append PREPARE and COMMIT records with one fsync.
+
+        Args:
+            tx_id: Transaction ID
+            changes: State changes to log
+
+        Returns:
+            Committed WALEntry object
+
+        Raises:
+            OSError: If disk is full (ENOSPC) or other I/O error occurs
+        """
+        entry = WALEntry(
+            tx_id=tx_id,
+            changes=changes,
+            timestamp=time.time(),
+            committed=True
+        )
+        entry.entry_offset = self._append([
+            self._prepare_record(entry),
+            self._commit_record(entry.tx_id, entry.timestamp)
+        ])
+        return entry
+
+    def truncate_committed(self) -> None:
+        """
+        Drop committed entries by advancing the checkpoint LSN.
+
+        Still-pending PREPAREs are re-logged in a fresh segment, so every
+        older segment can be unlinked without rewriting anything.
+        """
+        with self._lock:
+            if self._next_lsn - 1 <= self.checkpoint_lsn:
+                return
+
+            self._rewrite_wal([e for e in self._read_all_entries() if not e.committed])
+
+    def compact_wal(self) -> int:
+        """
+        Unlink segments that lie entirely before the checkpoint.
+
+        truncate_committed() already does this; compact_wal() only finishes
+        work left behind by a crash between the two steps.
+
+        Returns:
+            Number of records removed
+        """
+        with self._lock:
+            return self._remove_checkpointed_segments()
+
+    def shutdown(self) -> None:
+        """Close the active segment"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _read_all_entries(self) -> List[WALEntry]:
+        """
+        Read entries logged after the checkpoint.
+
+        A re-logged PREPARE replaces the original for the same tx_id.
+        """
+        with self._lock:
+            entries: Dict[str, WALEntry] = {}
+            committed = set()
+
+            for index, (base_lsn, path) in enumerate(self._segments):
+                next_base = (
+                    self._segments[index + 1][0]
+                    if index + 1 < len(self._segments) else None
+                )
+                if next_base is not None and next_base <= self.checkpoint_lsn + 1:
+                    continue
+
+                records, _ = self._scan_segment(path)
+                for lsn, record_type, body in records:
+                    if lsn <= self.checkpoint_lsn:
+                        continue
+
+                    data = json.loads(body)
+                    if record_type == RECORD_PREPARE:
+                        entry = WALEntry(
+                            tx_id=data['tx_id'],
+                            changes=data['changes'],
+                            timestamp=data['timestamp'],
+                            committed=False
+                        )
+                        entry.entry_offset = lsn
+                        entries[entry.tx_id] = entry
+                    elif record_type == RECORD_COMMIT:
+                        committed.add(data['tx_id'])
+
+            for entry in entries.values():
+                if entry.tx_id in committed:
+                    entry.committed = True
+
+            return list(entries.values())
+
+    def _rewrite_wal(self, entries: List[WALEntry]) -> None:
+        """
+        Replace the log contents with exactly `entries`.
+
+        The entries are re-logged in a fresh segment and the checkpoint
+        moves to the LSN just before them, so every older segment is
+        unlinked. No segment is rewritten in place: until the checkpoint is
+        written the old records stay authoritative.
+        """
+        with self._lock:
+            boundary = self._next_lsn - 1
+
+            if self._file.tell() > _HEADER.size:
+                self._roll_segment()
+            records = [record for entry in entries for record in self._entry_records(entry)]
+            if records:
+                self._append(records)
+
+            self._write_checkpoint(boundary)
+            self._remove_checkpointed_segments()
+
+    def _entry_records(self, entry: WALEntry) -> List[Tuple[int, bytes]]:
+        """PREPARE record of an entry, followed by COMMIT if committed"""
+        records = [self._prepare_record(entry)]
+        if entry.committed:
+            records.append(self._commit_record(entry.tx_id, entry.timestamp))
+        return records
+
+    @staticmethod
+    def _prepare_record(entry: WALEntry) -> Tuple[int, bytes]:
+        return RECORD_PREPARE, json.dumps({
+            'tx_id': entry.tx_id,
+            'changes': entry.changes,
+            'timestamp': entry.timestamp
+        }).encode('utf-8')
+
+    @staticmethod
+    def _commit_record(tx_id: str, timestamp: float) -> Tuple[int, bytes]:
+        return RECORD_COMMIT, json.dumps({
+            'tx_id': tx_id,
+            'timestamp': timestamp
+        }).encode('utf-8')
+
+    def _append(self, records: List[Tuple[int, bytes]]) -> int:
+        """
+        Frame, write and fsync records as one write.
+
+        Returns:
+            LSN of the first record
+        """
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("WAL has been shut down")
+
+            first_lsn = self._next_lsn
+            frames = []
+            for offset, (record_type, body) in enumerate(records):
+                payload = _RECORD.pack(first_lsn + offset, record_type) + body
+                frames.append(_FRAME.pack(len(payload), _checksum(self._active_checksum, payload)))
+                frames.append(payload)
+
+            start = self._file.tell()
+            try:
+                self._file.write(b"".join(frames))
+                os.fsync(self._file.fileno())  # Ensure durability
+            except OSError as e:
+                # Never leave a partial frame in front of later records
+                try:
+                    os.ftruncate(self._file.fileno(), start)
+                    self._file.seek(start)
+                except OSError:
+                    pass
+                if e.errno == 28:  # ENOSPC - No space left on device
+                    raise OSError(f"Disk full: Cannot write to WAL file {self.wal_file}") from e
+                else:
+                    raise OSError(f"I/O error writing to WAL: {e}") from e
+
+            self._next_lsn = first_lsn + len(records)
+            if self._file.tell() >= self.segment_size:
+                self._roll_segment()
+
+            return first_lsn
+
+    def _segment_path(self, base_lsn: int) -> Path:
+        return self.wal_dir / f"wal_{base_lsn:020d}.seg"
+
+    def _list_segments(self) -> List[Tuple[int, Path]]:
+        segments = []
+        for path in self.wal_dir.glob("wal_*.seg"):
+            try:
+                segments.append((int(path.stem[4:]), path))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _open_tail(self) -> None:
+        """Open the newest segment for appends, repairing a torn tail"""
+        self._next_lsn = self.checkpoint_lsn + 1
+
+        if self._segments:
+            base_lsn, path = self._segments[-1]
+            if path.stat().st_size < _HEADER.size:
+                # Crashed while creating the segment
+                path.unlink()
+                self._segments.pop()
+
+        if not self._segments:
+            self._create_segment(self._next_lsn)
+            return
+
+        base_lsn, path = self._segments[-1]
+        records, valid_end = self._scan_segment(path, repair=True)
+        if path.stat().st_size > valid_end:
+            print(f"[WAL] Truncating torn tail of {path.name} at offset {valid_end}")
+            with open(path, 'r+b') as f:
+                f.truncate(valid_end)
+                f.flush()
+                os.fsync(f.fileno())
+
+        last_lsn = records[-1][0] if records else base_lsn - 1
+        self._next_lsn = max(self._next_lsn, last_lsn + 1)
+
+        self._active_checksum = self._read_header(path)[1]
+        self.wal_file = path
+        self._file = open(path, 'ab', buffering=0)
+
+    def _create_segment(self, base_lsn: int) -> None:
+        path = self._segment_path(base_lsn)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(self.SEGMENT_MAGIC, self.FORMAT_VERSION, self.checksum, 0, base_lsn))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._segments.append((base_lsn, path))
+        self._active_checksum = self.checksum
+        self.wal_file = path
+        self._file = open(path, 'ab', buffering=0)
+
+    def _roll_segment(self) -> None:
+        self._file.close()
+        self._create_segment(self._next_lsn)
+
+    def _read_header(self, path: Path) -> Tuple[int, int]:
+        """
+        Returns:
+            (base LSN, checksum algorithm)
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+
+        try:
+            magic, version, checksum, _, base_lsn = _HEADER.unpack(header)
+        except struct.error:
+            magic, version = None, None
+
+        if magic != self.SEGMENT_MAGIC or version != self.FORMAT_VERSION:
+            raise StateCorruptionPanic(
+                violation_type="STATE_FILE_CORRUPTED",
+                details={
+                    "path": str(path),
+                    "error": "Invalid WAL segment header",
+                    "error_type": "SegmentHeaderError"
+                }
+            )
+        return base_lsn, checksum
+
+    def _scan_segment(self, path: Path, repair: bool = False) -> Tuple[List[Tuple[int, int, bytes]], int]:
+        """
+        Decode and verify every record in a segment.
+
+        Args:
+            path: Segment file
+            repair: Stop at the first bad record instead of failing closed
+                (torn tail of the newest segment)
+
+        Returns:
+            (records as (lsn, type, body), offset just past the last good record)
+        """
+        _, checksum = self._read_header(path)
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        records = []
+        offset = _HEADER.size
+        while offset < len(data):
+            error = None
+            if offset + _FRAME.size > len(data):
+                error = "truncated frame header"
+            else:
+                length, expected = _FRAME.unpack_from(data, offset)
+                start = offset + _FRAME.size
+                payload = data[start:start + length]
+                if length < _RECORD.size or len(payload) < length:
+                    error = "truncated record"
+                elif _checksum(checksum, payload) != expected:
+                    error = "checksum mismatch"
+
+            if error is not None:
+                if repair:
+                    break
+                raise StateCorruptionPanic(
+                    violation_type="STATE_FILE_CORRUPTED",
+                    details={
+                        "path": str(path),
+                        "offset": offset,
+                        "error": error,
+                        "error_type": "WALRecordError"
+                    }
+                )
+
+            lsn, record_type = _RECORD.unpack_from(payload)
+            records.append((lsn, record_type, payload[_RECORD.size:]))
+            offset = start + length
+
+        return records, offset
+
+    def _read_checkpoint(self) -> int:
+        if not self.checkpoint_file.exists():
+            return 0
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                return int(json.load(f)['checkpoint_lsn'])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            raise StateCorruptionPanic(
+                violation_type="STATE_FILE_CORRUPTED",
+                details={
+                    "path": str(self.checkpoint_file),
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                }
+            )
+
+    def _write_checkpoint(self, lsn: int) -> None:
+        """Atomically record the checkpoint LSN"""
+        temp_file = self.wal_dir / f"{self.CHECKPOINT_NAME}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump({'checkpoint_lsn': lsn}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.checkpoint_file)
+        self.checkpoint_lsn = lsn
+
+    def _remove_checkpointed_segments(self) -> int:
+        """
+        Unlink segments whose records all precede the checkpoint.
+
+        Returns:
+            Number of records removed (LSNs are contiguous across segments)
+        """
+        removed = 0
+        while len(self._segments) > 1 and self._segments[1][0] <= self.checkpoint_lsn + 1:
+            base_lsn, path = self._segments.pop(0)
+            removed += self._segments[0][0] - base_lsn
+            path.unlink()
+        return removed
+
+    def _convert_legacy(self, legacy_file: Path) -> int:
+        """
+        Import a JSON-lines WAL and keep it as wal.log.converted.
+
+        Safe to repeat after a crash mid-conversion: re-imported entries
+        replace earlier copies with the same tx_id.
+
+        Returns:
+            Number of entries converted
+        """
+        entries = WriteAheadLog(self.wal_dir)._read_all_entries()
+
+        records = [record for entry in entries for record in self._entry_records(entry)]
+        if records:
+            self._append(records)
+
+        legacy_file.replace(legacy_file.with_name(legacy_file.name + ".converted"))
+        print(f"[WAL] Converted {len(entries)} entries from {legacy_file.name}")
+        return len(entries)
+
+
+def convert_json_wal(wal_dir: Path, **kwargs) -> int:
+    """
+    Convert a JSON-lines WAL directory to the segmented format.
+
+    Args:
+        wal_dir: Directory holding wal.log
+        **kwargs: Passed to SegmentedWriteAheadLog
+
+    Returns:
+        Number of entries converted
+    """
+    wal = SegmentedWriteAheadLog(wal_dir, **kwargs)
+    wal.shutdown()
+    return wal.converted_entries
@@ -0,0 +1,333 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Process-pool proof verification for ProofVerifier.verify_proof_block.
+
+Thread-pool verification is bound by the GIL for everything the judge does
+around Z3, and a cancelled future keeps running once it has started.
+ProofVerificationPool keeps a set of long-lived worker processes instead:
+
+- Each worker builds one ProofVerifier/AethelJudge (and its Z3 context) at
+  start-up and reuses it for every proof it is sent
+- Proofs cross the process boundary as JSON
+- On the first invalid proof, crash or per-proof timeout the workers still
+  busy with that block are killed and replaced, so cancellation is real
+- Replacement workers warm up in the background while the caller continues
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import multiprocessing
+from collections import deque
+from dataclasses import asdict
+from multiprocessing.connection import wait
+from typing import Optional, Dict, Any, List
+
+from diotec360.consensus.data_models import VerificationResult, BlockVerificationResult
+
+
+def _worker_main(conn, intent_map: Optional[Dict[str, Any]]) -> None:
+    """
+    Worker process: build a verifier once, then verify JSON proofs until told to stop.
+
+    Messages in:  (task_id, proof_json) or None to exit
+    Messages out: ("ready", None) once, then (task_id, VerificationResult fields)
+    """
+    # The judge reports every layer on stdout; keep the parent's output clean
+    sys.stdout = open(os.devnull, "w")
+
+    from diotec360.consensus.proof_verifier import ProofVerifier
+    from diotec360.core.judge import AethelJudge
+
+    judge = AethelJudge(intent_map) if intent_map is not None else None
+    # Signatures are checked by the parent before proofs are dispatched
+    verifier = ProofVerifier(judge=judge, require_signatures=False)
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        task_id, proof_json = message
+        result = verifier.verify_proof(json.loads(proof_json))
+        conn.send((task_id, asdict(result)))
+
+
+class _Worker:
+    """Parent-side handle of one worker process"""
+
+    __slots__ = ("process", "conn", "ready", "task", "deadline")
+
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.task: Optional[int] = None
+        self.deadline: Optional[float] = None
+
+
+class ProofVerificationPool:
+    """
+    Persistent pool of verification worker processes.
+
+    One block is verified at a time (blocks are verified one after another
+    by consensus); its proofs are spread over all workers.
+    """
+
+    def __init__(
+        self,
+        intent_map: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None,
+        proof_timeout: Optional[float] = 10.0,
+        start_method: str = "spawn"
+    ):
+        """
+        Initialize the pool. Workers start on first use or on start().
+
+        Args:
+            intent_map: Intent specifications for the workers' AethelJudge
+                (None: only dict proofs can be verified, as with judge=None)
+            workers: Number of worker processes (default: CPU count)
+            proof_timeout: Seconds a single proof may take before it is
+                cancelled and the block rejected (None: no limit)
+            start_method: multiprocessing start method for workers
+        """
+        self.intent_map = intent_map
+        self.workers = workers or os.cpu_count() or 1
+        self.proof_timeout = proof_timeout
+        self._context = multiprocessing.get_context(start_method)
+
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._next_task = 0
+
+        # Statistics
+        self._blocks_verified = 0
+        self._proofs_verified = 0
+        self._proofs_cancelled = 0
+        self._timeouts = 0
+        self._worker_restarts = 0
+
+    def start(self) -> None:
+        """Start any missing workers (they warm up in the background)"""
+        with self._lock:
+            self._ensure_workers()
+
+    def verify_block(
+        self,
+        proofs: List[Any],
+        proof_timeout: Optional[float] = None
+    ) -> BlockVerificationResult:
+        """
+        Verify a block's proofs across the worker processes.
+
+        Args:
+            proofs: Proofs in JSON-serializable form (intent names or dicts)
+            proof_timeout: Override of the pool's per-proof timeout
+
+        Returns:
+            BlockVerificationResult; results are in completion order and
+            stop at the first failure, like the thread-pool path
+        """
+        timeout = self.proof_timeout if proof_timeout is None else proof_timeout
+        payloads = deque((index, json.dumps(proof)) for index, proof in enumerate(proofs))
+
+        results: List[VerificationResult] = []
+
+        with self._lock:
+            self._ensure_workers()
+            self._blocks_verified += 1
+
+            while payloads or any(w.task is not None for w in self._workers):
+                self._dispatch(payloads, timeout)
+
+                failed_index = self._collect(results)
+                if failed_index is None:
+                    failed_index = self._expire(results)
+
+                if failed_index is not None:
+                    self._cancel_running()
+                    self._proofs_cancelled += len(payloads)
+                    return BlockVerificationResult(
+                        valid=False,
+                        total_difficulty=sum(r.difficulty for r in results if r.valid),
+                        results=results,
+                        failed_proof=proofs[failed_index]
+                    )
+
+        return BlockVerificationResult(
+            valid=True,
+            total_difficulty=sum(r.difficulty for r in results),
+            results=results,
+            failed_proof=None
+        )
+
+    def shutdown(self) -> None:
+        """Stop all worker processes"""
+        with self._lock:
+            for worker in self._workers:
+                try:
+                    worker.conn.send(None)
+                except (OSError, ValueError):
+                    pass
+            for worker in self._workers:
+                worker.process.join(timeout=2)
+                if worker.process.is_alive():
+                    worker.process.kill()
+                    worker.process.join()
+                worker.conn.close()
+            self._workers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with worker, block, cancellation and timeout counts
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'workers_ready': sum(1 for w in self._workers if w.ready),
+                'blocks_verified': self._blocks_verified,
+                'proofs_verified': self._proofs_verified,
+                'proofs_cancelled': self._proofs_cancelled,
+                'timeouts': self._timeouts,
+                'worker_restarts': self._worker_restarts,
+            }
+
+    def _ensure_workers(self) -> None:
+        while len(self._workers) < self.workers:
+            self._workers.append(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.intent_map),
+            name="proof_verifier",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a worker (cancelling whatever it runs) and start a fresh one"""
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self._workers[self._workers.index(worker)] = self._spawn()
+        self._worker_restarts += 1
+
+    def _dispatch(self, payloads: deque, timeout: Optional[float]) -> None:
+        for worker in self._workers:
+            if not payloads:
+                return
+            if worker.ready and worker.task is None:
+                index, payload = payloads.popleft()
+                self._next_task += 1
+                worker.conn.send((self._next_task, payload))
+                worker.task = index
+                worker.deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def _collect(self, results: List[VerificationResult]) -> Optional[int]:
+        """
+        Wait for worker messages until the nearest deadline.
+
+        Returns:
+            Index of the first failed proof, or None
+        """
+        deadlines = [w.deadline for w in self._workers if w.deadline is not None]
+        wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+        by_conn = {w.conn: w for w in self._workers}
+        for conn in wait(list(by_conn), wait_for):
+            worker = by_conn[conn]
+            try:
+                task_id, payload = conn.recv()
+            except (EOFError, OSError):
+                if not worker.ready:
+                    raise RuntimeError(
+                        f"Proof verification worker exited during start-up "
+                        f"(exit code {worker.process.exitcode})"
+                    )
+                failed = worker.task
+                if failed is not None:
+                    results.append(VerificationResult(
+                        valid=False,
+                        difficulty=0,
+                        verification_time=0.0,
+                        proof_hash="",
+                        error="Verification worker crashed"
+                    ))
+                self._replace(worker)
+                if failed is not None:
+                    return failed
+                continue
+
+            if task_id == "ready":
+                worker.ready = True
+                continue
+
+            index = worker.task
+            worker.task = None
+            worker.deadline = None
+            result = VerificationResult(**payload)
+            results.append(result)
+            self._proofs_verified += 1
+
+            if not result.valid:
+                return index
+
+        return None
+
+    def _expire(self, results: List[VerificationResult]) -> Optional[int]:
+        """
+        Cancel proofs that ran past their deadline.
+
+        Returns:
+            Index of the first timed-out proof, or None
+        """
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.deadline is not None and worker.deadline <= now:
+                index = worker.task
+                results.append(VerificationResult(
+                    valid=False,
+                    difficulty=0,
+                    verification_time=0.0,
+                    proof_hash="",
+                    error="Verification timed out"
+                ))
+                self._timeouts += 1
+                self._replace(worker)
+                return index
+        return None
+
+    def _cancel_running(self) -> None:
+        for worker in list(self._workers):
+            if worker.task is not None:
+                self._proofs_cancelled += 1
+                self._replace(worker)
@@ -28,6 +28,7 @@ Date: February 4, 2026
 """
 
 from typing import List, Dict, Optional, Any
+import os
 import time
 import copy
 
@@ -44,6 +45,7 @@ from diotec360.core.synchrony import (
 from diotec360.core.dependency_analyzer import DependencyAnalyzer
 from diotec360.core.conflict_detector import ConflictDetector
 from diotec360.core.parallel_executor import ParallelExecutor
+from diotec360.core.speculative_executor import SpeculativeExecutor
 from diotec360.core.linearizability_prover import LinearizabilityProver
 from diotec360.core.conservation_validator import ConservationValidator
 from diotec360.core.commit_manager import CommitManager
@@ -64,6 +66,8 @@ class BatchProcessor:
     - Fallback: If parallel fails, fall back to serial execution
     - Atomicity: All transactions commit or all rollback
     - Verification: Formal proofs before commit
+    - Speculative mode: optionally replace stages 1-3 with optimistic
+      execution against a multi-version store (SpeculativeExecutor)
     
     Pipeline Stages:
     1. Dependency Analysis - Build DAG of transaction dependencies
@@ -77,17 +81,26 @@ class BatchProcessor:
         Requirements 1.1, 2.1, 2.2, 3.1-3.4, 4.1-4.2, 7.1-7.5, 9.1-9.5
     """
     
-    def __init__(self, num_threads: int = 8, timeout_seconds: float = 300.0):
+    def __init__(self, num_threads: int = 8, timeout_seconds: float = 300.0,
+                 speculative: bool = None):
         """
         Initialize batch processor.
         
         Args:
             num_threads: Number of threads for parallel execution (default 8)
             timeout_seconds: Timeout for batch execution (default 300s = 5 minutes)
+            speculative: Execute optimistically and re-execute only conflicting
+                transactions instead of levelling the dependency graph
+                (default: read from AETHEL_SPECULATIVE_BATCH env var)
         """
         self.num_threads = num_threads
         self.timeout_seconds = timeout_seconds
         
+        if speculative is None:
+            # Default: False for backward compatibility
+            speculative = os.environ.get('AETHEL_SPECULATIVE_BATCH', 'false').lower() == 'true'
+        self.speculative = speculative
+        
         # Initialize components
         self.dependency_analyzer = DependencyAnalyzer()
         self.conflict_detector = ConflictDetector()
@@ -95,6 +108,10 @@ class BatchProcessor:
         self.linearizability_prover = LinearizabilityProver()
         self.conservation_validator = ConservationValidator()
         self.commit_manager = CommitManager()
+        self.speculative_executor = SpeculativeExecutor(
+            thread_count=num_threads,
+            timeout_seconds=timeout_seconds
+        ) if speculative else None
     
     def execute_batch(self, transactions: List[Transaction]) -> BatchResult:
         """
@@ -130,36 +147,48 @@ class BatchProcessor:
         initial_states = self._capture_initial_states(transactions)
         
         try:
-            # ============================================================
-            # STAGE 1: Dependency Analysis
-            # ============================================================
-            dependency_graph = self.dependency_analyzer.analyze(transactions)
-            
-            # Check for circular dependencies
-            if dependency_graph.has_cycle():
-                cycle = dependency_graph.find_cycle()
-                raise CircularDependencyError(cycle)
-            
-            # ============================================================
-            # STAGE 2: Conflict Detection
-            # ============================================================
-            conflicts = self.conflict_detector.detect_conflicts(
-                transactions,
-                dependency_graph
-            )
-            
-            # Resolve conflicts deterministically
-            resolution_strategy = self.conflict_detector.resolve_conflicts(conflicts)
-            
-            # ============================================================
-            # STAGE 3: Parallel Execution
-            # ============================================================
-            execution_result = self.parallel_executor.execute_parallel(
-                transactions,
-                dependency_graph,
-                initial_states
-            )
-            
+            if self.speculative:
+                # ============================================================
+                # STAGES 1-3: Speculative Execution
+                # ============================================================
+                # Conflicts are found from the versions actually read, and
+                # only conflicting transactions are re-executed, in batch order
+                conflicts = []
+                execution_result = self.speculative_executor.execute(
+                    transactions,
+                    initial_states
+                )
+            else:
+                # ============================================================
+                # STAGE 1: Dependency Analysis
+                # ============================================================
+                dependency_graph = self.dependency_analyzer.analyze(transactions)
+                
+                # Check for circular dependencies
+                if dependency_graph.has_cycle():
+                    cycle = dependency_graph.find_cycle()
+                    raise CircularDependencyError(cycle)
+                
+                # ============================================================
+                # STAGE 2: Conflict Detection
+                # ============================================================
+                conflicts = self.conflict_detector.detect_conflicts(
+                    transactions,
+                    dependency_graph
+                )
+                
+                # Resolve conflicts deterministically
+                resolution_strategy = self.conflict_detector.resolve_conflicts(conflicts)
+                
+                # ============================================================
+                # STAGE 3: Parallel Execution
+                # ============================================================
+                execution_result = self.parallel_executor.execute_parallel(
+                    transactions,
+                    dependency_graph,
+                    initial_states
+                )
+                
             # ============================================================
             # STAGE 4: Linearizability Proof
             # ============================================================
@@ -209,6 +238,8 @@ class BatchProcessor:
             
             # Add conflicts to result
             result.conflicts_detected = conflicts
+            if self.speculative and result.success:
+                result.diagnostic_info = {"speculative": self.speculative_executor.get_stats()}
             
             # Calculate final metrics
             total_time = time.time() - start_time
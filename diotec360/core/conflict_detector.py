@@ -38,6 +38,18 @@ from diotec360.core.synchrony import (
     DependencyGraph,
     ConflictResolutionError
 )
+from diotec360.core.dependency_analyzer import build_resource_index
+
+
+# Conflicts of a pair (Ti, Tj), i < j, in reporting order: (type, reversed).
+# Reversed conflicts are reported as Tj → Ti.
+_PAIR_CONFLICT_KINDS = (
+    (ConflictType.RAW, False),  # Ti writes X, Tj reads X
+    (ConflictType.WAW, False),  # Ti writes X, Tj writes X
+    (ConflictType.WAR, False),  # Ti reads X, Tj writes X
+    (ConflictType.RAW, True),   # Tj writes X, Ti reads X
+    (ConflictType.WAR, True),   # Tj reads X, Ti writes X
+)
 
 
 @dataclass
@@ -85,13 +97,18 @@ class ConflictDetector:
         Detect all conflicts between transactions.
         
         Algorithm:
-        1. For each pair of transactions (Ti, Tj):
-           a. Get read and write sets for both
-           b. Check for RAW: Ti writes ∩ Tj reads
-           c. Check for WAW: Ti writes ∩ Tj writes
-           d. Check for WAR: Ti reads ∩ Tj writes
-        2. Create Conflict objects for each detected conflict
-        3. Return complete list of conflicts
+        1. Index every resource to its readers and writers (batch order)
+        2. For each resource, pair each writer with the other readers and
+           writers of that resource:
+           a. RAW: Ti writes ∩ Tj reads
+           b. WAW: Ti writes ∩ Tj writes
+           c. WAR: Ti reads ∩ Tj writes
+        3. Create Conflict objects for each detected conflict, pair by pair
+           in batch order (as a pairwise scan would report them)
+        4. Return complete list of conflicts
+        
+        Cost is O(accesses + conflicts) rather than one set intersection per
+        pair of transactions.
         
         Args:
             transactions: List of transactions to analyze
@@ -103,74 +120,46 @@ class ConflictDetector:
         Validates:
             Requirements 5.1, 5.2, 5.3, 5.5
         """
-        conflicts = []
+        index = build_resource_index(
+            (tx.get_read_set(), tx.get_write_set()) for tx in transactions
+        )
         
-        # Create transaction lookup map
-        tx_map = {tx.id: tx for tx in transactions}
+        # (i, j), i < j -> resources per _PAIR_CONFLICT_KINDS entry
+        pair_resources: Dict[Tuple[int, int], Tuple[List[str], ...]] = {}
         
-        # Check each pair of transactions
-        for i, tx1 in enumerate(transactions):
-            for tx2 in transactions[i+1:]:
-                # Get read and write sets
-                tx1_reads = tx1.get_read_set()
-                tx1_writes = tx1.get_write_set()
-                tx2_reads = tx2.get_read_set()
-                tx2_writes = tx2.get_write_set()
-                
-                # Detect RAW conflicts: T1 writes X, T2 reads X
-                raw_resources = tx1_writes & tx2_reads
-                for resource in raw_resources:
-                    conflicts.append(Conflict(
-                        type=ConflictType.RAW,
-                        transaction_1=tx1.id,
-                        transaction_2=tx2.id,
-                        resource=resource,
-                        resolution="enforce_order"
-                    ))
-                
-                # Detect WAW conflicts: T1 writes X, T2 writes X
-                waw_resources = tx1_writes & tx2_writes
-                for resource in waw_resources:
-                    conflicts.append(Conflict(
-                        type=ConflictType.WAW,
-                        transaction_1=tx1.id,
-                        transaction_2=tx2.id,
-                        resource=resource,
-                        resolution="enforce_order"
-                    ))
-                
-                # Detect WAR conflicts: T1 reads X, T2 writes X
-                war_resources = tx1_reads & tx2_writes
-                for resource in war_resources:
-                    conflicts.append(Conflict(
-                        type=ConflictType.WAR,
-                        transaction_1=tx1.id,
-                        transaction_2=tx2.id,
-                        resource=resource,
-                        resolution="enforce_order"
-                    ))
-                
-                # Also check reverse direction (T2 before T1)
-                # Detect RAW conflicts: T2 writes X, T1 reads X
-                raw_resources_rev = tx2_writes & tx1_reads
-                for resource in raw_resources_rev:
-                    conflicts.append(Conflict(
-                        type=ConflictType.RAW,
-                        transaction_1=tx2.id,
-                        transaction_2=tx1.id,
-                        resource=resource,
-                        resolution="enforce_order"
-                    ))
-                
-                # WAW is symmetric, already covered above
-                
-                # Detect WAR conflicts: T2 reads X, T1 writes X
-                war_resources_rev = tx2_reads & tx1_writes
-                for resource in war_resources_rev:
+        def resources_of(i: int, j: int) -> Tuple[List[str], ...]:
+            groups = pair_resources.get((i, j))
+            if groups is None:
+                groups = pair_resources[(i, j)] = ([], [], [], [], [])
+            return groups
+        
+        for resource, (readers, writers) in index.items():
+            for writer in writers:
+                for reader in readers:
+                    if writer < reader:
+                        groups = resources_of(writer, reader)
+                        groups[0].append(resource)  # RAW Ti → Tj
+                        groups[4].append(resource)  # WAR Tj → Ti
+                    elif reader < writer:
+                        groups = resources_of(reader, writer)
+                        groups[2].append(resource)  # WAR Ti → Tj
+                        groups[3].append(resource)  # RAW Tj → Ti
+                for other in writers:
+                    if writer < other:
+                        resources_of(writer, other)[1].append(resource)  # WAW
+        
+        conflicts = []
+        for i, j in sorted(pair_resources):
+            tx1_id = transactions[i].id
+            tx2_id = transactions[j].id
+            kinds = zip(_PAIR_CONFLICT_KINDS, pair_resources[(i, j)])
+            for (conflict_type, reversed_pair), resources in kinds:
+                first, second = (tx2_id, tx1_id) if reversed_pair else (tx1_id, tx2_id)
+                for resource in resources:
                     conflicts.append(Conflict(
-                        type=ConflictType.WAR,
-                        transaction_1=tx2.id,
-                        transaction_2=tx1.id,
+                        type=conflict_type,
+                        transaction_1=first,
+                        transaction_2=second,
                         resource=resource,
                         resolution="enforce_order"
                     ))
@@ -20,12 +20,16 @@ Aethel Dependency Analyzer - Synchrony Protocol v1.8.0
 Analyzes transaction dependencies and builds a directed acyclic graph (DAG).
 Detects RAW, WAW, and WAR dependencies between transactions.
 
+Dependencies are found through an inverted index from each resource to the
+transactions that read and write it, so analysis costs O(accesses + edges)
+instead of intersecting the read/write sets of every pair of transactions.
+
 Author: Aethel Team
 Version: 1.8.0
 Date: February 4, 2026
 """
 
-from typing import List, Set, Tuple, Dict
+from typing import Iterable, List, Set, Tuple, Dict
 from diotec360.core.synchrony import (
     Transaction,
     ConflictType,
@@ -34,6 +38,28 @@ from diotec360.core.synchrony import (
 from diotec360.core.dependency_graph import DependencyGraph
 
 
+def build_resource_index(
+    access_sets: Iterable[Tuple[Set[str], Set[str]]]
+) -> Dict[str, Tuple[List[int], List[int]]]:
+    """
+    Build an inverted index from resource to the transactions accessing it.
+    
+    Args:
+        access_sets: (read_set, write_set) of each transaction, in batch order
+        
+    Returns:
+        Dictionary mapping resource -> (reader positions, writer positions),
+        both in ascending batch order
+    """
+    index: Dict[str, Tuple[List[int], List[int]]] = {}
+    for position, (read_set, write_set) in enumerate(access_sets):
+        for resource in read_set:
+            index.setdefault(resource, ([], []))[0].append(position)
+        for resource in write_set:
+            index.setdefault(resource, ([], []))[1].append(position)
+    return index
+
+
 class DependencyAnalyzer:
     """
     Analyzes transaction dependencies and builds a dependency graph.
@@ -42,6 +68,9 @@ class DependencyAnalyzer:
     - Ti writes to account A and Tj reads from account A (RAW dependency)
     - Ti writes to account A and Tj writes to account A (WAW dependency)
     - Ti reads from account A and Tj writes to account A (WAR dependency)
+    
+    Only pairs that share a resource written by one of them can satisfy
+    these rules, so candidate pairs come from the resource index.
     """
     
     def __init__(self):
@@ -146,30 +175,36 @@ class DependencyAnalyzer:
             txn._read_set = read_set
             txn._write_set = write_set
         
-        # Analyze all pairs of transactions
-        for i, t1 in enumerate(transactions):
-            for j, t2 in enumerate(transactions):
-                if i >= j:  # Skip self and already processed pairs
-                    continue
-                
-                r1, w1 = rw_sets[t1.id]
-                r2, w2 = rw_sets[t2.id]
-                
-                # Check both directions
-                t1_to_t2 = self._detect_dependency(t1, t2, r1, w1, r2, w2)
-                t2_to_t1 = self._detect_dependency(t2, t1, r2, w2, r1, w1)
-                
-                # Add edges based on dependencies
-                if t1_to_t2 and t2_to_t1:
-                    # Bidirectional dependency - add both edges (creates cycle)
-                    graph.add_edge(t1.id, t2.id)
-                    graph.add_edge(t2.id, t1.id)
-                elif t1_to_t2:
-                    # Only t1 → t2
-                    graph.add_edge(t1.id, t2.id)
-                elif t2_to_t1:
-                    # Only t2 → t1
-                    graph.add_edge(t2.id, t1.id)
+        # Pairs (i, j), i < j, sharing a resource that at least one of them writes
+        index = build_resource_index(rw_sets[txn.id] for txn in transactions)
+        conflicting_pairs: Set[Tuple[int, int]] = set()
+        for readers, writers in index.values():
+            if not writers:
+                continue
+            accessors = readers + writers
+            for writer in writers:
+                for other in accessors:
+                    if other < writer:
+                        conflicting_pairs.add((other, writer))
+                    elif other > writer:
+                        conflicting_pairs.add((writer, other))
+        
+        # Apply the RAW/WAW/WAR rules to the candidate pairs only, in the same
+        # pair order as a pairwise scan (a pair sharing a written resource
+        # depends both ways, i.e. a cycle)
+        for i, j in sorted(conflicting_pairs):
+            t1 = transactions[i]
+            t2 = transactions[j]
+            r1, w1 = rw_sets[t1.id]
+            r2, w2 = rw_sets[t2.id]
+            
+            t1_to_t2 = self._detect_dependency(t1, t2, r1, w1, r2, w2)
+            t2_to_t1 = self._detect_dependency(t2, t1, r2, w2, r1, w1)
+            
+            if t1_to_t2:
+                graph.add_edge(t1.id, t2.id)
+            if t2_to_t1:
+                graph.add_edge(t2.id, t1.id)
         
         # Check for cycles
         if graph.has_cycle():
@@ -216,4 +251,4 @@ class DependencyAnalyzer:
         return dependencies
 
 
-__all__ = ["DependencyAnalyzer"]
+__all__ = ["DependencyAnalyzer", "build_resource_index"]
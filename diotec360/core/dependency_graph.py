@@ -63,6 +63,7 @@ class DependencyGraph:
         """Initialize an empty dependency graph"""
         self.nodes: Dict[str, TransactionNode] = {}
         self.edges: List[Tuple[str, str]] = []  # (from_id, to_id)
+        self._edge_set: Set[Tuple[str, str]] = set()  # O(1) duplicate check for add_edge
     
     def add_node(self, transaction: Any) -> None:
         """
@@ -87,7 +88,8 @@ class DependencyGraph:
             from_id: ID of the transaction that must execute first
             to_id: ID of the transaction that depends on from_id
         """
-        if (from_id, to_id) not in self.edges:
+        if (from_id, to_id) not in self._edge_set:
+            self._edge_set.add((from_id, to_id))
             self.edges.append((from_id, to_id))
             if from_id in self.nodes:
                 self.nodes[from_id].dependents.add(to_id)
@@ -25,10 +25,25 @@ it manifests truth by eliminating impossible states.
 "The answer exists before the question is complete."
 """
 
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
 import hashlib
 import json
+import re
+
+from .ghost_solver import GhostSolver, SymbolicRegion
+
+
+# Keystroke-rate calls: one prediction must fit in a frame or two
+DEFAULT_LATENCY_BUDGET_MS = 50
+DEFAULT_CACHE_SIZE = 4096
+
+# Only these characters can complete a condition (and so make an intent impossible)
+CONDITION_TERMINATORS = {';', '}'}
+
+_INTENT_SPLIT = re.compile(r'\bintent\b')
+_CONDITION_BLOCK = re.compile(r'\b(guard|verify)\s*\{([^{}]*)(\}?)')
 
 
 @dataclass
@@ -52,9 +67,10 @@ class GhostPrediction:
     status: str  # 'MANIFESTED', 'IMPOSSIBLE', 'UNCERTAIN'
     result: Optional[GhostState]
     confidence: float
-    latency: float  # Always 0 for manifested states
-    eliminated_states: int  # How many impossibilities were subtracted
+    latency: float  # Solver time in seconds (0 for cached truths)
+    eliminated_states: int  # How many conditions carved the state space
     message: str
+    region: Optional[Dict[str, Any]] = None  # Fixed / free variables of the output region
 
 
 class GhostRunner:
@@ -65,102 +81,39 @@ class GhostRunner:
     Core Principle:
     - Traditional: Build the answer step by step
     - Ghost: Remove all wrong answers, what remains IS the answer
+    
+    The subtraction is symbolic: guards and verifications are compiled to
+    Z3 (see ghost_solver) and the remaining region is solved for, instead
+    of filtering a sampled grid of states.
     """
     
-    def __init__(self, judge=None, state_manager=None):
+    def __init__(self, judge=None, state_manager=None,
+                 latency_budget_ms: int = DEFAULT_LATENCY_BUDGET_MS,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
         self.judge = judge
         self.state = state_manager
-        self.cache = {}  # Cache of manifested truths
+        self.solver = GhostSolver(latency_budget_ms=latency_budget_ms)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # Intent hash -> decided prediction (LRU)
         
     def predict_outcome(self, intent_ast: Dict) -> GhostPrediction:
         """
         Predicts the outcome BEFORE execution.
         
-        How? The Judge already proved only ONE state is valid.
-        We don't need to calculate - just manifest.
+        The guards and verifications are solved symbolically: if they leave
+        exactly one state it is manifested, if they leave none the intent is
+        impossible, otherwise a witness state is returned as uncertain.
         
         Args:
-            intent_ast: Parsed Aethel intent
+            intent_ast: Parsed Aethel intent (parser 'constraints'/'post_conditions'
+                or 'guards'/'verifications' with 'condition' entries)
             
         Returns:
             GhostPrediction with the manifested truth
         """
-        
-        # Check cache first - truth is eternal
-        cache_key = self._hash_intent(intent_ast)
-        if cache_key in self.cache:
-            cached = self.cache[cache_key]
-            return GhostPrediction(
-                status='MANIFESTED',
-                result=cached,
-                confidence=1.0,
-                latency=0.0,
-                eliminated_states=0,
-                message='Truth retrieved from eternal cache'
-            )
-        
         try:
-            # 1. Extract constraints from intent
-            guards = self._extract_guards(intent_ast)
-            verifications = self._extract_verifications(intent_ast)
-            
-            # 2. Generate universe of possible states
-            all_states = self._generate_state_space(intent_ast)
-            initial_count = len(all_states)
-            
-            # 3. SUBTRACTION: Eliminate impossible states
-            valid_states = set(all_states)
-            
-            # Subtract states that violate guards
-            for guard in guards:
-                valid_states = self._subtract_invalid(valid_states, guard)
-            
-            # Subtract states that violate verifications
-            for verify in verifications:
-                valid_states = self._subtract_invalid(valid_states, verify)
-            
-            eliminated = initial_count - len(valid_states)
-            
-            # 4. What remains IS the truth
-            if len(valid_states) == 1:
-                # Perfect manifestation - only one truth exists
-                truth = list(valid_states)[0]
-                self.cache[cache_key] = truth
-                
-                return GhostPrediction(
-                    status='MANIFESTED',
-                    result=truth,
-                    confidence=1.0,
-                    latency=0.0,
-                    eliminated_states=eliminated,
-                    message=f'Truth manifested by eliminating {eliminated} impossible states'
-                )
-                
-            elif len(valid_states) == 0:
-                # Impossible - no valid state exists
-                return GhostPrediction(
-                    status='IMPOSSIBLE',
-                    result=None,
-                    confidence=0.0,
-                    latency=0.0,
-                    eliminated_states=initial_count,
-                    message='All states eliminated - this intent is impossible'
-                )
-                
-            else:
-                # Multiple valid states - need more constraints
-                # Choose the first one but mark as uncertain
-                truth = list(valid_states)[0]
-                
-                return GhostPrediction(
-                    status='UNCERTAIN',
-                    result=truth,
-                    confidence=1.0 / len(valid_states),
-                    latency=0.0,
-                    eliminated_states=eliminated,
-                    message=f'{len(valid_states)} possible truths remain - need more constraints'
-                )
-                
+            conditions = self._extract_guards(intent_ast) + self._extract_verifications(intent_ast)
+            return self._predict(conditions)
         except Exception as e:
             return GhostPrediction(
                 status='ERROR',
@@ -178,154 +131,157 @@ class GhostRunner:
         
         This is the "cursor lock" feature - the keyboard physically
         prevents you from typing bugs.
+        
+        Only a character that completes a condition (';' or '}') can make an
+        intent impossible, so every other keystroke is answered without the
+        solver. Conditions still being typed are ignored.
         """
-        future_code = current_code + next_char
+        if next_char not in CONDITION_TERMINATORS:
+            return True
         
         try:
-            # Quick syntax check
-            if not self._is_valid_syntax(future_code):
-                return False
-            
-            # If it's a complete intent, check if it's possible
-            if self._is_complete_intent(future_code):
-                ast = self._parse_code(future_code)
-                prediction = self.predict_outcome(ast)
-                return prediction.status != 'IMPOSSIBLE'
-            
-            # Partial code is always allowed
+            for conditions in self._scan_conditions(current_code + next_char):
+                conditions = [c for c in conditions if self.solver.compiles(c)]
+                if self._predict(conditions).status == 'IMPOSSIBLE':
+                    return False
             return True
             
-        except:
+        except Exception:
             # If we can't determine, allow it (fail open)
             return True
     
-    def _generate_state_space(self, intent_ast: Dict) -> List[GhostState]:
-        """
-        Generates the universe of all possible states.
-        
-        In practice, this is bounded by the variables in the intent.
-        For a simple transfer, this might be:
-        - sender_balance: [0, 100, 1000, 10000]
-        - receiver_balance: [0, 100, 1000, 10000]
-        - amount: [0, 50, 100, 500]
-        
-        Total: 4 * 4 * 4 = 64 possible states
-        """
-        
-        # Extract variables from intent
-        variables = self._extract_variables(intent_ast)
-        
-        # Generate sample values for each variable
-        # In production, this would be smarter
-        states = []
-        
-        # For now, generate a small sample space
-        sample_values = [0, 10, 100, 1000]
+    def get_stats(self) -> Dict[str, Any]:
+        """Solver reuse counters and cache size"""
+        return dict(self.solver.get_stats(), cached_intents=len(self.cache))
+    
+    def _predict(self, conditions: List[str]) -> GhostPrediction:
+        """Prediction for a conjunction of conditions, cached by intent hash"""
+        cache_key = self._hash_intent(conditions)
+        if cache_key in self.cache:
+            self.cache.move_to_end(cache_key)
+            cached = self.cache[cache_key]
+            return GhostPrediction(
+                status=cached.status,
+                result=cached.result,
+                confidence=cached.confidence,
+                latency=0.0,
+                eliminated_states=cached.eliminated_states,
+                message='Truth retrieved from eternal cache',
+                region=cached.region
+            )
         
-        # Generate all combinations (simplified)
-        for val1 in sample_values:
-            for val2 in sample_values:
-                state = GhostState(
-                    variables={
-                        'sender_balance': val1,
-                        'receiver_balance': val2,
-                        'amount': min(val1, val2)
-                    },
-                    merkle_root=self._compute_merkle_root({
-                        'sender_balance': val1,
-                        'receiver_balance': val2
-                    }),
-                    confidence=1.0
-                )
-                states.append(state)
+        region = self.solver.solve(conditions)
+        prediction = self._to_prediction(region, len(conditions))
         
-        return states
+        # Budget-limited answers depend on timing and are never cached
+        if region.status != 'UNKNOWN' and not region.undecided:
+            self.cache[cache_key] = prediction
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return prediction
     
-    def _subtract_invalid(self, states: Set[GhostState], constraint: str) -> Set[GhostState]:
-        """
-        Removes states that violate the constraint.
+    def _to_prediction(self, region: SymbolicRegion, applied: int) -> GhostPrediction:
+        """Map a solved region to a prediction"""
+        if region.status == 'UNSAT':
+            return GhostPrediction(
+                status='IMPOSSIBLE',
+                result=None,
+                confidence=0.0,
+                latency=region.elapsed,
+                eliminated_states=applied,
+                message='All states eliminated - this intent is impossible'
+            )
         
-        This is the core of the Ghost-Runner:
-        We don't build the answer - we eliminate wrong answers.
-        """
-        valid_states = set()
+        if region.status == 'UNKNOWN':
+            return GhostPrediction(
+                status='UNCERTAIN',
+                result=None,
+                confidence=0.0,
+                latency=region.elapsed,
+                eliminated_states=applied,
+                message='Latency budget exhausted before the state space was decided'
+            )
         
-        for state in states:
-            if self._check_constraint(state, constraint):
-                valid_states.add(state)
+        total = len(region.witness)
+        confidence = len(region.fixed) / total if total else 1.0
+        truth = GhostState(
+            variables=region.witness,
+            merkle_root=self._compute_merkle_root(region.witness),
+            confidence=confidence
+        )
+        summary = {'fixed': region.fixed, 'free': region.free, 'undecided': region.undecided}
+        
+        if len(region.fixed) == total:
+            # Perfect manifestation - only one truth exists
+            return GhostPrediction(
+                status='MANIFESTED',
+                result=truth,
+                confidence=1.0,
+                latency=region.elapsed,
+                eliminated_states=applied,
+                message=f'Truth manifested by {applied} conditions: one state remains',
+                region=summary
+            )
         
-        return valid_states
+        # Multiple valid states - need more constraints
+        return GhostPrediction(
+            status='UNCERTAIN',
+            result=truth,
+            confidence=confidence,
+            latency=region.elapsed,
+            eliminated_states=applied,
+            message=f'{len(region.free) + len(region.undecided)} of {total} variables still free - need more constraints',
+            region=summary
+        )
     
-    def _check_constraint(self, state: GhostState, constraint: str) -> bool:
+    def _scan_conditions(self, code: str) -> List[List[str]]:
         """
-        Checks if a state satisfies a constraint.
+        Completed guard/verify conditions of each intent in (partial) code.
         
-        This is where the Judge (Z3) would be called in production.
-        For now, we do simple evaluation.
+        A condition is complete once it is followed by ';' or its block is
+        closed; the text after the last ';' of an open block is still being typed.
         """
-        try:
-            # Simple constraint evaluation
-            # In production, this would use Z3
-            
-            # Example: "sender_balance >= amount"
-            if '>=' in constraint:
-                parts = constraint.split('>=')
-                left = parts[0].strip()
-                right = parts[1].strip()
-                
-                left_val = state.variables.get(left, 0)
-                right_val = state.variables.get(right, 0) if right in state.variables else int(right)
-                
-                return left_val >= right_val
-            
-            # Add more constraint types as needed
-            return True
-            
-        except:
-            return True  # Fail open
+        intents = []
+        for chunk in _INTENT_SPLIT.split(code)[1:]:
+            conditions = []
+            for _, body, closed in _CONDITION_BLOCK.findall(chunk):
+                pieces = body.split(';')
+                if not closed:
+                    pieces = pieces[:-1]
+                for piece in pieces:
+                    piece = piece.strip()
+                    if piece.startswith('secret '):
+                        piece = piece[len('secret '):].strip()
+                    if piece:
+                        conditions.append(piece)
+            intents.append(conditions)
+        return intents
     
     def _extract_guards(self, intent_ast: Dict) -> List[str]:
         """Extract guard constraints from intent AST"""
-        guards = intent_ast.get('guards', [])
-        return [g.get('condition', '') for g in guards]
+        guards = intent_ast.get('guards', intent_ast.get('constraints', []))
+        return [c for c in (self._condition_text(g) for g in guards) if c]
     
     def _extract_verifications(self, intent_ast: Dict) -> List[str]:
         """Extract verification constraints from intent AST"""
-        verifications = intent_ast.get('verifications', [])
-        return [v.get('condition', '') for v in verifications]
+        verifications = intent_ast.get('verifications', intent_ast.get('post_conditions', []))
+        return [c for c in (self._condition_text(v) for v in verifications) if c]
     
-    def _extract_variables(self, intent_ast: Dict) -> List[str]:
-        """Extract variable names from intent AST"""
-        # Simplified - in production would parse AST properly
-        return ['sender_balance', 'receiver_balance', 'amount']
+    def _condition_text(self, condition) -> str:
+        """Expression string of a condition (dict with 'condition'/'expression', or str)"""
+        if isinstance(condition, dict):
+            condition = condition.get('condition', condition.get('expression', ''))
+        return str(condition).strip()
     
     def _compute_merkle_root(self, variables: Dict) -> str:
         """Compute Merkle root for a state"""
         data = json.dumps(variables, sort_keys=True)
         return hashlib.sha256(data.encode()).hexdigest()
     
-    def _hash_intent(self, intent_ast: Dict) -> str:
-        """Hash an intent for caching"""
-        data = json.dumps(intent_ast, sort_keys=True)
+    def _hash_intent(self, conditions: List[str]) -> str:
+        """Hash an intent's conditions for caching"""
+        data = json.dumps(conditions)
         return hashlib.sha256(data.encode()).hexdigest()
-    
-    def _is_valid_syntax(self, code: str) -> bool:
-        """Quick syntax validation"""
-        # Simplified - just check for basic structure
-        return True
-    
-    def _is_complete_intent(self, code: str) -> bool:
-        """Check if code is a complete intent"""
-        return 'intent' in code and '{' in code and '}' in code
-    
-    def _parse_code(self, code: str) -> Dict:
-        """Parse Aethel code to AST"""
-        # Simplified - in production would use real parser
-        return {
-            'name': 'transfer',
-            'guards': [],
-            'verifications': []
-        }
 
 
 # Singleton instance
@@ -0,0 +1,306 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Aethel Ghost-Runner - Symbolic State Space
+
+The universe of states of an intent is every integer assignment to its
+variables; guard and verify conditions carve it down. Instead of sampling
+that universe, the conditions are compiled to Z3 and the remaining region
+is described symbolically:
+- SAT with every variable fixed: exactly one state remains
+- SAT with free variables: a witness state, plus which variables are fixed
+- UNSAT: no state remains (the intent is impossible)
+
+One solver is shared by all queries. Each condition is parsed once (keyed
+by its expression text) and asserted in its own solver scope; a query pops
+only the scopes past the prefix it shares with the previous query, so while
+an intent is being typed only the newly completed condition is added.
+
+Every check runs under what is left of the latency budget (Z3 timeout); a
+query that runs out reports UNKNOWN rather than a verdict.
+"""
+
+import ast
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import z3
+
+from .integrity_panic import UnsupportedConstraintError
+from .judge import SUPPORTED_AST_NODES
+
+
+@dataclass
+class SymbolicRegion:
+    """The states of an intent left by its conditions"""
+    status: str  # 'SAT', 'UNSAT', 'UNKNOWN' (latency budget exhausted)
+    witness: Dict[str, int] = field(default_factory=dict)
+    fixed: Dict[str, int] = field(default_factory=dict)  # variables with one possible value
+    free: List[str] = field(default_factory=list)  # variables with more than one
+    undecided: List[str] = field(default_factory=list)  # not classified within budget
+    elapsed: float = 0.0
+
+
+class GhostSolver:
+    """
+    Incremental Z3 backend of the Ghost-Runner.
+
+    Example:
+        >>> solver = GhostSolver(latency_budget_ms=50)
+        >>> solver.solve(["amount > 0", "balance >= amount", "balance == 10"]).status
+        'SAT'
+    """
+
+    MAX_COMPILED_CONSTRAINTS = 10000
+
+    _COMPARISONS = {
+        ast.Eq: lambda a, b: a == b,
+        ast.NotEq: lambda a, b: a != b,
+        ast.Lt: lambda a, b: a < b,
+        ast.LtE: lambda a, b: a <= b,
+        ast.Gt: lambda a, b: a > b,
+        ast.GtE: lambda a, b: a >= b,
+    }
+
+    _ARITHMETIC = {
+        ast.Add: lambda a, b: a + b,
+        ast.Sub: lambda a, b: a - b,
+        ast.Mult: lambda a, b: a * b,
+        ast.Div: lambda a, b: a / b,  # Z3 integer division
+        ast.Mod: lambda a, b: a % b,
+    }
+
+    def __init__(self, latency_budget_ms: int = 50):
+        self.latency_budget_ms = latency_budget_ms
+        self.solver = z3.Solver()
+
+        # expression text -> (Z3 expression, variable names)
+        self._compiled: Dict[str, Tuple[z3.BoolRef, Set[str]]] = {}
+        # Conditions currently asserted, one scope each (None: unknown state)
+        self._scopes: Optional[List[str]] = []
+
+        self.stats = {
+            'queries': 0,
+            'compile_hits': 0,
+            'compile_misses': 0,
+            'reused_scopes': 0,
+            'pushed_scopes': 0,
+            'budget_exhausted': 0,
+        }
+
+    def compile(self, condition: str) -> Tuple[z3.BoolRef, Set[str]]:
+        """
+        Z3 expression and variable names of a condition, parsed once.
+
+        Raises:
+            UnsupportedConstraintError: syntax outside the Judge's whitelist
+        """
+        if condition in self._compiled:
+            self.stats['compile_hits'] += 1
+            return self._compiled[condition]
+
+        self.stats['compile_misses'] += 1
+        try:
+            tree = ast.parse(condition.strip(), mode='eval')
+        except SyntaxError as e:
+            raise self._unsupported("SyntaxError", condition, str(e))
+
+        names: Set[str] = set()
+        expr = self._to_z3(tree.body, names)
+        if not z3.is_bool(expr):
+            raise self._unsupported(type(tree.body).__name__, condition, "condition is not a comparison")
+
+        if len(self._compiled) >= self.MAX_COMPILED_CONSTRAINTS:
+            self._compiled.clear()
+        self._compiled[condition] = (expr, names)
+        return expr, names
+
+    def compiles(self, condition: str) -> bool:
+        """Whether a condition is complete, supported syntax"""
+        try:
+            self.compile(condition)
+            return True
+        except UnsupportedConstraintError:
+            return False
+
+    def solve(self, conditions: List[str]) -> SymbolicRegion:
+        """
+        Describe the region of states satisfying every condition.
+
+        Raises:
+            UnsupportedConstraintError: a condition cannot be compiled
+        """
+        start = time.perf_counter()
+        deadline = start + self.latency_budget_ms / 1000.0
+        self.stats['queries'] += 1
+
+        compiled = [self.compile(c) for c in conditions]
+        names = sorted(set().union(*(n for _, n in compiled)))
+        variables = {name: z3.Int(name) for name in names}
+
+        try:
+            self._enter_scopes(conditions, [expr for expr, _ in compiled])
+
+            verdict, model = self._check(deadline)
+            if verdict != z3.sat:
+                status = 'UNSAT' if verdict == z3.unsat else 'UNKNOWN'
+                return SymbolicRegion(status=status, undecided=names if status == 'UNKNOWN' else [],
+                                      elapsed=time.perf_counter() - start)
+
+            witness = self._values(model, variables)
+            fixed, free, undecided = self._classify(variables, witness, deadline)
+        except Exception:
+            # Scopes may be half pushed: rebuild the solver on the next query
+            self._scopes = None
+            raise
+
+        return SymbolicRegion(status='SAT', witness=witness, fixed=fixed, free=free,
+                              undecided=undecided, elapsed=time.perf_counter() - start)
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats, compiled_conditions=len(self._compiled))
+
+    def _enter_scopes(self, conditions: List[str], exprs: List[z3.BoolRef]):
+        """Make the solver assert exactly `conditions`, reusing the shared prefix"""
+        if self._scopes is None:
+            self.solver.reset()
+            self._scopes = []
+
+        shared = 0
+        limit = min(len(self._scopes), len(conditions))
+        while shared < limit and self._scopes[shared] == conditions[shared]:
+            shared += 1
+
+        if len(self._scopes) > shared:
+            self.solver.pop(len(self._scopes) - shared)
+            del self._scopes[shared:]
+
+        for condition, expr in zip(conditions[shared:], exprs[shared:]):
+            self.solver.push()
+            self.solver.add(expr)
+            self._scopes.append(condition)
+
+        self.stats['reused_scopes'] += shared
+        self.stats['pushed_scopes'] += len(conditions) - shared
+
+    def _check(self, deadline: float, *extra: z3.BoolRef):
+        """
+        Check the asserted conditions (and `extra`) within the remaining budget.
+
+        Returns:
+            (verdict, model or None)
+        """
+        remaining_ms = int((deadline - time.perf_counter()) * 1000)
+        if remaining_ms <= 0:
+            self.stats['budget_exhausted'] += 1
+            return z3.unknown, None
+
+        self.solver.set("timeout", remaining_ms)
+        self.solver.push()
+        try:
+            self.solver.add(*extra)
+            verdict = self.solver.check()
+            model = self.solver.model() if verdict == z3.sat else None
+        finally:
+            self.solver.pop()
+
+        if verdict == z3.unknown:
+            self.stats['budget_exhausted'] += 1
+        return verdict, model
+
+    def _classify(self, variables: Dict[str, z3.ArithRef], witness: Dict[str, int],
+                  deadline: float) -> Tuple[Dict[str, int], List[str], List[str]]:
+        """Split variables into fixed (one value), free and undecided"""
+        if not variables:
+            return {}, [], []
+
+        # One check decides uniqueness; a second model marks every variable it moves as free
+        other = z3.Or([var != witness[name] for name, var in variables.items()])
+        verdict, model = self._check(deadline, other)
+        if verdict == z3.unsat:
+            return dict(witness), [], []
+        if verdict == z3.unknown:
+            return {}, [], list(variables)
+        moved = self._values(model, variables)
+
+        fixed, free, undecided = {}, [], []
+        for name, var in variables.items():
+            if moved[name] != witness[name]:
+                free.append(name)
+                continue
+            verdict, _ = self._check(deadline, var != witness[name])
+            if verdict == z3.unsat:
+                fixed[name] = witness[name]
+            elif verdict == z3.sat:
+                free.append(name)
+            else:
+                undecided.append(name)
+        return fixed, free, undecided
+
+    @staticmethod
+    def _values(model: z3.ModelRef, variables: Dict[str, z3.ArithRef]) -> Dict[str, int]:
+        return {name: model.eval(var, model_completion=True).as_long() for name, var in variables.items()}
+
+    def _to_z3(self, node: ast.AST, names: Set[str]):
+        """Whitelisted Python AST to Z3 (same node whitelist as the Judge)"""
+        if type(node) not in SUPPORTED_AST_NODES:
+            raise self._unsupported(type(node).__name__, ast.dump(node))
+
+        if isinstance(node, ast.Compare):
+            if len(node.ops) != 1:
+                raise self._unsupported("ChainedCompare", ast.dump(node))
+            op = self._COMPARISONS.get(type(node.ops[0]))
+            if op is None:
+                raise self._unsupported(type(node.ops[0]).__name__, ast.dump(node))
+            return op(self._to_z3(node.left, names), self._to_z3(node.comparators[0], names))
+
+        if isinstance(node, ast.BinOp):
+            op = self._ARITHMETIC.get(type(node.op))
+            if op is None:
+                raise self._unsupported(type(node.op).__name__, ast.dump(node))
+            return op(self._to_z3(node.left, names), self._to_z3(node.right, names))
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._to_z3(node.operand, names)
+            if isinstance(node.op, ast.USub):
+                return -operand
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            raise self._unsupported(type(node.op).__name__, ast.dump(node))
+
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+            return z3.Int(node.id)
+
+        if isinstance(node, ast.Constant) and type(node.value) is int:
+            return z3.IntVal(node.value)
+
+        raise self._unsupported(type(node).__name__, ast.dump(node))
+
+    @staticmethod
+    def _unsupported(node_type: str, node_repr: str, context: str = "ghost solver") -> UnsupportedConstraintError:
+        return UnsupportedConstraintError(
+            violation_type="UNSUPPORTED_AST_NODE",
+            details={
+                "node_type": node_type,
+                "node_repr": node_repr,
+                "context": context,
+                "supported_types": sorted(t.__name__ for t in SUPPORTED_AST_NODES),
+            },
+            recovery_hint=None
+        )
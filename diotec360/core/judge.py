@@ -18,27 +18,11 @@ from z3 import *
 import re
 import ast  # v1.2: Para parsing de expressões aritméticas
 import time  # v1.5: Para medir tempo de execução
-import os  # v2.1: For environment variables
 from dataclasses import dataclass
-from .conservation import ConservationChecker  # v1.3: Conservation Checker
-from .overflow import OverflowSentinel  # v1.4: Overflow Sentinel
-from .sanitizer import AethelSanitizer  # v1.5: Input Sanitizer
-from .zkp_simulator import get_zkp_simulator  # v1.6.2: Zero-Knowledge Proofs
-from .sentinel_monitor import get_sentinel_monitor  # v1.9: Sentinel Monitor
-from .semantic_sanitizer import SemanticSanitizer  # v1.9: Semantic Sanitizer
-from .adaptive_rigor import AdaptiveRigor  # v1.9: Adaptive Rigor
-from .gauntlet_report import GauntletReport  # v1.9: Gauntlet Report
 from .integrity_panic import UnsupportedConstraintError  # v1.9.2: RVC2-004 Hard-Reject Parsing
-
-# v2.1: MOE Intelligence Layer imports
-try:
-    from ..moe.orchestrator import MOEOrchestrator
-    from ..moe.z3_expert import Z3Expert
-    from ..moe.sentinel_expert import SentinelExpert
-    from ..moe.guardian_expert import GuardianExpert
-    MOE_AVAILABLE = True
-except ImportError:
-    MOE_AVAILABLE = False
+from .verdict_cache import VerdictCache, canonical_intent_key  # Verdict Cache
+from .judge_trace import JudgeTrace, TraceLevel  # Structured events and layer timings
+from .judge_engine import JudgeEngine, MOE_AVAILABLE  # Shareable components (v1.3-v2.1 layers)
 
 
 # RVC2-004: Explicit whitelist of supported AST node types
@@ -124,45 +108,78 @@ class AethelJudge:
     MAX_VARIABLES = 100
     MAX_CONSTRAINTS = 500
     
-    def __init__(self, intent_map, enable_moe: bool = None):
+    # Incremental mode: bound on the compiled constraint cache
+    MAX_COMPILED_CONSTRAINTS = 10000
+    
+    def __init__(self, intent_map, enable_moe: bool = None, enable_verdict_cache: bool = None,
+                 verdict_cache: VerdictCache = None, quiet: bool = None, trace: JudgeTrace = None,
+                 incremental: bool = False, engine: JudgeEngine = None):
         """
         Initialize Aethel Judge.
         
         Args:
             intent_map: Dictionary mapping intent names to their specifications
             enable_moe: Enable MOE Intelligence Layer (default: read from AETHEL_ENABLE_MOE env var)
+            enable_verdict_cache: Reuse verdicts of identical intents (default: read from
+                AETHEL_VERDICT_CACHE env var)
+            verdict_cache: Cache instance to use, e.g. one shared between judges or
+                backed by disk (implies enable_verdict_cache)
+            quiet: Production mode with zero console output (default: read from
+                AETHEL_JUDGE_QUIET env var)
+            trace: Event/timing recorder to use (default: a new JudgeTrace whose console
+                level is read from AETHEL_JUDGE_LOG_LEVEL, default DEBUG)
+            incremental: Compile each constraint once and keep shared guard
+                prefixes asserted in solver scopes between verifications
+            engine: Existing JudgeEngine to run on, e.g. from a JudgeEnginePool. The
+                judge is then a cheap session and the engine options above
+                (enable_moe, enable_verdict_cache, verdict_cache, quiet, trace)
+                are taken from the engine
         """
+        if engine is None:
+            engine = JudgeEngine(
+                enable_moe=enable_moe,
+                enable_verdict_cache=enable_verdict_cache,
+                verdict_cache=verdict_cache,
+                quiet=quiet,
+                trace=trace
+            )
+        self.engine = engine
+        self.trace = engine.trace
+        
         self.intent_map = intent_map
-        self.solver = Solver()
+        self.solver = engine.solver
         self.variables = {}
-        self.sanitizer = AethelSanitizer()  # v1.5.1: Initialize Sanitizer
-        self.conservation_checker = ConservationChecker()  # v1.3: Initialize Conservation Checker
-        self.overflow_sentinel = OverflowSentinel()  # v1.4: Initialize Overflow Sentinel
-        self.zkp_engine = get_zkp_simulator()  # v1.6.2: Initialize ZKP Engine
+        self.sanitizer = engine.sanitizer  # v1.5.1: Input Sanitizer
+        self.conservation_checker = engine.conservation_checker  # v1.3: Conservation Checker
+        self.overflow_sentinel = engine.overflow_sentinel  # v1.4: Overflow Sentinel
+        self.zkp_engine = engine.zkp_engine  # v1.6.2: ZKP Engine
         self.secret_variables = set()  # v1.6.2: Track secret variables
         
-        # v1.9.0: Initialize Sentinel components
-        self.sentinel_monitor = get_sentinel_monitor()  # Telemetry system
-        self.semantic_sanitizer = SemanticSanitizer()  # Layer -1: Intent analysis
-        self.adaptive_rigor = AdaptiveRigor()  # Dynamic parameter adjustment
-        self.gauntlet_report = GauntletReport()  # Attack logging
-        
-        # v1.9.0: Register Crisis Mode listener with Adaptive Rigor
-        self.sentinel_monitor.register_crisis_listener(self._on_crisis_mode_change)
+        # v1.9.0: Sentinel components (the engine registered the Crisis Mode listener)
+        self.sentinel_monitor = engine.sentinel_monitor  # Telemetry system
+        self.semantic_sanitizer = engine.semantic_sanitizer  # Layer -1: Intent analysis
+        self.adaptive_rigor = engine.adaptive_rigor  # Dynamic parameter adjustment
+        self.gauntlet_report = engine.gauntlet_report  # Attack logging
         
         # v1.5.2: Configurar timeout do Z3
         self.solver.set("timeout", self.Z3_TIMEOUT_MS)
         
-        # v2.1.0: Initialize MOE Intelligence Layer
-        if enable_moe is None:
-            # Read from environment variable (default: False for backward compatibility)
-            enable_moe = os.environ.get('AETHEL_ENABLE_MOE', 'false').lower() == 'true'
-        
-        self.moe_enabled = enable_moe and MOE_AVAILABLE
-        self.moe_orchestrator = None
-        
-        if self.moe_enabled:
-            self._initialize_moe()
+        # Incremental solving: constraint string -> compiled Z3 expression (kept
+        # by the engine across sessions), and the guards currently asserted, one
+        # solver scope each (None: unknown state, e.g. left by a previous session)
+        self.incremental = incremental
+        self._compiled_constraints = engine.compiled_constraints
+        self._guard_scopes = None
+        self._compile_hits = 0
+        self._compile_misses = 0
+        self._reused_guard_scopes = 0
+        
+        # v2.1.0: MOE Intelligence Layer (disable_moe() only affects this judge)
+        self.moe_enabled = engine.moe_enabled
+        self.moe_orchestrator = engine.moe_orchestrator
+        
+        # Verdict Cache: content-addressed verdicts in front of the layer pipeline
+        self.verdict_cache = engine.verdict_cache
     
     def verify(self, aethel_code: str) -> JudgeVerdict:
         if not isinstance(aethel_code, str) or not aethel_code.strip():
@@ -186,39 +203,12 @@ class AethelJudge:
         """
         Initialize MOE Intelligence Layer with all experts.
         
-        Creates and registers:
-        - Z3 Expert (mathematical logic specialist)
-        - Sentinel Expert (security specialist)
-        - Guardian Expert (financial specialist)
+        The engine creates the orchestrator and registers the Z3, Sentinel and
+        Guardian experts once; later judges on the same engine reuse them.
         """
-        try:
-            # Create MOE Orchestrator
-            self.moe_orchestrator = MOEOrchestrator(
-                max_workers=3,
-                expert_timeout=30,
-                telemetry_db_path=".aethel_moe/telemetry.db",
-                cache_ttl_seconds=300,
-                enable_cache=True
-            )
-            
-            # Register Z3 Expert
-            z3_expert = Z3Expert()
-            self.moe_orchestrator.register_expert(z3_expert)
-            
-            # Register Sentinel Expert
-            sentinel_expert = SentinelExpert()
-            self.moe_orchestrator.register_expert(sentinel_expert)
-            
-            # Register Guardian Expert
-            guardian_expert = GuardianExpert()
-            self.moe_orchestrator.register_expert(guardian_expert)
-            
-            print("[JUDGE] ✅ MOE Intelligence Layer initialized with 3 experts")
-            
-        except Exception as e:
-            print(f"[JUDGE] ⚠️  MOE initialization failed: {e}")
+        self.moe_orchestrator = self.engine.initialize_moe()
+        if self.moe_orchestrator is None:
             self.moe_enabled = False
-            self.moe_orchestrator = None
     
     def enable_moe(self) -> bool:
         """
@@ -228,7 +218,7 @@ class AethelJudge:
             True if MOE was successfully enabled, False otherwise
         """
         if not MOE_AVAILABLE:
-            print("[JUDGE] ⚠️  MOE not available (missing dependencies)")
+            self.trace.warning(None, 'moe', "[JUDGE] ⚠️  MOE not available (missing dependencies)")
             return False
         
         if not self.moe_orchestrator:
@@ -242,7 +232,7 @@ class AethelJudge:
         Disable MOE Intelligence Layer (emergency rollback).
         """
         self.moe_enabled = False
-        print("[JUDGE] ⚠️  MOE Intelligence Layer disabled")
+        self.trace.warning(None, 'moe', "[JUDGE] ⚠️  MOE Intelligence Layer disabled")
 
     def _condition_to_expression(self, condition):
         """Normalize a condition representation to an expression string."""
@@ -254,6 +244,85 @@ class AethelJudge:
         """Return a list of expression strings for a mixed list of dict/str conditions."""
         return [self._condition_to_expression(c) for c in (conditions or []) if self._condition_to_expression(c)]
     
+    def _verdict_cache_key(self, data):
+        """
+        Cache key of an intent under the current judge configuration.
+        
+        The Adaptive Rigor mode and its live parameters are part of the key,
+        so a verdict is never reused across rigor levels.
+        """
+        rigor_config = self.adaptive_rigor.get_current_config()
+        config = {
+            'z3_timeout_ms': self.Z3_TIMEOUT_MS,
+            'max_variables': self.MAX_VARIABLES,
+            'max_constraints': self.MAX_CONSTRAINTS,
+            'overflow_limits': [self.overflow_sentinel.max_int, self.overflow_sentinel.min_int],
+            'rigor_mode': self.adaptive_rigor.current_mode.value,
+            'rigor': rigor_config.to_dict(),
+        }
+        return canonical_intent_key(data, config)
+    
+    def _is_cacheable(self, result, layer_results):
+        """
+        Whether a verdict is a deterministic function of its cache key.
+        
+        Semantic attacks must reach the Gauntlet Report on every attempt, and
+        Z3 unknown/exception rejections depend on timing, so neither is cached.
+        """
+        if 'semantic_violation' in result:
+            return False
+        if result.get('status') == 'REJECTED' and layer_results.get('z3_prover') is False:
+            return False
+        return True
+    
+    def _compile_constraint(self, constraint):
+        """
+        Parse a constraint to Z3 once and reuse the expression afterwards.
+        
+        Z3 variables are interned by name, so a compiled expression is valid
+        for every intent. UnsupportedConstraintError is never cached.
+        """
+        if constraint in self._compiled_constraints:
+            self._compile_hits += 1
+            return self._compiled_constraints[constraint]
+        
+        self._compile_misses += 1
+        z3_expr = self._parse_constraint(constraint)
+        if len(self._compiled_constraints) >= self.MAX_COMPILED_CONSTRAINTS:
+            self._compiled_constraints.clear()
+        self._compiled_constraints[constraint] = z3_expr
+        return z3_expr
+    
+    def _enter_guard_scopes(self, guards):
+        """
+        Make the solver assert exactly `guards`, reusing the shared prefix.
+        
+        Each guard lives in its own scope: scopes past the common prefix with
+        the previous intent are popped, and the remaining guards pushed.
+        
+        Args:
+            guards: List of (constraint string, Z3 expression) in intent order
+        """
+        if self._guard_scopes is None:
+            self.solver.reset()
+            self._guard_scopes = []
+        
+        shared = 0
+        limit = min(len(self._guard_scopes), len(guards))
+        while shared < limit and self._guard_scopes[shared] == guards[shared][0]:
+            shared += 1
+        
+        if len(self._guard_scopes) > shared:
+            self.solver.pop(len(self._guard_scopes) - shared)
+            del self._guard_scopes[shared:]
+        
+        for constraint, z3_expr in guards[shared:]:
+            self.solver.push()
+            self.solver.add(z3_expr)
+            self._guard_scopes.append(constraint)
+        
+        self._reused_guard_scopes += shared
+    
     def _on_crisis_mode_change(self, active: bool) -> None:
         """
         Handle Crisis Mode state changes from Sentinel Monitor.
@@ -261,12 +330,7 @@ class AethelJudge:
         Args:
             active: True if Crisis Mode activated, False if deactivated
         """
-        if active:
-            self.adaptive_rigor.activate_crisis_mode()
-            print("[JUDGE] 🚨 Crisis Mode activated - Adaptive Rigor engaged")
-        else:
-            self.adaptive_rigor.deactivate_crisis_mode()
-            print("[JUDGE] ✅ Crisis Mode deactivated - Gradual recovery initiated")
+        self.engine._on_crisis_mode_change(active)
     
     def verify_logic(self, intent_name):
         """
@@ -311,50 +375,61 @@ class AethelJudge:
         
         # Track layer results for telemetry
         layer_results = {}
+        self.trace.begin(tx_id, intent_name)
         
-        print(f"\n⚖️  Iniciando verificação formal de '{intent_name}'...")
+        self.trace.info(tx_id, 'judge', "\n⚖️  Iniciando verificação formal de '%s'...", intent_name)
         
         # ============================================================
         # MOE LAYER: Multi-Expert Consensus (v2.1.0)
         # ============================================================
         if self.moe_enabled and self.moe_orchestrator:
-            print("🏛️  Usando MOE Intelligence Layer (v2.1)")
-            print("    MOE Layer: Multi-Expert Consensus")
-            print("    - Z3 Expert (mathematical logic)")
-            print("    - Sentinel Expert (security analysis)")
-            print("    - Guardian Expert (financial verification)")
+            self.trace.debug(
+                tx_id, 'moe',
+                "🏛️  Usando MOE Intelligence Layer (v2.1)\n"
+                "    MOE Layer: Multi-Expert Consensus\n"
+                "    - Z3 Expert (mathematical logic)\n"
+                "    - Sentinel Expert (security analysis)\n"
+                "    - Guardian Expert (financial verification)"
+            )
             
             try:
                 # Convert intent data to string for MOE verification
                 intent_str = str(data)
                 
                 # Execute MOE verification
-                print("\n🏛️  [MOE LAYER] Executando verificação multi-expert...")
+                self.trace.debug(tx_id, 'moe', "\n🏛️  [MOE LAYER] Executando verificação multi-expert...")
                 moe_start_time = time.time()
                 moe_result = self.moe_orchestrator.verify_transaction(intent_str, tx_id)
                 moe_latency_ms = (time.time() - moe_start_time) * 1000
                 
                 layer_results['moe'] = moe_result.consensus == "APPROVED"
+                self.trace.mark(tx_id, 'moe', layer_results['moe'])
                 
                 # Display MOE results
-                print(f"\n🏛️  MOE Consensus: {moe_result.consensus}")
-                print(f"    Overall Confidence: {moe_result.overall_confidence:.2%}")
-                print(f"    Total Latency: {moe_latency_ms:.0f}ms")
-                print(f"    Activated Experts: {', '.join(moe_result.activated_experts)}")
-                
-                for verdict in moe_result.expert_verdicts:
-                    status_icon = "✅" if verdict.verdict == "APPROVE" else "❌"
-                    print(f"    {status_icon} {verdict.expert_name}: {verdict.verdict} ({verdict.confidence:.2%}, {verdict.latency_ms:.0f}ms)")
-                    if verdict.reason:
-                        print(f"       Reason: {verdict.reason}")
+                self.trace.info(tx_id, 'moe', "\n🏛️  MOE Consensus: %s", moe_result.consensus)
+                if self.trace.is_enabled_for(TraceLevel.DEBUG):
+                    self.trace.debug(tx_id, 'moe', "    Overall Confidence: %.2f%%", moe_result.overall_confidence * 100)
+                    self.trace.debug(tx_id, 'moe', "    Total Latency: %.0fms", moe_latency_ms)
+                    self.trace.debug(tx_id, 'moe', "    Activated Experts: %s", ', '.join(moe_result.activated_experts))
+                    
+                    for verdict in moe_result.expert_verdicts:
+                        status_icon = "✅" if verdict.verdict == "APPROVE" else "❌"
+                        self.trace.debug(
+                            tx_id, 'moe', "    %s %s: %s (%.2f%%, %.0fms)",
+                            status_icon, verdict.expert_name, verdict.verdict,
+                            verdict.confidence * 100, verdict.latency_ms
+                        )
+                        if verdict.reason:
+                            self.trace.debug(tx_id, 'moe', "       Reason: %s", verdict.reason)
                 
                 # Handle MOE verdict
                 if moe_result.consensus == "REJECTED":
                     # MOE rejected - skip existing layers and reject immediately
-                    print("\n🏛️  MOE REJECTION - Skipping existing layers")
+                    self.trace.info(tx_id, 'moe', "\n🏛️  MOE REJECTION - Skipping existing layers")
                     
                     # END TRANSACTION: Record metrics before returning
                     self.sentinel_monitor.end_transaction(tx_id, layer_results)
+                    self.trace.end(tx_id, 'REJECTED')
                     
                     return {
                         'status': 'REJECTED',
@@ -379,47 +454,141 @@ class AethelJudge:
                 
                 elif moe_result.consensus == "APPROVED":
                     # MOE approved - proceed to existing layers for additional verification
-                    print("\n🏛️  MOE APPROVAL - Proceeding to existing layers for additional verification")
+                    self.trace.info(tx_id, 'moe', "\n🏛️  MOE APPROVAL - Proceeding to existing layers for additional verification")
                     # Continue to existing layers below
                 
                 elif moe_result.consensus == "UNCERTAIN":
                     # MOE uncertain - proceed to existing layers as fallback
-                    print("\n🏛️  MOE UNCERTAIN - Proceeding to existing layers as fallback")
+                    self.trace.info(tx_id, 'moe', "\n🏛️  MOE UNCERTAIN - Proceeding to existing layers as fallback")
                     # Continue to existing layers below
                 
             except Exception as e:
                 # MOE failure - fallback to existing layers
-                print(f"\n🏛️  ⚠️  MOE FAILURE: {e}")
-                print("    Falling back to existing layers (v1.9.0)")
+                self.trace.warning(tx_id, 'moe', "\n🏛️  ⚠️  MOE FAILURE: %s", e)
+                self.trace.warning(tx_id, 'moe', "    Falling back to existing layers (v1.9.0)")
                 layer_results['moe'] = False
+                self.trace.mark(tx_id, 'moe', layer_results['moe'])
                 # Continue to existing layers below
         
+        # ============================================================
+        # VERDICT CACHE: identical intents skip the layer pipeline
+        # ============================================================
+        cache_key = None
+        if self.verdict_cache is not None:
+            cache_key = self._verdict_cache_key(data)
+            cached = self.verdict_cache.get(cache_key)
+            self.sentinel_monitor.record_verdict_cache(cached is not None)
+            
+            if cached is not None:
+                verdict, cached_layers = cached
+                self.trace.info(tx_id, 'verdict_cache', "\n⚡ [VERDICT CACHE] Veredito reutilizado: %s", verdict['status'])
+                layer_results.update(cached_layers)
+                self.trace.mark(tx_id, 'verdict_cache', True)
+                
+                # END TRANSACTION: Record metrics for the cached verdict
+                metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
+                
+                verdict['cached'] = True
+                if 'telemetry' in verdict:
+                    verdict['telemetry'] = {
+                        'anomaly_score': metrics.anomaly_score,
+                        'cpu_time_ms': metrics.cpu_time_ms,
+                        'memory_delta_mb': metrics.memory_delta_mb
+                    }
+                self.trace.end(tx_id, verdict['status'])
+                return verdict
+        
+        result = self._verify_layers(data, tx_id, layer_results)
+        
+        if cache_key is not None and self._is_cacheable(result, layer_results):
+            self.verdict_cache.put(
+                cache_key,
+                result,
+                {layer: ok for layer, ok in layer_results.items() if layer != 'moe'}
+            )
+        
+        self.trace.end(tx_id, result['status'])
+        return result
+    
+    def verify_many(self, intent_names):
+        """
+        Verify a batch of intents with incremental solving.
+        
+        Intents are verified in guard order so that shared guard prefixes
+        stay asserted between them; each constraint is compiled once.
+        
+        Args:
+            intent_names: Names of intents in intent_map
+        
+        Returns:
+            Dictionary with per-intent results (in the given order), verdicts,
+            total Z3 solve time and reuse counters
+        """
+        previous_mode = self.incremental
+        self.incremental = True
+        compile_hits = self._compile_hits
+        reused_scopes = self._reused_guard_scopes
+        
+        start_time = time.time()
+        results = {}
+        try:
+            order = sorted(
+                dict.fromkeys(intent_names),
+                key=lambda name: self._normalize_conditions(self.intent_map[name].get('constraints', []))
+            )
+            for intent_name in order:
+                results[intent_name] = self.verify_logic(intent_name)
+        finally:
+            self.incremental = previous_mode
+        total_ms = (time.time() - start_time) * 1000
+        
+        ordered = {name: results[name] for name in intent_names}
+        return {
+            'results': ordered,
+            'verdicts': {name: result['status'] for name, result in ordered.items()},
+            'total_solve_ms': sum(result.get('elapsed_ms', 0.0) for result in ordered.values()),
+            'total_ms': total_ms,
+            'compiled_constraint_hits': self._compile_hits - compile_hits,
+            'reused_guard_scopes': self._reused_guard_scopes - reused_scopes
+        }
+    
+    def _verify_layers(self, data, tx_id, layer_results):
+        """
+        Run the v1.9 layer pipeline (Layers -1 to 4) for one intent.
+        
+        Ends the Sentinel transaction on every path and returns the
+        verify_logic result dictionary.
+        """
         # ============================================================
         # EXISTING LAYERS (v1.9.0 - Autonomous Sentinel)
         # ============================================================
-        print("\n🛡️  Usando Autonomous Sentinel (v1.9)")
-        print("    Layer -1: Semantic Sanitizer (intent analysis)")
-        print("    Layer 0: Input Sanitizer (anti-injection)")
-        print("    Layer 1: Conservation Guardian")
-        print("    Layer 2: Overflow Sentinel")
-        print("    Layer 3: Z3 Theorem Prover (timeout: 2s)")
-        print("    Layer 4: ZKP Validator")
+        self.trace.debug(
+            tx_id, 'judge',
+            "\n🛡️  Usando Autonomous Sentinel (v1.9)\n"
+            "    Layer -1: Semantic Sanitizer (intent analysis)\n"
+            "    Layer 0: Input Sanitizer (anti-injection)\n"
+            "    Layer 1: Conservation Guardian\n"
+            "    Layer 2: Overflow Sentinel\n"
+            "    Layer 3: Z3 Theorem Prover (timeout: 2s)\n"
+            "    Layer 4: ZKP Validator"
+        )
         
         # STEP -1: Semantic Sanitizer (v1.9.0 - Intent Analysis)
-        print("\n🧠 [SEMANTIC SANITIZER] Analisando intenção do código...")
+        self.trace.debug(tx_id, 'semantic_sanitizer', "\n🧠 [SEMANTIC SANITIZER] Analisando intenção do código...")
         
         # Analyze the code for malicious intent
         code_to_analyze = str(data)
         semantic_result = self.semantic_sanitizer.analyze(code_to_analyze, self.gauntlet_report)
         layer_results['semantic_sanitizer'] = semantic_result.is_safe
+        self.trace.mark(tx_id, 'semantic_sanitizer', layer_results['semantic_sanitizer'])
         
         if not semantic_result.is_safe:
-            print("  🚨 INTENÇÃO MALICIOSA DETECTADA!")
-            print(f"  📊 Entropy score: {semantic_result.entropy_score:.2f}")
+            self.trace.warning(tx_id, 'semantic_sanitizer', "  🚨 INTENÇÃO MALICIOSA DETECTADA!")
+            self.trace.warning(tx_id, 'semantic_sanitizer', "  📊 Entropy score: %.2f", semantic_result.entropy_score)
             if semantic_result.detected_patterns:
-                print(f"  🔍 Padrões detectados: {len(semantic_result.detected_patterns)}")
+                self.trace.warning(tx_id, 'semantic_sanitizer', "  🔍 Padrões detectados: %d", len(semantic_result.detected_patterns))
                 for pattern in semantic_result.detected_patterns:
-                    print(f"     - {pattern.name} (severity: {pattern.severity:.2f})")
+                    self.trace.warning(tx_id, 'semantic_sanitizer', "     - %s (severity: %.2f)", pattern.name, pattern.severity)
             
             # Log to Gauntlet Report
             self.gauntlet_report.log_attack({
@@ -449,20 +618,21 @@ class AethelJudge:
                 }
             }
         
-        print(f"  ✅ Código aprovado pela análise semântica (entropy: {semantic_result.entropy_score:.2f})")
+        self.trace.debug(tx_id, 'semantic_sanitizer', "  ✅ Código aprovado pela análise semântica (entropy: %.2f)", semantic_result.entropy_score)
         
         # STEP 0: Input Sanitization (v1.5.1 - Anti-Injection)
-        print("\n🔒 [INPUT SANITIZER] Verificando segurança do código...")
+        self.trace.debug(tx_id, 'input_sanitizer', "\n🔒 [INPUT SANITIZER] Verificando segurança do código...")
         
         # Sanitizar todas as strings do intent
         code_to_check = str(data)
         sanitize_result = self.sanitizer.sanitize(code_to_check)
         layer_results['input_sanitizer'] = sanitize_result.is_safe
+        self.trace.mark(tx_id, 'input_sanitizer', layer_results['input_sanitizer'])
         
         if not sanitize_result.is_safe:
-            print("  🚨 TENTATIVA DE INJEÇÃO DETECTADA!")
+            self.trace.warning(tx_id, 'input_sanitizer', "  🚨 TENTATIVA DE INJEÇÃO DETECTADA!")
             for violation in sanitize_result.violations:
-                print(f"  ⚠️  {violation['type']}: {violation.get('matched', 'N/A')}")
+                self.trace.warning(tx_id, 'input_sanitizer', "  ⚠️  %s: %s", violation['type'], violation.get('matched', 'N/A'))
             
             # END TRANSACTION: Record metrics before returning
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
@@ -474,10 +644,10 @@ class AethelJudge:
                 'sanitizer_violations': sanitize_result.violations
             }
         
-        print(f"  ✅ Código aprovado pela sanitização")
+        self.trace.debug(tx_id, 'input_sanitizer', "  ✅ Código aprovado pela sanitização")
         
         # STEP 0.5: Complexity Check (v1.5.2 - Anti-DoS)
-        print("\n⏱️  [COMPLEXITY CHECK] Verificando complexidade...")
+        self.trace.debug(tx_id, 'complexity_check', "\n⏱️  [COMPLEXITY CHECK] Verificando complexidade...")
 
         constraints_exprs = self._normalize_conditions(data.get('constraints', []))
         post_exprs = self._normalize_conditions(data.get('post_conditions', []))
@@ -487,8 +657,9 @@ class AethelJudge:
         num_constraints = len(constraints_exprs) + len(post_exprs)
         
         if num_vars > self.MAX_VARIABLES:
-            print(f"  🚨 MUITAS VARIÁVEIS: {num_vars} > {self.MAX_VARIABLES}")
+            self.trace.warning(tx_id, 'complexity_check', "  🚨 MUITAS VARIÁVEIS: %d > %d", num_vars, self.MAX_VARIABLES)
             layer_results['complexity_check'] = False
+            self.trace.mark(tx_id, 'complexity_check', layer_results['complexity_check'])
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
             return {
                 'status': 'REJECTED',
@@ -497,8 +668,9 @@ class AethelJudge:
             }
         
         if num_constraints > self.MAX_CONSTRAINTS:
-            print(f"  🚨 MUITAS CONSTRAINTS: {num_constraints} > {self.MAX_CONSTRAINTS}")
+            self.trace.warning(tx_id, 'complexity_check', "  🚨 MUITAS CONSTRAINTS: %d > %d", num_constraints, self.MAX_CONSTRAINTS)
             layer_results['complexity_check'] = False
+            self.trace.mark(tx_id, 'complexity_check', layer_results['complexity_check'])
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
             return {
                 'status': 'REJECTED',
@@ -507,10 +679,11 @@ class AethelJudge:
             }
         
         layer_results['complexity_check'] = True
-        print(f"  ✅ Complexidade aceitável (vars: {num_vars}, constraints: {num_constraints})")
+        self.trace.mark(tx_id, 'complexity_check', layer_results['complexity_check'])
+        self.trace.debug(tx_id, 'complexity_check', "  ✅ Complexidade aceitável (vars: %d, constraints: %d)", num_vars, num_constraints)
         
         # STEP 1: Conservation Check (v1.3 - Fast Pre-Check)
-        print("\n💰 [CONSERVATION GUARDIAN] Verificando Lei da Conservação...")
+        self.trace.debug(tx_id, 'conservation', "\n💰 [CONSERVATION GUARDIAN] Verificando Lei da Conservação...")
 
         conservation_changes = self.conservation_checker.analyze_verify_block(post_exprs)
         has_symbolic_conservation = any(
@@ -519,11 +692,12 @@ class AethelJudge:
 
         conservation_result = self.conservation_checker.validate_conservation(conservation_changes)
         layer_results['conservation'] = True if has_symbolic_conservation else conservation_result.is_valid
+        self.trace.mark(tx_id, 'conservation', layer_results['conservation'])
         
         if (not has_symbolic_conservation) and (not conservation_result.is_valid):
-            print("  🚨 VIOLAÇÃO DE CONSERVAÇÃO DETECTADA!")
-            print(f"  📊 Balanço líquido: {conservation_result.net_change}")
-            print(f"  ⚖️  Lei violada: Σ(mudanças) = {conservation_result.net_change} ≠ 0")
+            self.trace.warning(tx_id, 'conservation', "  🚨 VIOLAÇÃO DE CONSERVAÇÃO DETECTADA!")
+            self.trace.warning(tx_id, 'conservation', "  📊 Balanço líquido: %s", conservation_result.net_change)
+            self.trace.warning(tx_id, 'conservation', "  ⚖️  Lei violada: Σ(mudanças) = %s ≠ 0", conservation_result.net_change)
             
             # END TRANSACTION: Record metrics before returning
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
@@ -540,24 +714,25 @@ class AethelJudge:
             }
         
         if conservation_changes:
-            print(f"  ✅ Conservação válida ({len(conservation_result.changes)} mudanças de saldo detectadas)")
+            self.trace.debug(tx_id, 'conservation', "  ✅ Conservação válida (%d mudanças de saldo detectadas)", len(conservation_result.changes))
         else:
-            print("  ℹ️  Nenhuma mudança de saldo detectada (pulando verificação de conservação)")
+            self.trace.debug(tx_id, 'conservation', "  ℹ️  Nenhuma mudança de saldo detectada (pulando verificação de conservação)")
 
         if has_symbolic_conservation:
-            print("  🧩 Conservação simbólica detectada - será provada via Z3 (Σ deltas == 0)")
+            self.trace.debug(tx_id, 'conservation', "  🧩 Conservação simbólica detectada - será provada via Z3 (Σ deltas == 0)")
         
         # STEP 2: Overflow Check (v1.4 - Hardware Safety Check)
-        print("\n🔢 [OVERFLOW SENTINEL] Verificando limites de hardware...")
+        self.trace.debug(tx_id, 'overflow', "\n🔢 [OVERFLOW SENTINEL] Verificando limites de hardware...")
         overflow_result = self.overflow_sentinel.check_intent({
             'verify': post_exprs
         })
         layer_results['overflow'] = overflow_result.is_safe
+        self.trace.mark(tx_id, 'overflow', layer_results['overflow'])
         
         if not overflow_result.is_safe:
-            print("  🚨 OVERFLOW/UNDERFLOW DETECTADO!")
+            self.trace.warning(tx_id, 'overflow', "  🚨 OVERFLOW/UNDERFLOW DETECTADO!")
             for violation in overflow_result.violations:
-                print(f"  ⚠️  {violation['type']}: {violation['operation']}")
+                self.trace.warning(tx_id, 'overflow', "  ⚠️  %s: %s", violation['type'], violation['operation'])
             
             # END TRANSACTION: Record metrics before returning
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
@@ -575,31 +750,39 @@ class AethelJudge:
                 }
             }
         
-        print(f"  ✅ Todas as operações estão dentro dos limites de hardware")
+        self.trace.debug(tx_id, 'overflow', "  ✅ Todas as operações estão dentro dos limites de hardware")
         
         # Reset do solver para nova verificação
-        self.solver.reset()
+        # (incremental mode keeps the guard scopes of the previous intent)
+        if not self.incremental:
+            self.solver.reset()
+            self._guard_scopes = None
         self.solver.set("timeout", self.Z3_TIMEOUT_MS)  # Reconfigurar timeout
         self.variables = {}
         
         # 3. Extrair e criar variáveis simbólicas
         self._extract_variables(constraints_exprs + post_exprs)
         
+        # Incremental mode compiles each constraint string to Z3 only once
+        parse_constraint = self._compile_constraint if self.incremental else self._parse_constraint
+        
         # 4. Adicionar PRÉ-CONDIÇÕES (guards) como premissas
-        print("\n📋 Adicionando pré-condições (guards):")
+        self.trace.debug(tx_id, 'constraint_parsing', "\n📋 Adicionando pré-condições (guards):")
+        guards = []
         try:
             for constraint in constraints_exprs:
-                z3_expr = self._parse_constraint(constraint)
+                z3_expr = parse_constraint(constraint)
                 if z3_expr is not None:
-                    self.solver.add(z3_expr)
-                    print(f"  ✓ {constraint}")
+                    guards.append((constraint, z3_expr))
+                    self.trace.debug(tx_id, 'constraint_parsing', "  ✓ %s", constraint)
         except UnsupportedConstraintError as e:
             # RVC2-004: Transaction MUST be rejected when constraint parsing fails
-            print(f"  🚨 UNSUPPORTED CONSTRAINT DETECTED!")
-            print(f"  ⚠️  Node type: {e.details.get('node_type', 'unknown')}")
-            print(f"  🔒 HARD-REJECT: Transaction rejected due to unsupported constraint syntax")
+            self.trace.warning(tx_id, 'constraint_parsing', "  🚨 UNSUPPORTED CONSTRAINT DETECTED!")
+            self.trace.warning(tx_id, 'constraint_parsing', "  ⚠️  Node type: %s", e.details.get('node_type', 'unknown'))
+            self.trace.warning(tx_id, 'constraint_parsing', "  🔒 HARD-REJECT: Transaction rejected due to unsupported constraint syntax")
             
             layer_results['constraint_parsing'] = False
+            self.trace.mark(tx_id, 'constraint_parsing', layer_results['constraint_parsing'])
             
             # END TRANSACTION: Record metrics before returning
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
@@ -616,6 +799,7 @@ class AethelJudge:
             }
 
         # 4.5 Prova simbólica de conservação (Σ deltas == 0)
+        conservation_constraint = None
         if has_symbolic_conservation and conservation_changes:
             deltas = []
             for change in conservation_changes:
@@ -627,27 +811,27 @@ class AethelJudge:
 
             if deltas:
                 conservation_constraint = Sum(deltas) == 0
-                self.solver.add(conservation_constraint)
-                print("\n🧾 Conservação simbólica injetada no Z3:")
-                print("  ✓ Σ(deltas) == 0")
+                self.trace.debug(tx_id, 'constraint_parsing', "\n🧾 Conservação simbólica injetada no Z3:")
+                self.trace.debug(tx_id, 'constraint_parsing', "  ✓ Σ(deltas) == 0")
         
         # 5. UNIFIED PROOF: Verificar TODAS as pós-condições JUNTAS
-        print("\n🎯 Verificando consistência global das pós-condições:")
+        self.trace.debug(tx_id, 'constraint_parsing', "\n🎯 Verificando consistência global das pós-condições:")
         
         all_post_conditions = []
         try:
             for post_condition in post_exprs:
-                z3_expr = self._parse_constraint(post_condition)
+                z3_expr = parse_constraint(post_condition)
                 if z3_expr is not None:
                     all_post_conditions.append(z3_expr)
-                    print(f"  • {post_condition}")
+                    self.trace.debug(tx_id, 'constraint_parsing', "  • %s", post_condition)
         except UnsupportedConstraintError as e:
             # RVC2-004: Transaction MUST be rejected when constraint parsing fails
-            print(f"  🚨 UNSUPPORTED CONSTRAINT DETECTED!")
-            print(f"  ⚠️  Node type: {e.details.get('node_type', 'unknown')}")
-            print(f"  🔒 HARD-REJECT: Transaction rejected due to unsupported constraint syntax")
+            self.trace.warning(tx_id, 'constraint_parsing', "  🚨 UNSUPPORTED CONSTRAINT DETECTED!")
+            self.trace.warning(tx_id, 'constraint_parsing', "  ⚠️  Node type: %s", e.details.get('node_type', 'unknown'))
+            self.trace.warning(tx_id, 'constraint_parsing', "  🔒 HARD-REJECT: Transaction rejected due to unsupported constraint syntax")
             
             layer_results['constraint_parsing'] = False
+            self.trace.mark(tx_id, 'constraint_parsing', layer_results['constraint_parsing'])
             
             # END TRANSACTION: Record metrics before returning
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
@@ -663,8 +847,11 @@ class AethelJudge:
                 }
             }
         
+        self.trace.mark(tx_id, 'constraint_parsing', True)
+        
         if not all_post_conditions:
             layer_results['z3_prover'] = False
+            self.trace.mark(tx_id, 'z3_prover', layer_results['z3_prover'])
             self.sentinel_monitor.end_transaction(tx_id, layer_results)
             return {
                 'status': 'ERROR',
@@ -676,6 +863,16 @@ class AethelJudge:
         unified_condition = And(all_post_conditions)
         
         # 7. Adicionar ao solver e verificar COM TIMEOUT
+        if self.incremental:
+            # Guards shared with the previous intent stay asserted; the
+            # intent's own assertions live in a scope popped after the check
+            self._enter_guard_scopes(guards)
+            self.solver.push()
+        else:
+            for _, z3_expr in guards:
+                self.solver.add(z3_expr)
+        if conservation_constraint is not None:
+            self.solver.add(conservation_constraint)
         self.solver.add(unified_condition)
         
         # v1.9.0: Apply Adaptive Rigor configuration
@@ -683,86 +880,129 @@ class AethelJudge:
         z3_timeout_ms = current_config.z3_timeout_seconds * 1000
         self.solver.set("timeout", z3_timeout_ms)
         
-        print(f"\n⏱️  Executando Z3 com timeout de {z3_timeout_ms}ms (Adaptive Rigor: {self.adaptive_rigor.current_mode.value})...")
+        self.trace.debug(tx_id, 'z3_prover', "\n⏱️  Executando Z3 com timeout de %dms (Adaptive Rigor: %s)...", z3_timeout_ms, self.adaptive_rigor.current_mode.value)
         start_time = time.time()
         
-        # RVC-001 FIX: Fail-Closed Z3 Solver
-        # CRITICAL: Only z3.sat is accepted. z3.unknown and exceptions MUST reject.
         try:
-            result = self.solver.check()
-            elapsed_ms = (time.time() - start_time) * 1000
+            # RVC-001 FIX: Fail-Closed Z3 Solver
+            # CRITICAL: Only z3.sat is accepted. z3.unknown and exceptions MUST reject.
+            try:
+                result = self.solver.check()
+                elapsed_ms = (time.time() - start_time) * 1000
             
-            print(f"\n🔍 Resultado da verificação unificada: {result} (tempo: {elapsed_ms:.0f}ms)")
+                self.trace.info(tx_id, 'z3_prover', "\n🔍 Resultado da verificação unificada: %s (tempo: %.0fms)", result, elapsed_ms)
             
-            # 8. Interpretar resultado - FAIL-CLOSED ESTRITO
-            if result == sat:
-                # Existe uma realidade onde TODAS as condições são verdadeiras!
-                model = self.solver.model()
-                print("  ✅ PROVED - Todas as pós-condições são consistentes!")
-                layer_results['z3_prover'] = True
+                # 8. Interpretar resultado - FAIL-CLOSED ESTRITO
+                if result == sat:
+                    # Existe uma realidade onde TODAS as condições são verdadeiras!
+                    model = self.solver.model()
+                    self.trace.info(tx_id, 'z3_prover', "  ✅ PROVED - Todas as pós-condições são consistentes!")
+                    layer_results['z3_prover'] = True
+                    self.trace.mark(tx_id, 'z3_prover', layer_results['z3_prover'])
                 
-                # END TRANSACTION: Record metrics with success
-                metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
+                    # END TRANSACTION: Record metrics with success
+                    metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
                 
-                return {
-                    'status': 'PROVED',
-                    'message': 'O código é matematicamente seguro. Todas as pós-condições são consistentes e prováveis.',
-                    'counter_examples': [],
-                    'model': self._format_model(model),
-                    'elapsed_ms': elapsed_ms,
-                    'telemetry': {
-                        'anomaly_score': metrics.anomaly_score,
-                        'cpu_time_ms': metrics.cpu_time_ms,
-                        'memory_delta_mb': metrics.memory_delta_mb
+                    return {
+                        'status': 'PROVED',
+                        'message': 'O código é matematicamente seguro. Todas as pós-condições são consistentes e prováveis.',
+                        'counter_examples': [],
+                        'model': self._format_model(model),
+                        'elapsed_ms': elapsed_ms,
+                        'telemetry': {
+                            'anomaly_score': metrics.anomaly_score,
+                            'cpu_time_ms': metrics.cpu_time_ms,
+                            'memory_delta_mb': metrics.memory_delta_mb
+                        }
                     }
-                }
-            elif result == unsat:
-                # Contradição detectada! Não existe realidade onde todas sejam verdadeiras
-                print("  ❌ FAILED - Contradição global detectada!")
-                layer_results['z3_prover'] = False
+                elif result == unsat:
+                    # Contradição detectada! Não existe realidade onde todas sejam verdadeiras
+                    self.trace.info(tx_id, 'z3_prover', "  ❌ FAILED - Contradição global detectada!")
+                    layer_results['z3_prover'] = False
+                    self.trace.mark(tx_id, 'z3_prover', layer_results['z3_prover'])
                 
-                # END TRANSACTION: Record metrics with failure
-                metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
+                    # END TRANSACTION: Record metrics with failure
+                    metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
                 
-                return {
-                    'status': 'FAILED',
-                    'message': 'As pós-condições são contraditórias ou não podem ser satisfeitas juntas. Contradição global detectada.',
-                    'counter_examples': [],
-                    'elapsed_ms': elapsed_ms,
-                    'telemetry': {
-                        'anomaly_score': metrics.anomaly_score,
-                        'cpu_time_ms': metrics.cpu_time_ms,
-                        'memory_delta_mb': metrics.memory_delta_mb
+                    return {
+                        'status': 'FAILED',
+                        'message': 'As pós-condições são contraditórias ou não podem ser satisfeitas juntas. Contradição global detectada.',
+                        'counter_examples': [],
+                        'elapsed_ms': elapsed_ms,
+                        'telemetry': {
+                            'anomaly_score': metrics.anomaly_score,
+                            'cpu_time_ms': metrics.cpu_time_ms,
+                            'memory_delta_mb': metrics.memory_delta_mb
+                        }
                     }
-                }
-            else:
-                # RVC-001 FIX: z3.unknown is REJECTED (Fail-Closed)
-                # Z3 não conseguiu determinar (timeout ou muito complexo)
-                print(f"  🚨 REJECTED - Z3 returned 'unknown': {self.solver.reason_unknown()}")
-                print("  🔒 FAIL-CLOSED: Proof unknown = REJECTED")
-                layer_results['z3_prover'] = False
+                else:
+                    # RVC-001 FIX: z3.unknown is REJECTED (Fail-Closed)
+                    # Z3 não conseguiu determinar (timeout ou muito complexo)
+                    self.trace.warning(tx_id, 'z3_prover', "  🚨 REJECTED - Z3 returned 'unknown': %s", self.solver.reason_unknown())
+                    self.trace.warning(tx_id, 'z3_prover', "  🔒 FAIL-CLOSED: Proof unknown = REJECTED")
+                    layer_results['z3_prover'] = False
+                    self.trace.mark(tx_id, 'z3_prover', layer_results['z3_prover'])
+                
+                    # Log to Gauntlet Report
+                    self.gauntlet_report.log_attack({
+                        'timestamp': time.time(),
+                        'attack_type': 'z3_unknown',
+                        'category': 'proof_failure',
+                        'code_snippet': str(data)[:500],
+                        'detection_method': 'z3_solver',
+                        'severity': 0.9,
+                        'blocked_by_layer': 'z3_prover',
+                        'metadata': {
+                            'reason_unknown': str(self.solver.reason_unknown()),
+                            'elapsed_ms': elapsed_ms
+                        }
+                    })
+                
+                    # END TRANSACTION: Record metrics with rejection
+                    metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
                 
+                    return {
+                        'status': 'REJECTED',
+                        'message': f'🔒 FAIL-CLOSED - Z3 returned unknown: {self.solver.reason_unknown()}. Cannot prove safety.',
+                        'counter_examples': [],
+                        'elapsed_ms': elapsed_ms,
+                        'telemetry': {
+                            'anomaly_score': metrics.anomaly_score,
+                            'cpu_time_ms': metrics.cpu_time_ms,
+                            'memory_delta_mb': metrics.memory_delta_mb
+                        }
+                    }
+        
+            except Exception as e:
+                # RVC-001 FIX: Any Z3 exception is REJECTED (Fail-Closed)
+                elapsed_ms = (time.time() - start_time) * 1000
+                self.trace.warning(tx_id, 'z3_prover', "  🚨 CRITICAL - Z3 Exception: %s", e)
+                self.trace.warning(tx_id, 'z3_prover', "  🔒 FAIL-CLOSED: Z3 exception = REJECTED")
+                layer_results['z3_prover'] = False
+                self.trace.mark(tx_id, 'z3_prover', layer_results['z3_prover'])
+            
                 # Log to Gauntlet Report
                 self.gauntlet_report.log_attack({
                     'timestamp': time.time(),
-                    'attack_type': 'z3_unknown',
+                    'attack_type': 'z3_exception',
                     'category': 'proof_failure',
                     'code_snippet': str(data)[:500],
                     'detection_method': 'z3_solver',
-                    'severity': 0.9,
+                    'severity': 1.0,  # Critical severity
                     'blocked_by_layer': 'z3_prover',
                     'metadata': {
-                        'reason_unknown': str(self.solver.reason_unknown()),
+                        'exception': str(e),
+                        'exception_type': type(e).__name__,
                         'elapsed_ms': elapsed_ms
                     }
                 })
-                
-                # END TRANSACTION: Record metrics with rejection
+            
+                # END TRANSACTION: Record metrics with critical failure
                 metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
-                
+            
                 return {
                     'status': 'REJECTED',
-                    'message': f'🔒 FAIL-CLOSED - Z3 returned unknown: {self.solver.reason_unknown()}. Cannot prove safety.',
+                    'message': f'🔒 FAIL-CLOSED - Z3 solver exception: {type(e).__name__}: {str(e)}',
                     'counter_examples': [],
                     'elapsed_ms': elapsed_ms,
                     'telemetry': {
@@ -771,44 +1011,9 @@ class AethelJudge:
                         'memory_delta_mb': metrics.memory_delta_mb
                     }
                 }
-        
-        except Exception as e:
-            # RVC-001 FIX: Any Z3 exception is REJECTED (Fail-Closed)
-            elapsed_ms = (time.time() - start_time) * 1000
-            print(f"  🚨 CRITICAL - Z3 Exception: {e}")
-            print("  🔒 FAIL-CLOSED: Z3 exception = REJECTED")
-            layer_results['z3_prover'] = False
-            
-            # Log to Gauntlet Report
-            self.gauntlet_report.log_attack({
-                'timestamp': time.time(),
-                'attack_type': 'z3_exception',
-                'category': 'proof_failure',
-                'code_snippet': str(data)[:500],
-                'detection_method': 'z3_solver',
-                'severity': 1.0,  # Critical severity
-                'blocked_by_layer': 'z3_prover',
-                'metadata': {
-                    'exception': str(e),
-                    'exception_type': type(e).__name__,
-                    'elapsed_ms': elapsed_ms
-                }
-            })
-            
-            # END TRANSACTION: Record metrics with critical failure
-            metrics = self.sentinel_monitor.end_transaction(tx_id, layer_results)
-            
-            return {
-                'status': 'REJECTED',
-                'message': f'🔒 FAIL-CLOSED - Z3 solver exception: {type(e).__name__}: {str(e)}',
-                'counter_examples': [],
-                'elapsed_ms': elapsed_ms,
-                'telemetry': {
-                    'anomaly_score': metrics.anomaly_score,
-                    'cpu_time_ms': metrics.cpu_time_ms,
-                    'memory_delta_mb': metrics.memory_delta_mb
-                }
-            }
+        finally:
+            if self.incremental:
+                self.solver.pop()
     
     def _extract_variables(self, constraints):
         """
@@ -858,13 +1063,13 @@ class AethelJudge:
                 left, right = constraint_str.split('<')
                 return self._parse_arithmetic_expr(left.strip()) < self._parse_arithmetic_expr(right.strip())
             else:
-                print(f"  ⚠️  Operador não reconhecido em: {constraint_str}")
+                self.trace.warning(None, 'constraint_parsing', "  ⚠️  Operador não reconhecido em: %s", constraint_str)
                 return None
         except UnsupportedConstraintError:
             # RVC2-004: Re-raise UnsupportedConstraintError to reject transaction
             raise
         except Exception as e:
-            print(f"  ⚠️  Erro ao parsear '{constraint_str}': {e}")
+            self.trace.warning(None, 'constraint_parsing', "  ⚠️  Erro ao parsear '%s': %s", constraint_str, e)
             return None
     
     def _parse_arithmetic_expr(self, expr_str):
@@ -899,7 +1104,7 @@ class AethelJudge:
             # RVC2-004: Re-raise UnsupportedConstraintError to reject transaction
             raise
         except Exception as e:
-            print(f"  ⚠️  Erro ao parsear expressão aritmética '{expr_str}': {e}")
+            self.trace.warning(None, 'constraint_parsing', "  ⚠️  Erro ao parsear expressão aritmética '%s': %s", expr_str, e)
             # Fallback: tentar como variável simples
             if expr_str not in self.variables:
                 self.variables[expr_str] = Int(expr_str)
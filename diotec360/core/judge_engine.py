@@ -0,0 +1,307 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Judge Engine - Shareable verification machinery for AethelJudge sessions
+
+An AethelJudge used to build all of its components on construction: the
+Z3 solver, the sanitizers (loading data/trojan_patterns.json), the overflow
+sentinel, Adaptive Rigor, the Gauntlet Report, the MOE orchestrator with its
+experts, and a crisis listener registered on the Sentinel Monitor singleton.
+Services that verify per request paid that on every call, and every judge
+left one more listener on the monitor.
+
+JudgeEngine owns those components and is not bound to an intent map. An
+AethelJudge built with engine=... is a cheap session: it binds the intent
+map and per-verification state to an existing engine.
+
+An engine is reused, not shared concurrently: its Z3 solver carries the
+assertions of the verification in progress. JudgeEnginePool hands each
+engine to one session at a time.
+"""
+
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from z3 import Solver
+
+from .conservation import ConservationChecker
+from .overflow import OverflowSentinel
+from .sanitizer import AethelSanitizer
+from .zkp_simulator import get_zkp_simulator
+from .sentinel_monitor import get_sentinel_monitor
+from .semantic_sanitizer import SemanticSanitizer
+from .adaptive_rigor import AdaptiveRigor
+from .gauntlet_report import GauntletReport
+from .verdict_cache import VerdictCache
+from .judge_trace import JudgeTrace, TraceLevel
+
+# v2.1: MOE Intelligence Layer imports
+try:
+    from ..moe.orchestrator import MOEOrchestrator
+    from ..moe.z3_expert import Z3Expert
+    from ..moe.sentinel_expert import SentinelExpert
+    from ..moe.guardian_expert import GuardianExpert
+    MOE_AVAILABLE = True
+except ImportError:
+    MOE_AVAILABLE = False
+
+
+# Intent verified by JudgeEnginePool.warm_up (pays Z3's first-check cost at startup)
+WARM_UP_INTENTS = {
+    '__warm_up__': {
+        'params': [],
+        'constraints': ['balance >= amount', 'amount > 0'],
+        'post_conditions': ['new_balance == balance - amount', 'new_balance >= 0'],
+    }
+}
+
+
+class JudgeEngine:
+    """
+    Verification components shared by successive AethelJudge sessions.
+
+    The engine's configuration is fixed at construction; sessions read its
+    components and reuse its solver and compiled constraints.
+    """
+
+    def __init__(self, enable_moe: bool = None, enable_verdict_cache: bool = None,
+                 verdict_cache: VerdictCache = None, quiet: bool = None, trace: JudgeTrace = None):
+        """
+        Build the engine components.
+
+        Args:
+            enable_moe: Enable MOE Intelligence Layer (default: read from AETHEL_ENABLE_MOE env var)
+            enable_verdict_cache: Reuse verdicts of identical intents (default: read from
+                AETHEL_VERDICT_CACHE env var)
+            verdict_cache: Cache instance to use (implies enable_verdict_cache)
+            quiet: Production mode with zero console output (default: read from
+                AETHEL_JUDGE_QUIET env var)
+            trace: Event/timing recorder to use (default: a new JudgeTrace whose console
+                level is read from AETHEL_JUDGE_LOG_LEVEL, default DEBUG)
+        """
+        # Structured events replace console prints; created first so every
+        # component below can report through it
+        if trace is None:
+            level_name = os.environ.get('AETHEL_JUDGE_LOG_LEVEL', 'debug').upper()
+            trace = JudgeTrace(level=TraceLevel.__members__.get(level_name, TraceLevel.DEBUG))
+        if quiet is None:
+            quiet = os.environ.get('AETHEL_JUDGE_QUIET', 'false').lower() == 'true'
+        if quiet:
+            trace.set_level(TraceLevel.QUIET)
+        self.trace = trace
+
+        self.solver = Solver()
+        self.sanitizer = AethelSanitizer()  # v1.5.1: Input Sanitizer
+        self.conservation_checker = ConservationChecker()  # v1.3: Conservation Checker
+        self.overflow_sentinel = OverflowSentinel()  # v1.4: Overflow Sentinel
+        self.zkp_engine = get_zkp_simulator()  # v1.6.2: ZKP Engine
+
+        # v1.9.0: Sentinel components
+        self.sentinel_monitor = get_sentinel_monitor()  # Telemetry system
+        self.semantic_sanitizer = SemanticSanitizer()  # Layer -1: Intent analysis
+        self.adaptive_rigor = AdaptiveRigor()  # Dynamic parameter adjustment
+        self.gauntlet_report = GauntletReport()  # Attack logging
+
+        # v1.9.0: Register Crisis Mode listener with Adaptive Rigor (once per engine)
+        self.sentinel_monitor.register_crisis_listener(self._on_crisis_mode_change)
+
+        # Incremental solving: constraint string -> compiled Z3 expression.
+        # Z3 variables are interned by name, so entries are valid for every intent map
+        self.compiled_constraints: Dict[str, Any] = {}
+
+        # v2.1.0: MOE Intelligence Layer
+        if enable_moe is None:
+            # Read from environment variable (default: False for backward compatibility)
+            enable_moe = os.environ.get('AETHEL_ENABLE_MOE', 'false').lower() == 'true'
+
+        self.moe_enabled = enable_moe and MOE_AVAILABLE
+        self.moe_orchestrator = None
+
+        if self.moe_enabled:
+            self.initialize_moe()
+
+        # Verdict Cache: content-addressed verdicts in front of the layer pipeline
+        if enable_verdict_cache is None:
+            # Default: False for backward compatibility
+            enable_verdict_cache = os.environ.get('AETHEL_VERDICT_CACHE', 'false').lower() == 'true'
+
+        if verdict_cache is None and enable_verdict_cache:
+            verdict_cache = VerdictCache()
+        self.verdict_cache = verdict_cache
+
+    def initialize_moe(self) -> Optional[Any]:
+        """
+        Initialize MOE Intelligence Layer with all experts (once per engine).
+
+        Creates and registers:
+        - Z3 Expert (mathematical logic specialist)
+        - Sentinel Expert (security specialist)
+        - Guardian Expert (financial specialist)
+
+        Returns:
+            The MOE orchestrator, or None if initialization failed
+        """
+        if self.moe_orchestrator is not None:
+            return self.moe_orchestrator
+
+        try:
+            # Create MOE Orchestrator
+            orchestrator = MOEOrchestrator(
+                max_workers=3,
+                expert_timeout=30,
+                telemetry_db_path=".aethel_moe/telemetry.db",
+                cache_ttl_seconds=300,
+                enable_cache=True
+            )
+
+            orchestrator.register_expert(Z3Expert())
+            orchestrator.register_expert(SentinelExpert())
+            orchestrator.register_expert(GuardianExpert())
+
+            self.moe_orchestrator = orchestrator
+            self.moe_enabled = True
+            self.trace.info(None, 'moe', "[JUDGE] ✅ MOE Intelligence Layer initialized with 3 experts")
+
+        except Exception as e:
+            self.trace.warning(None, 'moe', "[JUDGE] ⚠️  MOE initialization failed: %s", e)
+            self.moe_enabled = False
+            self.moe_orchestrator = None
+
+        return self.moe_orchestrator
+
+    def _on_crisis_mode_change(self, active: bool) -> None:
+        """
+        Handle Crisis Mode state changes from Sentinel Monitor.
+
+        Args:
+            active: True if Crisis Mode activated, False if deactivated
+        """
+        if active:
+            self.adaptive_rigor.activate_crisis_mode()
+            self.trace.warning(None, 'adaptive_rigor', "[JUDGE] 🚨 Crisis Mode activated - Adaptive Rigor engaged")
+        else:
+            self.adaptive_rigor.deactivate_crisis_mode()
+            self.trace.info(None, 'adaptive_rigor', "[JUDGE] ✅ Crisis Mode deactivated - Gradual recovery initiated")
+
+
+class JudgeEnginePool:
+    """
+    Fixed set of pre-built engines, each checked out by one session at a time.
+
+    Example:
+        pool = JudgeEnginePool(size=4, quiet=True)
+        with pool.session(intent_map) as judge:
+            result = judge.verify_logic('transfer')
+    """
+
+    def __init__(self, size: int = 1, warm_up: bool = True, **engine_kwargs: Any):
+        """
+        Build `size` engines now.
+
+        Args:
+            size: Number of engines (concurrent sessions)
+            warm_up: Verify a small intent on each engine so Z3's first-check
+                cost is paid here rather than by the first request
+            **engine_kwargs: Passed to every JudgeEngine
+        """
+        if size < 1:
+            raise ValueError("JudgeEnginePool size must be at least 1")
+
+        self.size = size
+        self._available: "queue.Queue[JudgeEngine]" = queue.Queue()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_ms = 0.0
+
+        start_time = time.perf_counter()
+        for _ in range(size):
+            engine = JudgeEngine(**engine_kwargs)
+            if warm_up:
+                self._warm_up(engine)
+            self._available.put(engine)
+        self.construction_ms = (time.perf_counter() - start_time) * 1000
+
+    @staticmethod
+    def _warm_up(engine: JudgeEngine) -> None:
+        from .judge import AethelJudge
+
+        AethelJudge(WARM_UP_INTENTS, engine=engine).verify_logic('__warm_up__')
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """
+        Borrow an engine, blocking until one is free.
+
+        Raises:
+            queue.Empty: No engine became free within timeout
+        """
+        try:
+            engine = self._available.get_nowait()
+            waited = False
+        except queue.Empty:
+            start_time = time.perf_counter()
+            engine = self._available.get(timeout=timeout)
+            waited = True
+
+        with self._lock:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_ms += (time.perf_counter() - start_time) * 1000
+        try:
+            yield engine
+        finally:
+            self._available.put(engine)
+
+    @contextmanager
+    def session(self, intent_map: Dict[str, Any], timeout: Optional[float] = None, **judge_kwargs: Any):
+        """
+        Borrow an engine and bind an AethelJudge session to it.
+
+        Args:
+            intent_map: Intent specifications for this session
+            timeout: Seconds to wait for a free engine (None: forever)
+            **judge_kwargs: Session options, e.g. incremental=True
+        """
+        from .judge import AethelJudge
+
+        with self.checkout(timeout) as engine:
+            yield AethelJudge(intent_map, engine=engine, **judge_kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with size, free engines, checkouts and wait times
+        """
+        with self._lock:
+            return {
+                'size': self.size,
+                'available': self._available.qsize(),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'total_wait_ms': self._wait_ms,
+                'construction_ms': self.construction_ms,
+            }
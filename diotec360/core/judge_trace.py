@@ -0,0 +1,249 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Judge Trace - Structured events and layer timings for AethelJudge
+
+The judge used to print() every banner, constraint echo and MOE verdict
+unconditionally. Under load the formatting and stdout writes were measurable
+and lines from concurrent verifications interleaved. JudgeTrace replaces them:
+
+- Level-gated events: messages use %-style arguments and are only formatted
+  when a console level or a subscriber wants them
+- Structured TraceEvent objects for subscribers (tx_id, layer, level, message)
+- An in-memory ring buffer of per-layer timings for the last N transactions
+- QUIET level: zero console output, timings are still recorded
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+
+class TraceLevel(IntEnum):
+    """Event levels (same numbering as the logging module)"""
+    DEBUG = 10      # Layer banners, per-constraint echoes
+    INFO = 20       # Verification start and verdicts
+    WARNING = 30    # Detections, rejections, fail-closed events
+    QUIET = 100     # Nothing reaches the console
+
+
+@dataclass
+class TraceEvent:
+    """A single judge event"""
+    tx_id: Optional[str]
+    layer: str
+    level: TraceLevel
+    message: str
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return {
+            'tx_id': self.tx_id,
+            'layer': self.layer,
+            'level': self.level.name,
+            'message': self.message,
+            'timestamp': self.timestamp
+        }
+
+
+@dataclass
+class TransactionTrace:
+    """Layer timings of one verification, in pipeline order"""
+    tx_id: str
+    intent_name: str
+    started_at: float
+    layers: List[Dict[str, Any]] = field(default_factory=list)
+    status: Optional[str] = None
+    total_ms: Optional[float] = None
+    _last_mark: float = field(default=0.0, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return {
+            'tx_id': self.tx_id,
+            'intent_name': self.intent_name,
+            'started_at': self.started_at,
+            'layers': [dict(layer) for layer in self.layers],
+            'status': self.status,
+            'total_ms': self.total_ms
+        }
+
+
+class JudgeTrace:
+    """
+    Event and timing recorder shared by one or more judges.
+
+    Console output goes to stdout for events at or above `level`.
+    Subscribers receive every event at or above `subscriber_level`.
+    """
+
+    def __init__(
+        self,
+        level: TraceLevel = TraceLevel.DEBUG,
+        max_transactions: int = 256,
+        subscriber_level: TraceLevel = TraceLevel.DEBUG
+    ):
+        """
+        Initialize the trace.
+
+        Args:
+            level: Minimum level printed to the console (QUIET: none)
+            max_transactions: Size of the per-transaction timing ring buffer
+            subscriber_level: Minimum level delivered to subscribers
+        """
+        self.level = level
+        self.subscriber_level = subscriber_level
+        self.max_transactions = max_transactions
+
+        self._subscribers: List[Callable[[TraceEvent], None]] = []
+        self._transactions: "OrderedDict[str, TransactionTrace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Lowest level anyone listens to; events below it are dropped unformatted
+        self._threshold = self._compute_threshold()
+
+    def set_level(self, level: TraceLevel) -> None:
+        """Change the console level"""
+        self.level = level
+        self._threshold = self._compute_threshold()
+
+    def subscribe(self, callback: Callable[[TraceEvent], None]) -> None:
+        """
+        Register a callback for structured events.
+
+        Args:
+            callback: Function that accepts a TraceEvent
+        """
+        self._subscribers.append(callback)
+        self._threshold = self._compute_threshold()
+
+    def is_enabled_for(self, level: TraceLevel) -> bool:
+        """Whether an event at `level` would be delivered anywhere"""
+        return level >= self._threshold
+
+    def debug(self, tx_id: Optional[str], layer: str, message: str, *args: Any) -> None:
+        if TraceLevel.DEBUG >= self._threshold:
+            self._emit(TraceLevel.DEBUG, tx_id, layer, message, args)
+
+    def info(self, tx_id: Optional[str], layer: str, message: str, *args: Any) -> None:
+        if TraceLevel.INFO >= self._threshold:
+            self._emit(TraceLevel.INFO, tx_id, layer, message, args)
+
+    def warning(self, tx_id: Optional[str], layer: str, message: str, *args: Any) -> None:
+        if TraceLevel.WARNING >= self._threshold:
+            self._emit(TraceLevel.WARNING, tx_id, layer, message, args)
+
+    def begin(self, tx_id: str, intent_name: str) -> None:
+        """Open the timing record of a verification"""
+        now = time.perf_counter()
+        trace = TransactionTrace(tx_id=tx_id, intent_name=intent_name, started_at=time.time())
+        trace._last_mark = now
+        with self._lock:
+            self._transactions[tx_id] = trace
+            while len(self._transactions) > self.max_transactions:
+                self._transactions.popitem(last=False)
+
+    def mark(self, tx_id: str, layer: str, passed: Optional[bool] = None) -> None:
+        """
+        Record that a layer finished.
+
+        The layer's duration is the time since the previous mark (or begin).
+        """
+        now = time.perf_counter()
+        trace = self._transactions.get(tx_id)
+        if trace is None:
+            return
+        trace.layers.append({
+            'layer': layer,
+            'duration_ms': (now - trace._last_mark) * 1000,
+            'passed': passed
+        })
+        trace._last_mark = now
+
+    def end(self, tx_id: str, status: str) -> None:
+        """Close the timing record of a verification"""
+        trace = self._transactions.get(tx_id)
+        if trace is None:
+            return
+        trace.status = status
+        trace.total_ms = sum(layer['duration_ms'] for layer in trace.layers)
+
+    def get_transaction(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the layer timings of a recent verification.
+
+        Returns:
+            Dictionary form of the TransactionTrace, or None if evicted
+        """
+        with self._lock:
+            trace = self._transactions.get(tx_id)
+            return trace.to_dict() if trace is not None else None
+
+    def recent_transactions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Layer timings of the most recent verifications, newest first"""
+        with self._lock:
+            traces = list(self._transactions.values())[-limit:]
+        return [trace.to_dict() for trace in reversed(traces)]
+
+    def get_layer_statistics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate layer timings over the ring buffer.
+
+        Returns:
+            layer -> {'count', 'avg_ms', 'max_ms'}
+        """
+        with self._lock:
+            traces = list(self._transactions.values())
+
+        totals: Dict[str, List[float]] = {}
+        for trace in traces:
+            for layer in trace.layers:
+                totals.setdefault(layer['layer'], []).append(layer['duration_ms'])
+
+        return {
+            layer: {
+                'count': len(durations),
+                'avg_ms': sum(durations) / len(durations),
+                'max_ms': max(durations)
+            }
+            for layer, durations in totals.items()
+        }
+
+    def _compute_threshold(self) -> int:
+        if self._subscribers:
+            return min(self.level, self.subscriber_level)
+        return self.level
+
+    def _emit(self, level: TraceLevel, tx_id: Optional[str], layer: str, message: str, args: tuple) -> None:
+        if args:
+            message = message % args
+
+        if level >= self.level:
+            sys.stdout.write(message + "\n")
+
+        if self._subscribers and level >= self.subscriber_level:
+            event = TraceEvent(tx_id=tx_id, layer=layer, level=level, message=message, timestamp=time.time())
+            for callback in self._subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    sys.stdout.write(f"[JUDGE_TRACE] Subscriber error: {e}\n")
@@ -165,7 +165,7 @@ class LinearizabilityProver:
                     tx1_after = tx_vars[tx1.id].get(f"state_after_{account_id}")
                     tx2_before = tx_vars[tx2.id].get(f"state_before_{account_id}")
                     
-                    if tx1_after and tx2_before:
+                    if tx1_after is not None and tx2_before is not None:
                         # Conditional constraint: if T1 → T2, then states match
                         constraints.append(
                             z3.Implies(
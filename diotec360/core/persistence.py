@@ -321,6 +321,44 @@ class AethelAuditor:
         self.conn.close()
 
 
+def build_state_tree(state: Dict[str, Any]):
+    """
+    Build the authenticated Merkle tree over all entries of a state dict.
+    
+    Returns:
+        MerkleTree whose root hash is the state root
+    """
+    # Deferred: diotec360.consensus imports this module
+    from diotec360.consensus.merkle_tree import MerkleTree
+    
+    tree = MerkleTree(compat_mode=False)
+    tree.batch_update(state)
+    return tree
+
+
+def legacy_state_root(state: Dict[str, Any]) -> str:
+    """
+    Calculate the pre-v2.1 flat root of a state dict.
+    
+    This is the root exchanged with peers (/api/lattice/state and the nexo
+    peer sync), so nodes running earlier releases can still verify it.
+    """
+    if not state:
+        return hashlib.sha256(b"empty").hexdigest()
+    
+    # Sort keys for deterministic ordering
+    sorted_items = sorted(state.items())
+    
+    # Combine all key-value hashes
+    combined = ""
+    for key, value in sorted_items:
+        entry_hash = hashlib.sha256(f"{key}:{json.dumps(value)}".encode()).hexdigest()
+        combined += entry_hash
+    
+    # Generate root hash
+    return hashlib.sha256(combined.encode()).hexdigest()
+
+
 class MerkleStateDB:
     """
     The Reality DB - Authenticated State Storage.
@@ -332,15 +370,24 @@ class MerkleStateDB:
     outside the system, the root hash breaks and the system detects tampering.
     """
     
-    def __init__(self, db_path: str = ".aethel_state"):
+    def __init__(self, db_path: str = ".aethel_state", deferred_root: bool = False):
+        """
+        Args:
+            db_path: Directory for snapshot and WAL files
+            deferred_root: Skip root recomputation on each write; call
+                commit() to publish the root (bulk ingestion)
+        """
         self.db_path = Path(db_path)
         self.db_path.mkdir(parents=True, exist_ok=True)
         
         self.snapshot_path = self.db_path / "snapshot.json"
         self.wal_path = self.db_path / "wal.log"  # Write-ahead log
+        self.deferred_root = deferred_root
         
         # In-memory state (would be RocksDB in production)
-        self.state = {}
+        self._state = {}
+        self._tree = build_state_tree(self._state)
+        self._legacy_root: Optional[str] = None  # Cached until the next write
         self.merkle_root = None
         
         # Load from disk if exists
@@ -350,50 +397,104 @@ class MerkleStateDB:
         if self.merkle_root:
             print(f"   Root: {self.merkle_root[:32]}...")
     
+    @property
+    def state(self) -> Dict[str, Any]:
+        """Current key-value state"""
+        return self._state
+    
+    @state.setter
+    def state(self, value: Dict[str, Any]):
+        """Replace the whole state and rebuild the authenticated index"""
+        self._state = value
+        self._tree = build_state_tree(value)
+        self._legacy_root = None
+        self.merkle_root = self._tree.get_root_hash()
+    
     def _calculate_merkle_root(self) -> str:
-        """Calculate Merkle root from current state"""
-        if not self.state:
-            return hashlib.sha256(b"empty").hexdigest()
-        
-        # Sort keys for deterministic ordering
-        sorted_items = sorted(self.state.items())
-        
-        # Combine all key-value hashes
-        combined = ""
-        for key, value in sorted_items:
-            entry_hash = hashlib.sha256(f"{key}:{json.dumps(value)}".encode()).hexdigest()
-            combined += entry_hash
+        """
+        Calculate Merkle root from current state.
         
-        # Generate root hash
-        root = hashlib.sha256(combined.encode()).hexdigest()
-        return root
+        Rebuilds the tree from scratch so it is independent of the cached
+        index; used for integrity checks, not on the write path.
+        """
+        return build_state_tree(self.state).get_root_hash()
+    
+    def _calculate_legacy_merkle_root(self) -> str:
+        """Calculate the pre-v2.1 flat root (for snapshot migration)"""
+        return legacy_state_root(self.state)
     
     def put(self, key: str, value: Any):
-        """Store key-value pair and update Merkle root"""
-        self.state[key] = value
-        self.merkle_root = self._calculate_merkle_root()
+        """Store key-value pair and update Merkle root (O(log n))"""
+        self._state[key] = value
+        self._tree.update(key, value)
+        self._legacy_root = None
+        
+        if not self.deferred_root:
+            self.merkle_root = self._tree.get_root_hash()
     
     def get(self, key: str) -> Optional[Any]:
         """Retrieve value by key"""
-        return self.state.get(key)
+        return self._state.get(key)
     
     def delete(self, key: str):
-        """Delete key and update Merkle root"""
-        if key in self.state:
-            del self.state[key]
-            self.merkle_root = self._calculate_merkle_root()
+        """Delete key and update Merkle root (O(log n))"""
+        if key in self._state:
+            del self._state[key]
+            self._tree.delete(key)
+            self._legacy_root = None
+            
+            if not self.deferred_root:
+                self.merkle_root = self._tree.get_root_hash()
+    
+    def commit(self) -> str:
+        """
+        Publish the Merkle root for all writes since the last commit.
+        
+        Only needed in deferred_root mode; otherwise the root is always
+        current.
+        
+        Returns:
+            Current Merkle root
+        """
+        self.merkle_root = self._tree.get_root_hash()
+        return self.merkle_root
     
     def get_root(self) -> str:
         """Get current Merkle root"""
         return self.merkle_root
     
+    def get_legacy_root(self) -> str:
+        """
+        Get the root in the legacy flat format, as exchanged with peers.
+        
+        O(n) to compute; cached until the next write.
+        """
+        if self._legacy_root is None:
+            self._legacy_root = legacy_state_root(self._state)
+        return self._legacy_root
+    
     def verify_integrity(self) -> bool:
-        """Verify database integrity by recalculating Merkle root"""
+        """
+        Verify database integrity by recalculating Merkle root.
+        
+        A root in the legacy flat format is accepted if it matches the
+        state, and is upgraded to the current format.
+        """
         calculated_root = self._calculate_merkle_root()
-        return calculated_root == self.merkle_root
+        if calculated_root == self.merkle_root:
+            return True
+        
+        if self.merkle_root == self._calculate_legacy_merkle_root():
+            self.merkle_root = calculated_root
+            return True
+        
+        return False
     
     def save_snapshot(self):
         """Save state snapshot to disk"""
+        if self.deferred_root:
+            self.commit()
+        
         snapshot = {
             'state': self.state,
             'merkle_root': self.merkle_root,
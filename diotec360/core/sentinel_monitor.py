@@ -34,7 +34,6 @@ Date: February 4, 2026
 from dataclasses import dataclass, field
 from typing import Dict, Optional, List, Any
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
 import time
 import psutil
 import statistics
@@ -49,6 +48,7 @@ from diotec360.core.thread_cpu_accounting import (
     ThreadCPUMetrics,
     CPUViolation
 )
+from diotec360.core.telemetry_sink import TelemetrySink
 
 
 @dataclass
@@ -204,8 +204,12 @@ class SentinelMonitor:
         # Request rate tracking (for DoS detection)
         self.request_timestamps: deque[float] = deque(maxlen=1000)
         
-        # Thread pool for async database operations
-        self._db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sentinel_db")
+        # Verdict cache lookups reported by AethelJudge
+        self.verdict_cache_hits = 0
+        self.verdict_cache_misses = 0
+        
+        # Batched writer for telemetry rows (one WAL connection, bounded queue)
+        self._telemetry_sink = TelemetrySink(self.db_path)
         
         # OPTIMIZATION: Cache psutil Process object to avoid repeated lookups
         self._process = psutil.Process()
@@ -394,11 +398,8 @@ class SentinelMonitor:
         # Update baseline (optimized to run every 10 transactions)
         self._update_baseline()
         
-        # Persist to database (async)
-        # OPTIMIZATION: Skip database writes in high-throughput scenarios
-        # Database writes add significant overhead and should be batched
-        if len(self.metrics_window) % 100 == 0:  # Only persist every 100th transaction
-            self._persist_metrics(metrics)
+        # Persist to database (queued, written in batches)
+        self._persist_metrics(metrics)
         
         # OPTIMIZATION: Only check crisis conditions every 10 transactions
         if len(self.metrics_window) % 10 == 0:
@@ -528,26 +529,20 @@ class SentinelMonitor:
             request_rate: Current request rate (requests/second)
             condition: Description of triggering condition
         """
-        try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO crisis_mode_transitions 
-                (timestamp, transition_type, anomaly_rate, request_rate, triggering_condition)
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                time.time(),
-                transition_type,
-                anomaly_rate,
-                request_rate,
-                condition
-            ))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[SENTINEL] Error logging crisis transition: {e}")
+        # Transitions are rare and audited: write them through immediately
+        self._telemetry_sink.submit("""
+            INSERT INTO crisis_mode_transitions 
+            (timestamp, transition_type, anomaly_rate, request_rate, triggering_condition)
+            VALUES (?, ?, ?, ?, ?)
+        """, (
+            time.time(),
+            transition_type,
+            anomaly_rate,
+            request_rate,
+            condition
+        ))
+        if not self._telemetry_sink.flush(timeout=5.0):
+            print("[SENTINEL] Error logging crisis transition: telemetry flush timed out")
     
     def _activate_crisis_mode(self) -> None:
         """
@@ -701,27 +696,18 @@ class SentinelMonitor:
             tx_id: Transaction ID
             violation: CPUViolation details
         """
-        try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO cpu_violations 
-                (tx_id, timestamp, thread_id, cpu_time_ms, threshold_ms, excess_ms)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                tx_id,
-                violation.timestamp,
-                violation.thread_id,
-                violation.cpu_time_ms,
-                violation.threshold_ms,
-                violation.excess_ms
-            ))
-            
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[SENTINEL] Error logging CPU violation: {e}")
+        self._telemetry_sink.submit("""
+            INSERT INTO cpu_violations 
+            (tx_id, timestamp, thread_id, cpu_time_ms, threshold_ms, excess_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            tx_id,
+            violation.timestamp,
+            violation.thread_id,
+            violation.cpu_time_ms,
+            violation.threshold_ms,
+            violation.excess_ms
+        ))
     
     def register_crisis_listener(self, callback: callable) -> None:
         """
@@ -732,6 +718,26 @@ class SentinelMonitor:
         """
         self.crisis_mode_listeners.append(callback)
     
+    def record_verdict_cache(self, hit: bool) -> None:
+        """
+        Record a verdict cache lookup made by the judge.
+        
+        Args:
+            hit: True if a cached verdict was reused
+        """
+        if hit:
+            self.verdict_cache_hits += 1
+        else:
+            self.verdict_cache_misses += 1
+    
+    def _verdict_cache_statistics(self) -> Dict[str, Any]:
+        lookups = self.verdict_cache_hits + self.verdict_cache_misses
+        return {
+            'hits': self.verdict_cache_hits,
+            'misses': self.verdict_cache_misses,
+            'hit_rate': self.verdict_cache_hits / lookups if lookups else 0.0
+        }
+    
     def get_statistics(self, time_window_seconds: int = 3600) -> Dict[str, Any]:
         """
         Return aggregated statistics for monitoring.
@@ -753,7 +759,8 @@ class SentinelMonitor:
                 'time_window_seconds': time_window_seconds,
                 'transaction_count': 0,
                 'baseline': self.baseline.to_dict(),
-                'crisis_mode_active': self.crisis_mode_active
+                'crisis_mode_active': self.crisis_mode_active,
+                'verdict_cache': self._verdict_cache_statistics()
             }
         
         # Calculate statistics
@@ -772,58 +779,52 @@ class SentinelMonitor:
             'baseline': self.baseline.to_dict(),
             'crisis_mode_active': self.crisis_mode_active,
             'request_rate_per_second': len([ts for ts in self.request_timestamps 
-                                           if current_time - ts <= 1.0])
+                                           if current_time - ts <= 1.0]),
+            'verdict_cache': self._verdict_cache_statistics()
         }
     
     def _persist_metrics(self, metrics: TransactionMetrics) -> None:
         """
-        Persist metrics to SQLite database asynchronously.
+        Queue metrics for the telemetry sink.
         
-        Uses ThreadPoolExecutor to avoid blocking the main thread.
-        Database writes happen in background threads.
+        The row is written by the sink's flusher thread together with other
+        queued rows, so end_transaction never waits on SQLite.
         
         Args:
             metrics: TransactionMetrics to persist
         """
-        # Submit to thread pool for async execution
-        self._db_executor.submit(self._persist_metrics_sync, metrics)
+        # Determine outcome
+        outcome = "accepted" if all(metrics.layer_results.values()) else "rejected"
+        
+        self._telemetry_sink.submit("""
+            INSERT OR REPLACE INTO transaction_metrics 
+            (tx_id, timestamp, cpu_time_ms, memory_delta_mb, z3_duration_ms, 
+             anomaly_score, layer_results, outcome, thread_cpu_ms, cpu_violation)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            metrics.tx_id,
+            metrics.start_time,
+            metrics.cpu_time_ms,
+            metrics.memory_delta_mb,
+            metrics.z3_duration_ms,
+            metrics.anomaly_score,
+            json.dumps(metrics.layer_results),
+            outcome,
+            metrics.thread_cpu_ms,
+            1 if metrics.cpu_violation else 0
+        ))
     
-    def _persist_metrics_sync(self, metrics: TransactionMetrics) -> None:
+    def flush_telemetry(self, timeout: Optional[float] = None) -> bool:
         """
-        Synchronous database write (called by thread pool).
+        Wait until all queued telemetry rows are written.
         
         Args:
-            metrics: TransactionMetrics to persist
-        """
-        try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Determine outcome
-            outcome = "accepted" if all(metrics.layer_results.values()) else "rejected"
-            
-            cursor.execute("""
-                INSERT OR REPLACE INTO transaction_metrics 
-                (tx_id, timestamp, cpu_time_ms, memory_delta_mb, z3_duration_ms, 
-                 anomaly_score, layer_results, outcome, thread_cpu_ms, cpu_violation)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metrics.tx_id,
-                metrics.start_time,
-                metrics.cpu_time_ms,
-                metrics.memory_delta_mb,
-                metrics.z3_duration_ms,
-                metrics.anomaly_score,
-                json.dumps(metrics.layer_results),
-                outcome,
-                metrics.thread_cpu_ms,
-                1 if metrics.cpu_violation else 0
-            ))
+            timeout: Maximum seconds to wait (None = no limit)
             
-            conn.commit()
-            conn.close()
-        except Exception as e:
-            print(f"[SENTINEL] Error persisting metrics: {e}")
+        Returns:
+            True if everything queued so far was written
+        """
+        return self._telemetry_sink.flush(timeout)
     
     def shutdown(self) -> None:
         """
@@ -831,7 +832,7 @@ class SentinelMonitor:
         
         Waits for all pending database writes to complete.
         """
-        self._db_executor.shutdown(wait=True)
+        self._telemetry_sink.close()
 
 
 # Singleton instance
@@ -0,0 +1,413 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Aethel Speculative Executor - Synchrony Protocol
+
+Optimistic (Block-STM style) execution of a transaction batch. Instead of
+deriving independent sets from static read/write sets and running them level
+by level, every transaction runs at once against a multi-version store:
+
+1. Speculative pass: all transactions execute concurrently. A read of
+   account A by transaction i returns the version written by the highest
+   transaction j < i that has published a write to A so far (or the initial
+   state), and the version is recorded in i's read set. Writes are published
+   as version (i, incarnation) as soon as i finishes.
+2. Validation in batch order: transaction i is valid if every version in its
+   read set is still the latest version below i. All transactions before i
+   are final at that point, so an invalid transaction re-executed inline
+   reads exactly the serial-order state.
+
+The final states are therefore identical to executing the batch serially in
+list order, while transactions that did not conflict never run twice.
+
+Author: Aethel Team
+Version: 1.8.0
+"""
+
+from typing import List, Dict, Set, Optional, Tuple, Any, Callable
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bisect
+import threading
+import time
+import copy
+
+from diotec360.core.synchrony import (
+    Transaction,
+    ExecutionEvent,
+    ExecutionResult,
+    EventType,
+    TimeoutError
+)
+
+
+# Version of a value in the store: (writer transaction index, incarnation),
+# or None for the initial state
+Version = Optional[Tuple[int, int]]
+
+# A transaction program reads account states through `read` and returns the
+# states it writes: program(transaction, read) -> {account_id: new_state}
+TransactionProgram = Callable[[Transaction, Callable[[str], Any]], Dict[str, Any]]
+
+
+def passthrough_program(transaction: Transaction, read: Callable[[str], Any]) -> Dict[str, Any]:
+    """
+    Read and rewrite every account of the transaction.
+
+    Same effect as ParallelExecutor._execute_transaction: balances are
+    unchanged and every account is written.
+    """
+    writes = {}
+    for account_id in transaction.accounts:
+        state = read(account_id)
+        writes[account_id] = state if state is not None else {"balance": 0}
+    return writes
+
+
+def apply_operations(transaction: Transaction, read: Callable[[str], Any]) -> Dict[str, Any]:
+    """
+    Apply debit/credit operations ({"type", "account", "amount"}) to balances.
+
+    Only accounts touched by an operation are written.
+    """
+    writes: Dict[str, Any] = {}
+    for op in transaction.operations:
+        if not isinstance(op, dict) or op.get("type") not in ("debit", "credit"):
+            continue
+        account_id = op["account"]
+        if account_id not in writes:
+            state = read(account_id)
+            writes[account_id] = state if state is not None else {"balance": 0}
+        sign = -1 if op["type"] == "debit" else 1
+        writes[account_id]["balance"] = writes[account_id].get("balance", 0) + sign * op["amount"]
+    return writes
+
+
+class MultiVersionStore:
+    """
+    Account states versioned by the index of the transaction that wrote them.
+
+    Each account keeps its writers sorted by transaction index, so a read
+    for transaction i is a binary search for the highest writer below i.
+    """
+
+    def __init__(self, initial_states: Dict[str, Any]):
+        self._initial = initial_states
+        self._writers: Dict[str, List[int]] = {}  # account -> sorted writer indices
+        self._values: Dict[Tuple[str, int], Tuple[int, Any]] = {}  # (account, index) -> (incarnation, state)
+        self._written: Dict[int, Set[str]] = {}  # index -> accounts in its latest write set
+        self._lock = threading.Lock()
+
+    def read(self, account_id: str, txn_index: int) -> Tuple[Version, Any]:
+        """Latest version of account_id visible to txn_index, with a private copy of the state"""
+        with self._lock:
+            writers = self._writers.get(account_id)
+            if writers:
+                position = bisect.bisect_left(writers, txn_index)
+                if position > 0:
+                    writer = writers[position - 1]
+                    incarnation, state = self._values[(account_id, writer)]
+                    return (writer, incarnation), copy.deepcopy(state)
+            return None, copy.deepcopy(self._initial.get(account_id))
+
+    def latest_version(self, account_id: str, txn_index: int) -> Version:
+        """Version read() would return now, without the state"""
+        with self._lock:
+            writers = self._writers.get(account_id)
+            if writers:
+                position = bisect.bisect_left(writers, txn_index)
+                if position > 0:
+                    writer = writers[position - 1]
+                    return writer, self._values[(account_id, writer)][0]
+            return None
+
+    def publish(self, txn_index: int, incarnation: int, writes: Dict[str, Any]) -> None:
+        """Replace txn_index's write set with `writes` as version (txn_index, incarnation)"""
+        with self._lock:
+            for account_id in self._written.get(txn_index, set()) - writes.keys():
+                self._writers[account_id].remove(txn_index)
+                del self._values[(account_id, txn_index)]
+            for account_id, state in writes.items():
+                if (account_id, txn_index) not in self._values:
+                    bisect.insort(self._writers.setdefault(account_id, []), txn_index)
+                self._values[(account_id, txn_index)] = (incarnation, state)
+            self._written[txn_index] = set(writes)
+
+    def final_states(self) -> Dict[str, Any]:
+        """Initial states overlaid with the last write to each account"""
+        with self._lock:
+            states = copy.deepcopy(self._initial)
+            for account_id, writers in self._writers.items():
+                if writers:
+                    states[account_id] = copy.deepcopy(self._values[(account_id, writers[-1])][1])
+            return states
+
+
+@dataclass
+class Incarnation:
+    """One execution of a transaction"""
+    index: int
+    number: int
+    thread_id: int
+    reads: Dict[str, Version] = field(default_factory=dict)
+    read_values: Dict[str, Any] = field(default_factory=dict)
+    writes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[Exception] = None
+    start_time: float = 0.0
+    end_time: float = 0.0
+
+
+class SpeculativeExecutor:
+    """
+    Executes a batch optimistically against a multi-version store.
+
+    Drop-in alternative to ParallelExecutor.execute_parallel that needs no
+    dependency graph: conflicts are discovered from the versions actually
+    read, and only transactions whose reads were invalidated run again.
+    Re-executions happen in batch order, so results are deterministic and
+    identical to serial execution.
+
+    Validates:
+        Requirements 2.1, 4.1 (results equivalent to a serial order)
+    """
+
+    def __init__(self,
+                 thread_count: int = 8,
+                 timeout_seconds: float = 30.0,
+                 program: Optional[TransactionProgram] = None):
+        """
+        Initialize speculative executor.
+
+        Args:
+            thread_count: Number of threads for the speculative pass (default 8)
+            timeout_seconds: Timeout for the speculative pass (default 30s)
+            program: Transaction program (default: passthrough_program, the
+                same effect as ParallelExecutor)
+        """
+        self.thread_count = thread_count
+        self.timeout_seconds = timeout_seconds
+        self.program = program or passthrough_program
+        self.executor = ThreadPoolExecutor(max_workers=thread_count)
+
+        # Statistics of the last execute() call
+        self.last_stats: Dict[str, Any] = {}
+
+    def _run(self,
+             transaction: Transaction,
+             index: int,
+             number: int,
+             store: MultiVersionStore) -> Incarnation:
+        """Execute one incarnation and publish its writes"""
+        incarnation = Incarnation(
+            index=index,
+            number=number,
+            thread_id=threading.get_ident(),
+            start_time=time.time()
+        )
+
+        def read(account_id: str) -> Any:
+            # Repeated reads within an incarnation see the same version
+            if account_id not in incarnation.reads:
+                version, state = store.read(account_id, index)
+                incarnation.reads[account_id] = version
+                incarnation.read_values[account_id] = state
+            return copy.deepcopy(incarnation.read_values[account_id])
+
+        try:
+            incarnation.writes = self.program(transaction, read)
+        except Exception as e:
+            # May be an artifact of a stale read; decided at validation
+            incarnation.error = e
+            incarnation.writes = {}
+
+        store.publish(index, number, incarnation.writes)
+        incarnation.end_time = time.time()
+        return incarnation
+
+    @staticmethod
+    def _is_valid(incarnation: Incarnation, store: MultiVersionStore) -> bool:
+        """Every version read is still the latest one below the transaction"""
+        return all(
+            store.latest_version(account_id, incarnation.index) == version
+            for account_id, version in incarnation.reads.items()
+        )
+
+    def execute(self,
+                transactions: List[Transaction],
+                initial_states: Dict[str, Any]) -> ExecutionResult:
+        """
+        Execute transactions with results identical to serial (list) order.
+
+        Args:
+            transactions: List of transactions, in serial order
+            initial_states: Initial account states
+
+        Returns:
+            ExecutionResult whose trace is the equivalent serial history and
+            whose parallel groups are the transactions committed from the
+            speculative pass plus one group per re-executed transaction
+
+        Raises:
+            TimeoutError: If the speculative pass exceeds timeout
+            Exception: The program's error for a transaction whose reads were valid
+        """
+        start_time = time.time()
+        store = MultiVersionStore(initial_states)
+
+        # Speculative pass: everything at once
+        futures = [
+            self.executor.submit(self._run, transaction, index, 0, store)
+            for index, transaction in enumerate(transactions)
+        ]
+        incarnations: List[Incarnation] = []
+        try:
+            for future in futures:
+                incarnations.append(future.result(timeout=self.timeout_seconds))
+        except FutureTimeoutError:
+            for future in futures:
+                future.cancel()
+            raise TimeoutError(
+                timeout_seconds=self.timeout_seconds,
+                completed=len(incarnations),
+                pending=len(futures) - len(incarnations)
+            )
+
+        # Validation in batch order; invalid transactions re-run inline
+        re_executed: List[str] = []
+        for index, transaction in enumerate(transactions):
+            if not self._is_valid(incarnations[index], store):
+                incarnations[index] = self._run(transaction, index, incarnations[index].number + 1, store)
+                re_executed.append(transaction.id)
+            if incarnations[index].error is not None:
+                raise incarnations[index].error
+
+        final_states = store.final_states()
+        execution_time = time.time() - start_time
+
+        re_executed_ids = set(re_executed)
+        committed_speculatively = {tx.id for tx in transactions if tx.id not in re_executed_ids}
+        parallel_groups: List[Set[str]] = []
+        if committed_speculatively:
+            parallel_groups.append(committed_speculatively)
+        parallel_groups.extend({tx_id} for tx_id in re_executed)
+
+        self.last_stats = {
+            "transactions": len(transactions),
+            "executions": len(transactions) + len(re_executed),
+            "re_executions": len(re_executed),
+            "re_executed": re_executed,
+            "execution_time": execution_time,
+        }
+
+        return ExecutionResult(
+            final_states=final_states,
+            execution_trace=self._serial_trace(transactions, incarnations),
+            parallel_groups=parallel_groups,
+            execution_time=execution_time,
+            thread_count=self.thread_count
+        )
+
+    def execute_serial(self,
+                       transactions: List[Transaction],
+                       initial_states: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reference: run the same program one transaction at a time.
+
+        Returns:
+            Final account states
+        """
+        states = copy.deepcopy(initial_states)
+        for transaction in transactions:
+            writes = self.program(transaction, lambda account_id: copy.deepcopy(states.get(account_id)))
+            states.update(writes)
+        return states
+
+    @staticmethod
+    def _serial_trace(transactions: List[Transaction],
+                      incarnations: List[Incarnation]) -> List[ExecutionEvent]:
+        """Events of the committed incarnations, in serial order"""
+        trace: List[ExecutionEvent] = []
+        for transaction, incarnation in zip(transactions, incarnations):
+            trace.append(ExecutionEvent(
+                timestamp=incarnation.start_time,
+                transaction_id=transaction.id,
+                event_type=EventType.START,
+                thread_id=incarnation.thread_id
+            ))
+            for account_id, state in incarnation.read_values.items():
+                trace.append(ExecutionEvent(
+                    timestamp=incarnation.start_time,
+                    transaction_id=transaction.id,
+                    event_type=EventType.READ,
+                    account_id=account_id,
+                    old_value=(state or {}).get("balance", 0),
+                    thread_id=incarnation.thread_id
+                ))
+            for account_id, state in incarnation.writes.items():
+                old_state = incarnation.read_values.get(account_id) or {}
+                trace.append(ExecutionEvent(
+                    timestamp=incarnation.end_time,
+                    transaction_id=transaction.id,
+                    event_type=EventType.WRITE,
+                    account_id=account_id,
+                    old_value=old_state.get("balance", 0),
+                    new_value=state.get("balance", 0),
+                    thread_id=incarnation.thread_id
+                ))
+            trace.append(ExecutionEvent(
+                timestamp=incarnation.end_time,
+                transaction_id=transaction.id,
+                event_type=EventType.COMMIT,
+                thread_id=incarnation.thread_id
+            ))
+        return trace
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the last execution.
+
+        Returns:
+            Dictionary with execution and re-execution counts
+        """
+        return dict(self.last_stats)
+
+    def shutdown(self):
+        """Shutdown the thread pool"""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.shutdown()
+        return False
+
+
+# ============================================================================
+# MODULE INFO
+# ============================================================================
+
+__version__ = "1.8.0"
+__author__ = "Aethel Team"
+__all__ = [
+    "SpeculativeExecutor",
+    "MultiVersionStore",
+    "passthrough_program",
+    "apply_operations",
+]
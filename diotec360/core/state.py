@@ -47,10 +47,22 @@ class MerkleStateTree:
     The root hash represents the entire global state.
     """
     
-    def __init__(self):
+    def __init__(self, deferred_root: bool = False):
+        """
+        Args:
+            deferred_root: Skip root recomputation on each write; call
+                commit() to publish the root (bulk ingestion)
+        """
+        # Deferred: diotec360.consensus imports the core package
+        from diotec360.consensus.merkle_tree import MerkleTree
+        
         self.accounts = {}  # address -> {balance, nonce, hash}
         self.root_hash = None
         self.history = []  # List of (root_hash, timestamp, operation)
+        self.deferred_root = deferred_root
+        
+        # Incremental authenticated index over account hashes
+        self._tree = MerkleTree(compat_mode=False)
     
     def _hash_account(self, balance: int, nonce: int, public_key: str = "") -> str:
         """Generate hash for account state (v2.2.0: includes public_key)"""
@@ -58,21 +70,34 @@ class MerkleStateTree:
         return hashlib.sha256(data.encode()).hexdigest()
     
     def _calculate_root(self) -> str:
-        """Calculate Merkle root from all accounts"""
-        if not self.accounts:
-            return hashlib.sha256(b"empty").hexdigest()
+        """
+        Calculate Merkle root from all accounts.
         
-        # Sort accounts by address for deterministic ordering
-        sorted_accounts = sorted(self.accounts.items())
+        Leaf hashes are cached in the tree, so only the paths of accounts
+        changed since the last call are rehashed (O(log n) per change).
+        """
+        return self._tree.get_root_hash()
+    
+    def _set_account(self, address: str, account: Dict[str, Any]):
+        """Store account state and refresh the root unless deferred"""
+        self.accounts[address] = account
+        self._tree.update(address, account['hash'])
         
-        # Combine all account hashes
-        combined = ""
-        for address, account in sorted_accounts:
-            combined += account['hash']
+        if not self.deferred_root:
+            self.root_hash = self._calculate_root()
+    
+    def commit(self) -> str:
+        """
+        Publish the root hash for all writes since the last commit.
+        
+        Only needed in deferred_root mode; otherwise the root is always
+        current.
         
-        # Generate root hash
-        root = hashlib.sha256(combined.encode()).hexdigest()
-        return root
+        Returns:
+            Current root hash
+        """
+        self.root_hash = self._calculate_root()
+        return self.root_hash
     
     def create_account(self, address: str, initial_balance: int = 0, public_key: str = "") -> str:
         """
@@ -91,16 +116,14 @@ class MerkleStateTree:
         
         account_hash = self._hash_account(initial_balance, 0, public_key)
         
-        self.accounts[address] = {
+        # Update root
+        old_root = self.root_hash
+        self._set_account(address, {
             'balance': initial_balance,
             'nonce': 0,
             'public_key': public_key,  # v2.2.0: Store public key
             'hash': account_hash
-        }
-        
-        # Update root
-        old_root = self.root_hash
-        self.root_hash = self._calculate_root()
+        })
         
         # Record history
         self.history.append({
@@ -137,16 +160,14 @@ class MerkleStateTree:
         new_nonce = old_nonce + 1
         new_hash = self._hash_account(new_balance, new_nonce, public_key)
         
-        self.accounts[address] = {
+        # Update root
+        old_root = self.root_hash
+        self._set_account(address, {
             'balance': new_balance,
             'nonce': new_nonce,
             'public_key': public_key,  # v2.2.0: Preserve public key
             'hash': new_hash
-        }
-        
-        # Update root
-        old_root = self.root_hash
-        self.root_hash = self._calculate_root()
+        })
         
         # Record history
         self.history.append({
@@ -177,14 +198,15 @@ class MerkleStateTree:
             raise ValueError(f"Account {address} does not exist")
         
         account = self.accounts[address]
+        tree_proof = self._tree.generate_proof(address)
         
-        # Simplified proof (in production, would include sibling hashes)
         proof = {
             'address': address,
             'balance': account['balance'],
             'nonce': account['nonce'],
             'account_hash': account['hash'],
             'root_hash': self.root_hash,
+            'path': tree_proof.path,  # Sibling hashes from leaf to root
             'timestamp': datetime.now().isoformat()
         }
         
@@ -221,8 +243,16 @@ class MerkleStateTree:
     
     def restore(self, snapshot: Dict[str, Any]):
         """Restore state from snapshot"""
+        # Deferred: diotec360.consensus imports the core package
+        from diotec360.consensus.merkle_tree import MerkleTree
+        
         self.root_hash = snapshot['root_hash']
         self.accounts = snapshot['accounts'].copy()
+        
+        self._tree = MerkleTree(compat_mode=False)
+        self._tree.batch_update({
+            address: account['hash'] for address, account in self.accounts.items()
+        })
 
 
 class StateTransitionEngine:
@@ -374,10 +404,15 @@ class AethelStateManager:
         print("🌳 AETHEL STATE MANAGER - INITIALIZING STATE")
         print("="*70 + "\n")
         
-        # Create accounts
-        for address, balance in accounts.items():
-            self.state_tree.create_account(address, balance)
-            print(f"  Created account: {address} with balance {balance}")
+        # Create accounts, publishing the root once at the end
+        self.state_tree.deferred_root = True
+        try:
+            for address, balance in accounts.items():
+                self.state_tree.create_account(address, balance)
+                print(f"  Created account: {address} with balance {balance}")
+        finally:
+            self.state_tree.deferred_root = False
+            self.state_tree.commit()
         
         # Verify total supply
         actual_supply = self.state_tree.get_total_supply()
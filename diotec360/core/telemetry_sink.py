@@ -0,0 +1,343 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Telemetry Sink - Batched SQLite writer for Sentinel and MOE telemetry
+
+SentinelMonitor and ExpertTelemetry used to open a connection, insert one
+row, commit and close for every transaction. Connection setup and the
+per-commit fsync dominate the cost of a telemetry row.
+
+TelemetrySink queues rows in memory and a single flusher thread writes them
+through one WAL-mode connection, grouping consecutive rows with the same
+statement into executemany calls inside one transaction per batch.
+
+Key Features:
+- Batches are written when batch_size rows are queued or flush_interval
+  seconds after the first queued row, whichever comes first
+- Bounded queue with an explicit overflow policy:
+  - "drop_oldest": evict the oldest queued row (default, telemetry favours
+    recent data)
+  - "drop_newest": reject the new row
+  - "block": wait up to block_timeout seconds for room, then reject
+- flush() waits until every row submitted so far is written (read-your-writes
+  for callers that query the database)
+- close() writes everything still queued; sinks still open at interpreter
+  exit are closed by an atexit hook
+- The flusher thread and its connection are released after
+  idle_timeout seconds without rows and recreated on the next submit
+
+Author: Aethel Team
+Version: v2.1.0
+"""
+
+import atexit
+import sqlite3
+import threading
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+OVERFLOW_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+
+class TelemetrySink:
+    """
+    Bounded, batched writer of telemetry rows into one SQLite database.
+
+    Rows are (sql, params) pairs; the sink does not know the schema, which
+    stays with the component that owns the table.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 256,
+                 flush_interval: float = 0.05, max_queue_size: int = 10000,
+                 overflow_policy: str = DROP_OLDEST, block_timeout: float = 1.0,
+                 idle_timeout: float = 5.0):
+        """
+        Initialize the sink.
+
+        Args:
+            db_path: Path to SQLite database file
+            batch_size: Rows that trigger an immediate write
+            flush_interval: Maximum seconds a row waits in the queue
+            max_queue_size: Maximum number of queued rows
+            overflow_policy: "drop_oldest", "drop_newest" or "block"
+            block_timeout: Seconds a submit waits for room under "block"
+            idle_timeout: Seconds without rows before the flusher thread exits
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got {overflow_policy!r}")
+        if batch_size < 1 or max_queue_size < 1:
+            raise ValueError("batch_size and max_queue_size must be positive")
+
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.idle_timeout = idle_timeout
+
+        # Queued rows: (sequence number, sql, params)
+        self._queue: Deque[Tuple[int, str, Sequence[Any]]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._flush_requested = False
+        self._writing = False
+
+        # Sequence numbers: last submitted row, last row taken out of the queue
+        # and written (or failed)
+        self._submitted_seq = 0
+        self._completed_seq = 0
+
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rows_failed = 0
+        self.batches_written = 0
+        self.blocked_submits = 0
+
+        atexit.register(_close_at_exit, weakref.ref(self))
+
+    def submit(self, sql: str, params: Sequence[Any]) -> bool:
+        """
+        Queue one row.
+
+        Args:
+            sql: Parameterized INSERT/UPDATE statement
+            params: Statement parameters
+
+        Returns:
+            True if the row was queued, False if it was dropped
+        """
+        with self._cond:
+            if self._closed:
+                self.rows_dropped += 1
+                return False
+
+            if len(self._queue) >= self.max_queue_size:
+                if self.overflow_policy == DROP_NEWEST:
+                    self.rows_dropped += 1
+                    return False
+                if self.overflow_policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.rows_dropped += 1
+                else:
+                    self.blocked_submits += 1
+                    self._flush_requested = True
+                    self._ensure_flusher()
+                    self._cond.notify_all()
+                    has_room = self._cond.wait_for(
+                        lambda: self._closed or len(self._queue) < self.max_queue_size,
+                        timeout=self.block_timeout
+                    )
+                    if not has_room or self._closed:
+                        self.rows_dropped += 1
+                        return False
+
+            self._submitted_seq += 1
+            self._queue.append((self._submitted_seq, sql, params))
+            self._ensure_flusher()
+            # The flusher sleeps on an empty queue and wakes early for a full batch
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def submit_many(self, sql: str, rows: Sequence[Sequence[Any]]) -> int:
+        """
+        Queue several rows for the same statement.
+
+        Returns:
+            Number of rows queued
+        """
+        return sum(1 for params in rows if self.submit(sql, params))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every row submitted before this call has been written.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue was drained up to this call, False on timeout
+        """
+        with self._cond:
+            target = self._submitted_seq
+            if self._drained_up_to(target):
+                return True
+            self._flush_requested = True
+            self._ensure_flusher()
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._drained_up_to(target), timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Write all queued rows and stop the flusher thread.
+
+        Rows submitted after close() are dropped.
+
+        Args:
+            timeout: Maximum seconds to wait for the flusher (None = no limit)
+        """
+        with self._cond:
+            if self._closed:
+                thread = self._thread
+            else:
+                self._closed = True
+                self._cond.notify_all()
+                thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sink statistics.
+
+        Returns:
+            Dictionary with queue depth, row and batch counters
+        """
+        with self._cond:
+            return {
+                'db_path': str(self.db_path),
+                'queue_depth': len(self._queue),
+                'max_queue_size': self.max_queue_size,
+                'overflow_policy': self.overflow_policy,
+                'rows_submitted': self._submitted_seq,
+                'rows_written': self.rows_written,
+                'rows_dropped': self.rows_dropped,
+                'rows_failed': self.rows_failed,
+                'batches_written': self.batches_written,
+                'avg_batch_size': (self.rows_written / self.batches_written
+                                   if self.batches_written > 0 else 0.0),
+                'blocked_submits': self.blocked_submits,
+                'closed': self._closed,
+            }
+
+    def _drained_up_to(self, target: int) -> bool:
+        # A row dropped under drop_oldest leaves newer rows behind it, so the
+        # completed sequence still passes the target
+        return self._completed_seq >= target or (not self._queue and not self._writing)
+
+    def _ensure_flusher(self) -> None:
+        """Start the flusher thread if it is not running (caller holds the lock)"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="telemetry_sink", daemon=True
+            )
+            self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self) -> None:
+        """Flusher loop: owns the connection for its whole lifetime"""
+        conn = None
+        try:
+            while True:
+                with self._cond:
+                    if not self._queue:
+                        self._cond.wait_for(lambda: self._queue or self._closed,
+                                            timeout=self.idle_timeout)
+                        if not self._queue:
+                            break
+
+                    # Give the batch time to fill unless someone is waiting on it
+                    self._cond.wait_for(
+                        lambda: (self._closed or self._flush_requested
+                                 or len(self._queue) >= self.batch_size),
+                        timeout=self.flush_interval
+                    )
+                    batch = list(self._queue)
+                    self._queue.clear()
+                    self._flush_requested = False
+                    self._writing = True
+                    # Blocked producers have room again
+                    self._cond.notify_all()
+
+                if conn is None:
+                    try:
+                        conn = self._connect()
+                    except sqlite3.Error as e:
+                        print(f"[TELEMETRY] Error opening {self.db_path}: {e}")
+
+                written = self._write_batch(conn, batch) if conn is not None else False
+
+                with self._cond:
+                    if written:
+                        self.rows_written += len(batch)
+                        self.batches_written += 1
+                    else:
+                        self.rows_failed += len(batch)
+                    self._completed_seq = batch[-1][0]
+                    self._writing = False
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._thread = None
+                self._writing = False
+                # Rows that raced with the exit decision get a new flusher
+                if self._queue and not self._closed:
+                    self._ensure_flusher()
+                self._cond.notify_all()
+            if conn is not None:
+                conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection,
+                     batch: List[Tuple[int, str, Sequence[Any]]]) -> bool:
+        """Write one batch in a single transaction, one executemany per statement run"""
+        try:
+            with conn:
+                start = 0
+                while start < len(batch):
+                    sql = batch[start][1]
+                    end = start
+                    while end < len(batch) and batch[end][1] == sql:
+                        end += 1
+                    conn.executemany(sql, [row[2] for row in batch[start:end]])
+                    start = end
+            return True
+        except sqlite3.Error as e:
+            print(f"[TELEMETRY] Error writing batch of {len(batch)} rows: {e}")
+            return False
+
+
+def _close_at_exit(sink_ref: "weakref.ReferenceType[TelemetrySink]") -> None:
+    sink = sink_ref()
+    if sink is not None:
+        sink.close(timeout=5.0)
+
+
+__all__ = [
+    'TelemetrySink',
+    'OVERFLOW_POLICIES',
+    'DROP_OLDEST',
+    'DROP_NEWEST',
+    'BLOCK',
+]
@@ -0,0 +1,266 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Verdict Cache - Content-addressed memory for AethelJudge.verify_logic
+
+Production traffic is dominated by a few hundred templated intents whose
+guards and verify blocks are identical. The layer pipeline (semantic
+sanitizer, input sanitizer, conservation, overflow, Z3) is deterministic for
+a given intent specification and judge configuration, so its verdict can be
+reused.
+
+Key Features:
+- Key = SHA256 of the canonical intent specification plus the judge
+  configuration and the active Adaptive Rigor mode/parameters
+- LRU eviction bounded by max_entries, TTL expiry on every lookup
+- Optional SQLite disk tier shared across processes and restarts
+- Hit/miss/eviction counters
+
+A rigor change yields a different key, so a verdict proved under one rigor
+level is never returned under another.
+"""
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def canonical_intent_key(intent: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """
+    Compute the cache key of an intent under a judge configuration.
+
+    The intent name is not part of the key: templated intents that differ
+    only in name share one verdict.
+
+    Args:
+        intent: Intent specification (constraints, post_conditions, ...)
+        config: Judge configuration that can influence the verdict
+
+    Returns:
+        SHA256 hex digest of the canonical JSON form
+    """
+    canonical = json.dumps(
+        {'intent': intent, 'config': config},
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class VerdictCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of judge verdicts.
+
+    Entries are (verdict, layer_results) pairs. Both are deep-copied on the
+    way in and out so callers can annotate the returned verdict freely.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 300.0,
+        disk_path: Optional[str] = None
+    ):
+        """
+        Initialize the verdict cache.
+
+        Args:
+            max_entries: Maximum number of verdicts held in memory
+            ttl_seconds: Time-to-live of a verdict in both tiers
+            disk_path: SQLite file for the disk tier (None: memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (created_at, verdict, layer_results), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], Dict[str, bool]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path is not None:
+            self.disk_path = Path(disk_path)
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.disk_path), check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    cache_key TEXT PRIMARY KEY,
+                    created_at REAL,
+                    verdict TEXT,
+                    layer_results TEXT
+                )
+            """)
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, bool]]]:
+        """
+        Look up a verdict.
+
+        Args:
+            key: Key from canonical_intent_key()
+
+        Returns:
+            (verdict, layer_results) copies, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] > self.ttl_seconds:
+                    del self._entries[key]
+                    self._delete_from_disk(key)
+                    self.expirations += 1
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+            if entry is None and self._db is not None:
+                entry = self._load_from_disk(key, now)
+                if entry is not None:
+                    self.disk_hits += 1
+                    self._store_in_memory(key, entry)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return copy.deepcopy(entry[1]), dict(entry[2])
+
+    def put(self, key: str, verdict: Dict[str, Any], layer_results: Dict[str, bool]) -> None:
+        """
+        Store a verdict in memory and, if configured, on disk.
+
+        Args:
+            key: Key from canonical_intent_key()
+            verdict: Result dictionary returned by verify_logic
+            layer_results: Per-layer outcomes recorded for the verdict
+        """
+        entry = (time.time(), copy.deepcopy(verdict), dict(layer_results))
+        with self._lock:
+            self._store_in_memory(key, entry)
+            if self._db is not None:
+                try:
+                    payload = json.dumps(entry[1])
+                except (TypeError, ValueError):
+                    # Verdicts carrying non-JSON objects stay memory-only
+                    return
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)",
+                    (key, entry[0], payload, json.dumps(entry[2]))
+                )
+                self._db.commit()
+
+    def clear(self) -> int:
+        """
+        Remove every verdict from both tiers.
+
+        Returns:
+            Number of in-memory entries cleared
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM verdicts")
+                self._db.commit()
+            return count
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove expired verdicts from both tiers.
+
+        Returns:
+            Number of in-memory entries removed
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [k for k, entry in self._entries.items() if entry[0] < cutoff]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            if self._db is not None:
+                self._db.execute("DELETE FROM verdicts WHERE created_at < ?", (cutoff,))
+                self._db.commit()
+            return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hit/miss counts and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'disk_tier': self._db is not None,
+            }
+
+    def close(self) -> None:
+        """Close the disk tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _store_in_memory(self, key: str, entry: Tuple[float, Dict[str, Any], Dict[str, bool]]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load_from_disk(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any], Dict[str, bool]]]:
+        row = self._db.execute(
+            "SELECT created_at, verdict, layer_results FROM verdicts WHERE cache_key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if now - row[0] > self.ttl_seconds:
+            self._delete_from_disk(key)
+            self.expirations += 1
+            return None
+        return row[0], json.loads(row[1]), json.loads(row[2])
+
+    def _delete_from_disk(self, key: str) -> None:
+        if self._db is not None:
+            self._db.execute("DELETE FROM verdicts WHERE cache_key = ?", (key,))
+            self._db.commit()
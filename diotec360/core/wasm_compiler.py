@@ -30,8 +30,7 @@ Philosophy: "If it's proved, it compiles. If it compiles, it's isolated."
 
 import json
 import hashlib
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class AethelWasmCompiler:
@@ -43,9 +42,41 @@ class AethelWasmCompiler:
     - No syscalls or host access
     - Gas metering points inserted
     - Runtime checks preserved
-    - Deterministic output
+    - Deterministic output (same bundle, same WAT hash)
+    
+    Calling convention of the emitted function:
+    - One i64 parameter per state name, in declaration order. State is
+      computed in i64: callers pass i32-range values, so no sum or
+      difference can wrap, and results match unbounded integer arithmetic
+    - Guard violations trap with unreachable, including the built-in
+      guards of each intent's business logic (LOGIC_GUARDS)
+    - Before returning, parameter i is stored as an i64 at byte offset
+      8 * i of the exported memory, so the caller can read the output
+      state back
+    - The i32 result is 1 for success, or the computed flag named by the
+      ";; @result <name>" header comment
     """
     
+    # State read and written by the built-in business logic of each intent
+    LOGIC_STATE = {
+        'transfer': ['sender_balance', 'receiver_balance', 'amount'],
+        'vote': ['votes'],
+        'check_balance': ['account_balance', 'minimum'],
+    }
+
+    # Guards the business logic itself relies on (checked after the
+    # bundle's guards, as the runtime simulator does)
+    LOGIC_GUARDS = {
+        'transfer': ['sender_balance >= amount', 'amount > 0'],
+        'vote': ['votes >= 0'],
+        'check_balance': ['account_balance >= 0'],
+    }
+
+    # Output key for the i32 result of intents that compute a flag
+    RESULT_NAMES = {
+        'check_balance': 'balance_check_passed',
+    }
+    
     def __init__(self, bundle: Dict[str, Any]):
         self.bundle = bundle
         self.intent_name = bundle['intent_name']
@@ -68,15 +99,68 @@ class AethelWasmCompiler:
     def _get_local_id(self, name: str) -> int:
         """Get local variable ID"""
         return self.local_vars.get(name, {}).get('id', 0)
-    
-    def _parse_param(self, param: str) -> tuple:
-        """Parse parameter string 'name:Type' into (name, type)"""
+
+    @staticmethod
+    def _is_literal(operand: str) -> bool:
+        """True for integer constants such as '0' or '-5'"""
+        return operand.lstrip('-').isdigit()
+
+    def _emit_operand(self, operand: str) -> str:
+        """Emit the instruction that pushes a guard operand"""
+        if self._is_literal(operand):
+            return f"    i64.const {int(operand)}"
+        return f"    local.get {self._get_local_id(operand)}  ;; {operand}"
+
+    @staticmethod
+    def _guard_text(guard: Any) -> str:
+        """Guard as 'left op right' (bundles store strings or parsed dicts)"""
+        if isinstance(guard, dict):
+            return guard.get('expression', '')
+        return guard
+
+    def _state_layout(self, params: List[str], guards: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Split every name the function reads into parameters and snapshots.
+
+        Names referenced by guards that are not declared parameters become
+        extra parameters, so their values come from the inputs instead of
+        aliasing local 0. old_X becomes a snapshot of X when X is state.
+
+        Returns:
+            (parameter names in order, snapshot local names)
+        """
+        referenced = []
+        for guard in guards:
+            for op in ('>=', '>', '==', '<=', '<'):
+                if op in guard:
+                    for operand in guard.split(op):
+                        operand = operand.strip()
+                        if operand and not self._is_literal(operand) and operand not in referenced:
+                            referenced.append(operand)
+                    break
+
+        state = list(params)
+        state += [name for name in referenced if not name.startswith('old_') and name not in state]
+        snapshots = [f"old_{name}" for name in params if name.endswith('_balance') or name == 'votes']
+        for name in referenced:
+            if not name.startswith('old_') or name in snapshots or name in state:
+                continue
+            if name[4:] in state:
+                snapshots.append(name)
+            else:
+                state.append(name)
+        return state, snapshots
+
+    def _parse_param(self, param: Any) -> tuple:
+        """Parse parameter string 'name:Type' (or a parsed dict) into (name, type)"""
+        if isinstance(param, dict):
+            return param['name'], param.get('type', 'i32')
         parts = param.split(':')
         if len(parts) == 2:
             return parts[0].strip(), parts[1].strip()
         return parts[0].strip(), 'i32'
     
-    def _emit_guards(self, guards: List[str]) -> List[str]:
+    def _emit_guards(self, guards: List[str], title: str = "GUARDS (Pre-conditions)") -> List[str]:
         """
         Emit WASM code for guard verification.
         
@@ -84,27 +168,25 @@ class AethelWasmCompiler:
         If any guard fails, the function traps (panics).
         """
         wat = []
-        wat.append("    ;; === GUARDS (Pre-conditions) ===")
+        wat.append(f"    ;; === {title} ===")
         
         for i, guard in enumerate(guards):
             wat.append(f"    ;; Guard {i+1}: {guard}")
             
             # Parse guard condition
-            # Format: "var1 >= var2" or "var1 > var2" etc.
+            # Format: "var1 >= var2", "var1 > var2", "var1 == var2", "var1 <= var2", "var1 < var2"
             if '>=' in guard:
                 left, right = guard.split('>=')
                 left, right = left.strip(), right.strip()
                 
                 # Load left operand
-                left_id = self._get_local_id(left)
-                wat.append(f"    local.get ${left_id}  ;; {left}")
+                wat.append(self._emit_operand(left))
                 
                 # Load right operand
-                right_id = self._get_local_id(right)
-                wat.append(f"    local.get ${right_id}  ;; {right}")
+                wat.append(self._emit_operand(right))
                 
                 # Compare: left >= right
-                wat.append(f"    i32.ge_s  ;; {left} >= {right}")
+                wat.append(f"    i64.ge_s  ;; {left} >= {right}")
                 
                 # If false (0), trap
                 wat.append(f"    i32.eqz")
@@ -116,13 +198,11 @@ class AethelWasmCompiler:
                 left, right = guard.split('>')
                 left, right = left.strip(), right.strip()
                 
-                left_id = self._get_local_id(left)
-                wat.append(f"    local.get ${left_id}  ;; {left}")
+                wat.append(self._emit_operand(left))
                 
-                right_id = self._get_local_id(right)
-                wat.append(f"    local.get ${right_id}  ;; {right}")
+                wat.append(self._emit_operand(right))
                 
-                wat.append(f"    i32.gt_s  ;; {left} > {right}")
+                wat.append(f"    i64.gt_s  ;; {left} > {right}")
                 wat.append(f"    i32.eqz")
                 wat.append(f"    if")
                 wat.append(f"      unreachable  ;; PANIC: Guard violation")
@@ -132,13 +212,39 @@ class AethelWasmCompiler:
                 left, right = guard.split('==')
                 left, right = left.strip(), right.strip()
                 
-                left_id = self._get_local_id(left)
-                wat.append(f"    local.get ${left_id}  ;; {left}")
+                wat.append(self._emit_operand(left))
                 
-                right_id = self._get_local_id(right)
-                wat.append(f"    local.get ${right_id}  ;; {right}")
+                wat.append(self._emit_operand(right))
                 
-                wat.append(f"    i32.eq  ;; {left} == {right}")
+                wat.append(f"    i64.eq  ;; {left} == {right}")
+                wat.append(f"    i32.eqz")
+                wat.append(f"    if")
+                wat.append(f"      unreachable  ;; PANIC: Guard violation")
+                wat.append(f"    end")
+            
+            elif '<=' in guard:
+                left, right = guard.split('<=')
+                left, right = left.strip(), right.strip()
+                
+                wat.append(self._emit_operand(left))
+                
+                wat.append(self._emit_operand(right))
+                
+                wat.append(f"    i64.le_s  ;; {left} <= {right}")
+                wat.append(f"    i32.eqz")
+                wat.append(f"    if")
+                wat.append(f"      unreachable  ;; PANIC: Guard violation")
+                wat.append(f"    end")
+            
+            elif '<' in guard:
+                left, right = guard.split('<')
+                left, right = left.strip(), right.strip()
+                
+                wat.append(self._emit_operand(left))
+                
+                wat.append(self._emit_operand(right))
+                
+                wat.append(f"    i64.lt_s  ;; {left} < {right}")
                 wat.append(f"    i32.eqz")
                 wat.append(f"    if")
                 wat.append(f"      unreachable  ;; PANIC: Guard violation")
@@ -164,20 +270,20 @@ class AethelWasmCompiler:
             amount_id = self._get_local_id('amount')
             
             wat.append(f"    ;; sender_balance -= amount")
-            wat.append(f"    local.get ${sender_id}  ;; sender_balance")
-            wat.append(f"    local.get ${amount_id}  ;; amount")
-            wat.append(f"    i32.sub")
-            wat.append(f"    local.set ${sender_id}  ;; sender_balance = sender_balance - amount")
+            wat.append(f"    local.get {sender_id}  ;; sender_balance")
+            wat.append(f"    local.get {amount_id}  ;; amount")
+            wat.append(f"    i64.sub")
+            wat.append(f"    local.set {sender_id}  ;; sender_balance = sender_balance - amount")
             wat.append("")
             
             # receiver_balance = receiver_balance + amount
             receiver_id = self._get_local_id('receiver_balance')
             
             wat.append(f"    ;; receiver_balance += amount")
-            wat.append(f"    local.get ${receiver_id}  ;; receiver_balance")
-            wat.append(f"    local.get ${amount_id}  ;; amount")
-            wat.append(f"    i32.add")
-            wat.append(f"    local.set ${receiver_id}  ;; receiver_balance = receiver_balance + amount")
+            wat.append(f"    local.get {receiver_id}  ;; receiver_balance")
+            wat.append(f"    local.get {amount_id}  ;; amount")
+            wat.append(f"    i64.add")
+            wat.append(f"    local.set {receiver_id}  ;; receiver_balance = receiver_balance + amount")
             wat.append("")
         
         elif intent_name == 'vote':
@@ -185,10 +291,10 @@ class AethelWasmCompiler:
             votes_id = self._get_local_id('votes')
             
             wat.append(f"    ;; votes += 1")
-            wat.append(f"    local.get ${votes_id}  ;; votes")
-            wat.append(f"    i32.const 1")
-            wat.append(f"    i32.add")
-            wat.append(f"    local.set ${votes_id}  ;; votes = votes + 1")
+            wat.append(f"    local.get {votes_id}  ;; votes")
+            wat.append(f"    i64.const 1")
+            wat.append(f"    i64.add")
+            wat.append(f"    local.set {votes_id}  ;; votes = votes + 1")
             wat.append("")
         
         elif intent_name == 'check_balance':
@@ -196,16 +302,17 @@ class AethelWasmCompiler:
             balance_id = self._get_local_id('account_balance')
             minimum_id = self._get_local_id('minimum')
             
-            wat.append(f"    ;; return account_balance >= minimum")
-            wat.append(f"    local.get ${balance_id}  ;; account_balance")
-            wat.append(f"    local.get ${minimum_id}  ;; minimum")
-            wat.append(f"    i32.ge_s")
-            wat.append(f"    return")
-        
+            result_id = self._get_local_id('result')
+
+            wat.append(f"    ;; result = account_balance >= minimum")
+            wat.append(f"    local.get {balance_id}  ;; account_balance")
+            wat.append(f"    local.get {minimum_id}  ;; minimum")
+            wat.append(f"    i64.ge_s")
+            wat.append(f"    local.set {result_id}  ;; result")
+
         else:
-            # Generic logic (placeholder)
+            # Generic logic (placeholder): result stays 1 (success)
             wat.append(f"    ;; Generic logic for {intent_name}")
-            wat.append(f"    i32.const 1  ;; Success")
         
         wat.append("")
         return wat
@@ -244,8 +351,9 @@ class AethelWasmCompiler:
         # Module header
         wat.append("(module")
         wat.append(f"  ;; Aethel WASM Module: {self.intent_name}")
-        wat.append(f"  ;; Generated: {datetime.now().isoformat()}")
         wat.append(f"  ;; Bundle Hash: {self.bundle['function_hash'][:16]}...")
+        if self.intent_name in self.RESULT_NAMES or self.intent_name not in self.LOGIC_STATE:
+            wat.append(f"  ;; @result {self.RESULT_NAMES.get(self.intent_name, 'executed')}")
         wat.append("")
         
         # Memory (1 page = 64KB)
@@ -256,39 +364,51 @@ class AethelWasmCompiler:
         # Main function
         wat.append(f"  (func ${self.intent_name}")
         
-        # Parameters
-        params = self.ast.get('params', [])
-        for param in params:
-            name, type_ = self._parse_param(param)
-            self._allocate_local(name, 'i32')
-            wat.append(f"    (param ${name} i32)")
+        # Parameters: declared params, then state the logic and guards read
+        params = [self._parse_param(param)[0] for param in self.ast.get('params', [])]
+        guards = [self._guard_text(guard) for guard in self.ast.get('constraints', [])]
+        for name in self.LOGIC_STATE.get(self.intent_name, []):
+            if name not in params:
+                params.append(name)
+        
+        params, snapshots = self._state_layout(params, guards)
+        
+        for name in params:
+            self._allocate_local(name, 'i64')
+            wat.append(f"    (param ${name} i64)")
         
         # Return type
         wat.append(f"    (result i32)")
         wat.append("")
         
-        # Local variables (for old_* snapshots)
+        # Local variables (declared before any instruction)
         wat.append("    ;; Local variables for snapshots")
-        for param in params:
-            name, _ = self._parse_param(param)
-            if name.endswith('_balance') or name == 'votes':
-                old_name = f"old_{name}"
-                old_id = self._allocate_local(old_name, 'i32')
-                
-                # Save snapshot: old_var = var
-                var_id = self._get_local_id(name)
-                wat.append(f"    (local ${old_name} i32)")
-                wat.append(f"    local.get ${var_id}")
-                wat.append(f"    local.set ${old_id}  ;; {old_name} = {name}")
+        for old_name in snapshots:
+            self._allocate_local(old_name, 'i64')
+            wat.append(f"    (local ${old_name} i64)")
+        result_id = self._allocate_local('result', 'i32')
+        wat.append(f"    (local $result i32)")
+        wat.append("")
         
+        # Save snapshots: old_var = var
+        for old_name in snapshots:
+            wat.append(f"    local.get {self._get_local_id(old_name[4:])}")
+            wat.append(f"    local.set {self._get_local_id(old_name)}  ;; {old_name} = {old_name[4:]}")
+        wat.append("    i32.const 1")
+        wat.append(f"    local.set {result_id}  ;; result = success")
         wat.append("")
         
         # Guards (pre-conditions)
-        guards = self.ast.get('constraints', [])
         if guards:
             guard_code = self._emit_guards(guards)
             wat.extend(["    " + line if line and not line.startswith("    ") else line for line in guard_code])
         
+        # Built-in guards of the business logic
+        logic_guards = self.LOGIC_GUARDS.get(self.intent_name, [])
+        if logic_guards:
+            guard_code = self._emit_guards(logic_guards, title="LOGIC GUARDS (built-in)")
+            wat.extend(["    " + line if line and not line.startswith("    ") else line for line in guard_code])
+        
         # Business logic
         logic_code = self._emit_logic(self.intent_name)
         wat.extend(["    " + line if line and not line.startswith("    ") else line for line in logic_code])
@@ -299,9 +419,18 @@ class AethelWasmCompiler:
             post_code = self._emit_postconditions(postconditions)
             wat.extend(["    " + line if line and not line.startswith("    ") else line for line in post_code])
         
-        # Return success
-        wat.append("    ;; Return success")
-        wat.append("    i32.const 1")
+        # Output state: parameter i is stored at byte offset 8 * i
+        wat.append("    ;; Store output state in linear memory")
+        for name in params:
+            local_id = self._get_local_id(name)
+            wat.append(f"    i32.const {8 * local_id}")
+            wat.append(f"    local.get {local_id}  ;; {name}")
+            wat.append(f"    i64.store")
+        wat.append("")
+        
+        # Return result
+        wat.append("    ;; Return result")
+        wat.append(f"    local.get {result_id}")
         wat.append("    return")
         
         # Close function
@@ -311,6 +440,7 @@ class AethelWasmCompiler:
         # Export function
         wat.append(f"  ;; Export function for access outside module")
         wat.append(f'  (export "{self.intent_name}" (func ${self.intent_name}))')
+        wat.append('  (export "memory" (memory 0))')
         wat.append("")
         
         # Close module
@@ -25,14 +25,45 @@ Security Features:
 - Deterministic execution
 - Runtime verification
 
+Execution Backends:
+- wasmtime (optional): the WAT is assembled and compiled once per WAT hash
+  and kept in a process-wide module cache; every call gets a fresh Store
+  and Instance with fuel metering and a linear-memory limit
+- Simulator: Python model of the built-in intents, used when wasmtime is
+  not installed or a module cannot run on the engine
+
 Philosophy: "Isolation is not paranoia. It's mathematics."
 """
 
 import hashlib
+import re
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+try:
+    import wasmtime
+except ImportError:
+    wasmtime = None
+
+
+# Gas charged per unit of engine fuel. One unit of fuel is about one WASM
+# instruction; the factor keeps compiled gas on the simulator's scale.
+GAS_PER_FUEL = 10
+
+# Largest linear memory a module may reserve (1 page = 64KB)
+DEFAULT_MEMORY_LIMIT = 65536
+
+# Compiled modules kept per process
+MODULE_CACHE_SIZE = 256
+
+_I32_MIN = -(1 << 31)
+_I32_MAX = (1 << 31) - 1
+
 
 class GasExhaustedException(Exception):
     """Raised when gas limit is exceeded"""
@@ -44,6 +75,107 @@ class SandboxViolationException(Exception):
     pass
 
 
+@dataclass
+class CompiledModule:
+    """WAT assembled and compiled once, instantiated per call"""
+    wat_hash: str
+    module: Optional[Any] = None
+    error: Optional[str] = None
+    params: List[str] = field(default_factory=list)
+    param_types: List[str] = field(default_factory=list)  # 'i32' or 'i64'
+    arity: Dict[str, int] = field(default_factory=dict)
+    result_name: Optional[str] = None
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _get_engine():
+    """Process-wide fuel-metered engine (compiled modules are tied to it)"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            config = wasmtime.Config()
+            config.consume_fuel = True
+            _engine = wasmtime.Engine(config)
+        return _engine
+
+
+def _compile_module(wat_code: str, wat_hash: str) -> CompiledModule:
+    """Assemble and compile WAT; failures are recorded, not raised"""
+    try:
+        module = wasmtime.Module(_get_engine(), wasmtime.wat2wasm(wat_code))
+    except wasmtime.WasmtimeError as e:
+        return CompiledModule(wat_hash, error=str(e).splitlines()[0])
+
+    result = re.search(r';;\s*@result\s+(\w+)', wat_code)
+    params = re.findall(r'\(param \$(\w+) (i32|i64)\)', wat_code)
+    return CompiledModule(
+        wat_hash,
+        module=module,
+        params=[name for name, _ in params],
+        param_types=[type_ for _, type_ in params],
+        arity={
+            export.name: len(export.type.params)
+            for export in module.exports
+            if isinstance(export.type, wasmtime.FuncType)
+        },
+        result_name=result.group(1) if result else None
+    )
+
+
+class WasmModuleCache:
+    """
+    Compiled modules keyed by WAT hash, least recently used evicted first.
+
+    Assembly and native compilation dominate a cold call; with the module
+    cached a call only pays for a Store and an Instance. Modules that fail
+    to assemble are cached too, so they are not retried on every call.
+    """
+    
+    def __init__(self, max_size: int = MODULE_CACHE_SIZE):
+        self.max_size = max_size
+        self._modules: "OrderedDict[str, CompiledModule]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, wat_code: str, wat_hash: str) -> CompiledModule:
+        """Cached module for the WAT, compiling it on first use"""
+        with self._lock:
+            compiled = self._modules.get(wat_hash)
+            if compiled is not None:
+                self._modules.move_to_end(wat_hash)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        
+        # Compile outside the lock; a concurrent duplicate compile is harmless
+        compiled = _compile_module(wat_code, wat_hash)
+        with self._lock:
+            self._modules[wat_hash] = compiled
+            self._modules.move_to_end(wat_hash)
+            while len(self._modules) > self.max_size:
+                self._modules.popitem(last=False)
+        return compiled
+    
+    def clear(self):
+        with self._lock:
+            self._modules.clear()
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'modules': len(self._modules),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+default_module_cache = WasmModuleCache()
+
+
 class AethelWasmRuntime:
     """
     Executes WASM modules in isolated sandbox.
@@ -54,11 +186,22 @@ class AethelWasmRuntime:
     - Deterministic execution
     - Runtime verification
     - Complete audit trail
+    
+    With wasmtime installed the WAT runs natively; gas is the fuel the
+    engine consumed times GAS_PER_FUEL. Otherwise the simulator runs.
     """
     
-    def __init__(self, wat_code: str, gas_limit: int = 10000):
+    def __init__(self, wat_code: str, gas_limit: int = 10000,
+                 memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                 module_cache: Optional[WasmModuleCache] = None,
+                 verbose: bool = True):
         self.wat_code = wat_code
+        self.wat_hash = hashlib.sha256(wat_code.encode()).hexdigest()
         self.gas_limit = gas_limit
+        self.memory_limit = memory_limit
+        self.module_cache = module_cache if module_cache is not None else default_module_cache
+        self.verbose = verbose
+        self.backend = None
         self.gas_used = 0
         self.audit_trail = []
         self.memory = bytearray(65536)  # 64KB isolated memory
@@ -83,7 +226,11 @@ class AethelWasmRuntime:
             'GAS': '⛽'
         }.get(level, '•')
         
-        print(f"{icon} [{level}] {message}")
+        self._print(f"{icon} [{level}] {message}")
+    
+    def _print(self, text: str):
+        if self.verbose:
+            print(text)
     
     def _consume_gas(self, amount: int):
         """
@@ -222,6 +369,100 @@ class AethelWasmRuntime:
         
         return output_state
     
+    def _compiled_unavailable(self, compiled: CompiledModule, intent_name: str,
+                              inputs: Dict[str, Any]) -> Optional[str]:
+        """Why the compiled module cannot run this call, or None"""
+        if compiled.module is None:
+            return f"WAT could not be assembled ({compiled.error})"
+        if intent_name not in compiled.arity:
+            return f"Module has no function '{intent_name}'"
+        if compiled.arity[intent_name] != len(compiled.params):
+            return f"Parameters of '{intent_name}' are not all named integer values"
+        # i32-range inputs keep the compiler's i64 arithmetic exact; larger
+        # values run on the simulator's unbounded integers
+        for name in compiled.params:
+            value = inputs.get(name, 0)
+            if not isinstance(value, int) or not _I32_MIN <= value <= _I32_MAX:
+                return f"Input {name}={value!r} is not an i32"
+        return None
+    
+    def _execute_compiled(self, compiled: CompiledModule, intent_name: str,
+                          inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the cached module on a fresh Store and Instance.
+        
+        Fuel is the gas limit in engine units; the memory limit caps what
+        the module may reserve. Traps map to the simulator's exceptions.
+        """
+        self._log('INFO', f"Executing WASM function: {intent_name} (module {compiled.wat_hash[:16]}...)")
+        self._log('GAS', f"Gas limit: {self.gas_limit}")
+        
+        fuel = self.gas_limit // GAS_PER_FUEL
+        store = wasmtime.Store(_get_engine())
+        store.set_limits(memory_size=self.memory_limit)
+        store.set_fuel(fuel)
+        
+        try:
+            instance = wasmtime.Instance(store, compiled.module, [])
+        except wasmtime.WasmtimeError as e:
+            self._log('PANIC', f"Sandbox violation: {e}")
+            raise SandboxViolationException(f"Sandbox violation: {e}")
+        
+        exports = instance.exports(store)
+        args = [int(inputs.get(name, 0)) for name in compiled.params]
+        
+        try:
+            result = exports[intent_name](store, *args)
+        except wasmtime.Trap as e:
+            self.gas_used = (fuel - store.get_fuel()) * GAS_PER_FUEL
+            if e.trap_code == wasmtime.TrapCode.OUT_OF_FUEL:
+                self._log('PANIC', f"Gas exhausted: {self.gas_used}/{self.gas_limit}")
+                raise GasExhaustedException(f"Gas limit exceeded: {self.gas_used}/{self.gas_limit}")
+            if e.trap_code == wasmtime.TrapCode.UNREACHABLE:
+                self._log('PANIC', "Guard violation: compiled guard trapped")
+                raise SandboxViolationException("Guard violation in WASM execution")
+            self._log('PANIC', f"WASM trap: {e.message}")
+            raise SandboxViolationException(f"WASM trap: {e.message}")
+        
+        # Fuel is checked at calls and loop back-edges only, so straight-line
+        # code can overrun the budget; the counter then stops at zero
+        remaining = store.get_fuel()
+        self.gas_used = (fuel - remaining) * GAS_PER_FUEL
+        if remaining == 0:
+            self._log('PANIC', f"Gas exhausted: {self.gas_used}/{self.gas_limit}")
+            raise GasExhaustedException(f"Gas limit exceeded: {self.gas_used}/{self.gas_limit}")
+        
+        # Output state: parameters stored back in order (i64 slots of 8
+        # bytes, i32 slots of 4)
+        output_state = inputs.copy()
+        memory = exports.get('memory')
+        if isinstance(memory, wasmtime.Memory) and args:
+            layout = "<" + "".join('q' if t == 'i64' else 'i' for t in compiled.param_types)
+            values = struct.unpack(layout, memory.read(store, 0, struct.calcsize(layout)))
+            for name, before, after in zip(compiled.params, args, values):
+                if name in inputs or after != before:
+                    output_state[name] = after
+        if compiled.result_name:
+            output_state[compiled.result_name] = bool(result)
+        
+        self._log('SUCCESS', f"Compiled execution of {intent_name} complete")
+        self._log('GAS', f"Gas used: {self.gas_used}/{self.gas_limit}")
+        
+        return output_state
+    
+    def _execute(self, intent_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Run on the compiled engine when possible, else the simulator"""
+        if wasmtime is not None:
+            compiled = self.module_cache.get(self.wat_code, self.wat_hash)
+            reason = self._compiled_unavailable(compiled, intent_name, inputs)
+            if reason is None:
+                self.backend = 'wasmtime'
+                return self._execute_compiled(compiled, intent_name, inputs)
+            self._log('WARNING', f"{reason}, using simulator")
+        
+        self.backend = 'simulator'
+        return self._simulate_wasm_execution(intent_name, inputs)
+    
     def execute_safely(self, intent_name: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute WASM module in isolated sandbox.
@@ -240,13 +481,14 @@ class AethelWasmRuntime:
             GasExhaustedException if gas limit exceeded
             SandboxViolationException if security violated
         """
-        print("\n" + "="*70)
-        print("🌐 AETHEL WASM RUNTIME - THE ISOLATED SANCTUARY")
-        print("    WebAssembly Sandbox Execution")
-        print("="*70 + "\n")
+        self._print("\n" + "="*70)
+        self._print("🌐 AETHEL WASM RUNTIME - THE ISOLATED SANCTUARY")
+        self._print("    WebAssembly Sandbox Execution")
+        self._print("="*70 + "\n")
         
         self.audit_trail = []
         self.gas_used = 0
+        self.backend = None
         start_time = datetime.now()
         
         try:
@@ -257,7 +499,7 @@ class AethelWasmRuntime:
             self._log('INFO', f"Input state: {inputs}")
             
             # 3. Execute in sandbox
-            output_state = self._simulate_wasm_execution(intent_name, inputs)
+            output_state = self._execute(intent_name, inputs)
             
             # 4. Generate execution envelope
             execution_time = (datetime.now() - start_time).total_seconds()
@@ -271,7 +513,8 @@ class AethelWasmRuntime:
                 'gas_limit': self.gas_limit,
                 'verification_passed': True,
                 'audit_trail': self.audit_trail.copy(),
-                'wat_hash': hashlib.sha256(self.wat_code.encode()).hexdigest()
+                'wat_hash': self.wat_hash,
+                'backend': self.backend
             }
             
             # 5. Seal envelope
@@ -281,32 +524,32 @@ class AethelWasmRuntime:
             self._log('SUCCESS', f"Execution complete in {execution_time:.4f}s")
             self._log('SUCCESS', f"Envelope sealed: {envelope['envelope_signature'][:16]}...")
             
-            print("\n" + "="*70)
-            print("✅ WASM EXECUTION SUCCESSFUL - SANDBOX SEALED")
-            print("="*70 + "\n")
+            self._print("\n" + "="*70)
+            self._print("✅ WASM EXECUTION SUCCESSFUL - SANDBOX SEALED")
+            self._print("="*70 + "\n")
             
             return envelope
         
         except GasExhaustedException as e:
-            print("\n" + "="*70)
-            print("⛽ GAS EXHAUSTED - EXECUTION TERMINATED")
-            print(f"   Reason: {e}")
-            print("="*70 + "\n")
+            self._print("\n" + "="*70)
+            self._print("⛽ GAS EXHAUSTED - EXECUTION TERMINATED")
+            self._print(f"   Reason: {e}")
+            self._print("="*70 + "\n")
             raise
         
         except SandboxViolationException as e:
-            print("\n" + "="*70)
-            print("🚨 SANDBOX VIOLATION - EXECUTION BLOCKED")
-            print(f"   Reason: {e}")
-            print("="*70 + "\n")
+            self._print("\n" + "="*70)
+            self._print("🚨 SANDBOX VIOLATION - EXECUTION BLOCKED")
+            self._print(f"   Reason: {e}")
+            self._print("="*70 + "\n")
             raise
         
         except Exception as e:
             self._log('PANIC', f"Unexpected error: {e}")
-            print("\n" + "="*70)
-            print("🚨 EXECUTION FAILED - SANCTUARY COMPROMISED")
-            print(f"   Reason: {e}")
-            print("="*70 + "\n")
+            self._print("\n" + "="*70)
+            self._print("🚨 EXECUTION FAILED - SANCTUARY COMPROMISED")
+            self._print(f"   Reason: {e}")
+            self._print("="*70 + "\n")
             raise
 
 
@@ -319,8 +562,8 @@ def compile_wat_to_wasm(wat_code: str, output_path: Optional[str] = None) -> byt
     """
     Compile WAT to WASM bytecode.
     
-    In production, this would use wat2wasm from WABT toolkit.
-    For Phase 2, we simulate the compilation.
+    Uses the wasmtime assembler when installed; otherwise the compilation
+    is simulated (header plus WAT text).
     
     Args:
         wat_code: WebAssembly Text code
@@ -328,17 +571,24 @@ def compile_wat_to_wasm(wat_code: str, output_path: Optional[str] = None) -> byt
     
     Returns:
         WASM bytecode as bytes
+    
+    Raises:
+        WasmCompilationError if the assembler rejects the WAT
     """
     print(f"\n🔧 [WAT2WASM] Compiling WAT to WASM...")
     
-    # Simulate WASM compilation
-    # In production: subprocess.run(['wat2wasm', wat_file, '-o', wasm_file])
-    
-    # WASM magic number and version
-    wasm_header = bytes([0x00, 0x61, 0x73, 0x6D, 0x01, 0x00, 0x00, 0x00])
-    
-    # Simulated WASM bytecode (placeholder)
-    wasm_bytecode = wasm_header + wat_code.encode()
+    if wasmtime is not None:
+        try:
+            wasm_bytecode = bytes(wasmtime.wat2wasm(wat_code))
+        except wasmtime.WasmtimeError as e:
+            print(f"❌ [WAT2WASM] Compilation failed")
+            raise WasmCompilationError(str(e)) from e
+    else:
+        # WASM magic number and version
+        wasm_header = bytes([0x00, 0x61, 0x73, 0x6D, 0x01, 0x00, 0x00, 0x00])
+        
+        # Simulated WASM bytecode (placeholder)
+        wasm_bytecode = wasm_header + wat_code.encode()
     
     if output_path:
         with open(output_path, 'wb') as f:
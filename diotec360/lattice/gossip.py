@@ -56,6 +56,9 @@ except ImportError:
 
 # Import ED25519 crypto from Aethel
 from diotec360.core.crypto import AethelCrypt
+from diotec360.lattice.set_reconciliation import (
+    InvertibleBloomFilter, item_key, key_to_hex, key_from_hex
+)
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 logger = logging.getLogger(__name__)
@@ -153,6 +156,11 @@ class GossipConfig:
         enable_push: Enable push gossip
         enable_pull: Enable pull gossip
         enable_anti_entropy: Enable anti-entropy synchronization
+        max_batch_size: Maximum pending messages sent per round (one POST per peer)
+        max_concurrent_sends: Maximum in-flight HTTP requests to peers
+        connections_per_peer: Keep-alive connections pooled per peer
+        anti_entropy_cells: IBLT cells in the first digest exchange
+        anti_entropy_max_cells: Largest IBLT tried before a full ID exchange
     """
     fanout: int = 3  # Gossip to 3 random peers per round
     gossip_interval: float = 0.5  # 500ms between rounds
@@ -162,6 +170,11 @@ class GossipConfig:
     enable_push: bool = True
     enable_pull: bool = True
     enable_anti_entropy: bool = True
+    max_batch_size: int = 64  # Up to 64 messages per round
+    max_concurrent_sends: int = 16
+    connections_per_peer: int = 4
+    anti_entropy_cells: int = 96  # Decodes ~40 differing messages
+    anti_entropy_max_cells: int = 24576  # Doubles up to 8 times
 
 
 class GossipProtocol:
@@ -211,6 +224,12 @@ class GossipProtocol:
         # Message cache (message_id -> GossipMessage)
         self.message_cache: Dict[str, GossipMessage] = {}
         
+        # Anti-entropy digests (cells -> IBLT over message IDs) and the
+        # IBLT key -> message ID index; built on first use, then kept in
+        # step with message_cache
+        self._digests: Dict[int, InvertibleBloomFilter] = {}
+        self._digest_index: Optional[Dict[int, str]] = None
+        
         # Messages pending gossip
         self.pending_messages: deque[GossipMessage] = deque()
         
@@ -222,11 +241,17 @@ class GossipProtocol:
         self._anti_entropy_task: Optional[asyncio.Task] = None
         self._running = False
         
+        # Pooled HTTP session (keep-alive connections per peer), created on first send
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._send_semaphore = asyncio.Semaphore(config.max_concurrent_sends)
+        
         # Statistics
         self.stats = {
             "messages_sent": 0,
             "messages_received": 0,
             "messages_forwarded": 0,
+            "batches_sent": 0,
+            "send_failures": 0,
             "duplicates_filtered": 0,
             "signature_verifications": 0,
             "signature_failures": 0
@@ -254,6 +279,8 @@ class GossipProtocol:
     async def stop(self) -> None:
         """Stop the gossip protocol"""
         if not self._running:
+            # Sends made without start() still hold pooled connections
+            await self._close_session()
             return
         
         self._running = False
@@ -273,8 +300,16 @@ class GossipProtocol:
             except asyncio.CancelledError:
                 pass
         
+        await self._close_session()
+        
         logger.info("[GOSSIP] Protocol stopped")
     
+    async def _close_session(self) -> None:
+        """Close the pooled HTTP session and its connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     def register_handler(self, message_type: str, handler: Callable) -> None:
         """
         Register a handler for a message type.
@@ -315,7 +350,7 @@ class GossipProtocol:
             logger.debug(f"[GOSSIP] ✍️  Signed message {message_id[:8]}")
         
         # Add to cache
-        self.message_cache[message_id] = message
+        self._cache_message(message)
         
         # Add to pending queue
         self.pending_messages.append(message)
@@ -407,7 +442,7 @@ class GossipProtocol:
                 return False
             
             # Add to cache
-            self.message_cache[message.message_id] = message
+            self._cache_message(message)
             message.seen_by.add(self.node_id)
             
             # Update stats
@@ -433,6 +468,41 @@ class GossipProtocol:
             logger.error(f"[GOSSIP] Error receiving message: {e}")
             return False
     
+    async def receive_batch(self, batch_data: Dict[str, Any]) -> int:
+        """
+        Receive a batch of gossip messages from a peer (POST /api/gossip/batch).
+        
+        Every message goes through receive_message, so each one is verified
+        on its own. A rejected message does not discard the rest of the batch:
+        the first IntegrityPanic is raised after all messages were handled.
+        
+        Args:
+            batch_data: {"messages": [message_data, ...]}
+        
+        Returns:
+            Number of new messages
+            
+        Raises:
+            IntegrityPanic: If any message is unsigned or has invalid signature
+        """
+        from diotec360.core.integrity_panic import IntegrityPanic
+        
+        new_messages = 0
+        panic: Optional[IntegrityPanic] = None
+        
+        for message_data in batch_data.get("messages", []):
+            try:
+                if await self.receive_message(message_data):
+                    new_messages += 1
+            except IntegrityPanic as e:
+                if panic is None:
+                    panic = e
+        
+        if panic is not None:
+            raise panic
+        
+        return new_messages
+    
     async def _process_message(self, message: GossipMessage) -> None:
         """
         Process a received message.
@@ -457,10 +527,11 @@ class GossipProtocol:
         
         while self._running:
             try:
-                # Process pending messages
+                # Process pending messages (up to one batch per round)
                 if self.pending_messages:
-                    message = self.pending_messages.popleft()
-                    await self._gossip_message(message)
+                    batch_size = min(self.config.max_batch_size, len(self.pending_messages))
+                    batch = [self.pending_messages.popleft() for _ in range(batch_size)]
+                    await self._gossip_round(batch)
                 
                 # Periodic cache cleanup (every 100 iterations)
                 cleanup_counter += 1
@@ -468,8 +539,11 @@ class GossipProtocol:
                     self._cleanup_old_messages()
                     cleanup_counter = 0
                 
-                # Wait before next round
-                await asyncio.sleep(self.config.gossip_interval)
+                # Wait before next round, unless a backlog is left over
+                if self.pending_messages:
+                    await asyncio.sleep(0)
+                else:
+                    await asyncio.sleep(self.config.gossip_interval)
                 
             except Exception as e:
                 logger.error(f"[GOSSIP] Error in gossip loop: {e}")
@@ -482,59 +556,108 @@ class GossipProtocol:
         Args:
             message: Message to gossip
         """
+        await self._gossip_round([message])
+    
+    async def _gossip_round(self, messages: List[GossipMessage]) -> None:
+        """
+        Gossip a batch of messages to random peers.
+        
+        Each message picks its own fanout peers; the messages bound for the
+        same peer go out in one request, and all peers are sent to
+        concurrently (bounded by max_concurrent_sends).
+        
+        Args:
+            messages: Messages to gossip
+        """
         # Get available peers
         peers = self.get_peers()
         
         if not peers:
             return
         
-        # Select random peers (fanout)
         fanout = min(self.config.fanout, len(peers))
-        selected_peers = random.sample(peers, fanout)
         
-        # Send to selected peers
-        for peer in selected_peers:
-            try:
+        # Group messages by destination peer (peer_id -> (peer, messages))
+        outgoing: Dict[str, Any] = {}
+        for message in messages:
+            # Select random peers (fanout)
+            for peer in random.sample(peers, fanout):
                 # Skip if peer has already seen this message
                 if peer.peer_id in message.seen_by:
                     continue
-                
-                # Send message to peer
-                await self._send_to_peer(peer.address, message)
-                message.seen_by.add(peer.peer_id)
-                
-                self.stats["messages_sent"] += 1
-                
-            except Exception as e:
-                logger.debug(f"[GOSSIP] Failed to send to {peer.peer_id}: {e}")
+                outgoing.setdefault(peer.peer_id, (peer, []))[1].append(message)
+        
+        if not outgoing:
+            return
+        
+        peer_batches = list(outgoing.values())
+        results = await asyncio.gather(
+            *(self._send_batch_to_peer(peer.address, batch) for peer, batch in peer_batches),
+            return_exceptions=True
+        )
+        
+        for (peer, batch), result in zip(peer_batches, results):
+            if result is True:
+                for message in batch:
+                    message.seen_by.add(peer.peer_id)
+                self.stats["messages_sent"] += len(batch)
+                self.stats["batches_sent"] += 1
+            else:
+                self.stats["send_failures"] += 1
+                if isinstance(result, Exception):
+                    logger.debug(f"[GOSSIP] Failed to send to {peer.peer_id}: {result}")
     
-    async def _send_to_peer(self, peer_address: str, message: GossipMessage) -> None:
+    async def _send_to_peer(self, peer_address: str, message: GossipMessage) -> bool:
         """
         Send a message to a specific peer via HTTP.
         
         Args:
             peer_address: Peer's network address (e.g., "http://node1.aethel.network:8000")
             message: Message to send
+        
+        Returns:
+            True if the peer accepted the message
+        """
+        return await self._send_batch_to_peer(peer_address, [message])
+    
+    async def _send_batch_to_peer(self, peer_address: str, messages: List[GossipMessage]) -> bool:
+        """
+        Send messages to a specific peer in one HTTP request.
+        
+        A single message is posted to /api/gossip as before; several go to
+        /api/gossip/batch as {"messages": [...]}.
+        
+        Args:
+            peer_address: Peer's network address
+            messages: Messages to send
+        
+        Returns:
+            True if the peer accepted the request
         """
         if not aiohttp:
             logger.debug(f"[GOSSIP] aiohttp not available, simulating send to {peer_address}")
-            return
+            return True
         
-        try:
-            # Construct gossip endpoint URL
+        if len(messages) == 1:
             url = f"{peer_address}/api/gossip"
-            
-            # Send message via HTTP POST
-            async with aiohttp.ClientSession() as session:
+            body = messages[0].to_dict()
+        else:
+            url = f"{peer_address}/api/gossip/batch"
+            body = {"messages": [message.to_dict() for message in messages]}
+        
+        try:
+            async with self._send_semaphore:
+                session = self._get_session()
                 async with session.post(
                     url,
-                    json=message.to_dict(),
+                    json=body,
                     timeout=aiohttp.ClientTimeout(total=5)
                 ) as response:
                     if response.status == 200:
-                        logger.debug(f"[GOSSIP] ✓ Sent {message.message_type} to {peer_address}")
-                    else:
-                        logger.warning(f"[GOSSIP] Peer {peer_address} returned {response.status}")
+                        logger.debug(f"[GOSSIP] ✓ Sent {len(messages)} message(s) to {peer_address}")
+                        return True
+                    logger.warning(f"[GOSSIP] Peer {peer_address} returned {response.status}")
+                    return False
                         
         except asyncio.TimeoutError:
             logger.debug(f"[GOSSIP] Timeout sending to {peer_address}")
@@ -542,6 +665,17 @@ class GossipProtocol:
             logger.debug(f"[GOSSIP] Connection error to {peer_address}: {e}")
         except Exception as e:
             logger.error(f"[GOSSIP] Unexpected error sending to {peer_address}: {e}")
+        return False
+    
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Return the pooled HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.max_concurrent_sends,
+                limit_per_host=self.config.connections_per_peer
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
     
     async def _anti_entropy_loop(self) -> None:
         """Anti-entropy loop - periodic synchronization with peers"""
@@ -557,8 +691,12 @@ class GossipProtocol:
         """
         Perform anti-entropy synchronization.
         
-        Exchanges message digests with a random peer to detect
-        and repair missing messages.
+        Reconciles message sets with a random peer through IBLT digests:
+        only the IDs that differ are found, and the missing messages are
+        fetched in one batched request. The digest starts at
+        anti_entropy_cells and doubles while it is too small to decode;
+        peers without digest support, or differences beyond
+        anti_entropy_max_cells, fall back to exchanging full ID lists.
         """
         peers = self.get_peers()
         
@@ -570,30 +708,122 @@ class GossipProtocol:
         
         logger.debug(f"[GOSSIP] 🔄 Anti-entropy sync with {peer.peer_id}")
         
+        try:
+            cells = self.config.anti_entropy_cells
+            while cells <= self.config.anti_entropy_max_cells:
+                remote = await self._request_digest(peer.address, cells)
+                if remote is None:
+                    break
+                
+                local = self._get_digest(remote.cells)
+                peer_only, ours_only, complete = remote.subtract(local).decode()
+                if complete:
+                    if peer_only:
+                        await self._request_messages(peer.address, [key_to_hex(key) for key in peer_only])
+                    if ours_only:
+                        logger.debug(f"[GOSSIP] Peer {peer.peer_id} is missing {len(ours_only)} messages")
+                    return
+                
+                cells *= 2
+            
+            await self._full_anti_entropy_sync(peer)
+                
+        except Exception as e:
+            logger.debug(f"[GOSSIP] Anti-entropy sync failed with {peer.peer_id}: {e}")
+    
+    async def _full_anti_entropy_sync(self, peer: Any) -> None:
+        """
+        Reconcile with a peer by exchanging full message ID lists.
+        
+        Args:
+            peer: Peer to synchronize with
+        """
         # Get our message IDs
         our_messages = set(self.message_cache.keys())
         
+        # Request peer's message IDs
+        peer_messages = await self._request_message_ids(peer.address)
+        
+        if peer_messages is None:
+            return
+        
+        # Find messages we're missing
+        missing = peer_messages - our_messages
+        
+        # Request missing messages
+        for msg_id in missing:
+            await self._request_message(peer.address, msg_id)
+        
+        # Find messages peer is missing (optional: help peer catch up)
+        peer_missing = our_messages - peer_messages
+        if peer_missing:
+            logger.debug(f"[GOSSIP] Peer {peer.peer_id} is missing {len(peer_missing)} messages")
+    
+    async def _request_digest(self, peer_address: str, cells: int) -> Optional[InvertibleBloomFilter]:
+        """
+        Request a peer's IBLT digest of its message IDs.
+        
+        Args:
+            peer_address: Peer's network address
+            cells: Digest size
+        
+        Returns:
+            The peer's digest, or None if the peer does not serve digests
+        """
+        if not aiohttp:
+            return None
+        
         try:
-            # Request peer's message IDs
-            peer_messages = await self._request_message_ids(peer.address)
+            url = f"{peer_address}/api/gossip/digest"
             
-            if peer_messages is None:
-                return
-            
-            # Find messages we're missing
-            missing = peer_messages - our_messages
+            async with self._send_semaphore:
+                session = self._get_session()
+                async with session.get(
+                    url,
+                    params={"cells": str(cells)},
+                    timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    if response.status == 200:
+                        return InvertibleBloomFilter.from_dict(await response.json())
+                    else:
+                        logger.debug(f"[GOSSIP] Failed to get digest from {peer_address}")
+                        return None
+                        
+        except Exception as e:
+            logger.debug(f"[GOSSIP] Error requesting digest from {peer_address}: {e}")
+            return None
+    
+    async def _request_messages(self, peer_address: str, keys: List[str]) -> None:
+        """
+        Request several messages from a peer in one round trip.
+        
+        Args:
+            peer_address: Peer's network address
+            keys: IBLT keys (hex) of the messages to request
+        """
+        if not aiohttp:
+            return
+        
+        try:
+            url = f"{peer_address}/api/gossip/messages"
             
-            # Request missing messages
-            for msg_id in missing:
-                await self._request_message(peer.address, msg_id)
+            async with self._send_semaphore:
+                session = self._get_session()
+                async with session.post(
+                    url,
+                    json={"keys": keys},
+                    timeout=aiohttp.ClientTimeout(total=30)
+                ) as response:
+                    if response.status != 200:
+                        logger.debug(f"[GOSSIP] Failed to get {len(keys)} messages from {peer_address}")
+                        return
+                    data = await response.json()
             
-            # Find messages peer is missing (optional: help peer catch up)
-            peer_missing = our_messages - peer_messages
-            if peer_missing:
-                logger.debug(f"[GOSSIP] Peer {peer.peer_id} is missing {len(peer_missing)} messages")
-                
+            await self.receive_batch(data)
+            logger.debug(f"[GOSSIP] Retrieved {len(data.get('messages', []))} missing messages")
+                        
         except Exception as e:
-            logger.debug(f"[GOSSIP] Anti-entropy sync failed with {peer.peer_id}: {e}")
+            logger.debug(f"[GOSSIP] Error requesting {len(keys)} messages from {peer_address}: {e}")
     
     async def _request_message_ids(self, peer_address: str) -> Optional[Set[str]]:
         """
@@ -611,7 +841,8 @@ class GossipProtocol:
         try:
             url = f"{peer_address}/api/gossip/message_ids"
             
-            async with aiohttp.ClientSession() as session:
+            async with self._send_semaphore:
+                session = self._get_session()
                 async with session.get(
                     url,
                     timeout=aiohttp.ClientTimeout(total=10)
@@ -641,7 +872,8 @@ class GossipProtocol:
         try:
             url = f"{peer_address}/api/gossip/message/{message_id}"
             
-            async with aiohttp.ClientSession() as session:
+            async with self._send_semaphore:
+                session = self._get_session()
                 async with session.get(
                     url,
                     timeout=aiohttp.ClientTimeout(total=10)
@@ -720,7 +952,25 @@ class GossipProtocol:
         # Remove oldest messages
         to_remove = len(self.message_cache) - self.config.message_cache_size
         for msg_id, _ in sorted_messages[:to_remove]:
-            del self.message_cache[msg_id]
+            self._evict_message(msg_id)
+    
+    def _cache_message(self, message: GossipMessage) -> None:
+        """Add a message to the cache and the anti-entropy digests"""
+        if message.message_id not in self.message_cache and self._digest_index is not None:
+            key = item_key(message.message_id)
+            self._digest_index[key] = message.message_id
+            for digest in self._digests.values():
+                digest.add_key(key)
+        self.message_cache[message.message_id] = message
+    
+    def _evict_message(self, message_id: str) -> None:
+        """Remove a message from the cache and the anti-entropy digests"""
+        del self.message_cache[message_id]
+        if self._digest_index is not None:
+            key = item_key(message_id)
+            self._digest_index.pop(key, None)
+            for digest in self._digests.values():
+                digest.remove_key(key)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get gossip statistics"""
@@ -762,6 +1012,79 @@ class GossipProtocol:
             GossipMessage if found, None otherwise
         """
         return self.message_cache.get(message_id)
+    
+    def get_digest(self, cells: int) -> Dict[str, Any]:
+        """
+        Get the IBLT digest of all cached message IDs.
+        
+        Used by anti-entropy peers (GET /api/gossip/digest?cells=N). The
+        size is rounded up to anti_entropy_cells doubled as often as needed,
+        capped at anti_entropy_max_cells, so only a few digests are kept.
+        
+        Args:
+            cells: Digest size requested by the peer
+        
+        Returns:
+            Wire form of the digest
+        """
+        size = self.config.anti_entropy_cells
+        while size < cells and size * 2 <= self.config.anti_entropy_max_cells:
+            size *= 2
+        return self._get_digest(size).to_dict()
+    
+    def get_messages_by_keys(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get cached messages by IBLT key.
+        
+        Used by anti-entropy peers (POST /api/gossip/messages) to fetch the
+        difference found by reconciliation in one request.
+        
+        Args:
+            keys: IBLT keys (hex)
+        
+        Returns:
+            {"messages": [message_data, ...]} for the keys still cached
+        """
+        index = self._get_digest_index()
+        messages = []
+        for key in keys:
+            message_id = index.get(key_from_hex(key))
+            message = self.message_cache.get(message_id) if message_id else None
+            if message is not None:
+                messages.append(message.to_dict())
+        return {"messages": messages}
+    
+    def _get_digest_index(self) -> Dict[int, str]:
+        if self._digest_index is None:
+            self._digest_index = {item_key(message_id): message_id for message_id in self.message_cache}
+        return self._digest_index
+    
+    def _get_digest(self, cells: int) -> InvertibleBloomFilter:
+        """
+        Return the digest of this size.
+        
+        Sizes on the anti_entropy_cells doubling ladder are built once and
+        then maintained by _cache_message/_evict_message; other sizes (a
+        peer configured differently) are built for one use.
+        """
+        cells = InvertibleBloomFilter.table_cells(cells)
+        digest = self._digests.get(cells)
+        if digest is None:
+            digest = InvertibleBloomFilter(cells)
+            for key in self._get_digest_index():
+                digest.add_key(key)
+            if cells in self._digest_sizes():
+                self._digests[cells] = digest
+        return digest
+    
+    def _digest_sizes(self) -> Set[int]:
+        """Digest sizes worth maintaining incrementally"""
+        sizes = set()
+        size = self.config.anti_entropy_cells
+        while size <= self.config.anti_entropy_max_cells:
+            sizes.add(InvertibleBloomFilter.table_cells(size))
+            size *= 2
+        return sizes
 
 
 # Singleton instance
@@ -0,0 +1,245 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Set Reconciliation - Invertible Bloom Lookup Tables for Gossip Anti-Entropy
+
+Two nodes holding almost the same set of message IDs can find the few IDs
+that differ without exchanging the sets. Each side folds its IDs into a
+fixed number of cells (an IBLT); subtracting one table from the other
+cancels every shared ID, and the cells left over can be "peeled" to list
+the IDs only one side has.
+
+The digest size depends on the size of the difference, not on the size of
+the sets: with 3 hash functions, a table of about 1.5x the difference (plus
+a small constant) decodes with high probability. When decoding fails the
+caller retries with a larger table.
+
+Items are message IDs (arbitrary strings). They are hashed to 128-bit keys;
+a holder maps keys back to IDs with its own index.
+
+Research Foundation:
+- Eppstein et al., "What's the Difference? Efficient Set Reconciliation
+  without Prior Context" (SIGCOMM 2011)
+- Goodrich & Mitzenmacher, "Invertible Bloom Lookup Tables" (2011)
+
+Author: Aethel Team
+Version: Epoch 3.0 "The Lattice"
+"""
+
+import base64
+import hashlib
+import struct
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+KEY_BYTES = 16
+CHECK_BYTES = 8
+HASH_COUNT = 3
+
+_KEY_MASK = (1 << 32) - 1
+
+
+def item_key(item: str) -> int:
+    """128-bit IBLT key of a message ID"""
+    return int.from_bytes(hashlib.blake2b(item.encode(), digest_size=KEY_BYTES).digest(), "big")
+
+
+def _key_check(key: int) -> int:
+    """Independent checksum of a key, used to recognise pure cells"""
+    return int.from_bytes(
+        hashlib.blake2b(key.to_bytes(KEY_BYTES, "big"), digest_size=CHECK_BYTES).digest(), "big"
+    )
+
+
+class InvertibleBloomFilter:
+    """
+    Invertible Bloom lookup table over 128-bit keys.
+
+    Cells are split into HASH_COUNT equal sub-tables and every key lands in
+    one cell of each, so a key never hits the same cell twice.
+    """
+
+    def __init__(self, cells: int):
+        """
+        Initialize an empty table.
+
+        Args:
+            cells: Minimum number of cells (rounded up to a multiple of HASH_COUNT)
+        """
+        if cells < HASH_COUNT:
+            raise ValueError(f"An IBLT needs at least {HASH_COUNT} cells, got {cells}")
+
+        self.cells = self.table_cells(cells)
+        self.subtable_size = self.cells // HASH_COUNT
+        self.counts: List[int] = [0] * self.cells
+        self.key_sums: List[int] = [0] * self.cells
+        self.check_sums: List[int] = [0] * self.cells
+
+    @staticmethod
+    def table_cells(cells: int) -> int:
+        """Actual size of a table created with the given number of cells"""
+        return -(-cells // HASH_COUNT) * HASH_COUNT
+
+    def _positions(self, key: int) -> Tuple[int, ...]:
+        size = self.subtable_size
+        return tuple(
+            ((key >> (32 * i)) & _KEY_MASK) % size + i * size
+            for i in range(HASH_COUNT)
+        )
+
+    def _apply(self, key: int, check: int, sign: int) -> None:
+        for pos in self._positions(key):
+            self.counts[pos] += sign
+            self.key_sums[pos] ^= key
+            self.check_sums[pos] ^= check
+
+    def add(self, item: str) -> None:
+        """Insert a message ID"""
+        self.add_key(item_key(item))
+
+    def remove(self, item: str) -> None:
+        """Delete a message ID"""
+        self.remove_key(item_key(item))
+
+    def add_key(self, key: int) -> None:
+        """Insert a key"""
+        self._apply(key, _key_check(key), 1)
+
+    def remove_key(self, key: int) -> None:
+        """Delete a key"""
+        self._apply(key, _key_check(key), -1)
+
+    def update(self, items: Iterable[str]) -> None:
+        """Insert several message IDs"""
+        for item in items:
+            self.add(item)
+
+    def subtract(self, other: "InvertibleBloomFilter") -> "InvertibleBloomFilter":
+        """
+        Cell-wise difference self - other.
+
+        Keys in both tables cancel; the result decodes to the keys only in
+        self (count +1) and only in other (count -1).
+
+        Raises:
+            ValueError: If the tables have different sizes
+        """
+        if other.cells != self.cells:
+            raise ValueError(f"IBLT size mismatch: {self.cells} != {other.cells}")
+
+        result = InvertibleBloomFilter(self.cells)
+        result.counts = [a - b for a, b in zip(self.counts, other.counts)]
+        result.key_sums = [a ^ b for a, b in zip(self.key_sums, other.key_sums)]
+        result.check_sums = [a ^ b for a, b in zip(self.check_sums, other.check_sums)]
+        return result
+
+    def copy(self) -> "InvertibleBloomFilter":
+        result = InvertibleBloomFilter(self.cells)
+        result.counts = list(self.counts)
+        result.key_sums = list(self.key_sums)
+        result.check_sums = list(self.check_sums)
+        return result
+
+    def _is_pure(self, pos: int) -> bool:
+        return (self.counts[pos] in (1, -1)
+                and self.check_sums[pos] == _key_check(self.key_sums[pos]))
+
+    def decode(self) -> Tuple[Set[int], Set[int], bool]:
+        """
+        Peel the table (usually a difference) into its keys.
+
+        The table itself is left unchanged.
+
+        Returns:
+            (keys with positive count, keys with negative count, complete);
+            complete is False when peeling got stuck and the key lists are
+            partial, i.e. the table was too small for the difference
+        """
+        table = self.copy()
+        positive: Set[int] = set()
+        negative: Set[int] = set()
+
+        stack = [pos for pos in range(table.cells) if table._is_pure(pos)]
+        while stack:
+            pos = stack.pop()
+            if not table._is_pure(pos):
+                continue
+            key = table.key_sums[pos]
+            sign = table.counts[pos]
+            (positive if sign > 0 else negative).add(key)
+            table._apply(key, table.check_sums[pos], -sign)
+            stack.extend(p for p in table._positions(key) if table._is_pure(p))
+
+        complete = (not any(table.counts) and not any(table.key_sums)
+                    and not any(table.check_sums))
+        return positive, negative, complete
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact wire form: cell arrays packed into one base64 string"""
+        counts = struct.pack(f"<{self.cells}i", *self.counts)
+        keys = b"".join(k.to_bytes(KEY_BYTES, "big") for k in self.key_sums)
+        checks = b"".join(c.to_bytes(CHECK_BYTES, "big") for c in self.check_sums)
+        return {
+            "cells": self.cells,
+            "iblt": base64.b64encode(counts + keys + checks).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "InvertibleBloomFilter":
+        """
+        Parse the wire form produced by to_dict.
+
+        Raises:
+            ValueError: If the payload does not match the declared size
+        """
+        cells = int(data["cells"])
+        raw = base64.b64decode(data["iblt"])
+        table = cls(cells)
+        if table.cells != cells:
+            raise ValueError(f"IBLT cell count {cells} is not a multiple of {HASH_COUNT}")
+
+        counts_len = 4 * cells
+        if len(raw) != counts_len + (KEY_BYTES + CHECK_BYTES) * cells:
+            raise ValueError("IBLT payload size does not match cell count")
+
+        keys_end = counts_len + KEY_BYTES * cells
+        table.counts = list(struct.unpack(f"<{cells}i", raw[:counts_len]))
+        table.key_sums = [
+            int.from_bytes(raw[i:i + KEY_BYTES], "big")
+            for i in range(counts_len, keys_end, KEY_BYTES)
+        ]
+        table.check_sums = [
+            int.from_bytes(raw[i:i + CHECK_BYTES], "big")
+            for i in range(keys_end, len(raw), CHECK_BYTES)
+        ]
+        return table
+
+
+def key_to_hex(key: int) -> str:
+    return key.to_bytes(KEY_BYTES, "big").hex()
+
+
+def key_from_hex(value: str) -> int:
+    return int(value, 16)
+
+
+__all__ = [
+    'InvertibleBloomFilter',
+    'item_key',
+    'key_to_hex',
+    'key_from_hex',
+]
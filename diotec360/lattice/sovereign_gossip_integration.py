@@ -423,6 +423,21 @@ class SovereignGossipIntegration:
         
         return await self.gossip.receive_message(message_data)
 
+    async def receive_batch(self, batch_data: Dict[str, Any]) -> int:
+        """
+        Receive and verify a batch of gossip messages.
+
+        Args:
+            batch_data: {"messages": [message_data, ...]}
+
+        Returns:
+            Number of new messages
+        """
+        if not self.gossip:
+            raise RuntimeError("Gossip protocol not initialized")
+
+        return await self.gossip.receive_batch(batch_data)
+
 
 # Global instance
 _sovereign_gossip_integration: Optional[SovereignGossipIntegration] = None
@@ -23,6 +23,8 @@ and gossip-based propagation.
 
 Key Features:
 1. Merkle Diff: Compare local and remote state roots to find divergences
+   (range diff: top-down subtree hash comparison, cost proportional to the
+   divergence rather than the size of the state)
 2. State Request: Request missing blocks from peers
 3. Proof Validation: Only accept state updates with valid Z3 proofs
 4. Genesis Verification: Ensure all state traces back to genesis signature
@@ -47,7 +49,7 @@ import asyncio
 import time
 import hashlib
 import json
-from typing import List, Dict, Set, Optional, Tuple, Any
+from typing import List, Dict, Set, Optional, Tuple, Any, Callable, Iterable, Iterator
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import sqlite3
@@ -183,6 +185,12 @@ class SyncResponse:
     complete: bool = True
 
 
+# Range hash tree over block hashes: one level per hash character
+RANGE_DEPTH = 4  # Leaf buckets hold ~15 blocks at 1M blocks
+RANGE_LEAF_SIZE = 32  # Subtrees this small are listed instead of descended
+RANGE_PAD = "~"  # Pads hashes shorter than RANGE_DEPTH
+
+
 class StateSynchronizer:
     """
     The Collective Memory - Synchronizes state across the Lattice.
@@ -224,6 +232,16 @@ class StateSynchronizer:
         self.state_tree: Dict[str, MerkleNode] = {}
         self.root_hash: Optional[str] = None
         
+        # Range hash tree over state_tree keys (built on first use)
+        # prefix -> number of blocks under it
+        self._range_counts: Dict[str, int] = {}
+        # prefix -> child prefixes present (prefixes shorter than RANGE_DEPTH)
+        self._range_children: Dict[str, Set[str]] = {}
+        # RANGE_DEPTH prefix -> block hashes
+        self._range_buckets: Dict[str, Set[str]] = {}
+        # prefix -> subtree hash, dropped along the path of every change
+        self._range_hash_cache: Dict[str, str] = {}
+        
         # Sync state
         self.sync_status = SyncStatus.SYNCED
         self.pending_requests: Dict[str, SyncRequest] = {}
@@ -360,6 +378,39 @@ class StateSynchronizer:
         except Exception as e:
             print(f"[SYNC] Error persisting block {node.hash}: {e}")
     
+    def _persist_blocks(self, nodes: List[MerkleNode], status: BlockStatus) -> None:
+        """Persist several blocks in one transaction"""
+        if not nodes:
+            return
+        
+        try:
+            conn = sqlite3.connect(str(self.storage_path))
+            cursor = conn.cursor()
+            
+            cursor.executemany("""
+                INSERT OR REPLACE INTO state_blocks 
+                (hash, parent_hash, children, data, proof, signature, timestamp, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    node.hash,
+                    node.parent_hash,
+                    json.dumps(node.children),
+                    json.dumps(node.data),
+                    node.proof,
+                    node.signature,
+                    node.timestamp,
+                    status.value
+                )
+                for node in nodes
+            ])
+            
+            conn.commit()
+            conn.close()
+            
+        except Exception as e:
+            print(f"[SYNC] Error persisting {len(nodes)} blocks: {e}")
+    
     def _persist_root_hash(self, root_hash: str) -> None:
         """Persist root hash to disk"""
         try:
@@ -472,6 +523,258 @@ class StateSynchronizer:
         
         return ancestors
     
+    # ========================================================================
+    # Range Diff - Interactive Subtree Hash Comparison
+    # ========================================================================
+    
+    def calculate_range_diff(
+        self,
+        remote_root: str,
+        fetch_summary: Callable[[List[str]], Dict[str, Dict[str, Dict[str, Any]]]],
+        fetch_hashes: Callable[[List[str]], Dict[str, List[str]]]
+    ) -> StateDiff:
+        """
+        Calculate the difference with a remote node without its full tree.
+        
+        Both nodes keep a hash tree over their block hashes, keyed by hash
+        prefix. Starting at the root, the remote's child subtree hashes are
+        compared with ours and only differing subtrees are descended, one
+        round trip per level for all of them. Small or bottom-level subtrees
+        are settled by listing their block hashes. The cost grows with the
+        number of differing blocks, not with the size of the state.
+        
+        Args:
+            remote_root: Remote Merkle root hash (equal roots skip the diff)
+            fetch_summary: Calls the remote's get_range_summary
+            fetch_hashes: Calls the remote's get_range_hashes
+        
+        Returns:
+            StateDiff with missing and extra blocks (no ancestor walk: the
+            divergence point is not computed)
+        """
+        diff = StateDiff(
+            local_root=self.root_hash or "empty",
+            remote_root=remote_root
+        )
+        
+        if self.root_hash == remote_root:
+            print(f"[SYNC] Trees are identical (root: {self.root_hash})")
+            return diff
+        
+        self._ensure_range_index()
+        
+        level = [""]
+        to_list: List[str] = []
+        round_trips = 0
+        
+        while level:
+            summaries = fetch_summary(level)
+            round_trips += 1
+            next_level = []
+            
+            for prefix in level:
+                remote_children = summaries.get(prefix, {})
+                local_children = self._range_children.get(prefix, set()) if len(prefix) < RANGE_DEPTH else set()
+                
+                for child in sorted(set(remote_children) | local_children):
+                    remote = remote_children.get(child)
+                    local_count = self._range_counts.get(child, 0)
+                    
+                    if remote is None:
+                        # Whole subtree only exists locally
+                        diff.extra_blocks.extend(self._range_hashes_under(child))
+                        continue
+                    if local_count == 0:
+                        to_list.append(child)
+                        continue
+                    if remote['count'] == local_count and remote['hash'] == self._range_hash(child):
+                        continue
+                    
+                    if (len(child) >= RANGE_DEPTH
+                            or max(remote['count'], local_count) <= RANGE_LEAF_SIZE):
+                        to_list.append(child)
+                    else:
+                        next_level.append(child)
+            
+            level = next_level
+        
+        if to_list:
+            remote_hashes = fetch_hashes(to_list)
+            round_trips += 1
+            for prefix in to_list:
+                remote_set = set(remote_hashes.get(prefix, []))
+                local_set = set(self._range_hashes_under(prefix))
+                diff.missing_blocks.extend(sorted(remote_set - local_set))
+                diff.extra_blocks.extend(sorted(local_set - remote_set))
+        
+        print(f"[SYNC] Range diff calculated in {round_trips} round trips:")
+        print(f"  Missing blocks: {len(diff.missing_blocks)}")
+        print(f"  Extra blocks: {len(diff.extra_blocks)}")
+        
+        return diff
+    
+    def get_range_summary(self, prefixes: List[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Answer a range diff round: child subtree hashes of each prefix.
+        
+        Args:
+            prefixes: Subtrees the requester found to differ
+        
+        Returns:
+            prefix -> {child prefix -> {'hash': subtree hash, 'count': blocks}}
+        """
+        self._ensure_range_index()
+        
+        summary = {}
+        for prefix in prefixes:
+            children = self._range_children.get(prefix, set()) if len(prefix) < RANGE_DEPTH else set()
+            summary[prefix] = {
+                child: {'hash': self._range_hash(child), 'count': self._range_counts[child]}
+                for child in children
+            }
+        return summary
+    
+    def get_range_hashes(self, prefixes: List[str]) -> Dict[str, List[str]]:
+        """
+        Answer the last range diff round: block hashes under each prefix.
+        
+        Args:
+            prefixes: Subtrees to list
+        
+        Returns:
+            prefix -> block hashes
+        """
+        self._ensure_range_index()
+        return {prefix: self._range_hashes_under(prefix) for prefix in prefixes}
+    
+    def stream_blocks(self, block_hashes: Iterable[str], batch_size: int = 500) -> Iterator[List[MerkleNode]]:
+        """
+        Stream requested blocks in batches, parents before children.
+        
+        Hashes this node does not have are skipped.
+        
+        Args:
+            block_hashes: Blocks to send (e.g. a StateDiff's missing_blocks)
+            batch_size: Blocks per batch
+        
+        Yields:
+            Lists of MerkleNode, at most batch_size each
+        """
+        wanted = {h for h in block_hashes if h in self.state_tree}
+        emitted: Set[str] = set()
+        batch: List[MerkleNode] = []
+        
+        for hash_val in sorted(wanted):
+            # Requested ancestors not sent yet go first
+            chain = []
+            current = hash_val
+            while current in wanted and current not in emitted:
+                chain.append(current)
+                emitted.add(current)
+                current = self.state_tree[current].parent_hash
+            
+            for ancestor in reversed(chain):
+                batch.append(self.state_tree[ancestor])
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        
+        if batch:
+            yield batch
+    
+    def apply_block_stream(self, batches: Iterable[List[MerkleNode]]) -> int:
+        """
+        Validate and apply streamed blocks, one database transaction per batch.
+        
+        Args:
+            batches: Output of the remote's stream_blocks
+        
+        Returns:
+            Number of blocks applied
+        """
+        applied = 0
+        
+        for batch in batches:
+            touched: Dict[str, MerkleNode] = {}
+            for node in batch:
+                if not self._validate_block(node):
+                    print(f"[SYNC] Block {node.hash} failed validation")
+                    self.blocks_rejected += 1
+                    continue
+                if self._apply_block(node, persist=False):
+                    touched[node.hash] = node
+                    if node.parent_hash in self.state_tree:
+                        touched[node.parent_hash] = self.state_tree[node.parent_hash]
+                    applied += 1
+                    self.blocks_synced += 1
+            
+            self._persist_blocks(list(touched.values()), BlockStatus.APPLIED)
+            if self.root_hash:
+                self._persist_root_hash(self.root_hash)
+        
+        if applied > 0:
+            self.last_sync_time = time.time()
+            self.sync_status = SyncStatus.SYNCED
+        
+        print(f"[SYNC] Applied {applied} streamed blocks")
+        
+        return applied
+    
+    def _ensure_range_index(self) -> None:
+        """Build the range hash tree if it does not cover state_tree"""
+        if self._range_counts.get("", 0) == len(self.state_tree):
+            return
+        
+        self._range_counts = {}
+        self._range_children = {}
+        self._range_buckets = {}
+        self._range_hash_cache = {}
+        for hash_val in self.state_tree:
+            self._range_add(hash_val)
+    
+    def _range_add(self, hash_val: str) -> None:
+        """Add a block hash to the range hash tree"""
+        key = hash_val.ljust(RANGE_DEPTH, RANGE_PAD)[:RANGE_DEPTH]
+        bucket = self._range_buckets.setdefault(key, set())
+        if hash_val in bucket:
+            return
+        bucket.add(hash_val)
+        
+        for i in range(RANGE_DEPTH + 1):
+            prefix = key[:i]
+            self._range_counts[prefix] = self._range_counts.get(prefix, 0) + 1
+            self._range_hash_cache.pop(prefix, None)
+            if i < RANGE_DEPTH:
+                self._range_children.setdefault(prefix, set()).add(key[:i + 1])
+    
+    def _range_hash(self, prefix: str) -> str:
+        """Hash of the subtree under prefix (sorted children, sorted leaf hashes)"""
+        cached = self._range_hash_cache.get(prefix)
+        if cached is not None:
+            return cached
+        
+        if len(prefix) >= RANGE_DEPTH:
+            content = "\n".join(sorted(self._range_buckets.get(prefix, ())))
+        else:
+            content = "\n".join(
+                f"{child}:{self._range_hash(child)}"
+                for child in sorted(self._range_children.get(prefix, ()))
+            )
+        
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        self._range_hash_cache[prefix] = digest
+        return digest
+    
+    def _range_hashes_under(self, prefix: str) -> List[str]:
+        """All block hashes under prefix"""
+        if len(prefix) >= RANGE_DEPTH:
+            return sorted(self._range_buckets.get(prefix, ()))
+        
+        hashes = []
+        for child in sorted(self._range_children.get(prefix, ())):
+            hashes.extend(self._range_hashes_under(child))
+        return hashes
+    
     # ========================================================================
     # State Request - Ask Peers for Missing Blocks
     # ========================================================================
@@ -654,17 +957,23 @@ class StateSynchronizer:
     # Block Application - Update State Tree
     # ========================================================================
     
-    def _apply_block(self, node: MerkleNode) -> bool:
+    def _apply_block(self, node: MerkleNode, persist: bool = True) -> bool:
         """
         Apply a validated block to the state tree.
         
         Args:
             node: MerkleNode to apply
+            persist: Write the block, its parent and the root to disk
+                     (False when the caller persists a whole batch)
         
         Returns:
             True if successfully applied, False otherwise
         """
         try:
+            # Keep the range hash tree in step (if built)
+            if node.hash not in self.state_tree and self._range_counts.get("", 0) == len(self.state_tree) > 0:
+                self._range_add(node.hash)
+            
             # Add to state tree
             self.state_tree[node.hash] = node
             
@@ -674,17 +983,19 @@ class StateSynchronizer:
                 if node.hash not in parent.children:
                     parent.children.append(node.hash)
                     # Persist updated parent
-                    self._persist_block(parent, BlockStatus.APPLIED)
+                    if persist:
+                        self._persist_block(parent, BlockStatus.APPLIED)
             
             # Update block status
             self.block_status[node.hash] = BlockStatus.APPLIED
             
             # Persist block
-            self._persist_block(node, BlockStatus.APPLIED)
+            if persist:
+                self._persist_block(node, BlockStatus.APPLIED)
             
             # Update root if this is a new leaf
             if not node.children:
-                self._update_root(node.hash)
+                self._update_root(node.hash, persist)
             
             print(f"[SYNC] Applied block {node.hash}")
             
@@ -694,13 +1005,14 @@ class StateSynchronizer:
             print(f"[SYNC] Error applying block {node.hash}: {e}")
             return False
     
-    def _update_root(self, new_root: str) -> None:
+    def _update_root(self, new_root: str, persist: bool = True) -> None:
         """Update the Merkle root hash"""
         old_root = self.root_hash
         self.root_hash = new_root
         
         # Persist new root
-        self._persist_root_hash(new_root)
+        if persist:
+            self._persist_root_hash(new_root)
         
         print(f"[SYNC] Root updated: {old_root} -> {new_root}")
     
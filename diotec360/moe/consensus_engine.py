@@ -27,7 +27,7 @@ Date: February 13, 2026
 Version: v2.1.0
 """
 
-from typing import List
+from typing import List, Optional
 from .data_models import ExpertVerdict, MOEResult
 
 
@@ -133,6 +133,28 @@ class ConsensusEngine:
             activated_experts=activated_experts
         )
     
+    def decided_consensus(self, verdicts: List[ExpertVerdict], pending: int) -> Optional[str]:
+        """
+        Consensus that no pending verdict can change, if any.
+        
+        A high-confidence rejection fixes REJECTED (rule 1 wins over the
+        others). APPROVED and UNCERTAIN stay open while any expert is
+        pending, since that expert could still reject with high confidence.
+        
+        Args:
+            verdicts: Verdicts received so far
+            pending: Number of experts that have not answered yet
+            
+        Returns:
+            The final consensus, or None if it is not decided yet
+        """
+        for verdict in verdicts:
+            if verdict.verdict == "REJECT" and verdict.confidence >= self.confidence_threshold:
+                return "REJECTED"
+        if pending == 0:
+            return self.aggregate(verdicts).consensus
+        return None
+    
     def set_confidence_threshold(self, threshold: float) -> None:
         """
         Update confidence threshold for approval.
@@ -0,0 +1,118 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Intent Canonicalizer - Cache keys for MOEOrchestrator verdicts
+
+The orchestrator receives intents in two shapes:
+- the repr of an intent specification dict (AethelJudge passes str(data))
+- Aethel source text with guard/verify blocks
+
+Cosmetic differences (dict key order, quoting, whitespace, redundant
+parentheses) change the raw string but not the verdict. canonicalize_intent
+maps such variants to one canonical string.
+
+Structured intents: the repr is parsed back with ast.literal_eval, dict keys
+are sorted, and every string that parses as an expression is re-rendered
+from its AST. With alpha_rename=True, identifiers are additionally renamed
+to v0, v1, ... in order of first appearance.
+
+Text intents: lines are stripped, whitespace runs inside a line collapse to
+one space, and blank lines are dropped. Line breaks are kept, because the
+experts read one condition per line.
+
+Alpha renaming is opt-in. The gating network routes on identifier keywords
+and the Guardian expert looks for 'balance' in names, so two intents that
+differ only in variable names can receive different verdicts.
+
+Author: Aethel Team
+Version: v2.1.0
+"""
+
+import ast
+import json
+import re
+from typing import Any, Dict, Optional
+
+
+# Names that keep their spelling under alpha renaming
+_RESERVED_NAMES = frozenset({'True', 'False', 'None', 'old', 'abs', 'min', 'max', 'sum', 'len'})
+
+
+class _AlphaRenamer(ast.NodeTransformer):
+    """Rename free identifiers to v0, v1, ... with one mapping per intent"""
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        if node.id in _RESERVED_NAMES:
+            return node
+        if node.id not in self.mapping:
+            self.mapping[node.id] = f"v{len(self.mapping)}"
+        return ast.copy_location(ast.Name(id=self.mapping[node.id], ctx=node.ctx), node)
+
+
+def _canonical_expression(text: str, mapping: Optional[Dict[str, str]]) -> str:
+    """Re-render an expression from its AST, or collapse whitespace if it does not parse"""
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+    except SyntaxError:
+        return re.sub(r'\s+', ' ', text).strip()
+    if mapping is not None:
+        tree = _AlphaRenamer(mapping).visit(tree)
+    return ast.unparse(tree)
+
+
+def _canonical_value(value: Any, mapping: Optional[Dict[str, str]]) -> Any:
+    if isinstance(value, dict):
+        # Sorted traversal so the renaming does not depend on key order
+        return {str(key): _canonical_value(value[key], mapping) for key in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(item, mapping) for item in value]
+    if isinstance(value, str):
+        return _canonical_expression(value, mapping)
+    return value
+
+
+def _canonical_text(intent: str) -> str:
+    lines = (re.sub(r'\s+', ' ', line).strip() for line in intent.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def canonicalize_intent(intent: str, alpha_rename: bool = False) -> str:
+    """
+    Canonical form of an intent string.
+
+    Args:
+        intent: Intent as passed to MOEOrchestrator.verify_transaction
+        alpha_rename: Also rename identifiers of structured intents in order
+            of first appearance
+
+    Returns:
+        Canonical string; equal for cosmetically different variants
+    """
+    try:
+        structured = ast.literal_eval(intent.strip())
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        structured = None
+
+    if isinstance(structured, (dict, list, tuple)):
+        mapping: Optional[Dict[str, str]] = {} if alpha_rename else None
+        canonical = _canonical_value(structured, mapping)
+        return 'structured:' + json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+
+    return 'text:' + _canonical_text(intent)
@@ -23,9 +23,12 @@ experts, executes experts in parallel, and aggregates results into unified verdi
 Key Responsibilities:
 - Expert registration and management
 - Feature extraction from transaction intents
-- Parallel expert execution using ThreadPoolExecutor
+- Parallel expert execution on a long-lived ThreadPoolExecutor, with
+  per-expert deadlines and early exit once the consensus is decided
 - Result aggregation via consensus engine
 - Telemetry recording for monitoring
+- Verdict caching: canonical intent keys, per-verdict TTLs, LRU bound and
+  single-flight deduplication of concurrent identical intents
 
 Author: Kiro AI - Engenheiro-Chefe
 Date: February 13, 2026
@@ -35,14 +38,26 @@ Version: v2.1.0
 import time
 import hashlib
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from .base_expert import BaseExpert
 from .data_models import ExpertVerdict, MOEResult
 from .gating_network import GatingNetwork
 from .consensus_engine import ConsensusEngine
 from .telemetry import ExpertTelemetry
+from .intent_canonicalizer import canonicalize_intent
+
+
+# Cache class of a result produced while an expert timed out or crashed.
+# Such verdicts say nothing about the intent and are not cached by default.
+TRANSIENT = "TRANSIENT"
+
+# Default TTLs per cache class; APPROVED and REJECTED follow cache_ttl_seconds
+DEFAULT_UNCERTAIN_TTL_SECONDS = 30
+DEFAULT_TRANSIENT_TTL_SECONDS = 0
 
 
 @dataclass
@@ -53,11 +68,13 @@ class CacheEntry:
     Attributes:
         result: Cached MOEResult
         timestamp: Unix timestamp when cached
-        cache_key: SHA256 hash of intent
+        cache_key: SHA256 hash of the canonical intent
+        verdict_class: APPROVED, REJECTED, UNCERTAIN or TRANSIENT (selects the TTL)
     """
     result: MOEResult
     timestamp: float
     cache_key: str
+    verdict_class: str = "APPROVED"
 
 
 class MOEOrchestrator:
@@ -84,7 +101,12 @@ class MOEOrchestrator:
         expert_timeout: int = 30,
         telemetry_db_path: str = ".aethel_moe/telemetry.db",
         cache_ttl_seconds: int = 300,
-        enable_cache: bool = True
+        enable_cache: bool = True,
+        cache_ttl_by_verdict: Optional[Dict[str, float]] = None,
+        max_cache_entries: int = 10000,
+        alpha_rename_cache_keys: bool = False,
+        early_exit_consensus: bool = True,
+        expert_queue_timeout: Optional[float] = None
     ):
         """
         Initialize MOE Orchestrator.
@@ -95,6 +117,18 @@ class MOEOrchestrator:
             telemetry_db_path: Path to telemetry database
             cache_ttl_seconds: Time-to-live for cache entries in seconds (default 300 = 5 minutes)
             enable_cache: Enable verdict caching (default True)
+            cache_ttl_by_verdict: TTL overrides per cache class (APPROVED, REJECTED,
+                UNCERTAIN, TRANSIENT). Defaults: UNCERTAIN 30s (at most cache_ttl_seconds),
+                TRANSIENT 0 (not cached), others cache_ttl_seconds
+            max_cache_entries: LRU bound on cached verdicts (default 10000)
+            alpha_rename_cache_keys: Treat structured intents that differ only in
+                variable names as identical (default False: experts read names)
+            early_exit_consensus: Stop waiting for experts once a high-confidence
+                rejection has decided the consensus (default True)
+            expert_queue_timeout: How long an expert may wait for a free pool
+                thread, in seconds (default expert_timeout). An expert that has
+                not started within expert_timeout + expert_queue_timeout of
+                submission gets a timeout verdict.
         """
         self.experts: Dict[str, BaseExpert] = {}
         self.gating_network = GatingNetwork()
@@ -104,15 +138,37 @@ class MOEOrchestrator:
         # Execution configuration
         self.max_workers = max_workers
         self.expert_timeout = expert_timeout
+        self.expert_queue_timeout = expert_timeout if expert_queue_timeout is None else expert_queue_timeout
+        self.early_exit_consensus = early_exit_consensus
+        
+        # Expert threads live as long as the orchestrator (created on first use)
+        self._executor_lock = threading.Lock()
+        self._expert_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Expert scheduling statistics
+        self.expert_timeouts = 0
+        self.early_exits = 0
+        self.experts_skipped = 0
         
         # Verdict caching
         self.enable_cache = enable_cache
         self.cache_ttl_seconds = cache_ttl_seconds
-        self.verdict_cache: Dict[str, CacheEntry] = {}
+        self.cache_ttl_by_verdict: Dict[str, float] = dict(cache_ttl_by_verdict or {})
+        self.max_cache_entries = max_cache_entries
+        self.alpha_rename_cache_keys = alpha_rename_cache_keys
+        self.verdict_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        
+        # Single-flight: cache key -> future of the verification in progress
+        self._cache_lock = threading.RLock()
+        self._in_flight: Dict[str, Future] = {}
         
         # Cache statistics
         self.cache_hits = 0
         self.cache_misses = 0
+        self.cache_coalesced = 0
+        self.cache_evictions = 0
+        self.cache_expirations = 0
+        self.cache_uncached = 0
         
         # Statistics
         self.total_verifications = 0
@@ -160,6 +216,9 @@ class MOEOrchestrator:
         5. Aggregate results via consensus engine
         6. Record telemetry and update cache
         
+        Concurrent calls with the same canonical intent share one expert run:
+        the first caller verifies, the others wait for its result.
+        
         Args:
             intent: Transaction intent string to verify
             tx_id: Unique transaction identifier
@@ -167,25 +226,62 @@ class MOEOrchestrator:
         Returns:
             MOEResult with consensus verdict and expert verdicts
         """
-        start_time = time.time()
+        if not self.enable_cache:
+            return self._verify_uncached(intent, tx_id)
         
-        try:
-            # Step 1: Check cache
-            if self.enable_cache:
-                cached_result = self._check_cache(intent)
-                if cached_result is not None:
-                    # Cache hit - return cached result
-                    self.cache_hits += 1
-                    self.total_verifications += 1
-                    
-                    # Update transaction ID to current one
-                    cached_result.transaction_id = tx_id
-                    
-                    return cached_result
-                
-                # Cache miss
+        # Step 1: Check cache, or join a verification already in flight
+        cache_key = self._generate_cache_key(intent)
+        with self._cache_lock:
+            cached_result = self._check_cache_key(cache_key)
+            if cached_result is not None:
+                # Cache hit - return a copy carrying the current transaction ID
+                self.cache_hits += 1
+                self.total_verifications += 1
+                return replace(cached_result, transaction_id=tx_id)
+            
+            in_flight = self._in_flight.get(cache_key)
+            if in_flight is None:
+                # Cache miss - this call verifies
                 self.cache_misses += 1
+                in_flight = Future()
+                self._in_flight[cache_key] = in_flight
+                leader = True
+            else:
+                self.cache_coalesced += 1
+                leader = False
+        
+        if not leader:
+            result = in_flight.result()
+            with self._cache_lock:
+                self.total_verifications += 1
+            return replace(result, transaction_id=tx_id)
+        
+        try:
+            result = self._verify_uncached(intent, tx_id, cache_key)
+            in_flight.set_result(result)
+            return result
+        except BaseException as e:
+            in_flight.set_exception(e)
+            raise
+        finally:
+            with self._cache_lock:
+                del self._in_flight[cache_key]
+    
+    def _verify_uncached(self, intent: str, tx_id: str, cache_key: Optional[str] = None) -> MOEResult:
+        """
+        Run the expert pipeline (steps 2-6) for one intent.
+        
+        Args:
+            intent: Transaction intent string to verify
+            tx_id: Unique transaction identifier
+            cache_key: Key to store the verdict under (None: do not cache)
             
+        Returns:
+            MOEResult with consensus verdict and expert verdicts
+        """
+        start_time = time.time()
+        
+        try:
             # Step 2: Extract features from intent
             features = self._extract_features(intent)
             
@@ -227,12 +323,13 @@ class MOEOrchestrator:
             self.telemetry.record(tx_id, verdicts, consensus)
             
             # Update cache
-            if self.enable_cache:
-                self._update_cache(intent, consensus)
+            if cache_key is not None:
+                self._store_in_cache(cache_key, consensus)
             
             # Update statistics
-            self.total_verifications += 1
-            self.total_latency_ms += total_latency_ms
+            with self._cache_lock:
+                self.total_verifications += 1
+                self.total_latency_ms += total_latency_ms
             
             return consensus
             
@@ -272,6 +369,27 @@ class MOEOrchestrator:
         """
         return self.gating_network.extract_features(intent)
     
+    def _get_expert_executor(self) -> ThreadPoolExecutor:
+        """Long-lived expert thread pool, created on first use"""
+        with self._executor_lock:
+            if self._expert_executor is None:
+                self._expert_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="moe_expert"
+                )
+            return self._expert_executor
+    
+    def shutdown(self) -> None:
+        """Cancel queued expert runs, wait for running ones, stop the expert threads and flush telemetry"""
+        with self._executor_lock:
+            executor = self._expert_executor
+            self._expert_executor = None
+        
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        self.telemetry.flush()
+    
     def _execute_experts_parallel(
         self,
         expert_names: List[str],
@@ -279,7 +397,17 @@ class MOEOrchestrator:
         tx_id: str
     ) -> List[ExpertVerdict]:
         """
-        Execute multiple experts in parallel using ThreadPoolExecutor.
+        Execute multiple experts in parallel on the orchestrator's thread pool.
+        
+        Each expert gets expert_timeout seconds from the moment it starts
+        running; an expert past its deadline gets a timeout verdict and its
+        late result is ignored. The pool is shared, so an expert may also
+        wait for a thread: one that has not started within expert_timeout +
+        expert_queue_timeout of submission is cancelled and gets a timeout
+        verdict too, so hung experts cannot stall later requests forever.
+        With early_exit_consensus, collection stops
+        as soon as the consensus engine reports the outcome as decided, and
+        experts that have not answered are cancelled or ignored.
         
         Args:
             expert_names: List of expert names to execute
@@ -287,37 +415,37 @@ class MOEOrchestrator:
             tx_id: Transaction identifier
             
         Returns:
-            List of expert verdicts
+            List of expert verdicts, in completion order
         """
         verdicts = []
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all expert verification tasks
-            futures = {
-                executor.submit(self.experts[name].verify, intent, tx_id): name
-                for name in expert_names
-            }
+        executor = self._get_expert_executor()
+        started_at: Dict[str, float] = {}
+        
+        def run_expert(name: str) -> ExpertVerdict:
+            started_at[name] = time.monotonic()
+            return self.experts[name].verify(intent, tx_id)
+        
+        # Submit all expert verification tasks
+        futures = {executor.submit(run_expert, name): name for name in expert_names}
+        pending = set(futures)
+        queue_deadline = time.monotonic() + self.expert_timeout + self.expert_queue_timeout
+        
+        while pending:
+            # Sleep until the earliest deadline of a running or queued expert
+            now = time.monotonic()
+            deadlines = [
+                started_at[futures[future]] + self.expert_timeout
+                if futures[future] in started_at else queue_deadline
+                for future in pending
+            ]
+            timeout = max(0.0, min(deadlines) - now)
+            
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
             
-            # Collect results as they complete (without global timeout on as_completed)
-            for future in as_completed(futures):
+            for future in done:
                 expert_name = futures[future]
-                
                 try:
-                    # Get verdict with timeout
-                    verdict = future.result(timeout=self.expert_timeout)
-                    verdicts.append(verdict)
-                    
-                except FuturesTimeoutError:
-                    # Expert timed out - create timeout verdict
-                    verdicts.append(ExpertVerdict(
-                        expert_name=expert_name,
-                        verdict="REJECT",
-                        confidence=0.0,
-                        latency_ms=self.expert_timeout * 1000,
-                        reason=f"Expert timeout ({self.expert_timeout}s)",
-                        proof_trace={'timeout': True}
-                    ))
-                    
+                    verdicts.append(future.result())
                 except Exception as e:
                     # Expert crashed - create error verdict
                     verdicts.append(ExpertVerdict(
@@ -328,6 +456,46 @@ class MOEOrchestrator:
                         reason=f"Expert failure: {str(e)}",
                         proof_trace={'error': str(e), 'error_type': type(e).__name__}
                     ))
+            
+            # Expert timed out - create timeout verdict, ignore its late result
+            now = time.monotonic()
+            for future in list(pending):
+                expert_name = futures[future]
+                if expert_name in started_at:
+                    if now - started_at[expert_name] >= self.expert_timeout:
+                        pending.discard(future)
+                        self.expert_timeouts += 1
+                        verdicts.append(ExpertVerdict(
+                            expert_name=expert_name,
+                            verdict="REJECT",
+                            confidence=0.0,
+                            latency_ms=self.expert_timeout * 1000,
+                            reason=f"Expert timeout ({self.expert_timeout}s)",
+                            proof_trace={'timeout': True}
+                        ))
+                elif now >= queue_deadline:
+                    # Never got a pool thread (pool busy with hung experts)
+                    future.cancel()
+                    pending.discard(future)
+                    self.expert_timeouts += 1
+                    waited = self.expert_timeout + self.expert_queue_timeout
+                    verdicts.append(ExpertVerdict(
+                        expert_name=expert_name,
+                        verdict="REJECT",
+                        confidence=0.0,
+                        latency_ms=waited * 1000,
+                        reason=f"Expert timeout (not started within {waited}s)",
+                        proof_trace={'timeout': True, 'queued': True}
+                    ))
+            
+            if (pending and self.early_exit_consensus
+                    and self.consensus_engine.decided_consensus(verdicts, len(pending)) is not None):
+                # Outcome fixed: cancel experts not yet started, ignore the rest
+                for future in pending:
+                    future.cancel()
+                self.early_exits += 1
+                self.experts_skipped += len(pending)
+                break
         
         return verdicts
     
@@ -352,7 +520,11 @@ class MOEOrchestrator:
                 if self.total_verifications > 0 else 0.0
             ),
             'max_workers': self.max_workers,
-            'expert_timeout': self.expert_timeout
+            'expert_timeout': self.expert_timeout,
+            'expert_queue_timeout': self.expert_queue_timeout,
+            'expert_timeouts': self.expert_timeouts,
+            'early_exits': self.early_exits,
+            'experts_skipped': self.experts_skipped
         }
         
         return {
@@ -396,7 +568,7 @@ class MOEOrchestrator:
     
     def _generate_cache_key(self, intent: str) -> str:
         """
-        Generate cache key from intent using SHA256 hash.
+        Generate cache key from the canonical form of the intent.
         
         Args:
             intent: Transaction intent string
@@ -404,7 +576,29 @@ class MOEOrchestrator:
         Returns:
             SHA256 hash as hex string
         """
-        return hashlib.sha256(intent.encode('utf-8')).hexdigest()
+        canonical = canonicalize_intent(intent, alpha_rename=self.alpha_rename_cache_keys)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+    
+    def _classify_result(self, result: MOEResult) -> str:
+        """
+        Cache class of a result: its consensus, or TRANSIENT if an expert
+        timed out or crashed while producing it.
+        """
+        for verdict in result.expert_verdicts:
+            trace = verdict.proof_trace or {}
+            if trace.get('timeout') or 'error' in trace:
+                return TRANSIENT
+        return result.consensus
+    
+    def _ttl_for(self, verdict_class: str) -> float:
+        """TTL in seconds for a cache class"""
+        if verdict_class in self.cache_ttl_by_verdict:
+            return self.cache_ttl_by_verdict[verdict_class]
+        if verdict_class == "UNCERTAIN":
+            return min(DEFAULT_UNCERTAIN_TTL_SECONDS, self.cache_ttl_seconds)
+        if verdict_class == TRANSIENT:
+            return DEFAULT_TRANSIENT_TTL_SECONDS
+        return self.cache_ttl_seconds
     
     def _check_cache(self, intent: str) -> Optional[MOEResult]:
         """
@@ -416,21 +610,25 @@ class MOEOrchestrator:
         Returns:
             Cached MOEResult if found and not expired, None otherwise
         """
-        cache_key = self._generate_cache_key(intent)
-        
-        if cache_key not in self.verdict_cache:
+        with self._cache_lock:
+            return self._check_cache_key(self._generate_cache_key(intent))
+    
+    def _check_cache_key(self, cache_key: str) -> Optional[MOEResult]:
+        """Look up a key, dropping it if expired (caller holds _cache_lock)"""
+        entry = self.verdict_cache.get(cache_key)
+        if entry is None:
             return None
         
-        entry = self.verdict_cache[cache_key]
-        
         # Check if entry has expired
         age_seconds = time.time() - entry.timestamp
-        if age_seconds > self.cache_ttl_seconds:
+        if age_seconds > self._ttl_for(entry.verdict_class):
             # Expired - remove from cache
             del self.verdict_cache[cache_key]
+            self.cache_expirations += 1
             return None
         
-        # Valid cache entry
+        # Valid cache entry - most recently used
+        self.verdict_cache.move_to_end(cache_key)
         return entry.result
     
     def _update_cache(self, intent: str, result: MOEResult) -> None:
@@ -441,15 +639,28 @@ class MOEOrchestrator:
             intent: Transaction intent string
             result: MOEResult to cache
         """
-        cache_key = self._generate_cache_key(intent)
-        
-        entry = CacheEntry(
-            result=result,
-            timestamp=time.time(),
-            cache_key=cache_key
-        )
-        
-        self.verdict_cache[cache_key] = entry
+        self._store_in_cache(self._generate_cache_key(intent), result)
+    
+    def _store_in_cache(self, cache_key: str, result: MOEResult) -> None:
+        """Store a verdict under its class TTL, evicting least recently used entries"""
+        verdict_class = self._classify_result(result)
+        
+        with self._cache_lock:
+            if self._ttl_for(verdict_class) <= 0:
+                self.cache_uncached += 1
+                return
+            
+            self.verdict_cache[cache_key] = CacheEntry(
+                result=replace(result),
+                timestamp=time.time(),
+                cache_key=cache_key,
+                verdict_class=verdict_class
+            )
+            self.verdict_cache.move_to_end(cache_key)
+            
+            while len(self.verdict_cache) > self.max_cache_entries:
+                self.verdict_cache.popitem(last=False)
+                self.cache_evictions += 1
     
     def clear_cache(self) -> int:
         """
@@ -458,9 +669,10 @@ class MOEOrchestrator:
         Returns:
             Number of entries cleared
         """
-        count = len(self.verdict_cache)
-        self.verdict_cache.clear()
-        return count
+        with self._cache_lock:
+            count = len(self.verdict_cache)
+            self.verdict_cache.clear()
+            return count
     
     def cleanup_expired_cache(self) -> int:
         """
@@ -470,15 +682,16 @@ class MOEOrchestrator:
             Number of entries removed
         """
         current_time = time.time()
-        expired_keys = []
-        
-        for cache_key, entry in self.verdict_cache.items():
-            age_seconds = current_time - entry.timestamp
-            if age_seconds > self.cache_ttl_seconds:
-                expired_keys.append(cache_key)
         
-        for key in expired_keys:
-            del self.verdict_cache[key]
+        with self._cache_lock:
+            expired_keys = [
+                cache_key for cache_key, entry in self.verdict_cache.items()
+                if current_time - entry.timestamp > self._ttl_for(entry.verdict_class)
+            ]
+            
+            for key in expired_keys:
+                del self.verdict_cache[key]
+            self.cache_expirations += len(expired_keys)
         
         return len(expired_keys)
     
@@ -494,18 +707,45 @@ class MOEOrchestrator:
             - hits: Number of cache hits
             - misses: Number of cache misses
             - hit_rate: Cache hit rate (0.0-1.0)
-        """
-        total_requests = self.cache_hits + self.cache_misses
-        hit_rate = self.cache_hits / total_requests if total_requests > 0 else 0.0
-        
-        return {
-            'enabled': self.enable_cache,
-            'ttl_seconds': self.cache_ttl_seconds,
-            'size': len(self.verdict_cache),
-            'hits': self.cache_hits,
-            'misses': self.cache_misses,
-            'hit_rate': hit_rate
-        }
+            - coalesced: Calls that joined an identical verification in flight
+            - effective_hit_rate: (hits + coalesced) / all cached-path calls
+            - max_entries, evictions, expirations: LRU and TTL activity
+            - uncached: Results not stored because their class TTL is 0
+            - ttl_by_verdict: TTL per cache class
+            - entries_by_verdict: Current entries per cache class
+        """
+        with self._cache_lock:
+            total_requests = self.cache_hits + self.cache_misses
+            hit_rate = self.cache_hits / total_requests if total_requests > 0 else 0.0
+            all_requests = total_requests + self.cache_coalesced
+            effective_hit_rate = (
+                (self.cache_hits + self.cache_coalesced) / all_requests
+                if all_requests > 0 else 0.0
+            )
+            
+            entries_by_verdict: Dict[str, int] = {}
+            for entry in self.verdict_cache.values():
+                entries_by_verdict[entry.verdict_class] = entries_by_verdict.get(entry.verdict_class, 0) + 1
+            
+            return {
+                'enabled': self.enable_cache,
+                'ttl_seconds': self.cache_ttl_seconds,
+                'size': len(self.verdict_cache),
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': hit_rate,
+                'coalesced': self.cache_coalesced,
+                'effective_hit_rate': effective_hit_rate,
+                'max_entries': self.max_cache_entries,
+                'evictions': self.cache_evictions,
+                'expirations': self.cache_expirations,
+                'uncached': self.cache_uncached,
+                'ttl_by_verdict': {
+                    verdict_class: self._ttl_for(verdict_class)
+                    for verdict_class in ("APPROVED", "REJECTED", "UNCERTAIN", TRANSIENT)
+                },
+                'entries_by_verdict': entries_by_verdict
+            }
     
     def set_cache_enabled(self, enabled: bool) -> None:
         """
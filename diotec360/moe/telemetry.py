@@ -34,6 +34,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from .data_models import ExpertVerdict, MOEResult
+from ..core.telemetry_sink import TelemetrySink
 
 
 class ExpertTelemetry:
@@ -45,18 +46,24 @@ class ExpertTelemetry:
     - Historical analysis
     - Performance optimization
     - Anomaly detection
+    
+    Writes are queued on a TelemetrySink and written in batches; the query
+    methods flush the sink first so they see every recorded verdict.
     """
     
-    def __init__(self, db_path: str = ".aethel_moe/telemetry.db"):
+    def __init__(self, db_path: str = ".aethel_moe/telemetry.db",
+                 sink: Optional[TelemetrySink] = None):
         """
         Initialize telemetry system.
         
         Args:
             db_path: Path to SQLite database file
+            sink: Telemetry sink to write through (default: a new sink on db_path)
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
+        self.sink = sink if sink is not None else TelemetrySink(self.db_path)
         
     def _init_database(self) -> None:
         """Initialize SQLite database schema."""
@@ -136,47 +143,42 @@ class ExpertTelemetry:
             verdicts: List of expert verdicts
             consensus: Aggregated consensus result
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         timestamp = time.time()
         
-        try:
-            # Record individual expert verdicts
-            for verdict in verdicts:
-                cursor.execute('''
-                    INSERT INTO expert_verdicts 
-                    (timestamp, transaction_id, expert_name, verdict, 
-                     confidence, latency_ms, reason, proof_trace)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    timestamp,
-                    tx_id,
-                    verdict.expert_name,
-                    verdict.verdict,
-                    verdict.confidence,
-                    verdict.latency_ms,
-                    verdict.reason,
-                    str(verdict.proof_trace) if verdict.proof_trace else None
-                ))
-            
-            # Record consensus result
-            cursor.execute('''
-                INSERT INTO consensus_results 
-                (timestamp, transaction_id, consensus, overall_confidence,
-                 total_latency_ms, activated_experts)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+        # Record individual expert verdicts
+        self.sink.submit_many('''
+            INSERT INTO expert_verdicts 
+            (timestamp, transaction_id, expert_name, verdict, 
+             confidence, latency_ms, reason, proof_trace)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (
                 timestamp,
-                consensus.transaction_id,
-                consensus.consensus,
-                consensus.overall_confidence,
-                consensus.total_latency_ms,
-                ','.join(consensus.activated_experts)
-            ))
-            
-            conn.commit()
-        finally:
-            conn.close()
+                tx_id,
+                verdict.expert_name,
+                verdict.verdict,
+                verdict.confidence,
+                verdict.latency_ms,
+                verdict.reason,
+                str(verdict.proof_trace) if verdict.proof_trace else None
+            )
+            for verdict in verdicts
+        ])
+        
+        # Record consensus result
+        self.sink.submit('''
+            INSERT INTO consensus_results 
+            (timestamp, transaction_id, consensus, overall_confidence,
+             total_latency_ms, activated_experts)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            timestamp,
+            consensus.transaction_id,
+            consensus.consensus,
+            consensus.overall_confidence,
+            consensus.total_latency_ms,
+            ','.join(consensus.activated_experts)
+        ))
             
     def record_ground_truth(self, tx_id: str, expert_name: str, 
                            was_correct: bool) -> None:
@@ -188,23 +190,32 @@ class ExpertTelemetry:
             expert_name: Name of the expert
             was_correct: True if expert verdict matched ground truth
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.sink.submit('''
+            INSERT INTO ground_truth 
+            (timestamp, transaction_id, expert_name, was_correct)
+            VALUES (?, ?, ?, ?)
+        ''', (
+            time.time(),
+            tx_id,
+            expert_name,
+            1 if was_correct else 0
+        ))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all recorded telemetry is written.
         
-        try:
-            cursor.execute('''
-                INSERT INTO ground_truth 
-                (timestamp, transaction_id, expert_name, was_correct)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                time.time(),
-                tx_id,
-                expert_name,
-                1 if was_correct else 0
-            ))
-            conn.commit()
-        finally:
-            conn.close()
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+            
+        Returns:
+            True if everything recorded so far was written
+        """
+        return self.sink.flush(timeout)
+    
+    def close(self) -> None:
+        """Write pending telemetry and release the sink."""
+        self.sink.close()
             
     def get_expert_stats(self, expert_name: str, 
                         time_window_seconds: int = 3600) -> Dict[str, Any]:
@@ -224,6 +235,7 @@ class ExpertTelemetry:
             - verdict_distribution: Count of approvals vs rejections
             - total_verifications: Total number of verifications
         """
+        self.sink.flush()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -312,6 +324,7 @@ class ExpertTelemetry:
         Returns:
             List of statistics dictionaries, one per expert
         """
+        self.sink.flush()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -383,6 +396,7 @@ class ExpertTelemetry:
         Returns:
             Number of records deleted
         """
+        self.sink.flush()
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
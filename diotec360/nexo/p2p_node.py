@@ -15,26 +15,22 @@ limitations under the License.
 """
 
 import json
-import hashlib
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.request import Request, urlopen
 from urllib.error import URLError, HTTPError
 
-from diotec360.core.persistence import AethelPersistenceLayer
+from diotec360.core.persistence import AethelPersistenceLayer, build_state_tree, legacy_state_root
 
 
 def compute_merkle_root(state: Dict[str, Any]) -> str:
-    if not state:
-        return hashlib.sha256(b"empty").hexdigest()
+    # Wire format: the legacy flat root, which every release can verify
+    return legacy_state_root(state)
 
-    sorted_items = sorted(state.items())
-    combined = ""
-    for key, value in sorted_items:
-        entry_hash = hashlib.sha256(f"{key}:{json.dumps(value)}".encode()).hexdigest()
-        combined += entry_hash
 
-    return hashlib.sha256(combined.encode()).hexdigest()
+def root_matches_state(root: str, state: Dict[str, Any]) -> bool:
+    # Peers may publish either the legacy root or the sparse tree root
+    return root == compute_merkle_root(state) or root == build_state_tree(state).get_root_hash()
 
 
 def _http_get_json(url: str, timeout_seconds: float = 5.0) -> Tuple[bool, Optional[Dict[str, Any]], str]:
@@ -72,12 +68,11 @@ def sync_state_if_empty(
         if not isinstance(peer_state, dict) or not isinstance(peer_root, str) or not peer_root:
             continue
 
-        calculated = compute_merkle_root(peer_state)
-        if calculated != peer_root:
+        if not root_matches_state(peer_root, peer_state):
             continue
 
+        # Assigning the state publishes the local (sparse) root
         persistence.merkle_db.state = dict(peer_state)
-        persistence.merkle_db.merkle_root = peer_root
         persistence.merkle_db.save_snapshot()
         return True, f"synced_from:{base}"
 
@@ -29,6 +29,19 @@ from .risk import (
     SortinoResult
 )
 
+from .batch import (
+    value_at_risk_batch,
+    sharpe_ratio_batch,
+    sortino_ratio_batch,
+    simple_interest_batch,
+    compound_interest_batch,
+    loan_payment_batch,
+    amortization_schedule_batch,
+    AmortizationTable
+)
+
+from .streaming import RollingRiskMetrics
+
 __all__ = [
     # Interest
     "simple_interest",
@@ -50,4 +63,17 @@ __all__ = [
     "VaRResult",
     "SharpeResult",
     "SortinoResult",
+    
+    # Batch
+    "value_at_risk_batch",
+    "sharpe_ratio_batch",
+    "sortino_ratio_batch",
+    "simple_interest_batch",
+    "compound_interest_batch",
+    "loan_payment_batch",
+    "amortization_schedule_batch",
+    "AmortizationTable",
+    
+    # Streaming
+    "RollingRiskMetrics",
 ]
@@ -0,0 +1,184 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Aethel Financial Library - Streaming Risk Metrics
+
+Rolling VaR, Sharpe and Sortino over a sliding window of returns, updated
+per tick instead of recomputed over the whole window.
+
+Each result equals calling value_at_risk / sharpe_ratio / sortino_ratio on
+the current window, certificate included:
+- Sharpe and Sortino keep exact integer running sums (Σr, Σr², and the same
+  over returns below target); push and evict are O(1)
+- VaR keeps the window in an order-statistics structure (sorted buckets of
+  bounded size); push and evict are O(√n) with a small constant, and the
+  percentile return is read from the low tail
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Iterable, List, Optional
+
+from .risk import VaRResult, SharpeResult, SortinoResult
+from .batch import _var_index, _var_result, _sharpe_from_sums, _sortino_from_sums
+
+
+class _SortedWindow:
+    """Multiset of ints kept as sorted buckets, with the max of each bucket indexed"""
+
+    LOAD = 128
+
+    def __init__(self):
+        self._buckets: List[List[int]] = []
+        self._maxes: List[int] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int):
+        self._size += 1
+        if not self._buckets:
+            self._buckets.append([value])
+            self._maxes.append(value)
+            return
+
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._buckets):
+            pos -= 1
+            self._buckets[pos].append(value)
+            self._maxes[pos] = value
+        else:
+            insort(self._buckets[pos], value)
+
+        bucket = self._buckets[pos]
+        if len(bucket) > 2 * self.LOAD:
+            half = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._buckets.insert(pos + 1, half)
+            self._maxes.insert(pos, bucket[-1])
+
+    def remove(self, value: int):
+        pos = bisect_left(self._maxes, value)
+        bucket = self._buckets[pos] if pos < len(self._buckets) else []
+        index = bisect_left(bucket, value)
+        if index == len(bucket) or bucket[index] != value:
+            raise ValueError(f"{value} not in window")
+
+        del bucket[index]
+        self._size -= 1
+        if not bucket:
+            del self._buckets[pos]
+            del self._maxes[pos]
+        elif index == len(bucket):
+            self._maxes[pos] = bucket[-1]
+
+    def kth(self, k: int) -> int:
+        """k-th smallest value (0-based)"""
+        for bucket in self._buckets:
+            if k < len(bucket):
+                return bucket[k]
+            k -= len(bucket)
+        raise IndexError("rank out of range")
+
+
+class RollingRiskMetrics:
+    """
+    Risk metrics over the last `window` returns (in basis points).
+
+    Example:
+        >>> metrics = RollingRiskMetrics(window=250)
+        >>> for r in daily_returns_bps:
+        ...     metrics.push(r)
+        >>> metrics.sharpe_ratio(risk_free_rate_bps=200).sharpe_ratio
+    """
+
+    def __init__(self, window: int, target_return_bps: int = 0):
+        """
+        Args:
+            window: Number of most recent returns kept
+            target_return_bps: Sortino target (minimum acceptable return)
+        """
+        assert window >= 1, "Window must hold at least one return"
+
+        self.window = window
+        self.target_return_bps = target_return_bps
+
+        self._returns = deque()
+        self._sorted = _SortedWindow()
+        self._total = 0
+        self._squares = 0
+        self._downside_count = 0
+        self._downside_total = 0
+        self._downside_squares = 0
+
+    def __len__(self) -> int:
+        return len(self._returns)
+
+    @property
+    def returns(self) -> List[int]:
+        """Returns in the window, oldest first"""
+        return list(self._returns)
+
+    def push(self, return_bps: int) -> Optional[int]:
+        """
+        Add the latest return; once the window is full the oldest is evicted.
+
+        Returns:
+            The evicted return, or None
+        """
+        evicted = None
+        if len(self._returns) == self.window:
+            evicted = self._returns.popleft()
+            self._account(evicted, -1)
+            self._sorted.remove(evicted)
+
+        self._returns.append(return_bps)
+        self._account(return_bps, 1)
+        self._sorted.add(return_bps)
+        return evicted
+
+    def extend(self, returns: Iterable[int]):
+        """Push every return in order"""
+        for r in returns:
+            self.push(r)
+
+    def _account(self, r: int, sign: int):
+        square = r * r
+        self._total += sign * r
+        self._squares += sign * square
+        if r < self.target_return_bps:
+            self._downside_count += sign
+            self._downside_total += sign * r
+            self._downside_squares += sign * square
+
+    def value_at_risk(self, portfolio_value: int, confidence_bps: int = 9500) -> VaRResult:
+        """value_at_risk over the current window"""
+        index = _var_index(portfolio_value, len(self._returns), confidence_bps)
+        return _var_result(portfolio_value, self._sorted.kth(index), confidence_bps)
+
+    def sharpe_ratio(self, risk_free_rate_bps: int) -> SharpeResult:
+        """sharpe_ratio over the current window"""
+        return _sharpe_from_sums(len(self._returns), self._total, self._squares, risk_free_rate_bps)
+
+    def sortino_ratio(self, risk_free_rate_bps: int) -> SortinoResult:
+        """sortino_ratio over the current window, against target_return_bps"""
+        return _sortino_from_sums(
+            len(self._returns), self._total,
+            self._downside_count, self._downside_total, self._downside_squares,
+            risk_free_rate_bps, self.target_return_bps
+        )
@@ -37,6 +37,9 @@ setup(
         'gpu': [
             'GPUtil>=1.4.0',
         ],
+        'wasm': [
+            'wasmtime>=20.0.0',
+        ],
     },
     entry_points={
         'console_scripts': [
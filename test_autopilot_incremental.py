@@ -0,0 +1,140 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the incremental intent document behind Aethel-Pilot.
+
+Tests:
+- Region-by-region parsing returns the whole-document intent map
+- A keystroke re-parses only the edited intent
+- Warm (cached) editor calls equal cold calls on every keystroke
+- Context detection across intents uses cached block effects correctly
+- Precedent lookups are skipped past the latency budget, and not cached
+"""
+
+import random
+
+import pytest
+
+from diotec360.ai.autopilot_engine import AethelAutopilot, EditorState
+from diotec360.ai.intent_document import IntentDocument
+from diotec360.core.parser import AethelParser
+
+
+def intent(i: int) -> str:
+    return f"""intent transfer_{i}(sender: Account, receiver: Account, amount: Balance) {{
+    guard {{
+        sender_balance >= amount;
+        amount > 0;
+    }}
+    solve {{
+        priority: security;
+    }}
+    verify {{
+        sender_balance == old_sender_balance - (amount * {i});
+    }}
+}}
+"""
+
+
+DOC = "# ledger\n" + "\n".join(intent(i) for i in range(8))
+
+
+def editor_calls(autopilot, code, cursor):
+    suggestions = autopilot.get_suggestions(EditorState(code, cursor, "", 0, ""))
+    return (
+        [vars(s) for s in suggestions],
+        autopilot.get_safety_status(code),
+        autopilot.get_correction_stream(code),
+    )
+
+
+def test_regions_parse_like_whole_document():
+    parser = AethelParser()
+    document = IntentDocument(parser)
+
+    assert document.parse(DOC) == parser.parse(DOC)
+
+    duplicated = DOC + intent(3).replace("amount * 3", "amount * 30")
+    assert document.parse(duplicated) == parser.parse(duplicated)
+
+    broken = DOC.replace("amount > 0;", "amount > ;", 1)
+    with pytest.raises(Exception):
+        parser.parse(broken)
+    with pytest.raises(Exception):
+        document.parse(broken)
+
+
+def test_keystroke_reparses_only_edited_intent():
+    document = IntentDocument(AethelParser())
+    document.parse(DOC)
+    assert document.get_stats()['region_parses'] == 8
+
+    edited = DOC.replace("amount * 5", "amount * 55")
+    document.parse(edited)
+
+    assert document.get_stats()['region_parses'] == 9
+
+
+def test_warm_calls_match_cold_calls_on_every_keystroke():
+    rng = random.Random(360)
+    warm = AethelAutopilot()
+    cold = AethelAutopilot()
+    code = DOC
+
+    for _ in range(150):
+        pos = rng.randrange(len(code) + 1)
+        roll = rng.random()
+        if roll < 0.6:
+            code = code[:pos] + rng.choice("ab ;{}\n+*0>=") + code[pos:]
+        elif roll < 0.85:
+            code = code[:pos] + code[pos + 1:]
+        else:
+            code = DOC
+        cursor = rng.randrange(len(code) + 1)
+
+        cold.clear_cache()
+        assert editor_calls(warm, code, cursor) == editor_calls(cold, code, cursor)
+
+
+def test_context_across_intents():
+    autopilot = AethelAutopilot()
+    guard_cursor = DOC.index("amount > 0;", DOC.index("transfer_5"))
+    verify_cursor = DOC.index("old_sender_balance", DOC.index("transfer_6"))
+    solve_cursor = DOC.index("priority", DOC.index("transfer_2"))
+
+    assert autopilot._detect_context(DOC, guard_cursor) == 'guard'
+    assert autopilot._detect_context(DOC, verify_cursor) == 'verify'
+    assert autopilot._detect_context(DOC, solve_cursor) == 'solve'
+    assert autopilot._detect_context(DOC, len(DOC)) == 'general'
+
+    # An unclosed block in an earlier intent leaves that intent's body open
+    # (its '{' is too far from the keyword to be named, hence 'unknown')
+    unclosed = DOC.replace("priority: security;\n    }", "priority: security;\n", 1)
+    assert autopilot._detect_context(DOC, DOC.index("intent transfer_4")) == 'general'
+    assert autopilot._detect_context(unclosed, unclosed.index("intent transfer_4")) == 'unknown'
+
+
+def test_precedents_skipped_past_budget():
+    autopilot = AethelAutopilot()
+    autopilot.SUGGESTION_LATENCY_BUDGET_MS = 0
+    cursor = DOC.index("amount > 0;")
+
+    autopilot.get_suggestions(EditorState(DOC, cursor, "", 0, ""))
+
+    stats = autopilot.get_cache_stats()
+    assert stats['budget_skips'] == 1
+    assert stats['suggestion_cache_size'] == 0
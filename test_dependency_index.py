@@ -0,0 +1,143 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Property-Based Tests for the resource index in DependencyAnalyzer and ConflictDetector
+
+The index-driven analysis must report exactly what a pairwise comparison of
+read/write sets reports: the same edges in the same order, the same cycle
+verdict, and the same conflicts pair by pair.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from diotec360.core.synchrony import Transaction, ConflictType, CircularDependencyError
+from diotec360.core.dependency_graph import DependencyGraph
+from diotec360.core.dependency_analyzer import DependencyAnalyzer, build_resource_index
+from diotec360.core.conflict_detector import ConflictDetector
+
+
+ACCOUNTS = ["alice", "bob", "charlie", "dave", "erin", "frank"]
+
+
+@st.composite
+def batch_strategy(draw):
+    """Transactions reading a few accounts and writing a subset of them"""
+    transactions = []
+    for i in range(draw(st.integers(min_value=0, max_value=12))):
+        accounts = draw(st.lists(st.sampled_from(ACCOUNTS), min_size=1, max_size=3, unique=True))
+        written = draw(st.lists(st.sampled_from(accounts), max_size=len(accounts), unique=True))
+        transactions.append(Transaction(
+            id=f"tx_{i}",
+            intent_name="transfer",
+            accounts={account: {} for account in accounts},
+            operations=[SimpleNamespace(target_account=account) for account in written],
+            verify_conditions=[]
+        ))
+    return transactions
+
+
+def pairwise_edges(transactions):
+    """Reference: the pairwise scan DependencyAnalyzer.analyze used to do"""
+    analyzer = DependencyAnalyzer()
+    rw = {txn.id: analyzer.extract_read_write_sets(txn) for txn in transactions}
+    edges = []
+    for i, t1 in enumerate(transactions):
+        for t2 in transactions[i + 1:]:
+            (r1, w1), (r2, w2) = rw[t1.id], rw[t2.id]
+            if (w1 & r2) or (w1 & w2) or (r1 & w2):
+                edges.append((t1.id, t2.id))
+            if (w2 & r1) or (w2 & w1) or (r2 & w1):
+                edges.append((t2.id, t1.id))
+    return edges
+
+
+def pairwise_conflicts(transactions):
+    """Reference: pairwise conflicts as (t1, t2, type, resource), grouped per pair"""
+    conflicts = []
+    for i, tx1 in enumerate(transactions):
+        for tx2 in transactions[i + 1:]:
+            r1, w1 = tx1.get_read_set(), tx1.get_write_set()
+            r2, w2 = tx2.get_read_set(), tx2.get_write_set()
+            pair = []
+            pair += [(tx1.id, tx2.id, ConflictType.RAW, x) for x in sorted(w1 & r2)]
+            pair += [(tx1.id, tx2.id, ConflictType.WAW, x) for x in sorted(w1 & w2)]
+            pair += [(tx1.id, tx2.id, ConflictType.WAR, x) for x in sorted(r1 & w2)]
+            pair += [(tx2.id, tx1.id, ConflictType.RAW, x) for x in sorted(w2 & r1)]
+            pair += [(tx2.id, tx1.id, ConflictType.WAR, x) for x in sorted(r2 & w1)]
+            conflicts.append(pair)
+    return conflicts
+
+
+@settings(max_examples=200, deadline=None)
+@given(transactions=batch_strategy())
+def test_analyze_matches_pairwise_scan(transactions):
+    expected = pairwise_edges(transactions)
+
+    # Inspect the edges even when the graph is cyclic
+    with patch.object(DependencyGraph, "has_cycle", return_value=False):
+        graph = DependencyAnalyzer().analyze(transactions)
+    assert graph.edges == expected
+
+    if expected:
+        # Any conflicting pair depends both ways
+        with pytest.raises(CircularDependencyError):
+            DependencyAnalyzer().analyze(transactions)
+
+
+@settings(max_examples=200, deadline=None)
+@given(transactions=batch_strategy(), data=st.data())
+def test_detect_conflicts_matches_pairwise_scan(transactions, data):
+    # Read sets that differ from write sets exercise every conflict kind
+    for txn in transactions:
+        txn._read_set = set(data.draw(st.lists(st.sampled_from(ACCOUNTS), max_size=3, unique=True)))
+        txn._write_set = set(data.draw(st.lists(st.sampled_from(ACCOUNTS), max_size=2, unique=True)))
+
+    detected = ConflictDetector().detect_conflicts(transactions, None)
+    actual = [(c.transaction_1, c.transaction_2, c.type, c.resource) for c in detected]
+
+    # Same conflicts, pair by pair in batch order; resource order within a kind is free
+    position = 0
+    for pair in pairwise_conflicts(transactions):
+        chunk = actual[position:position + len(pair)]
+        assert [c[:3] for c in chunk] == [c[:3] for c in pair]
+        assert sorted(chunk, key=str) == sorted(pair, key=str)
+        position += len(pair)
+    assert position == len(actual)
+
+
+def test_resource_index_orders_accesses_by_batch_position():
+    index = build_resource_index([
+        ({"a", "b"}, {"a"}),
+        ({"b"}, set()),
+        ({"a"}, {"a", "b"}),
+    ])
+    assert index == {"a": ([0, 2], [0, 2]), "b": ([0, 1], [2])}
+
+
+def test_analyze_large_independent_batch():
+    transactions = [
+        Transaction(id=f"tx_{i}", intent_name="transfer", accounts={f"acc_{i}": {}},
+                    operations=[], verify_conditions=[])
+        for i in range(2000)
+    ]
+    graph = DependencyAnalyzer().analyze(transactions)
+    assert graph.edges == []
+    assert len(graph.get_independent_sets()[0]) == 2000
@@ -0,0 +1,154 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the batch financial functions.
+
+Tests:
+- Every batch function is bit-identical to its scalar function
+- Guard violations raise like the scalar functions
+- The existing verify_*_properties checks still hold
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from diotec360.stdlib.financial import (
+    value_at_risk, sharpe_ratio, sortino_ratio,
+    simple_interest, compound_interest, loan_payment, amortization_schedule,
+    value_at_risk_batch, sharpe_ratio_batch, sortino_ratio_batch,
+    simple_interest_batch, compound_interest_batch, loan_payment_batch,
+    amortization_schedule_batch,
+)
+from diotec360.stdlib.financial import interest, amortization, risk, batch
+
+
+returns_lists = st.lists(st.integers(min_value=-3000, max_value=3000), min_size=30, max_size=1500)
+
+
+def outcome(fn, *args):
+    """Result of fn, or AssertionError if a guard or post-condition fails"""
+    try:
+        return fn(*args)
+    except AssertionError:
+        return AssertionError
+
+
+def expected_outcome(scalar_results):
+    """A batch fails as a whole if any scalar call fails"""
+    return AssertionError if AssertionError in scalar_results else scalar_results
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    series=st.lists(returns_lists, min_size=1, max_size=5),
+    confidence=st.integers(min_value=9000, max_value=9999),
+    portfolio_value=st.integers(min_value=1, max_value=10**12),
+)
+def test_value_at_risk_batch_matches_scalar(series, confidence, portfolio_value):
+    expected = [outcome(value_at_risk, portfolio_value, r, confidence) for r in series]
+    actual = outcome(value_at_risk_batch, [portfolio_value] * len(series), series, confidence)
+    assert actual == expected_outcome(expected)
+
+
+def test_value_at_risk_shared_series():
+    returns = [(i * 7919) % 4001 - 2000 for i in range(5000)]
+    confidences = [9000, 9500, 9900, 9999]
+
+    results = value_at_risk_batch([10**8] * 4, [returns] * 4, confidences)
+
+    assert results == [value_at_risk(10**8, returns, c) for c in confidences]
+
+
+def test_value_at_risk_sorted_input_falls_back():
+    returns = sorted(range(-5000, 5000), reverse=True)
+    assert value_at_risk_batch([10**6], [returns], 9500) == [value_at_risk(10**6, returns, 9500)]
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    series=st.lists(st.lists(st.integers(min_value=-3000, max_value=3000), min_size=12, max_size=400),
+                    min_size=1, max_size=5),
+    rf=st.integers(min_value=0, max_value=10000),
+    target=st.integers(min_value=-500, max_value=500),
+)
+def test_sharpe_sortino_batch_match_scalar(series, rf, target):
+    sharpe = [outcome(sharpe_ratio, r, rf) for r in series]
+    sortino = [outcome(sortino_ratio, r, rf, target) for r in series]
+
+    assert outcome(sharpe_ratio_batch, series, rf) == expected_outcome(sharpe)
+    assert outcome(sortino_ratio_batch, series, rf, target) == expected_outcome(sortino)
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    principals=st.lists(st.integers(min_value=1, max_value=10**9), min_size=1, max_size=5),
+    rate=st.integers(min_value=0, max_value=3000),
+    periods=st.sampled_from([1, 4, 12]),
+    years=st.integers(min_value=0, max_value=10),
+)
+def test_interest_batch_matches_scalar(principals, rate, periods, years):
+    assert simple_interest_batch(principals, rate, years) == \
+        [simple_interest(p, rate, years) for p in principals]
+    assert compound_interest_batch(principals, rate, periods, years) == \
+        [compound_interest(p, rate, periods, years) for p in principals]
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    loans=st.lists(
+        st.tuples(
+            st.integers(min_value=1000, max_value=10**9),
+            st.sampled_from([0, 300, 450, 600, 1200, 2400]),
+            st.sampled_from([12, 60, 120, 180, 360]),
+        ),
+        min_size=1, max_size=6,
+    ),
+)
+def test_loan_book_batch_matches_scalar(loans):
+    principals, rates, terms = (list(column) for column in zip(*loans))
+
+    payments = [outcome(loan_payment, *loan) for loan in loans]
+    schedules = [outcome(amortization_schedule, *loan) for loan in loans]
+
+    assert outcome(loan_payment_batch, principals, rates, terms) == expected_outcome(payments)
+    tables = outcome(amortization_schedule_batch, principals, rates, terms)
+    if tables is not AssertionError:
+        tables = [table.to_schedule() for table in tables]
+    assert tables == expected_outcome(schedules)
+
+
+def test_batch_rejects_mismatched_columns():
+    with pytest.raises(ValueError):
+        loan_payment_batch([1000000, 2000000], [600], 360)
+
+
+def test_guard_violations_raise():
+    with pytest.raises(AssertionError, match="at least 30"):
+        value_at_risk_batch([100], [[1] * 10], 9500)
+    with pytest.raises(AssertionError, match="Rate must be"):
+        compound_interest_batch([100], -1, 12, 1)
+
+
+def test_property_checks_still_hold():
+    interest.verify_simple_interest_properties()
+    interest.verify_compound_interest_properties()
+    amortization.verify_loan_payment_properties()
+    amortization.verify_amortization_properties()
+    risk.verify_var_properties()
+    risk.verify_sharpe_properties()
+    risk.verify_sortino_properties()
+    batch.verify_batch_properties()
@@ -0,0 +1,117 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the streaming risk metrics.
+
+Tests:
+- Rolling VaR/Sharpe/Sortino equal the scalar functions on the current window
+- The order-statistics window stays sorted through pushes and evictions
+- Guards raise like the scalar functions
+- The trader records per-tick returns and reports rolling risk
+"""
+
+from decimal import Decimal
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from diotec360.stdlib.financial import (
+    value_at_risk, sharpe_ratio, sortino_ratio, RollingRiskMetrics,
+)
+from diotec360.stdlib.financial.streaming import _SortedWindow
+
+
+def outcome(fn, *args):
+    """Result of fn, or AssertionError if a guard or post-condition fails"""
+    try:
+        return fn(*args)
+    except AssertionError:
+        return AssertionError
+
+
+@settings(max_examples=60, deadline=None)
+@given(
+    stream=st.lists(st.integers(min_value=-3000, max_value=3000), min_size=1, max_size=1200),
+    window=st.integers(min_value=30, max_value=600),
+    rf=st.integers(min_value=0, max_value=1000),
+    target=st.integers(min_value=-500, max_value=500),
+    confidence=st.integers(min_value=9000, max_value=9999),
+)
+def test_rolling_matches_scalar_on_window(stream, window, rf, target, confidence):
+    metrics = RollingRiskMetrics(window, target_return_bps=target)
+
+    for tick, r in enumerate(stream):
+        metrics.push(r)
+        if tick % 97 and tick != len(stream) - 1:
+            continue
+
+        current = stream[max(0, tick + 1 - window):tick + 1]
+        assert metrics.returns == current
+        assert outcome(metrics.value_at_risk, 10**8, confidence) == \
+            outcome(value_at_risk, 10**8, current, confidence)
+        assert outcome(metrics.sharpe_ratio, rf) == outcome(sharpe_ratio, current, rf)
+        assert outcome(metrics.sortino_ratio, rf) == outcome(sortino_ratio, current, rf, target)
+
+
+@settings(max_examples=100, deadline=None)
+@given(stream=st.lists(st.integers(min_value=-50, max_value=50), max_size=2000),
+       window=st.integers(min_value=1, max_value=700))
+def test_sorted_window_order_statistics(stream, window):
+    sorted_window = _SortedWindow()
+    for tick, r in enumerate(stream):
+        sorted_window.add(r)
+        if tick >= window:
+            sorted_window.remove(stream[tick - window])
+
+    expected = sorted(stream[-window:]) if stream else []
+    assert len(sorted_window) == len(expected)
+    assert [sorted_window.kth(k) for k in range(len(expected))] == expected
+
+
+def test_push_returns_evicted():
+    metrics = RollingRiskMetrics(3)
+    assert [metrics.push(r) for r in (1, 2, 3, 4, 5)] == [None, None, None, 1, 2]
+    assert metrics.returns == [3, 4, 5]
+
+
+def test_guard_violations_raise():
+    metrics = RollingRiskMetrics(100)
+    metrics.extend(range(20))
+
+    with pytest.raises(AssertionError, match="at least 30"):
+        metrics.value_at_risk(10**6, 9500)
+    with pytest.raises(AssertionError, match="Risk-free rate"):
+        metrics.sharpe_ratio(20000)
+    with pytest.raises(ValueError):
+        _SortedWindow().remove(1)
+
+
+def test_trader_reports_rolling_risk():
+    from diotec360.bot.deterministic_trader import DeterministicTrader
+
+    trader = DeterministicTrader(forex_api=None, whatsapp_gate=None, judge=None)
+    trader.initial_capital = trader.portfolio_value = Decimal('100000')
+    assert trader.get_status()['risk'] is None
+
+    for tick in range(60):
+        trader.portfolio_value *= Decimal('1.001') if tick % 3 else Decimal('0.998')
+        trader._check_portfolio_health()
+
+    risk = trader.get_status()['risk']
+    assert risk['window_ticks'] == 59
+    assert risk['proof_certificates'][0].startswith("VAR_PROOF:")
+    assert risk['sharpe_ratio_bps'] == sharpe_ratio(trader.risk_metrics.returns, 0).sharpe_ratio
@@ -0,0 +1,158 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the symbolic Ghost-Runner.
+
+Tests:
+- Predictions come from the Z3 region: manifested, uncertain, impossible
+- Every comparison operator is enforced (no fail-open on unknown syntax)
+- Parser output and the legacy guards/verifications shape are both read
+- Predictions are cached per intent hash; solver scopes are reused
+- Cursor lock blocks only the keystroke that makes an intent impossible
+- Budget-limited answers are uncertain and not cached
+"""
+
+from diotec360.core.ghost import GhostRunner
+from diotec360.core.ghost_solver import GhostSolver
+from diotec360.core.parser import AethelParser
+
+
+TRANSFER = """intent transfer(sender: Account, receiver: Account, amount: Balance) {
+    guard {
+        sender_balance >= amount;
+        amount > 0;
+    }
+    solve {
+        priority: security;
+    }
+    verify {
+        sender_balance == old_sender_balance - amount;
+    }
+}
+"""
+
+
+def legacy(*guards, verifications=()):
+    return {
+        'name': 'transfer',
+        'guards': [{'condition': g} for g in guards],
+        'verifications': [{'condition': v} for v in verifications],
+    }
+
+
+def test_single_state_is_manifested():
+    ghost = GhostRunner()
+    prediction = ghost.predict_outcome(legacy('sender_balance == 500', 'amount == 150',
+                                              verifications=['new_balance == sender_balance - amount']))
+
+    assert prediction.status == 'MANIFESTED'
+    assert prediction.result.variables == {'amount': 150, 'new_balance': 350, 'sender_balance': 500}
+    assert prediction.region['free'] == []
+
+
+def test_open_region_is_uncertain_with_witness():
+    ghost = GhostRunner()
+    prediction = ghost.predict_outcome(legacy('sender_balance >= amount', 'amount == 100'))
+
+    assert prediction.status == 'UNCERTAIN'
+    assert prediction.region['fixed'] == {'amount': 100}
+    assert prediction.region['free'] == ['sender_balance']
+    assert prediction.result.variables['sender_balance'] >= 100
+    assert prediction.confidence == 0.5
+
+
+def test_contradictions_are_impossible_for_every_operator():
+    ghost = GhostRunner()
+    contradictions = [
+        ('amount > 10', 'amount < 5'),
+        ('amount <= 0', 'amount >= 1'),
+        ('amount == 3', 'amount != 3'),
+        ('(amount * 2) == 7',),
+        ('amount % 2 == 1', 'amount == 4'),
+    ]
+    for guards in contradictions:
+        assert ghost.predict_outcome(legacy(*guards)).status == 'IMPOSSIBLE', guards
+
+
+def test_unsupported_syntax_is_an_error_not_a_pass():
+    ghost = GhostRunner()
+    assert ghost.predict_outcome(legacy('amount ** 2 >= 4')).status == 'ERROR'
+    assert ghost.predict_outcome(legacy('amount >= ')).status == 'ERROR'
+
+
+def test_reads_parser_output():
+    ghost = GhostRunner()
+    intent = AethelParser().parse(TRANSFER)['transfer']
+
+    prediction = ghost.predict_outcome(intent)
+
+    assert prediction.status == 'UNCERTAIN'
+    assert prediction.eliminated_states == 3
+    variables = prediction.result.variables
+    assert variables['sender_balance'] == variables['old_sender_balance'] - variables['amount']
+    assert variables['amount'] > 0
+
+
+def test_cached_per_intent_hash():
+    ghost = GhostRunner()
+    intent = legacy('amount == 1', 'fee == 2')
+
+    first = ghost.predict_outcome(intent)
+    second = ghost.predict_outcome(dict(intent, name='renamed'))
+
+    assert second.message == 'Truth retrieved from eternal cache'
+    assert second.result == first.result
+    assert ghost.get_stats()['queries'] == 1
+
+
+def test_growing_intent_reuses_solver_scopes():
+    solver = GhostSolver()
+    conditions = ['a >= 0', 'b >= a', 'c >= b', 'd >= c']
+    for n in range(1, len(conditions) + 1):
+        solver.solve(conditions[:n])
+
+    stats = solver.get_stats()
+    assert stats['pushed_scopes'] == len(conditions)
+    assert stats['reused_scopes'] == 0 + 1 + 2 + 3
+
+
+def test_cursor_lock_blocks_only_the_impossible_keystroke():
+    ghost = GhostRunner()
+    code = "intent pay(amount: Balance) {\n    guard {\n        amount > 10;\n        amount < 5"
+
+    assert ghost.can_type_next_char(code, ' ') is True
+    assert ghost.can_type_next_char(code, ';') is False
+    assert ghost.can_type_next_char(code.replace('< 5', '< 50'), ';') is True
+    # Half-typed conditions never block
+    assert ghost.can_type_next_char("intent pay(amount: Balance) {\n guard { amount > ", '}') is True
+
+
+def test_cursor_lock_checks_every_intent():
+    ghost = GhostRunner()
+    code = TRANSFER + "intent bad(x: Balance) {\n    guard {\n        x > 1;\n        x < 0"
+
+    assert ghost.can_type_next_char(TRANSFER, '\n') is True
+    assert ghost.can_type_next_char(code, ';') is False
+
+
+def test_exhausted_budget_is_uncertain_and_not_cached():
+    ghost = GhostRunner(latency_budget_ms=0)
+    prediction = ghost.predict_outcome(legacy('amount > 10', 'amount < 5'))
+
+    assert prediction.status == 'UNCERTAIN'
+    assert prediction.result is None
+    assert len(ghost.cache) == 0
@@ -0,0 +1,157 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for IBLT set reconciliation in gossip anti-entropy.
+
+Tests:
+- IBLT difference decoding and wire round trip
+- Undersized tables report an incomplete decode
+- Maintained digests match digests built from scratch
+- Anti-entropy fetches only the difference, in one batched request
+- Digest size doubles until the difference decodes
+- Peers without digests fall back to the full ID exchange
+"""
+
+from dataclasses import dataclass
+
+import pytest
+
+from diotec360.core.crypto import AethelCrypt
+from diotec360.lattice.gossip import GossipProtocol, GossipConfig
+from diotec360.lattice.set_reconciliation import InvertibleBloomFilter, item_key
+
+
+@dataclass
+class Peer:
+    peer_id: str
+    address: str
+
+
+class LoopbackProtocol(GossipProtocol):
+    """Anti-entropy requests go straight to another protocol object"""
+
+    def __init__(self, *args, remote=None, serve_digests=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.remote = remote
+        self.serve_digests = serve_digests
+        self.requests = []
+
+    async def _request_digest(self, peer_address, cells):
+        self.requests.append(("digest", cells))
+        if not self.serve_digests:
+            return None
+        return InvertibleBloomFilter.from_dict(self.remote.get_digest(cells))
+
+    async def _request_messages(self, peer_address, keys):
+        self.requests.append(("messages", len(keys)))
+        await self.receive_batch(self.remote.get_messages_by_keys(keys))
+
+    async def _request_message_ids(self, peer_address):
+        self.requests.append(("message_ids", None))
+        return set(self.remote.get_message_ids())
+
+    async def _request_message(self, peer_address, message_id):
+        self.requests.append(("message", message_id))
+        await self.receive_message(self.remote.get_message(message_id).to_dict())
+
+
+def make_pair(shared=200, missing=10, **kwargs):
+    config = GossipConfig(enable_anti_entropy=False, message_cache_size=10000)
+    remote = GossipProtocol(config, "node_b", lambda: [], AethelCrypt.generate_keypair().private_key)
+    local = LoopbackProtocol(config, "node_a", lambda: [Peer("node_b", "http://node-b.test")],
+                             AethelCrypt.generate_keypair().private_key, remote=remote, **kwargs)
+
+    for i in range(shared):
+        message_id = remote.broadcast("proof", {"n": i})
+        local._cache_message(remote.message_cache[message_id])
+    missing_ids = {remote.broadcast("proof", {"extra": i}) for i in range(missing)}
+    return local, remote, missing_ids
+
+
+def test_iblt_decodes_symmetric_difference():
+    a = InvertibleBloomFilter(60)
+    b = InvertibleBloomFilter(60)
+    shared = [f"shared_{i}" for i in range(5000)]
+    a.update(shared + ["only_a_1", "only_a_2"])
+    b.update(shared + ["only_b"])
+
+    only_a, only_b, complete = InvertibleBloomFilter.from_dict(a.to_dict()).subtract(b).decode()
+
+    assert complete
+    assert only_a == {item_key("only_a_1"), item_key("only_a_2")}
+    assert only_b == {item_key("only_b")}
+
+
+def test_undersized_iblt_reports_incomplete():
+    a = InvertibleBloomFilter(6)
+    a.update(f"item_{i}" for i in range(100))
+    assert a.subtract(InvertibleBloomFilter(6)).decode()[2] is False
+
+
+def test_iblt_rejects_bad_payload():
+    wire = InvertibleBloomFilter(30).to_dict()
+    with pytest.raises(ValueError):
+        InvertibleBloomFilter.from_dict({"cells": 60, "iblt": wire["iblt"]})
+
+
+def test_maintained_digest_matches_rebuilt():
+    local, remote, _ = make_pair(shared=50, missing=0)
+    remote.get_digest(96)
+
+    for i in range(30):
+        remote.broadcast("proof", {"late": i})
+    for message_id in list(remote.message_cache)[:20]:
+        remote._evict_message(message_id)
+
+    rebuilt = InvertibleBloomFilter(96)
+    rebuilt.update(remote.message_cache)
+    assert remote._get_digest(96).counts == rebuilt.counts
+    assert remote._get_digest(96).key_sums == rebuilt.key_sums
+
+
+@pytest.mark.asyncio
+async def test_anti_entropy_fetches_only_difference():
+    local, remote, missing_ids = make_pair()
+
+    await local._anti_entropy_sync()
+
+    assert set(remote.message_cache) <= set(local.message_cache)
+    assert missing_ids <= set(local.message_cache)
+    assert local.requests == [("digest", 96), ("messages", 10)]
+
+
+@pytest.mark.asyncio
+async def test_digest_grows_until_decodable():
+    local, remote, missing_ids = make_pair(shared=100, missing=150)
+
+    await local._anti_entropy_sync()
+
+    digests = [cells for kind, cells in local.requests if kind == "digest"]
+    assert digests[0] == 96 and digests == sorted(digests) and len(digests) > 1
+    assert local.requests[-1] == ("messages", 150)
+    assert missing_ids <= set(local.message_cache)
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_full_exchange():
+    local, remote, missing_ids = make_pair(missing=3, serve_digests=False)
+
+    await local._anti_entropy_sync()
+
+    assert missing_ids <= set(local.message_cache)
+    assert ("message_ids", None) in local.requests
+    assert sum(1 for kind, _ in local.requests if kind == "message") == 3
@@ -0,0 +1,168 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for batched, concurrent gossip fan-out.
+
+Tests:
+- One request per peer per round, carrying every message bound for it
+- Failed sends do not mark the peer as having seen the message
+- The gossip loop drains a whole batch per round
+- receive_batch verifies every message and keeps good ones next to bad ones
+- Real HTTP round trip through one pooled session
+"""
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+from aiohttp import web
+
+from diotec360.core.crypto import AethelCrypt
+from diotec360.core.integrity_panic import IntegrityPanic
+from diotec360.lattice.gossip import GossipProtocol, GossipConfig
+
+
+@dataclass
+class Peer:
+    peer_id: str
+    address: str
+
+
+PEERS = [Peer(f"peer_{i}", f"http://peer{i}.test") for i in range(3)]
+
+
+class RecordingProtocol(GossipProtocol):
+    """Records sends instead of doing HTTP"""
+
+    def __init__(self, *args, failing=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent = []
+        self.failing = set(failing)
+
+    async def _send_batch_to_peer(self, peer_address, messages):
+        self.sent.append((peer_address, [m.message_id for m in messages]))
+        return peer_address not in self.failing
+
+
+def make_protocol(cls=GossipProtocol, peers=PEERS, **kwargs):
+    config = GossipConfig(fanout=3, gossip_interval=0.01, enable_anti_entropy=False)
+    return cls(config, "node_a", lambda: peers, AethelCrypt.generate_keypair().private_key, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_round_sends_one_batch_per_peer():
+    protocol = make_protocol(RecordingProtocol)
+    ids = [protocol.broadcast("proof", {"n": i}) for i in range(5)]
+    messages = [protocol.pending_messages.popleft() for _ in range(5)]
+
+    await protocol._gossip_round(messages)
+
+    assert sorted(address for address, _ in protocol.sent) == sorted(p.address for p in PEERS)
+    for _, sent_ids in protocol.sent:
+        assert sent_ids == ids
+    assert protocol.stats["messages_sent"] == 15
+    assert protocol.stats["batches_sent"] == 3
+    assert all(message.seen_by == {p.peer_id for p in PEERS} for message in messages)
+
+
+@pytest.mark.asyncio
+async def test_failed_send_keeps_peer_unseen():
+    protocol = make_protocol(RecordingProtocol, failing={PEERS[0].address})
+    protocol.broadcast("proof", {"n": 1})
+    message = protocol.pending_messages.popleft()
+
+    await protocol._gossip_round([message])
+
+    assert PEERS[0].peer_id not in message.seen_by
+    assert protocol.stats["send_failures"] == 1
+    assert protocol.stats["messages_sent"] == 2
+
+
+@pytest.mark.asyncio
+async def test_loop_drains_a_batch_per_round():
+    protocol = make_protocol(RecordingProtocol)
+    for i in range(20):
+        protocol.broadcast("proof", {"n": i})
+
+    await protocol.start()
+    for _ in range(100):
+        if not protocol.pending_messages and protocol.sent:
+            break
+        await asyncio.sleep(0.01)
+    await protocol.stop()
+
+    assert not protocol.pending_messages
+    # 20 messages to 3 peers in a single round
+    assert len(protocol.sent) == 3
+
+
+@pytest.mark.asyncio
+async def test_receive_batch_keeps_valid_messages():
+    sender = make_protocol(peers=[])
+    receiver = make_protocol(peers=[])
+    receiver.node_id = "node_b"
+
+    good = [sender.message_cache[sender.broadcast("proof", {"n": i})].to_dict() for i in range(3)]
+    unsigned = dict(good[0], message_id="unsigned", signature=None)
+
+    with pytest.raises(IntegrityPanic):
+        await receiver.receive_batch({"messages": [good[0], unsigned, good[1], good[2]]})
+
+    assert all(message["message_id"] in receiver.message_cache for message in good)
+    assert await receiver.receive_batch({"messages": good}) == 0
+
+
+@pytest.mark.asyncio
+async def test_http_round_trip_uses_pooled_session(unused_tcp_port):
+    receiver = make_protocol(peers=[])
+    receiver.node_id = "node_b"
+    requests = []
+
+    async def gossip(request):
+        requests.append(request.path)
+        await receiver.receive_message(await request.json())
+        return web.json_response({"ok": True})
+
+    async def gossip_batch(request):
+        requests.append(request.path)
+        await receiver.receive_batch(await request.json())
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_post("/api/gossip", gossip)
+    app.router.add_post("/api/gossip/batch", gossip_batch)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", unused_tcp_port).start()
+
+    sender = make_protocol(peers=[Peer("node_b", f"http://127.0.0.1:{unused_tcp_port}")])
+    try:
+        for i in range(4):
+            sender.broadcast("proof", {"n": i})
+        first = [sender.pending_messages.popleft()]
+        rest = [sender.pending_messages.popleft() for _ in range(3)]
+
+        await sender._gossip_round(first)
+        session = sender._session
+        await sender._gossip_round(rest)
+
+        assert sender._session is session
+        assert requests == ["/api/gossip", "/api/gossip/batch"]
+        assert len(receiver.message_cache) == 4
+    finally:
+        await sender.stop()
+        await runner.cleanup()
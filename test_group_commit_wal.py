@@ -0,0 +1,240 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Tests for the group commit write-ahead log.
+
+This module tests:
+- PREPARE + COMMIT written with a single fsync
+- Concurrent callers share fsyncs and all records are durable
+- The long-lived handle survives WAL truncation
+- I/O errors reach every caller in the failed batch, and the failed
+  records are rolled back so recovery never replays them
+- Non-I/O flush errors fail the WAL instead of hanging callers
+- LogStructuredCommitLayer with group commit under concurrent commits
+"""
+
+import errno
+import threading
+
+import pytest
+
+import diotec360.consensus.atomic_commit as atomic_commit
+import diotec360.consensus.group_commit_wal as group_commit_wal
+from diotec360.consensus.atomic_commit import WriteAheadLog
+from diotec360.consensus.group_commit_wal import GroupCommitWriteAheadLog
+from diotec360.consensus.log_structured_state import LogStructuredCommitLayer
+
+
+def run_threads(count, target):
+    barrier = threading.Barrier(count)
+    errors = []
+
+    def worker(index):
+        barrier.wait()
+        try:
+            target(index)
+        except Exception as e:  # pragma: no cover - surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def test_append_committed_entry_uses_one_fsync(tmp_path, monkeypatch):
+    """The plain WAL writes PREPARE and COMMIT with a single fsync."""
+    calls = []
+    real_fsync = atomic_commit.os.fsync
+    monkeypatch.setattr(atomic_commit.os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd)))
+
+    wal = WriteAheadLog(tmp_path)
+    wal.append_committed_entry("tx_1", {"a": 1})
+
+    assert len(calls) == 1
+    entries = wal.get_committed_entries()
+    assert [(e.tx_id, e.changes) for e in entries] == [("tx_1", {"a": 1})]
+
+
+def test_concurrent_callers_share_fsyncs(tmp_path):
+    """Every record is durable and batches hold more than one record."""
+    wal = GroupCommitWriteAheadLog(tmp_path, max_batch_delay_ms=20)
+    try:
+        run_threads(16, lambda i: wal.append_committed_entry(f"tx_{i}", {f"k{i}": i}))
+        metrics = wal.get_metrics()
+    finally:
+        wal.shutdown()
+
+    assert metrics["records"] == 16
+    assert metrics["batches"] < 16
+    assert metrics["max_batch_size"] > 1
+
+    # A fresh reader sees every commit
+    entries = WriteAheadLog(tmp_path).get_committed_entries()
+    assert sorted(e.tx_id for e in entries) == sorted(f"tx_{i}" for i in range(16))
+
+
+def test_prepare_then_commit_round_trip(tmp_path):
+    """append_entry + mark_committed keep the WriteAheadLog semantics."""
+    wal = GroupCommitWriteAheadLog(tmp_path)
+    try:
+        entry = wal.append_entry("tx_1", {"a": 1})
+        assert [e.tx_id for e in wal.get_uncommitted_entries()] == ["tx_1"]
+
+        wal.mark_committed(entry)
+        assert entry.committed
+        assert wal.get_uncommitted_entries() == []
+        assert [e.tx_id for e in wal.get_committed_entries()] == ["tx_1"]
+    finally:
+        wal.shutdown()
+
+
+def test_handle_survives_truncation(tmp_path):
+    """Writes after truncate_committed land in the new WAL file."""
+    wal = GroupCommitWriteAheadLog(tmp_path)
+    try:
+        wal.append_committed_entry("tx_old", {"a": 1})
+        pending = wal.append_entry("tx_pending", {"b": 2})
+        wal.truncate_committed()
+
+        wal.append_committed_entry("tx_new", {"c": 3})
+        wal.mark_committed(pending)
+    finally:
+        wal.shutdown()
+
+    entries = WriteAheadLog(tmp_path).get_committed_entries()
+    assert sorted(e.tx_id for e in entries) == ["tx_new", "tx_pending"]
+
+
+def test_fsync_error_reaches_caller(tmp_path, monkeypatch):
+    """A failed fsync raises in the caller instead of acknowledging."""
+    def failing_fsync(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    wal = GroupCommitWriteAheadLog(tmp_path)
+    monkeypatch.setattr(group_commit_wal.os, "fsync", failing_fsync)
+    try:
+        with pytest.raises(OSError, match="Disk full"):
+            wal.append_committed_entry("tx_1", {"a": 1})
+        assert wal.get_metrics()["batches"] == 0
+    finally:
+        monkeypatch.undo()
+        wal.shutdown()
+
+
+def fail_fsync_once(monkeypatch, module):
+    real_fsync = module.os.fsync
+    calls = []
+
+    def fsync(fd):
+        calls.append(fd)
+        if len(calls) == 1:
+            raise OSError(errno.EIO, "Input/output error")
+        return real_fsync(fd)
+
+    monkeypatch.setattr(module.os, "fsync", fsync)
+
+
+@pytest.mark.parametrize("wal_class", [WriteAheadLog, GroupCommitWriteAheadLog])
+def test_failed_fsync_is_not_recovered(tmp_path, monkeypatch, wal_class):
+    """Records of a batch whose fsync failed never reach recovery."""
+    wal = wal_class(tmp_path)
+    wal.append_committed_entry("tx_before", {"a": 1})
+
+    fail_fsync_once(monkeypatch, atomic_commit)
+    with pytest.raises(OSError, match="I/O error writing to WAL"):
+        wal.append_committed_entry("tx_failed", {"b": 2})
+    wal.append_committed_entry("tx_after", {"c": 3})
+    monkeypatch.undo()
+    if isinstance(wal, GroupCommitWriteAheadLog):
+        wal.shutdown()
+
+    recovered = WriteAheadLog(tmp_path)
+    assert sorted(e.tx_id for e in recovered.get_committed_entries()) == ["tx_after", "tx_before"]
+    assert recovered.get_uncommitted_entries() == []
+
+
+def test_failed_rollback_fails_wal(tmp_path, monkeypatch):
+    """If a failed batch cannot be truncated, later records are refused."""
+    wal = GroupCommitWriteAheadLog(tmp_path)
+
+    def failing_ftruncate(fd, length):
+        raise OSError(errno.EIO, "Input/output error")
+
+    fail_fsync_once(monkeypatch, group_commit_wal)
+    monkeypatch.setattr(group_commit_wal.os, "ftruncate", failing_ftruncate)
+    try:
+        with pytest.raises(OSError, match="I/O error writing to WAL"):
+            wal.append_committed_entry("tx_failed", {"b": 2})
+        with pytest.raises(RuntimeError, match="WAL has failed"):
+            wal.append_entry("tx_next", {"c": 3})
+    finally:
+        monkeypatch.undo()
+        wal.shutdown()
+
+
+def test_unexpected_flush_error_fails_wal(tmp_path):
+    """A non-OSError reaches the caller and later records raise, not hang."""
+    wal = GroupCommitWriteAheadLog(tmp_path)
+    wal._file.close()  # As after a failed reopen in _rewrite_wal
+    try:
+        with pytest.raises(ValueError, match="closed file"):
+            wal.append_committed_entry("tx_1", {"a": 1})
+        with pytest.raises(RuntimeError, match="WAL has failed"):
+            wal.append_entry("tx_2", {"b": 2})
+        assert not wal._flusher.is_alive()
+    finally:
+        wal.shutdown()
+
+
+def test_shutdown_rejects_new_records(tmp_path):
+    wal = GroupCommitWriteAheadLog(tmp_path)
+    wal.shutdown()
+
+    with pytest.raises(RuntimeError):
+        wal.append_entry("tx_1", {"a": 1})
+
+
+def test_log_structured_layer_with_group_commit(tmp_path):
+    """Concurrent commits and checkpoints lose nothing across a restart."""
+    layer = LogStructuredCommitLayer(
+        tmp_path / "state", tmp_path / "wal",
+        checkpoint_interval=25, group_commit=True, max_batch_delay_ms=1
+    )
+    assert layer.recover_from_crash().recovered
+
+    def commit_many(index):
+        for n in range(20):
+            tx = layer.begin_transaction(f"tx_{index}_{n}")
+            tx.changes = {f"account_{index}_{n}": n}
+            assert layer.commit_transaction(tx)
+
+    run_threads(8, commit_many)
+    assert layer.wal.get_metrics()["records"] == 160
+    layer.engine.close()
+    layer.wal.shutdown()
+
+    # No shutdown checkpoint: whatever is not in a segment comes from the WAL
+    reopened = LogStructuredCommitLayer(tmp_path / "state", tmp_path / "wal")
+    assert reopened.recover_from_crash().recovered
+    for index in range(8):
+        for n in range(20):
+            assert reopened.get(f"account_{index}_{n}") == n
+    reopened.shutdown()
@@ -0,0 +1,103 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for incremental Z3 solving in AethelJudge.
+
+Tests verify:
+- verify_many verdicts match one-by-one verification
+- Shared guard prefixes are reused and nothing leaks between intents
+- Hard-rejected intents leave the solver scopes consistent
+- Constraints are compiled once
+"""
+
+from diotec360.core.judge import AethelJudge
+
+
+def templated_intents():
+    intents = {}
+    for i in range(8):
+        intents[f'transfer_{i}'] = {
+            'params': [],
+            'constraints': ['balance >= amount', 'amount > 0', f'fee >= {i % 2}'],
+            'post_conditions': ['new_balance == balance - amount - fee', f'new_balance >= {i}'],
+        }
+    # Same guards as the transfers, contradictory post-conditions
+    intents['contradiction'] = {
+        'params': [],
+        'constraints': ['balance >= amount', 'amount > 0'],
+        'post_conditions': ['new_balance > 10', 'new_balance < 5'],
+    }
+    return intents
+
+
+def test_verify_many_matches_sequential():
+    intents = templated_intents()
+    sequential = AethelJudge(intents, quiet=True)
+    expected = {name: sequential.verify_logic(name)['status'] for name in intents}
+
+    judge = AethelJudge(intents, quiet=True)
+    names = list(reversed(list(intents)))
+    batch = judge.verify_many(names)
+
+    assert list(batch['verdicts']) == names
+    assert batch['verdicts'] == expected
+    assert batch['verdicts']['contradiction'] == 'FAILED'
+    assert batch['reused_guard_scopes'] > 0
+    assert batch['compiled_constraint_hits'] > 0
+    assert batch['total_solve_ms'] >= 0
+    assert not judge.incremental
+
+
+def test_post_conditions_do_not_leak_between_intents():
+    intents = templated_intents()
+    judge = AethelJudge(intents, quiet=True, incremental=True)
+
+    assert judge.verify_logic('contradiction')['status'] == 'FAILED'
+    assert judge.verify_logic('transfer_0')['status'] == 'PROVED'
+    # Only the current guards remain asserted after a verification
+    assert judge._guard_scopes == ['balance >= amount', 'amount > 0', 'fee >= 0']
+    assert judge.solver.num_scopes() == 3
+
+
+def test_hard_reject_keeps_solver_consistent():
+    intents = templated_intents()
+    intents['unsupported'] = {
+        'params': [],
+        'constraints': ['balance >= amount', 'balance ** 2 > 1'],
+        'post_conditions': ['new_balance >= 0'],
+    }
+    judge = AethelJudge(intents, quiet=True, incremental=True)
+
+    assert judge.verify_logic('transfer_1')['status'] == 'PROVED'
+    scopes = list(judge._guard_scopes)
+    assert judge.verify_logic('unsupported')['status'] == 'REJECTED'
+    assert judge._guard_scopes == scopes
+    assert judge.verify_logic('transfer_1')['status'] == 'PROVED'
+
+
+def test_constraints_compiled_once():
+    judge = AethelJudge(templated_intents(), quiet=True, incremental=True)
+    judge.verify_logic('transfer_0')
+    misses = judge._compile_misses
+
+    judge.verify_logic('transfer_0')
+    assert judge._compile_misses == misses
+
+    # A regular verification resets the solver and forgets the scopes
+    judge.incremental = False
+    assert judge.verify_logic('transfer_0')['status'] == 'PROVED'
+    assert judge._guard_scopes is None
@@ -0,0 +1,208 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Tests for incremental root maintenance in MerkleStateDB and MerkleStateTree.
+
+This module tests:
+- Incremental roots match a from-scratch rebuild after puts and deletes
+- Deferred-root mode with explicit commit()
+- Legacy flat-root snapshots are accepted and upgraded on load
+- Tampering with state outside put/delete is still detected
+- Peers exchange the legacy flat root; peer sync accepts both formats
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from diotec360.core.persistence import MerkleStateDB, build_state_tree, legacy_state_root
+from diotec360.core.state import MerkleStateTree
+from diotec360.nexo import p2p_node
+
+
+@pytest.fixture
+def db(tmp_path):
+    return MerkleStateDB(str(tmp_path / "state"))
+
+
+class TestMerkleStateDB:
+    """Incremental root maintenance for the Reality DB."""
+    
+    def test_fresh_db_has_no_root(self, db):
+        """A new database has no root until the first write."""
+        assert db.get_root() is None
+    
+    def test_incremental_root_matches_rebuild(self, db):
+        """Root after puts/deletes equals a full rebuild of the state."""
+        for i in range(200):
+            db.put(f"account:{i}", {"balance": i, "nonce": 0})
+        for i in range(0, 200, 3):
+            db.delete(f"account:{i}")
+        db.put("account:1", {"balance": 999, "nonce": 1})
+        
+        assert db.get_root() == build_state_tree(db.state).get_root_hash()
+        assert db.verify_integrity() is True
+    
+    def test_deferred_root_requires_commit(self, tmp_path):
+        """In deferred mode the root only moves on commit()."""
+        db = MerkleStateDB(str(tmp_path / "bulk"), deferred_root=True)
+        for i in range(1000):
+            db.put(f"k{i}", i)
+        
+        assert db.get_root() is None
+        
+        root = db.commit()
+        assert root == db.get_root()
+        assert db.verify_integrity() is True
+    
+    def test_deferred_snapshot_commits_first(self, tmp_path):
+        """save_snapshot() never persists a stale root."""
+        path = str(tmp_path / "bulk")
+        db = MerkleStateDB(path, deferred_root=True)
+        db.put("a", 1)
+        db.save_snapshot()
+        
+        reloaded = MerkleStateDB(path)
+        assert reloaded.get_root() == db.get_root()
+        assert reloaded.get("a") == 1
+    
+    def test_legacy_snapshot_is_upgraded(self, tmp_path):
+        """Snapshots written with the flat root still load."""
+        path = str(tmp_path / "legacy")
+        db = MerkleStateDB(path)
+        db.put("account:alice", {"balance": 100})
+        db.put("account:bob", {"balance": 50})
+        db.save_snapshot()
+        
+        snapshot = json.loads(db.snapshot_path.read_text())
+        snapshot['merkle_root'] = db._calculate_legacy_merkle_root()
+        db.snapshot_path.write_text(json.dumps(snapshot))
+        
+        reloaded = MerkleStateDB(path)
+        assert reloaded.get_root() == db.get_root()
+    
+    def test_out_of_band_change_detected(self, db):
+        """Editing the state dict directly breaks integrity."""
+        db.put("account:alice", {"balance": 100})
+        db.state["account:alice"] = {"balance": 1_000_000}
+        
+        assert db.verify_integrity() is False
+    
+    def test_state_assignment_rebuilds_index(self, db):
+        """Assigning a whole state keeps later writes consistent."""
+        db.state = {"x": 1, "y": 2}
+        db.put("z", 3)
+        
+        assert db.get_root() == build_state_tree({"x": 1, "y": 2, "z": 3}).get_root_hash()
+
+
+class TestMerkleStateTree:
+    """Incremental root maintenance for the account state tree."""
+    
+    def test_root_independent_of_creation_order(self):
+        """Same accounts in any order give the same root."""
+        tree1 = MerkleStateTree()
+        tree2 = MerkleStateTree()
+        for i in range(50):
+            tree1.create_account(f"addr{i}", i)
+        for i in reversed(range(50)):
+            tree2.create_account(f"addr{i}", i)
+        
+        assert tree1.root_hash == tree2.root_hash
+    
+    def test_update_changes_root(self):
+        """Balance updates move the root."""
+        tree = MerkleStateTree()
+        tree.create_account("alice", 100)
+        tree.create_account("bob", 0)
+        root = tree.root_hash
+        
+        tree.update_account("alice", 90)
+        
+        assert tree.root_hash != root
+        assert tree.history[-1]['new_root'] == tree.root_hash
+    
+    def test_deferred_root(self):
+        """Deferred mode publishes the root on commit()."""
+        eager = MerkleStateTree()
+        deferred = MerkleStateTree(deferred_root=True)
+        for i in range(100):
+            eager.create_account(f"addr{i}", i)
+            deferred.create_account(f"addr{i}", i)
+        
+        assert deferred.root_hash is None
+        assert deferred.commit() == eager.root_hash
+    
+    def test_proof_contains_sibling_path(self):
+        """Account proofs carry the sibling hashes to the root."""
+        tree = MerkleStateTree()
+        for i in range(8):
+            tree.create_account(f"addr{i}", i)
+        
+        proof = tree.get_merkle_proof("addr3")
+        
+        assert len(proof['path']) > 0
+        assert tree.verify_merkle_proof(proof) is True
+
+
+class TestPeerSyncRoot:
+    """Root format exchanged with peers stays readable by earlier releases."""
+    
+    PEER_STATE = {"account:alice": {"balance": 100}, "account:bob": {"balance": 50}}
+    
+    def sync_from(self, monkeypatch, tmp_path, peer_root):
+        payload = {"state": dict(self.PEER_STATE), "merkle_root": peer_root}
+        monkeypatch.setattr(p2p_node, "_http_get_json", lambda url, timeout_seconds: (True, payload, "ok"))
+        db = MerkleStateDB(str(tmp_path / "node"))
+        ok, _ = p2p_node.sync_state_if_empty(SimpleNamespace(merkle_db=db), ["http://peer"])
+        return ok, db
+    
+    def test_wire_root_is_legacy_root(self, db):
+        """compute_merkle_root and get_legacy_root use the flat format."""
+        db.put("account:alice", {"balance": 100})
+        assert db.get_legacy_root() == legacy_state_root(db.state)
+        assert p2p_node.compute_merkle_root(db.state) == db.get_legacy_root()
+        
+        db.put("account:bob", {"balance": 50})
+        assert db.get_legacy_root() == legacy_state_root(db.state)
+        
+        db.delete("account:alice")
+        assert db.get_legacy_root() == legacy_state_root(db.state)
+    
+    def test_sync_accepts_legacy_root(self, monkeypatch, tmp_path):
+        """A peer on an earlier release publishes the flat root."""
+        ok, db = self.sync_from(monkeypatch, tmp_path, legacy_state_root(self.PEER_STATE))
+        
+        assert ok is True
+        assert db.state == self.PEER_STATE
+        assert db.verify_integrity() is True
+    
+    def test_sync_accepts_sparse_root(self, monkeypatch, tmp_path):
+        """A peer publishing the sparse tree root is accepted too."""
+        ok, db = self.sync_from(monkeypatch, tmp_path, build_state_tree(self.PEER_STATE).get_root_hash())
+        
+        assert ok is True
+        assert db.get_root() == build_state_tree(self.PEER_STATE).get_root_hash()
+    
+    def test_sync_rejects_wrong_root(self, monkeypatch, tmp_path):
+        """A root matching neither format is rejected."""
+        ok, db = self.sync_from(monkeypatch, tmp_path, "0" * 64)
+        
+        assert ok is False
+        assert db.state == {}
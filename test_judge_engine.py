@@ -0,0 +1,135 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for JudgeEngine sessions and JudgeEnginePool.
+
+Tests verify:
+- Sessions on a shared engine give the same verdicts as standalone judges
+- Sessions reuse the engine components and do not add crisis listeners
+- An incremental session never inherits solver state from a previous one
+- The pool hands each engine to one session at a time
+"""
+
+import queue
+import threading
+
+import pytest
+
+from diotec360.core.judge import AethelJudge
+from diotec360.core.judge_engine import JudgeEngine, JudgeEnginePool
+from diotec360.core.adaptive_rigor import SystemMode
+
+
+INTENTS = {
+    'transfer': {
+        'params': [],
+        'constraints': ['balance >= amount', 'amount > 0'],
+        'post_conditions': ['new_balance == balance - amount', 'new_balance >= 0'],
+    },
+    'contradiction': {
+        'params': [],
+        'constraints': ['balance >= amount', 'amount > 0'],
+        'post_conditions': ['new_balance > 10', 'new_balance < 5'],
+    },
+}
+
+
+def test_session_verdicts_match_standalone_judge():
+    standalone = AethelJudge(INTENTS, quiet=True)
+    engine = JudgeEngine(quiet=True)
+
+    for name in INTENTS:
+        session = AethelJudge(INTENTS, engine=engine)
+        assert session.verify_logic(name)['status'] == standalone.verify_logic(name)['status']
+
+    assert AethelJudge(INTENTS, engine=engine).verify_logic('contradiction')['status'] == 'FAILED'
+
+
+def test_sessions_share_engine_components():
+    engine = JudgeEngine(quiet=True)
+    listeners = len(engine.sentinel_monitor.crisis_mode_listeners)
+
+    first = AethelJudge(INTENTS, engine=engine)
+    second = AethelJudge({'other': INTENTS['transfer']}, engine=engine)
+
+    assert first.semantic_sanitizer is second.semantic_sanitizer is engine.semantic_sanitizer
+    assert first.solver is second.solver is engine.solver
+    assert first.gauntlet_report is engine.gauntlet_report
+    assert first.intent_map is not second.intent_map
+    assert len(engine.sentinel_monitor.crisis_mode_listeners) == listeners
+
+
+def test_crisis_mode_reaches_engine_rigor():
+    engine = JudgeEngine(quiet=True)
+    session = AethelJudge(INTENTS, engine=engine)
+
+    session._on_crisis_mode_change(True)
+    assert engine.adaptive_rigor.current_mode == SystemMode.CRISIS
+    session._on_crisis_mode_change(False)
+    assert engine.adaptive_rigor.current_mode != SystemMode.CRISIS
+
+
+def test_incremental_session_starts_from_clean_solver():
+    engine = JudgeEngine(quiet=True)
+    first = AethelJudge(INTENTS, engine=engine, incremental=True)
+    assert first.verify_logic('transfer')['status'] == 'PROVED'
+    assert engine.solver.num_scopes() == 2
+
+    # A different map whose guards contradict the ones left asserted
+    second = AethelJudge({
+        'withdraw': {
+            'params': [],
+            'constraints': ['amount <= 0'],
+            'post_conditions': ['new_balance == balance + amount'],
+        }
+    }, engine=engine, incremental=True)
+    assert second._guard_scopes is None
+    assert second.verify_logic('withdraw')['status'] == 'PROVED'
+    assert second._guard_scopes == ['amount <= 0']
+
+    # Compiled constraints carry over between sessions
+    assert 'balance >= amount' in second._compiled_constraints
+
+
+def test_pool_checkout_is_exclusive():
+    pool = JudgeEnginePool(size=1, quiet=True)
+    assert pool.construction_ms > 0
+
+    with pool.session(INTENTS) as judge:
+        assert judge.verify_logic('transfer')['status'] == 'PROVED'
+        with pytest.raises(queue.Empty):
+            with pool.checkout(timeout=0.05):
+                pass
+
+        waiter_engines = []
+
+        def waiter_session():
+            with pool.checkout() as engine:
+                waiter_engines.append(engine)
+
+        waiter = threading.Thread(target=waiter_session)
+        waiter.start()
+        waiter.join(timeout=0.1)
+        assert waiter.is_alive()
+        assert waiter_engines == []
+
+    waiter.join(timeout=5)
+    assert waiter_engines == [judge.engine]
+    stats = pool.get_stats()
+    assert stats['waits'] == 1
+    assert stats['checkouts'] == 2
+    assert stats['available'] == 1
@@ -0,0 +1,111 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the judge's structured event/trace API.
+
+Tests verify:
+- Quiet mode produces zero console output but still records layer timings
+- Console output is level-gated
+- Subscribers receive structured events tagged with the tx_id
+- Disabled events are never formatted and the ring buffer is bounded
+"""
+
+from diotec360.core.judge import AethelJudge
+from diotec360.core.judge_trace import JudgeTrace, TraceLevel
+
+
+INTENT = {
+    'params': [],
+    'constraints': ['sender_balance >= amount', 'amount > 0'],
+    'post_conditions': ['sender_balance_new == sender_balance - amount', 'sender_balance_new >= 0'],
+}
+
+
+class ExplodingStr:
+    """Fails the test if a disabled event is formatted"""
+
+    def __str__(self):
+        raise AssertionError("disabled event was formatted")
+
+
+def test_quiet_mode_has_no_console_output(capsys):
+    judge = AethelJudge({'transfer': INTENT}, quiet=True)
+    capsys.readouterr()
+
+    result = judge.verify_logic('transfer')
+
+    assert result['status'] == 'PROVED'
+    assert capsys.readouterr().out == ""
+
+    trace = judge.trace.recent_transactions(1)[0]
+    assert trace['intent_name'] == 'transfer'
+    assert trace['status'] == 'PROVED'
+    layers = [layer['layer'] for layer in trace['layers']]
+    assert layers == [
+        'semantic_sanitizer', 'input_sanitizer', 'complexity_check',
+        'conservation', 'overflow', 'constraint_parsing', 'z3_prover',
+    ]
+    assert all(layer['duration_ms'] >= 0 for layer in trace['layers'])
+    assert set(judge.trace.get_layer_statistics()) == set(layers)
+
+
+def test_info_level_prints_verdicts_only(capsys):
+    judge = AethelJudge({'transfer': INTENT}, trace=JudgeTrace(level=TraceLevel.INFO))
+    capsys.readouterr()
+
+    judge.verify_logic('transfer')
+    out = capsys.readouterr().out
+
+    assert "PROVED" in out
+    assert "Layer -1" not in out
+    assert "✓ amount > 0" not in out
+
+
+def test_subscriber_receives_structured_events(capsys):
+    trace = JudgeTrace(level=TraceLevel.QUIET, subscriber_level=TraceLevel.INFO)
+    events = []
+    trace.subscribe(events.append)
+    judge = AethelJudge({'transfer': INTENT}, trace=trace)
+
+    judge.verify_logic('transfer')
+
+    assert capsys.readouterr().out == ""
+    assert events and all(e.level >= TraceLevel.INFO for e in events)
+    tx_ids = {e.tx_id for e in events}
+    assert len(tx_ids) == 1
+    assert trace.get_transaction(tx_ids.pop())['status'] == 'PROVED'
+    assert any(e.layer == 'z3_prover' and 'PROVED' in e.message for e in events)
+
+
+def test_disabled_events_are_not_formatted():
+    trace = JudgeTrace(level=TraceLevel.WARNING)
+    trace.debug('tx', 'layer', "%s", ExplodingStr())
+    trace.info('tx', 'layer', "%s", ExplodingStr())
+    assert not trace.is_enabled_for(TraceLevel.INFO)
+    assert trace.is_enabled_for(TraceLevel.WARNING)
+
+
+def test_ring_buffer_is_bounded():
+    trace = JudgeTrace(level=TraceLevel.QUIET, max_transactions=3)
+    for i in range(5):
+        trace.begin(f'tx_{i}', 'intent')
+        trace.mark(f'tx_{i}', 'z3_prover', True)
+        trace.end(f'tx_{i}', 'PROVED')
+
+    assert trace.get_transaction('tx_0') is None
+    assert [t['tx_id'] for t in trace.recent_transactions()] == ['tx_4', 'tx_3', 'tx_2']
+    assert trace.get_layer_statistics()['z3_prover']['count'] == 3
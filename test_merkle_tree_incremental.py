@@ -0,0 +1,187 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Tests for the incremental MerkleTree layouts.
+
+This module tests:
+- Sparse mode: history independence, proofs, deletes and path binding
+- Compat mode: root hashes identical to the legacy full-rebuild layout
+- Incremental hashing: one update rehashes only its root-to-leaf path
+"""
+
+import hashlib
+import random
+
+from hypothesis import given, settings, strategies as st
+
+from diotec360.consensus.merkle_tree import MerkleTree, EMPTY_HASH
+
+
+def legacy_root(state):
+    """Reference root computed exactly like the original full rebuild."""
+    tree = MerkleTree(compat_mode=False)
+    level = [tree._hash_leaf(key, state[key]) for key in sorted(state)]
+    if not level:
+        return hashlib.sha256(b"empty").hexdigest()
+    while len(level) > 1:
+        level = [
+            tree._hash_pair(level[i], level[i + 1] if i + 1 < len(level) else level[i])
+            for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+class TestSparseMerkleTree:
+    """Unit tests for the sparse layout (compat_mode=False)."""
+    
+    def test_empty_root_unchanged(self):
+        """Empty tree keeps the historical empty root."""
+        assert MerkleTree(compat_mode=False).get_root_hash() == EMPTY_HASH
+    
+    def test_root_independent_of_insertion_order(self):
+        """Same key-value set gives the same root in any order."""
+        items = [(f"account_{i}", i * 10) for i in range(200)]
+        tree1 = MerkleTree(compat_mode=False)
+        for key, value in items:
+            tree1.update(key, value)
+        
+        random.Random(7).shuffle(items)
+        tree2 = MerkleTree(compat_mode=False)
+        tree2.batch_update(dict(items))
+        
+        assert tree1.get_root_hash() == tree2.get_root_hash()
+    
+    def test_delete_restores_previous_root(self):
+        """Insert followed by delete returns to the previous root."""
+        tree = MerkleTree(compat_mode=False)
+        tree.batch_update({f"k{i}": i for i in range(50)})
+        root_before = tree.get_root_hash()
+        
+        tree.update("extra", 1)
+        assert tree.get_root_hash() != root_before
+        
+        tree.delete("extra")
+        assert tree.get_root_hash() == root_before
+    
+    def test_delete_all_keys_gives_empty_root(self):
+        """Deleting every key collapses the tree back to empty."""
+        tree = MerkleTree(compat_mode=False)
+        tree.batch_update({f"k{i}": i for i in range(20)})
+        for i in range(20):
+            tree.delete(f"k{i}")
+        
+        assert tree.root is None
+        assert tree.get_root_hash() == EMPTY_HASH
+    
+    def test_update_rehashes_only_its_path(self):
+        """A single update recomputes O(log n) internal hashes."""
+        tree = MerkleTree(compat_mode=False)
+        tree.batch_update({f"k{i}": i for i in range(4096)})
+        tree.get_root_hash()
+        
+        misses_before = tree.get_cache_stats()['cache_misses']
+        tree.update("k123", "changed")
+        tree.get_root_hash()
+        rehashed = tree.get_cache_stats()['cache_misses'] - misses_before
+        
+        assert rehashed == len(tree.generate_proof("k123").path)
+        assert rehashed < 40
+    
+    def test_proof_rejected_for_other_key(self):
+        """Sibling positions are bound to the key's path bits."""
+        tree = MerkleTree(compat_mode=False)
+        tree.batch_update({f"k{i}": i for i in range(16)})
+        proof = tree.generate_proof("k1")
+        
+        proof.key = "k2"
+        proof.value = 2
+        proof.leaf_hash = tree._hash_leaf("k2", 2)
+        
+        assert tree.verify_proof(proof) is False
+
+
+class TestCompatMerkleTree:
+    """Compat mode must reproduce the legacy root."""
+    
+    def test_compat_is_default(self):
+        """Existing callers keep the legacy root without opting in."""
+        state = {f"k{i}": i for i in range(37)}
+        tree = MerkleTree()
+        tree.batch_update(state)
+        
+        assert tree.compat_mode is True
+        assert tree.get_root_hash() == legacy_root(state)
+    
+    def test_matches_legacy_root_after_updates_and_deletes(self):
+        """Root matches the legacy layout across mixed operations."""
+        rng = random.Random(42)
+        tree = MerkleTree(compat_mode=True)
+        state = {}
+        
+        for step in range(300):
+            key = f"acct_{rng.randint(0, 60)}"
+            if rng.random() < 0.2 and key in state:
+                tree.delete(key)
+                del state[key]
+            else:
+                state[key] = rng.randint(0, 1000)
+                tree.update(key, state[key])
+            
+            if step % 7 == 0:
+                assert tree.get_root_hash() == legacy_root(state)
+        
+        assert tree.get_root_hash() == legacy_root(state)
+    
+    def test_value_update_is_incremental(self):
+        """Updating an existing key does not rebuild every level."""
+        tree = MerkleTree(compat_mode=True)
+        tree.batch_update({f"k{i}": i for i in range(1000)})
+        tree.get_root_hash()
+        
+        misses_before = tree.get_cache_stats()['cache_misses']
+        tree.update("k500", -1)
+        tree.get_root_hash()
+        
+        assert tree.get_cache_stats()['cache_misses'] - misses_before == 10
+
+
+@settings(max_examples=50)
+@given(
+    state=st.dictionaries(
+        st.text(min_size=1, max_size=8),
+        st.integers(min_value=0, max_value=10**6),
+        max_size=40
+    )
+)
+def test_proofs_valid_in_both_modes(state):
+    """
+    Property test: every key has a valid proof in both layouts, and the
+    compat root equals the legacy root.
+    """
+    sparse = MerkleTree(compat_mode=False)
+    compat = MerkleTree(compat_mode=True)
+    sparse.batch_update(state)
+    compat.batch_update(state)
+    
+    assert compat.get_root_hash() == legacy_root(state)
+    
+    for key in state:
+        for tree in (sparse, compat):
+            proof = tree.generate_proof(key)
+            assert proof is not None
+            assert tree.verify_proof(proof) is True
@@ -0,0 +1,177 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for expert scheduling in MOEOrchestrator.
+
+Tests:
+- The expert thread pool outlives a single verification
+- Expert deadlines are enforced from the moment each expert starts
+- Experts that never get a pool thread time out from submission
+- Early exit once a high-confidence rejection decides the consensus
+- ConsensusEngine.decided_consensus
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from diotec360.moe.orchestrator import MOEOrchestrator
+from diotec360.moe.consensus_engine import ConsensusEngine
+from diotec360.moe.base_expert import BaseExpert
+from diotec360.moe.data_models import ExpertVerdict
+
+
+class TimedExpert(BaseExpert):
+    """Expert answering a fixed verdict after a delay."""
+
+    def __init__(self, name, verdict="APPROVE", confidence=0.9, delay=0.0):
+        super().__init__(name)
+        self.verdict = verdict
+        self.confidence = confidence
+        self.delay = delay
+        self.threads = []
+
+    def verify(self, intent: str, tx_id: str) -> ExpertVerdict:
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return ExpertVerdict(
+            expert_name=self.name,
+            verdict=self.verdict,
+            confidence=self.confidence,
+            latency_ms=self.delay * 1000
+        )
+
+
+@pytest.fixture
+def make_orchestrator():
+    created = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def factory(*experts, **kwargs):
+            kwargs.setdefault('enable_cache', False)
+            orchestrator = MOEOrchestrator(telemetry_db_path=os.path.join(tmpdir, "telemetry.db"), **kwargs)
+            for expert in experts:
+                orchestrator.register_expert(expert)
+            created.append(orchestrator)
+            return orchestrator
+        yield factory
+        for orchestrator in created:
+            orchestrator.shutdown()
+
+
+def test_expert_pool_is_reused(make_orchestrator):
+    expert = TimedExpert("Expert_1")
+    orchestrator = make_orchestrator(expert, max_workers=1)
+
+    orchestrator.verify_transaction("intent", "tx_1")
+    executor = orchestrator._expert_executor
+    orchestrator.verify_transaction("intent", "tx_2")
+
+    assert orchestrator._expert_executor is executor
+    assert expert.threads[0] == expert.threads[1]
+    assert expert.threads[0].startswith("moe_expert")
+
+
+def test_deadline_is_enforced(make_orchestrator):
+    fast = TimedExpert("Fast_Expert")
+    slow = TimedExpert("Slow_Expert", delay=3.0)
+    orchestrator = make_orchestrator(fast, slow, expert_timeout=0.3)
+
+    start = time.monotonic()
+    result = orchestrator.verify_transaction("intent", "tx_1")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2.0
+    slow_verdict = next(v for v in result.expert_verdicts if v.expert_name == "Slow_Expert")
+    assert slow_verdict.verdict == "REJECT"
+    assert slow_verdict.proof_trace == {'timeout': True}
+    assert orchestrator.get_expert_status()['orchestrator_stats']['expert_timeouts'] == 1
+
+
+def test_deadline_counts_from_expert_start(make_orchestrator):
+    # One worker: the second expert waits for the first before it starts
+    first = TimedExpert("Expert_1", delay=0.3)
+    second = TimedExpert("Expert_2", delay=0.3)
+    orchestrator = make_orchestrator(first, second, max_workers=1, expert_timeout=0.5)
+
+    result = orchestrator.verify_transaction("intent", "tx_1")
+
+    assert result.consensus == "APPROVED"
+    assert all(v.verdict == "APPROVE" for v in result.expert_verdicts)
+
+
+def test_queued_experts_time_out_when_pool_is_hung(make_orchestrator):
+    # The only worker is held by a hung expert from an earlier request
+    hung = TimedExpert("Hung_Expert", delay=3.0)
+    waiting = TimedExpert("Waiting_Expert")
+    orchestrator = make_orchestrator(hung, waiting, max_workers=1, expert_timeout=0.2,
+                                     expert_queue_timeout=0.2, early_exit_consensus=False)
+
+    start = time.monotonic()
+    orchestrator._execute_experts_parallel(["Hung_Expert"], "intent", "tx_1")
+    verdicts = orchestrator._execute_experts_parallel(["Waiting_Expert"], "intent", "tx_2")
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1.5
+    assert len(verdicts) == 1
+    assert verdicts[0].verdict == "REJECT"
+    assert verdicts[0].proof_trace == {'timeout': True, 'queued': True}
+    assert waiting.threads == []
+
+
+def test_early_exit_on_decided_rejection(make_orchestrator):
+    rejecter = TimedExpert("Rejecter", verdict="REJECT", confidence=0.95)
+    slow = TimedExpert("Slow_Expert", delay=2.0)
+    orchestrator = make_orchestrator(rejecter, slow)
+
+    start = time.monotonic()
+    result = orchestrator.verify_transaction("intent", "tx_1")
+
+    assert time.monotonic() - start < 1.0
+    assert result.consensus == "REJECTED"
+    assert [v.expert_name for v in result.expert_verdicts] == ["Rejecter"]
+    stats = orchestrator.get_expert_status()['orchestrator_stats']
+    assert stats['early_exits'] == 1
+    assert stats['experts_skipped'] == 1
+
+
+def test_early_exit_can_be_disabled(make_orchestrator):
+    rejecter = TimedExpert("Rejecter", verdict="REJECT", confidence=0.95)
+    slow = TimedExpert("Slow_Expert", delay=0.3)
+    orchestrator = make_orchestrator(rejecter, slow, early_exit_consensus=False)
+
+    result = orchestrator.verify_transaction("intent", "tx_1")
+
+    assert result.consensus == "REJECTED"
+    assert len(result.expert_verdicts) == 2
+
+
+def test_decided_consensus():
+    engine = ConsensusEngine()
+    approve = ExpertVerdict("A", "APPROVE", 0.9, 1.0)
+    weak_reject = ExpertVerdict("B", "REJECT", 0.3, 1.0)
+    strong_reject = ExpertVerdict("C", "REJECT", 0.9, 1.0)
+
+    assert engine.decided_consensus([strong_reject], pending=2) == "REJECTED"
+    # A pending expert could still reject with high confidence
+    assert engine.decided_consensus([approve], pending=1) is None
+    assert engine.decided_consensus([weak_reject], pending=1) is None
+    # Nothing pending: same as aggregate
+    assert engine.decided_consensus([approve], pending=0) == "APPROVED"
+    assert engine.decided_consensus([approve, weak_reject], pending=0) == "UNCERTAIN"
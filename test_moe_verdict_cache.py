@@ -0,0 +1,193 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the MOEOrchestrator verdict cache.
+
+Tests:
+- Canonical keys: key order, whitespace and parentheses do not matter
+- Alpha renaming is opt-in
+- Per-verdict TTLs; timeouts and crashes are not cached
+- LRU eviction bound
+- Single-flight deduplication of concurrent identical intents
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from diotec360.moe.orchestrator import MOEOrchestrator, TRANSIENT
+from diotec360.moe.intent_canonicalizer import canonicalize_intent
+from diotec360.moe.base_expert import BaseExpert
+from diotec360.moe.data_models import ExpertVerdict
+
+
+class CountingExpert(BaseExpert):
+    """Expert with a fixed verdict that counts its runs."""
+
+    def __init__(self, name="Counting_Expert", verdict="APPROVE", confidence=0.9, delay=0.0, fail=False):
+        super().__init__(name)
+        self.verdict = verdict
+        self.confidence = confidence
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def verify(self, intent: str, tx_id: str) -> ExpertVerdict:
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("expert crashed")
+        return ExpertVerdict(
+            expert_name=self.name,
+            verdict=self.verdict,
+            confidence=self.confidence,
+            latency_ms=self.delay * 1000,
+            proof_trace={'mock': True}
+        )
+
+
+@pytest.fixture
+def make_orchestrator():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        def factory(*experts, **kwargs):
+            orchestrator = MOEOrchestrator(telemetry_db_path=os.path.join(tmpdir, "telemetry.db"), **kwargs)
+            for expert in experts:
+                orchestrator.register_expert(expert)
+            return orchestrator
+        yield factory
+
+
+TRANSFER = {
+    'params': [],
+    'constraints': ['balance >= amount', 'amount > 0'],
+    'post_conditions': ['new_balance == balance - amount'],
+}
+
+
+def test_cosmetic_variants_share_a_key():
+    reordered = {
+        'post_conditions': ['(new_balance)==balance-amount'],
+        'params': [],
+        'constraints': ['balance>=amount', '  amount > 0'],
+    }
+    assert canonicalize_intent(str(TRANSFER)) == canonicalize_intent(str(reordered))
+
+    text = "intent t() {\n  guard {\n    balance >= amount\n  }\n}"
+    spaced = "intent t()  {\n\n guard {\n balance   >=  amount\n  }\n}\n"
+    assert canonicalize_intent(text) == canonicalize_intent(spaced)
+
+    # Line breaks separate conditions, so they are significant
+    assert canonicalize_intent("a > 0\nb > 0") != canonicalize_intent("a > 0 b > 0")
+    # Different constraints stay different
+    assert canonicalize_intent(str(TRANSFER)) != canonicalize_intent(
+        str(dict(TRANSFER, constraints=['balance > amount', 'amount > 0'])))
+
+
+def test_alpha_renaming_is_opt_in(make_orchestrator):
+    renamed = {
+        'params': [],
+        'constraints': ['funds >= value', 'value > 0'],
+        'post_conditions': ['remaining == funds - value'],
+    }
+    assert canonicalize_intent(str(TRANSFER)) != canonicalize_intent(str(renamed))
+    assert canonicalize_intent(str(TRANSFER), alpha_rename=True) == canonicalize_intent(str(renamed), alpha_rename=True)
+
+    expert = CountingExpert()
+    orchestrator = make_orchestrator(expert, alpha_rename_cache_keys=True)
+    orchestrator.verify_transaction(str(TRANSFER), "tx_1")
+    result = orchestrator.verify_transaction(str(renamed), "tx_2")
+    assert expert.calls == 1
+    assert result.transaction_id == "tx_2"
+
+
+def test_cache_hit_does_not_mutate_cached_result(make_orchestrator):
+    orchestrator = make_orchestrator(CountingExpert())
+    first = orchestrator.verify_transaction(str(TRANSFER), "tx_1")
+    second = orchestrator.verify_transaction(str(TRANSFER), "tx_2")
+    assert (first.transaction_id, second.transaction_id) == ("tx_1", "tx_2")
+
+
+def test_uncertain_and_transient_ttls(make_orchestrator):
+    uncertain = make_orchestrator(CountingExpert(confidence=0.5), cache_ttl_by_verdict={"UNCERTAIN": 0.2})
+    assert uncertain.verify_transaction("intent a", "tx_1").consensus == "UNCERTAIN"
+    assert uncertain.get_cache_stats()['entries_by_verdict'] == {"UNCERTAIN": 1}
+    uncertain.verify_transaction("intent a", "tx_2")
+    assert uncertain.cache_hits == 1
+    time.sleep(0.3)
+    uncertain.verify_transaction("intent a", "tx_3")
+    assert uncertain.cache_misses == 2
+    assert uncertain.get_cache_stats()['expirations'] == 1
+
+    crashing = CountingExpert(fail=True)
+    transient = make_orchestrator(crashing)
+    assert transient.verify_transaction("intent b", "tx_1").consensus != "APPROVED"
+    transient.verify_transaction("intent b", "tx_2")
+    assert crashing.calls == 2
+    stats = transient.get_cache_stats()
+    assert stats['size'] == 0
+    assert stats['uncached'] == 2
+    assert stats['ttl_by_verdict'][TRANSIENT] == 0
+
+    # Real rejections are cached like approvals
+    rejecting = CountingExpert(verdict="REJECT", confidence=0.95)
+    negative = make_orchestrator(rejecting)
+    negative.verify_transaction("intent c", "tx_1")
+    negative.verify_transaction("intent c", "tx_2")
+    assert rejecting.calls == 1
+
+
+def test_lru_eviction(make_orchestrator):
+    orchestrator = make_orchestrator(CountingExpert(), max_cache_entries=2)
+    orchestrator.verify_transaction("intent 1", "tx_1")
+    orchestrator.verify_transaction("intent 2", "tx_2")
+    orchestrator.verify_transaction("intent 1", "tx_3")  # intent 1 most recently used
+    orchestrator.verify_transaction("intent 3", "tx_4")  # evicts intent 2
+
+    assert len(orchestrator.verdict_cache) == 2
+    assert orchestrator._check_cache("intent 1") is not None
+    assert orchestrator._check_cache("intent 2") is None
+    assert orchestrator.get_cache_stats()['evictions'] == 1
+
+
+def test_single_flight_runs_experts_once(make_orchestrator):
+    expert = CountingExpert(delay=0.3)
+    orchestrator = make_orchestrator(expert)
+    results = []
+
+    def verify(i):
+        results.append(orchestrator.verify_transaction(str(TRANSFER), f"tx_{i}"))
+
+    threads = [threading.Thread(target=verify, args=(i,)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert expert.calls == 1
+    assert sorted(r.transaction_id for r in results) == [f"tx_{i}" for i in range(5)]
+    assert {r.consensus for r in results} == {"APPROVED"}
+
+    stats = orchestrator.get_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] + stats['coalesced'] == 4
+    assert stats['effective_hit_rate'] == pytest.approx(0.8)
+    assert orchestrator._in_flight == {}
@@ -0,0 +1,154 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the indexed ProofMempool.
+
+Tests verify:
+- The addressable heap and its position index stay consistent
+- Top-k selection matches a full sort and leaves the heap untouched
+- Verification runs outside the mempool lock
+"""
+
+import hashlib
+import json
+import random
+import threading
+
+from hypothesis import given, settings, strategies as st
+
+from diotec360.consensus.proof_mempool import ProofMempool
+
+
+class StubResult:
+    def __init__(self, valid, difficulty):
+        self.valid = valid
+        self.difficulty = difficulty
+
+
+class BlockingVerifier:
+    """Verifier that waits until released, to observe the mempool meanwhile"""
+
+    def __init__(self, valid=True):
+        self.valid = valid
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def verify_proof(self, proof):
+        self.entered.set()
+        self.release.wait(timeout=5)
+        return StubResult(self.valid, 1000)
+
+
+def make_proof(i):
+    return {'intent': f'intent_{i}', 'constraints': [], 'valid': True}
+
+
+def proof_hash(proof):
+    return hashlib.sha256(json.dumps(proof).encode()).hexdigest()
+
+
+def assert_heap_consistent(mempool):
+    heap = mempool._heap
+    assert len(mempool._positions) == len(heap)
+    for index, pending in enumerate(heap):
+        assert mempool._positions[pending.proof_hash] == index
+        if index:
+            assert not pending < heap[(index - 1) // 2]
+
+
+@settings(max_examples=30, deadline=None)
+@given(
+    difficulties=st.lists(st.integers(min_value=0, max_value=50), min_size=1, max_size=120),
+    seed=st.integers(min_value=0, max_value=1000),
+)
+def test_random_add_remove_keeps_index(difficulties, seed):
+    rng = random.Random(seed)
+    mempool = ProofMempool(max_size=1000)
+    hashes = {}
+    for i, difficulty in enumerate(difficulties):
+        assert mempool.add_proof(make_proof(i), difficulty=difficulty)
+        hashes[i] = proof_hash(make_proof(i))
+
+    for i in rng.sample(sorted(hashes), len(hashes) // 2):
+        assert mempool.remove_proof(hashes.pop(i))
+        assert_heap_consistent(mempool)
+
+    remaining = sorted(
+        (-difficulties[i], i) for i in hashes
+    )
+    block = mempool.get_next_block(block_size=len(remaining))
+    assert [p['intent'] for p in block.proofs] == [f'intent_{i}' for _, i in remaining]
+
+
+def test_top_k_does_not_modify_heap():
+    mempool = ProofMempool(max_size=1000)
+    for i in range(200):
+        mempool.add_proof(make_proof(i), difficulty=(i * 37) % 101)
+    before = list(mempool._heap)
+
+    block = mempool.get_next_block(block_size=10)
+    expected = sorted(range(200), key=lambda i: (-((i * 37) % 101), i))[:10]
+    assert [p['intent'] for p in block.proofs] == [f'intent_{i}' for i in expected]
+    assert mempool._heap == before
+
+
+def test_bulk_removal_rebuilds_index():
+    mempool = ProofMempool(max_size=1000)
+    for i in range(100):
+        mempool.add_proof(make_proof(i), difficulty=i)
+    hashes = [p.proof_hash for p in mempool._heap[:60]]
+
+    assert mempool.remove_proofs(hashes + ['missing']) == 60
+    assert mempool.size() == 40
+    assert_heap_consistent(mempool)
+
+
+def test_verification_runs_outside_lock():
+    verifier = BlockingVerifier()
+    mempool = ProofMempool(max_size=10, proof_verifier=verifier)
+    result = {}
+
+    worker = threading.Thread(target=lambda: result.setdefault('added', mempool.add_proof(make_proof(1))))
+    worker.start()
+    assert verifier.entered.wait(timeout=5)
+
+    # The mempool stays usable while the proof is being verified
+    assert mempool.add_proof(make_proof(2), difficulty=5)
+    assert mempool.size() == 1
+    # A concurrent duplicate is rejected while the original is in flight
+    assert not mempool.add_proof(make_proof(1), difficulty=5)
+
+    verifier.release.set()
+    worker.join(timeout=5)
+    assert result['added'] is True
+    assert mempool.size() == 2
+
+
+def test_in_flight_admissions_count_towards_capacity():
+    verifier = BlockingVerifier(valid=False)
+    mempool = ProofMempool(max_size=1, proof_verifier=verifier)
+
+    future = mempool.submit_proof(make_proof(1))
+    assert verifier.entered.wait(timeout=5)
+    assert not mempool.add_proof(make_proof(2), difficulty=5)
+
+    verifier.release.set()
+    assert future.result(timeout=5) is False
+    mempool.shutdown()
+
+    # The rejected proof released its reservation
+    assert mempool.add_proof(make_proof(2), difficulty=5)
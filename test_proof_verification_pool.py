@@ -0,0 +1,128 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for process-pool block verification.
+
+Tests verify:
+- Pool results agree with in-process verification
+- The first failure cancels proofs that are already running
+- Per-proof timeouts reject the block and replace the worker
+- ProofVerifier(process_pool=True) checks signatures before dispatch
+"""
+
+import time
+
+import pytest
+
+from diotec360.consensus.data_models import ProofBlock, SignedProof
+from diotec360.consensus.proof_verifier import ProofVerifier
+from diotec360.consensus.verification_pool import ProofVerificationPool
+from diotec360.core.judge import AethelJudge
+
+
+# 0.1ms of simulated solver time per constraint: ~10s
+SLOW_PROOF = {'intent': 'slow', 'constraints': ['c'] * 100_000, 'valid': True}
+
+
+def mock_proof(i, valid=True):
+    return {'intent': f'intent_{i}', 'constraints': [f'c_{i}'], 'valid': valid}
+
+
+def make_block(proofs):
+    return ProofBlock(
+        block_id="block_1",
+        timestamp=int(time.time()),
+        proofs=proofs,
+        previous_block_hash="",
+        proposer_id="node_1",
+        signature=b"",
+    )
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ProofVerificationPool(workers=2, proof_timeout=5.0)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_valid_block_matches_in_process(pool):
+    proofs = [mock_proof(i) for i in range(6)]
+    result = pool.verify_block(proofs)
+
+    assert result.valid
+    assert len(result.results) == 6
+    assert all(r.valid for r in result.results)
+    assert {r.proof_hash for r in result.results} == {
+        ProofVerifier(require_signatures=False).verify_proof(p).proof_hash for p in proofs
+    }
+
+
+def test_first_failure_cancels_running_proofs(pool):
+    restarts = pool.get_stats()['worker_restarts']
+
+    start = time.monotonic()
+    result = pool.verify_block([SLOW_PROOF, mock_proof(1, valid=False)])
+    elapsed = time.monotonic() - start
+
+    assert not result.valid
+    assert result.failed_proof == mock_proof(1, valid=False)
+    # The slow proof was killed, not waited for
+    assert elapsed < 3.0
+    assert pool.get_stats()['worker_restarts'] == restarts + 1
+
+
+def test_proof_timeout_rejects_block(pool):
+    result = pool.verify_block([SLOW_PROOF], proof_timeout=0.5)
+
+    assert not result.valid
+    assert result.results[-1].error == "Verification timed out"
+    assert pool.get_stats()['timeouts'] >= 1
+
+    # Replacement workers keep serving blocks
+    assert pool.verify_block([mock_proof(1), mock_proof(2)]).valid
+
+
+def test_proof_verifier_process_pool_with_judge():
+    intent_map = {
+        f"transfer_{i}": {
+            'params': [],
+            'constraints': [f'balance_{i} >= 100', f'amount_{i} > 0'],
+            'post_conditions': [f'new_balance_{i} == balance_{i} - amount_{i}'],
+        }
+        for i in range(4)
+    }
+    verifier = ProofVerifier(
+        judge=AethelJudge(intent_map),
+        require_signatures=True,
+        max_workers=2,
+        process_pool=True,
+    )
+    try:
+        block = make_block(list(intent_map))
+        result = verifier.verify_proof_block(block)
+        assert result.valid, [r.error for r in result.results]
+        assert verifier.get_stats()['verification_count'] == 4
+
+        unsigned = make_block([SignedProof(proof_data="transfer_0"), "transfer_1"])
+        result = verifier.verify_proof_block(unsigned)
+        assert not result.valid
+        assert result.results[0].error == "Invalid or missing signature"
+        assert result.failed_proof is unsigned.proofs[0]
+    finally:
+        verifier.shutdown()
@@ -0,0 +1,190 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+"""
+Tests for the segmented binary write-ahead log.
+
+This module tests:
+- WriteAheadLog semantics survive a reopen
+- truncate_committed advances the checkpoint and unlinks segments
+- _rewrite_wal replaces the segment set for base-class callers
+- A torn tail is repaired, corruption elsewhere fails closed
+- JSON-lines WALs are converted on open
+- LogStructuredCommitLayer recovery on the segmented WAL
+"""
+
+import pytest
+
+from diotec360.consensus.atomic_commit import WriteAheadLog
+from diotec360.consensus.log_structured_state import LogStructuredCommitLayer
+from diotec360.consensus.segmented_wal import (
+    CHECKSUM_CRC32,
+    CHECKSUM_CRC32C,
+    SegmentedWriteAheadLog,
+    convert_json_wal,
+    crc32c,
+)
+from diotec360.core.integrity_panic import StateCorruptionPanic
+
+
+def tx_ids(entries):
+    return sorted(entry.tx_id for entry in entries)
+
+
+def test_crc32c_check_value():
+    assert crc32c(b"123456789") == 0xE3069283
+
+
+@pytest.mark.parametrize("checksum", [CHECKSUM_CRC32C, CHECKSUM_CRC32])
+def test_entries_survive_reopen(tmp_path, checksum):
+    wal = SegmentedWriteAheadLog(tmp_path, checksum=checksum)
+    pending = wal.append_entry("tx_pending", {"a": 1})
+    committed = wal.append_entry("tx_committed", {"b": 2})
+    wal.mark_committed(committed)
+    wal.append_committed_entry("tx_single", {"c": 3})
+    assert pending.entry_offset == 1
+    wal.shutdown()
+
+    reopened = SegmentedWriteAheadLog(tmp_path)
+    assert tx_ids(reopened.get_uncommitted_entries()) == ["tx_pending"]
+    assert tx_ids(reopened.get_committed_entries()) == ["tx_committed", "tx_single"]
+    assert reopened.get_uncommitted_entries()[0].changes == {"a": 1}
+    reopened.shutdown()
+
+
+def test_truncate_unlinks_segments_and_keeps_pending(tmp_path):
+    wal = SegmentedWriteAheadLog(tmp_path, segment_size=512)
+    pending = wal.append_entry("tx_pending", {"a": 1})
+    for i in range(50):
+        wal.append_committed_entry(f"tx_{i}", {f"k{i}": i})
+    assert len(list(tmp_path.glob("wal_*.seg"))) > 5
+
+    wal.truncate_committed()
+    assert len(list(tmp_path.glob("wal_*.seg"))) == 1
+    assert wal.checkpoint_lsn == 101
+    assert wal.get_committed_entries() == []
+    assert tx_ids(wal.get_uncommitted_entries()) == ["tx_pending"]
+
+    # A pending transaction can still commit after being re-logged
+    wal.mark_committed(pending)
+    wal.shutdown()
+
+    reopened = SegmentedWriteAheadLog(tmp_path, segment_size=512)
+    assert tx_ids(reopened.get_committed_entries()) == ["tx_pending"]
+    assert reopened.get_uncommitted_entries() == []
+    reopened.shutdown()
+
+
+def test_rewrite_replaces_segment_set(tmp_path):
+    """The base-class rewrite hook keeps exactly the given entries."""
+    wal = SegmentedWriteAheadLog(tmp_path, segment_size=512)
+    for i in range(30):
+        wal.append_committed_entry(f"tx_{i}", {f"k{i}": i})
+    wal.append_entry("tx_pending", {"a": 1})
+    keep = [e for e in wal._read_all_entries() if e.tx_id in ("tx_3", "tx_pending")]
+
+    wal._rewrite_wal(keep)
+    assert len(list(tmp_path.glob("wal_*.seg"))) == 1
+    assert tx_ids(wal.get_committed_entries()) == ["tx_3"]
+    assert tx_ids(wal.get_uncommitted_entries()) == ["tx_pending"]
+    wal.shutdown()
+
+    reopened = SegmentedWriteAheadLog(tmp_path, segment_size=512)
+    assert tx_ids(reopened.get_committed_entries()) == ["tx_3"]
+    assert tx_ids(reopened.get_uncommitted_entries()) == ["tx_pending"]
+    reopened.shutdown()
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    wal = SegmentedWriteAheadLog(tmp_path)
+    wal.append_committed_entry("tx_1", {"a": 1})
+    segment = wal.wal_file
+    wal.shutdown()
+
+    # Crash in the middle of writing the next record
+    with open(segment, "ab") as f:
+        f.write(b"\x40\x00\x00\x00\x12\x34")
+
+    reopened = SegmentedWriteAheadLog(tmp_path)
+    assert tx_ids(reopened.get_committed_entries()) == ["tx_1"]
+    reopened.append_committed_entry("tx_2", {"b": 2})
+    reopened.shutdown()
+
+    assert tx_ids(SegmentedWriteAheadLog(tmp_path).get_committed_entries()) == ["tx_1", "tx_2"]
+
+
+def test_corruption_before_tail_fails_closed(tmp_path):
+    wal = SegmentedWriteAheadLog(tmp_path, segment_size=256)
+    for i in range(20):
+        wal.append_committed_entry(f"tx_{i}", {f"k{i}": i})
+    wal.shutdown()
+
+    first = sorted(tmp_path.glob("wal_*.seg"))[0]
+    data = bytearray(first.read_bytes())
+    data[40] ^= 0xFF
+    first.write_bytes(bytes(data))
+
+    reopened = SegmentedWriteAheadLog(tmp_path, segment_size=256)
+    with pytest.raises(StateCorruptionPanic):
+        reopened.get_committed_entries()
+
+
+def test_json_wal_is_converted(tmp_path):
+    legacy = WriteAheadLog(tmp_path)
+    entry = legacy.append_entry("tx_committed", {"a": 1})
+    legacy.mark_committed(entry)
+    legacy.append_entry("tx_pending", {"b": 2})
+
+    assert convert_json_wal(tmp_path) == 2
+    assert not (tmp_path / "wal.log").exists()
+    assert (tmp_path / "wal.log.converted").exists()
+
+    wal = SegmentedWriteAheadLog(tmp_path)
+    assert wal.converted_entries == 0
+    assert tx_ids(wal.get_committed_entries()) == ["tx_committed"]
+    assert tx_ids(wal.get_uncommitted_entries()) == ["tx_pending"]
+    wal.shutdown()
+
+
+def test_log_structured_layer_on_segmented_wal(tmp_path):
+    layer = LogStructuredCommitLayer(
+        tmp_path / "state", tmp_path / "wal",
+        checkpoint_interval=10, segmented_wal=True
+    )
+    assert layer.recover_from_crash().recovered
+    for i in range(25):
+        tx = layer.begin_transaction(f"tx_{i}")
+        tx.changes = {f"account_{i}": i}
+        assert layer.commit_transaction(tx)
+
+    # Two checkpoints ran; the last five commits only exist in the WAL
+    assert len(layer.wal.get_committed_entries()) == 5
+    layer.engine.close()
+    layer.wal.shutdown()
+
+    reopened = LogStructuredCommitLayer(tmp_path / "state", tmp_path / "wal", segmented_wal=True)
+    assert reopened.recover_from_crash().recovered
+    assert all(reopened.get(f"account_{i}") == i for i in range(25))
+    reopened.shutdown()
+
+
+def test_group_commit_and_segmented_wal_are_exclusive(tmp_path):
+    with pytest.raises(ValueError):
+        LogStructuredCommitLayer(
+            tmp_path / "state", tmp_path / "wal",
+            group_commit=True, segmented_wal=True
+        )
@@ -0,0 +1,185 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the speculative (optimistic) batch executor.
+
+Tests verify:
+- Final states are identical to serial execution in batch order
+- Only transactions whose reads were invalidated are re-executed
+- The multi-version store serves the highest lower writer
+- BatchProcessor in speculative mode commits batches the level engine rejects
+"""
+
+import pytest
+from hypothesis import given, settings, strategies as st
+
+from diotec360.core.synchrony import Transaction
+from diotec360.core.speculative_executor import (
+    SpeculativeExecutor,
+    MultiVersionStore,
+    apply_operations,
+)
+from diotec360.core.batch_processor import BatchProcessor
+
+
+ACCOUNTS = ["alice", "bob", "charlie", "dave"]
+
+
+def transfer(tx_id, sender, receiver, amount, balances):
+    return Transaction(
+        id=tx_id,
+        intent_name="transfer",
+        accounts={sender: {"balance": balances[sender]}, receiver: {"balance": balances[receiver]}},
+        operations=[
+            {"type": "debit", "account": sender, "amount": amount},
+            {"type": "credit", "account": receiver, "amount": amount},
+        ],
+        verify_conditions=[]
+    )
+
+
+@st.composite
+def transfers_strategy(draw):
+    balances = {account: draw(st.integers(min_value=0, max_value=1000)) for account in ACCOUNTS}
+    transactions = []
+    for i in range(draw(st.integers(min_value=0, max_value=20))):
+        sender, receiver = draw(st.lists(st.sampled_from(ACCOUNTS), min_size=2, max_size=2, unique=True))
+        amount = draw(st.integers(min_value=1, max_value=100))
+        transactions.append(transfer(f"tx_{i}", sender, receiver, amount, balances))
+    return balances, transactions
+
+
+@settings(max_examples=100, deadline=None)
+@given(batch=transfers_strategy(), threads=st.integers(min_value=1, max_value=4))
+def test_results_identical_to_serial(batch, threads):
+    balances, transactions = batch
+    initial_states = {account: {"balance": balance} for account, balance in balances.items()}
+
+    with SpeculativeExecutor(thread_count=threads, program=apply_operations) as executor:
+        result = executor.execute(transactions, initial_states)
+        assert result.final_states == executor.execute_serial(transactions, initial_states)
+
+        stats = executor.get_stats()
+        assert stats["executions"] == len(transactions) + stats["re_executions"]
+
+    # Initial states are never mutated
+    assert initial_states == {account: {"balance": balance} for account, balance in balances.items()}
+
+
+def test_independent_transactions_run_once():
+    balances = {f"acc_{i}": 100 for i in range(20)}
+    transactions = [
+        transfer(f"tx_{i}", f"acc_{2 * i}", f"acc_{2 * i + 1}", 10, balances)
+        for i in range(10)
+    ]
+
+    with SpeculativeExecutor(thread_count=4, program=apply_operations) as executor:
+        result = executor.execute(transactions, {a: {"balance": b} for a, b in balances.items()})
+        assert executor.get_stats()["re_executions"] == 0
+
+    assert result.parallel_groups == [{tx.id for tx in transactions}]
+    assert result.final_states["acc_0"] == {"balance": 90}
+    assert result.final_states["acc_1"] == {"balance": 110}
+
+
+def test_only_invalidated_transactions_re_execute():
+    balances = {"alice": 100, "bob": 0, "carol": 50, "dave": 0}
+    transactions = [
+        transfer("tx_0", "alice", "bob", 30, balances),
+        transfer("tx_1", "carol", "dave", 5, balances),
+        transfer("tx_2", "bob", "alice", 10, balances),
+    ]
+
+    # One thread: every transaction sees only the initial states first
+    with SpeculativeExecutor(thread_count=1, program=apply_operations) as executor:
+        store_states = {a: {"balance": b} for a, b in balances.items()}
+        result = executor.execute(transactions, store_states)
+        stats = executor.get_stats()
+
+    assert result.final_states == {
+        "alice": {"balance": 80}, "bob": {"balance": 20},
+        "carol": {"balance": 45}, "dave": {"balance": 5},
+    }
+    # tx_2 may have read bob before tx_0 published; tx_1 never conflicts
+    assert "tx_1" not in stats["re_executed"]
+    assert set(stats["re_executed"]) <= {"tx_2"}
+
+
+def test_program_errors_raise_only_when_reads_were_valid():
+    def overdraft_check(transaction, read):
+        writes = apply_operations(transaction, read)
+        for account_id, state in writes.items():
+            if state["balance"] < 0:
+                raise ValueError(f"{account_id} overdrawn by {transaction.id}")
+        return writes
+
+    balances = {"alice": 10, "bob": 0}
+    transactions = [
+        transfer("tx_0", "alice", "bob", 10, balances),
+        transfer("tx_1", "bob", "alice", 10, balances),  # valid only after tx_0
+        transfer("tx_2", "bob", "alice", 1, balances),  # overdraws in serial order
+    ]
+    with SpeculativeExecutor(thread_count=2, program=overdraft_check) as executor:
+        with pytest.raises(ValueError, match="bob overdrawn by tx_2"):
+            executor.execute(transactions, {a: {"balance": b} for a, b in balances.items()})
+        result = executor.execute(transactions[:2], {a: {"balance": b} for a, b in balances.items()})
+
+    assert result.final_states == {"alice": {"balance": 10}, "bob": {"balance": 0}}
+
+
+def test_multi_version_store_reads_highest_lower_writer():
+    store = MultiVersionStore({"a": {"balance": 1}})
+    store.publish(2, 0, {"a": {"balance": 20}})
+    store.publish(5, 0, {"a": {"balance": 50}})
+
+    assert store.read("a", 0) == (None, {"balance": 1})
+    assert store.read("a", 3) == ((2, 0), {"balance": 20})
+    assert store.read("a", 9) == ((5, 0), {"balance": 50})
+
+    # A re-execution that no longer writes "a" removes its version
+    store.publish(5, 1, {})
+    assert store.latest_version("a", 9) == (2, 0)
+    assert store.final_states() == {"a": {"balance": 20}}
+
+
+def test_batch_processor_speculative_mode_commits_conflicting_batch():
+    # No operations: the analyzer treats every account as written, so the
+    # shared account makes the level engine report a circular dependency
+    transactions = [
+        Transaction(id=f"tx_{i}", intent_name="touch",
+                    accounts={"alice": {"balance": 100}, f"acc_{i}": {"balance": i}},
+                    operations=[], verify_conditions=[])
+        for i in range(3)
+    ]
+
+    level = BatchProcessor(num_threads=2, speculative=False)
+    assert level.execute_batch(transactions).error_type == "CircularDependencyError"
+
+    speculative = BatchProcessor(num_threads=2, speculative=True)
+    result = speculative.execute_batch(transactions)
+    assert result.success is True
+    assert result.transactions_executed == 3
+    assert result.diagnostic_info["speculative"]["transactions"] == 3
+
+
+def test_batch_processor_speculative_env_flag(monkeypatch):
+    monkeypatch.setenv("AETHEL_SPECULATIVE_BATCH", "true")
+    assert BatchProcessor(num_threads=1).speculative is True
+    monkeypatch.delenv("AETHEL_SPECULATIVE_BATCH")
+    processor = BatchProcessor(num_threads=1)
+    assert processor.speculative is False
+    assert processor.speculative_executor is None
@@ -0,0 +1,205 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for TelemetrySink and its use by SentinelMonitor and ExpertTelemetry.
+
+Tests:
+- Rows are written in batches through one WAL connection
+- flush() gives read-your-writes, close() writes everything queued
+- Overflow policies: drop_oldest, drop_newest, block
+- SentinelMonitor persists every transaction
+- ExpertTelemetry queries see rows recorded just before
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import pytest
+
+from diotec360.core.telemetry_sink import TelemetrySink, DROP_NEWEST, BLOCK
+from diotec360.core.sentinel_monitor import SentinelMonitor
+from diotec360.moe.telemetry import ExpertTelemetry
+from diotec360.moe.data_models import ExpertVerdict, MOEResult
+
+
+INSERT = "INSERT INTO events (value) VALUES (?)"
+
+
+@pytest.fixture
+def db_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "telemetry.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE events (value INTEGER)")
+        conn.commit()
+        conn.close()
+        yield path
+
+
+def read_values(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT value FROM events ORDER BY rowid")]
+    finally:
+        conn.close()
+
+
+def test_rows_are_written_in_batches(db_path):
+    sink = TelemetrySink(db_path, batch_size=100, flush_interval=10.0)
+    for i in range(1000):
+        assert sink.submit(INSERT, (i,))
+    assert sink.flush(timeout=10)
+
+    assert read_values(db_path) == list(range(1000))
+    stats = sink.get_stats()
+    assert stats['rows_written'] == 1000
+    assert stats['batches_written'] < 1000
+    assert stats['queue_depth'] == 0
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    sink.close()
+
+
+def test_flush_interval_writes_partial_batch(db_path):
+    sink = TelemetrySink(db_path, batch_size=1000, flush_interval=0.05)
+    sink.submit(INSERT, (1,))
+    for _ in range(50):
+        if read_values(db_path):
+            break
+        time.sleep(0.05)
+    assert read_values(db_path) == [1]
+    sink.close()
+
+
+def test_close_writes_queued_rows_and_rejects_new_ones(db_path):
+    sink = TelemetrySink(db_path, batch_size=10000, flush_interval=60.0)
+    for i in range(500):
+        sink.submit(INSERT, (i,))
+    sink.close()
+
+    assert read_values(db_path) == list(range(500))
+    assert sink.submit(INSERT, (500,)) is False
+    assert sink.get_stats()['rows_dropped'] == 1
+    assert sink._thread is None
+
+
+def test_drop_oldest_keeps_recent_rows(db_path):
+    sink = TelemetrySink(db_path, max_queue_size=10, flush_interval=60.0, batch_size=10000)
+    # Hold the queue: the flusher waits for a full batch or the interval
+    for i in range(25):
+        assert sink.submit(INSERT, (i,))
+    sink.close()
+
+    assert read_values(db_path) == list(range(15, 25))
+    assert sink.get_stats()['rows_dropped'] == 15
+
+
+def test_drop_newest_rejects_new_rows(db_path):
+    sink = TelemetrySink(db_path, max_queue_size=10, flush_interval=60.0,
+                         batch_size=10000, overflow_policy=DROP_NEWEST)
+    accepted = [sink.submit(INSERT, (i,)) for i in range(25)]
+    sink.close()
+
+    assert accepted == [True] * 10 + [False] * 15
+    assert read_values(db_path) == list(range(10))
+
+
+def test_block_policy_waits_for_room(db_path):
+    sink = TelemetrySink(db_path, max_queue_size=10, flush_interval=60.0,
+                         batch_size=10000, overflow_policy=BLOCK)
+    accepted = [sink.submit(INSERT, (i,)) for i in range(25)]
+    sink.close()
+
+    assert all(accepted)
+    assert read_values(db_path) == list(range(25))
+    assert sink.get_stats()['blocked_submits'] > 0
+
+
+def test_concurrent_producers(db_path):
+    sink = TelemetrySink(db_path, batch_size=50)
+
+    def produce(offset):
+        for i in range(200):
+            sink.submit(INSERT, (offset + i,))
+
+    threads = [threading.Thread(target=produce, args=(k * 1000,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sink.close()
+
+    assert sorted(read_values(db_path)) == sorted(k * 1000 + i for k in range(4) for i in range(200))
+
+
+def test_failed_batch_is_counted(db_path):
+    sink = TelemetrySink(db_path)
+    sink.submit("INSERT INTO missing_table (value) VALUES (?)", (1,))
+    assert sink.flush(timeout=10)
+    assert sink.get_stats()['rows_failed'] == 1
+    sink.close()
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        TelemetrySink("unused.db", overflow_policy="spill")
+
+
+def test_sentinel_persists_every_transaction():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "sentinel.db")
+        monitor = SentinelMonitor(db_path=path)
+        for i in range(30):
+            monitor.start_transaction(f"tx_{i}")
+            monitor.end_transaction(f"tx_{i}", {"z3": True})
+        assert monitor.flush_telemetry(timeout=10)
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM transaction_metrics").fetchone()[0] == 30
+        conn.close()
+        monitor.shutdown()
+
+
+def test_expert_telemetry_reads_its_writes():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        telemetry = ExpertTelemetry(db_path=os.path.join(tmpdir, "moe.db"))
+        verdicts = [
+            ExpertVerdict("Z3_Expert", "APPROVE", 0.9, 10.0),
+            ExpertVerdict("Sentinel_Expert", "REJECT", 0.8, 2.0),
+        ]
+        for i in range(20):
+            result = MOEResult(
+                transaction_id=f"tx_{i}",
+                consensus="UNCERTAIN",
+                overall_confidence=0.5,
+                expert_verdicts=verdicts,
+                total_latency_ms=12.0,
+                activated_experts=["Z3_Expert", "Sentinel_Expert"],
+            )
+            telemetry.record(f"tx_{i}", verdicts, result)
+        telemetry.record_ground_truth("tx_0", "Z3_Expert", True)
+
+        stats = telemetry.get_expert_stats("Z3_Expert")
+        assert stats['total_verifications'] == 20
+        assert stats['accuracy'] == 1.0
+        assert len(telemetry.get_all_experts_stats()) == 2
+        telemetry.close()
@@ -0,0 +1,116 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the AethelJudge verdict cache.
+
+Tests verify:
+- Templated intents that differ only in name share one verdict
+- A rigor change never reuses a verdict from another rigor level
+- LRU and TTL eviction, and the SQLite disk tier
+- Hit/miss counts reach the Sentinel telemetry
+"""
+
+import time
+
+from diotec360.core.adaptive_rigor import SystemMode
+from diotec360.core.judge import AethelJudge
+from diotec360.core.verdict_cache import VerdictCache, canonical_intent_key
+
+
+def transfer_intent():
+    return {
+        'params': [],
+        'constraints': ['sender_balance >= amount', 'amount > 0'],
+        'post_conditions': ['sender_balance_new == sender_balance - amount', 'sender_balance_new >= 0'],
+    }
+
+
+def test_identical_intents_share_verdict():
+    judge = AethelJudge(
+        {'transfer_a': transfer_intent(), 'transfer_b': transfer_intent()},
+        enable_verdict_cache=True,
+    )
+    monitor = judge.sentinel_monitor
+    hits_before = monitor.verdict_cache_hits
+
+    first = judge.verify_logic('transfer_a')
+    second = judge.verify_logic('transfer_b')
+
+    assert first['status'] == 'PROVED'
+    assert 'cached' not in first
+    assert second['status'] == 'PROVED'
+    assert second['cached'] is True
+    assert second['model'] == first['model']
+    assert judge.verdict_cache.get_stats()['hits'] == 1
+    assert monitor.verdict_cache_hits == hits_before + 1
+    assert 'verdict_cache' in monitor.get_statistics()
+
+
+def test_rigor_change_misses_cache():
+    judge = AethelJudge({'transfer': transfer_intent()}, enable_verdict_cache=True)
+    assert judge.verify_logic('transfer')['status'] == 'PROVED'
+
+    judge.adaptive_rigor.activate_crisis_mode()
+    try:
+        crisis = judge.verify_logic('transfer')
+    finally:
+        judge.adaptive_rigor.current_mode = SystemMode.NORMAL
+        judge.adaptive_rigor.current_config = judge.adaptive_rigor.normal_config
+
+    assert 'cached' not in crisis
+    assert judge.verdict_cache.get_stats()['hits'] == 0
+    assert judge.verify_logic('transfer')['cached'] is True
+
+
+def test_cache_disabled_by_default():
+    judge = AethelJudge({'transfer': transfer_intent()})
+    assert judge.verdict_cache is None
+    assert 'cached' not in judge.verify_logic('transfer')
+
+
+def test_lru_and_ttl_eviction():
+    cache = VerdictCache(max_entries=2, ttl_seconds=0.2)
+    for name in ('a', 'b'):
+        cache.put(name, {'status': 'PROVED', 'name': name}, {'z3_prover': True})
+    assert cache.get('a') is not None  # 'b' becomes least recently used
+
+    cache.put('c', {'status': 'FAILED'}, {'z3_prover': False})
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get_stats()['evictions'] == 1
+
+    time.sleep(0.25)
+    assert cache.get('c') is None
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    key = canonical_intent_key(transfer_intent(), {'rigor_mode': 'normal'})
+    assert key == canonical_intent_key(dict(reversed(list(transfer_intent().items()))), {'rigor_mode': 'normal'})
+    assert key != canonical_intent_key(transfer_intent(), {'rigor_mode': 'crisis'})
+
+    path = tmp_path / "verdicts.db"
+    cache = VerdictCache(disk_path=str(path))
+    cache.put(key, {'status': 'PROVED', 'model': {'amount': 1}}, {'z3_prover': True})
+    cache.close()
+
+    restarted = VerdictCache(disk_path=str(path))
+    verdict, layers = restarted.get(key)
+    assert verdict == {'status': 'PROVED', 'model': {'amount': 1}}
+    assert layers == {'z3_prover': True}
+    assert restarted.get_stats()['disk_hits'] == 1
+    restarted.close()
@@ -0,0 +1,122 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the API verification executor.
+
+Tests verify:
+- Aethel source is parsed and verified in a worker process
+- The event loop keeps running while workers are busy
+- Admission control rejects with a Retry-After estimate when saturated
+- Deadlines fail the request but keep the slot until the worker finishes
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from api.verify_executor import (
+    VerifyExecutor,
+    VerificationRejected,
+    VerificationDeadlineExceeded,
+    verify_source,
+)
+
+
+TRANSFER = """intent transfer(sender: Account, receiver: Account, amount: Balance) {
+    guard {
+        sender_balance >= amount;
+        amount > 0;
+    }
+    solve {
+        priority: security;
+    }
+    verify {
+        sender_balance == old_sender_balance - amount;
+        receiver_balance == old_receiver_balance + amount;
+    }
+}"""
+
+
+@pytest.fixture(scope="module")
+def executor():
+    executor = VerifyExecutor(workers=1, max_pending=2, default_deadline=60.0)
+    executor.start()
+    yield executor
+    executor.shutdown()
+
+
+def test_verify_source_in_worker(executor):
+    outcome = asyncio.run(executor.run(verify_source, TRANSFER))
+
+    assert outcome['parsed']
+    assert outcome['results'] == [{
+        'name': 'transfer',
+        'status': 'PROVED',
+        'message': outcome['results'][0]['message'],
+    }]
+    assert executor.get_metrics()['completed'] >= 1
+
+
+def test_event_loop_not_blocked(executor):
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.5)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 20
+
+
+def test_saturation_rejects_with_retry_after(executor):
+    async def scenario():
+        running = [asyncio.create_task(executor.run(time.sleep, 0.5)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(VerificationRejected) as excinfo:
+            await executor.run(time.sleep, 0)
+        await asyncio.gather(*running)
+        return excinfo.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.retry_after >= 1
+    metrics = executor.get_metrics()
+    assert metrics['rejected'] >= 1
+    assert metrics['max_queue_depth'] >= 1
+    assert metrics['in_flight'] == 0
+
+
+def test_deadline_keeps_slot_until_worker_finishes(executor):
+    async def scenario():
+        with pytest.raises(VerificationDeadlineExceeded):
+            await executor.run(time.sleep, 1.0, deadline=0.1)
+        # The worker is still sleeping: the request still counts as in flight
+        in_flight = executor.get_metrics()['in_flight']
+        await asyncio.sleep(1.5)
+        return in_flight
+
+    assert asyncio.run(scenario()) == 1
+    metrics = executor.get_metrics()
+    assert metrics['deadline_exceeded'] >= 1
+    assert metrics['in_flight'] == 0
@@ -0,0 +1,216 @@
+"""
+Copyright 2024 Dionísio Sebastião Barros / DIOTEC 360
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+"""
+Tests for the compiled WASM backend of AethelWasmRuntime.
+
+Tests:
+- Compiled WAT assembles and runs the built-in intents
+- Modules are compiled once per WAT hash and reused
+- Guard traps and fuel exhaustion map to the runtime exceptions
+- Linear-memory limits are enforced at instantiation
+- Calls the engine cannot run fall back to the simulator
+- Compiled results and guard violations match the simulator
+"""
+
+import contextlib
+import io
+
+import pytest
+
+pytest.importorskip("wasmtime")
+
+from diotec360.core import wasm_runtime
+from diotec360.core.wasm_compiler import AethelWasmCompiler
+from diotec360.core.wasm_runtime import (
+    AethelWasmRuntime, WasmModuleCache, GasExhaustedException, SandboxViolationException
+)
+
+
+TRANSFER = {
+    'function_hash': 'transfer_test_hash',
+    'intent_name': 'transfer',
+    'ast': {
+        'params': ['sender:Account', 'receiver:Account', 'amount:Balance'],
+        'constraints': [
+            'sender_balance >= amount',
+            'amount >= min_transfer',
+            'old_sender_balance == sender_balance',
+        ],
+        'post_conditions': ['sender_balance == old_sender_balance'],
+    },
+}
+
+CHECK_BALANCE = {
+    'function_hash': 'check_balance_test_hash',
+    'intent_name': 'check_balance',
+    'ast': {
+        'params': [{'name': 'account', 'type': 'Account'}, {'name': 'minimum', 'type': 'Balance'}],
+        'constraints': [{'expression': 'account_balance >= balance_zero'}],
+        'post_conditions': [],
+    },
+}
+
+TRANSFER_INPUTS = {'sender_balance': 500, 'receiver_balance': 100, 'amount': 150}
+
+
+def compile_wat(bundle):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return AethelWasmCompiler(bundle).compile()
+
+
+def run(wat_code, intent_name, inputs, **kwargs):
+    kwargs.setdefault('module_cache', WasmModuleCache())
+    runtime = AethelWasmRuntime(wat_code, verbose=False, **kwargs)
+    return runtime.execute_safely(intent_name, inputs)
+
+
+def test_transfer_runs_compiled():
+    envelope = run(compile_wat(TRANSFER), 'transfer', TRANSFER_INPUTS)
+
+    assert envelope['backend'] == 'wasmtime'
+    assert envelope['output_state'] == {'sender_balance': 350, 'receiver_balance': 250, 'amount': 150}
+    assert 0 < envelope['gas_used'] <= envelope['gas_limit']
+
+
+def test_check_balance_result_flag():
+    wat_code = compile_wat(CHECK_BALANCE)
+
+    passed = run(wat_code, 'check_balance', {'account_balance': 50, 'minimum': 10})
+    failed = run(wat_code, 'check_balance', {'account_balance': 5, 'minimum': 10})
+
+    assert passed['output_state']['balance_check_passed'] is True
+    assert failed['output_state']['balance_check_passed'] is False
+
+
+def test_module_compiled_once_per_hash():
+    cache = WasmModuleCache()
+    wat_code = compile_wat(TRANSFER)
+    assert compile_wat(TRANSFER) == wat_code
+
+    for _ in range(5):
+        run(wat_code, 'transfer', TRANSFER_INPUTS, module_cache=cache)
+
+    assert cache.get_stats() == {'modules': 1, 'hits': 4, 'misses': 1}
+
+
+def test_guard_violation_traps():
+    inputs = dict(TRANSFER_INPUTS, amount=1000)
+    with pytest.raises(SandboxViolationException, match="Guard violation"):
+        run(compile_wat(TRANSFER), 'transfer', inputs)
+
+
+def test_fuel_exhaustion():
+    with pytest.raises(GasExhaustedException):
+        run(compile_wat(TRANSFER), 'transfer', TRANSFER_INPUTS, gas_limit=50)
+
+
+def test_loop_stopped_by_fuel():
+    wat_code = """
+    (module
+      (func $spin (param $n i32) (result i32)
+        (loop $again
+          br $again)
+        i32.const 1)
+      (export "spin" (func $spin)))
+    """
+    with pytest.raises(GasExhaustedException):
+        run(wat_code, 'spin', {'n': 1}, gas_limit=5000)
+
+
+def test_memory_limit_enforced():
+    wat_code = """
+    (module
+      (memory 4)
+      (func $vote (param $votes i32) (result i32)
+        i32.const 1)
+      (export "vote" (func $vote)))
+    """
+    with pytest.raises(SandboxViolationException):
+        run(wat_code, 'vote', {'votes': 1})
+
+    envelope = run(wat_code, 'vote', {'votes': 1}, memory_limit=4 * 65536)
+    assert envelope['backend'] == 'wasmtime'
+
+
+def test_falls_back_to_simulator():
+    wat_code = compile_wat(TRANSFER)
+    cache = WasmModuleCache()
+
+    # Values outside i32 cannot be passed to the module
+    envelope = run(wat_code, 'transfer', dict(TRANSFER_INPUTS, sender_balance=2 ** 40), module_cache=cache)
+    assert envelope['backend'] == 'simulator'
+
+    # WAT that does not assemble is remembered, not retried
+    for _ in range(2):
+        envelope = run("(module (func $vote", 'vote', {'votes': 1}, module_cache=cache)
+        assert envelope['backend'] == 'simulator'
+        assert envelope['output_state']['votes'] == 2
+    assert cache.get_stats()['misses'] == 2
+
+
+def test_simulator_without_engine(monkeypatch):
+    monkeypatch.setattr(wasm_runtime, 'wasmtime', None)
+
+    envelope = run(compile_wat(TRANSFER), 'transfer', TRANSFER_INPUTS)
+
+    assert envelope['backend'] == 'simulator'
+    assert envelope['output_state']['sender_balance'] == 350
+
+
+def plain_bundle(intent_name):
+    """Bundle whose only guards are the intent's built-in ones"""
+    return {
+        'function_hash': f'{intent_name}_plain_hash',
+        'intent_name': intent_name,
+        'ast': {'params': [], 'constraints': [], 'post_conditions': []},
+    }
+
+
+def outcome(wat_code, intent_name, inputs):
+    """(backend, output state or exception type)"""
+    try:
+        envelope = run(wat_code, intent_name, inputs)
+    except (SandboxViolationException, GasExhaustedException) as e:
+        return None, type(e)
+    return envelope['backend'], envelope['output_state']
+
+
+I32_MAX = 2 ** 31 - 1
+
+
+@pytest.mark.parametrize("intent_name, inputs", [
+    ('transfer', TRANSFER_INPUTS),
+    ('transfer', {'sender_balance': I32_MAX, 'receiver_balance': I32_MAX, 'amount': 1}),
+    ('transfer', {'sender_balance': -(2 ** 31), 'receiver_balance': 0, 'amount': -(2 ** 31)}),
+    ('transfer', {'sender_balance': 500, 'receiver_balance': 100, 'amount': -50}),
+    ('transfer', {'sender_balance': 500, 'receiver_balance': 100, 'amount': 0}),
+    ('transfer', {'sender_balance': 10, 'receiver_balance': 100, 'amount': 50}),
+    ('vote', {'votes': I32_MAX}),
+    ('vote', {'votes': -1}),
+    ('check_balance', {'account_balance': I32_MAX, 'minimum': -(2 ** 31)}),
+    ('check_balance', {'account_balance': -1, 'minimum': 0}),
+])
+def test_compiled_matches_simulator(monkeypatch, intent_name, inputs):
+    """No i32 wraparound, and the built-in intent guards still trap."""
+    wat_code = compile_wat(plain_bundle(intent_name))
+
+    backend, compiled = outcome(wat_code, intent_name, inputs)
+    monkeypatch.setattr(wasm_runtime, 'wasmtime', None)
+    _, simulated = outcome(wat_code, intent_name, inputs)
+
+    assert backend in ('wasmtime', None)
+    assert compiled == simulated